@@ -3,30 +3,29 @@
 Visual Analyzer
 Core visual analysis functionality extracted from visual_reference_analyzer.py
 """
+import io
 import os
+import base64
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    Image = None
+from ..base import LazyModule, RateLimiter, module_available
 
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
-    np = None
+# 重い依存（PIL / numpy / Gemini）は解析を実行するまで読み込まない
+Image = LazyModule('PIL.Image')
+PIL_AVAILABLE = module_available('PIL')
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+np = LazyModule('numpy')
+_edge_detector = LazyModule(f'{__package__}.edge_detector')
+NUMPY_AVAILABLE = module_available('numpy')
+
+genai = LazyModule('google.generativeai')
+GEMINI_AVAILABLE = module_available('google.generativeai')
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -64,6 +63,26 @@ class VisualAnalysis:
 class VisualAnalyzer:
     """Analyze key visual images to extract style elements"""
 
+    STYLE_PROMPT = """
+    Analyze the art style of this image. Identify:
+    1. Overall style (anime, realistic, cartoon, painterly, etc.)
+    2. Rendering technique (2D, 3D, digital painting, watercolor, etc.)
+    3. Visual characteristics (line art, cel-shaded, photorealistic, etc.)
+
+    Return a concise style description in 3-5 words.
+    Example: "watercolor anime style" or "photorealistic 3D render"
+    """
+
+    # Longest side of the array used for the cheap local features
+    ANALYSIS_SIZE = 256
+
+    # Longest side of the JPEG sent to the vision API
+    VISION_SIZE = 1024
+
+    # Sobel magnitude (|gx| + |gy|) that counts as an edge; a clean step of 32
+    # luminance levels scores 4 * 32
+    EDGE_THRESHOLD = 128
+
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize analyzer
@@ -90,52 +109,213 @@ class VisualAnalyzer:
         """
         if not PIL_AVAILABLE:
             # Return default analysis if PIL not available
-            return VisualAnalysis(
-                style="digital illustration",
-                colors=['#FFE4B5', '#87CEEB', '#FF6B6B'],
-                mood="neutral",
-                composition="rule_of_thirds",
-                lighting="natural lighting",
-                elements=["characters", "background"],
-                texture="medium detail",
-                camera_angle="eye level",
-                depth="moderate depth",
-                contrast="medium contrast",
-                saturation="medium saturation"
-            )
-
-        image = Image.open(image_path)
+            return self._default_analysis()
+
+        image = self._downsample(image_path)
 
         style = self._detect_art_style(image, image_path)
-        colors = self._extract_color_palette(image)
-        mood = self._analyze_mood(image)
-        composition = self._analyze_composition(image)
-        lighting = self._detect_lighting(image)
-        elements = self._identify_elements(image)
-        texture = self._analyze_texture(image)
-        camera_angle = self._detect_camera_angle(image)
-        depth = self._analyze_depth(image)
-        contrast = self._analyze_contrast(image)
-        saturation = self._analyze_saturation(image)
+        local = self._analyze_local(image)
+
+        return VisualAnalysis(style=style, **local)
+
+    def analyze_many(
+        self,
+        image_paths: List[str],
+        max_workers: Optional[int] = None,
+        vision_concurrency: int = 4,
+        requests_per_minute: Optional[float] = 60
+    ) -> Iterator[Tuple[str, VisualAnalysis]]:
+        """
+        Analyze many images, streaming results as they complete
+
+        Local analysis (palette, edges, contrast, saturation) is CPU-bound and
+        runs in a process pool. Vision API queries run concurrently on a
+        thread pool paced by a shared rate limiter.
+
+        Args:
+            image_paths: Paths to the reference images
+            max_workers: Process pool size (None = CPU count, 1 = in-process)
+            vision_concurrency: Maximum number of concurrent vision API requests
+            requests_per_minute: Vision API rate limit (None disables limiting)
+
+        Yields:
+            (image_path, VisualAnalysis) tuples in completion order
+            (an image that cannot be analyzed gets the default analysis)
+        """
+        paths = [str(path) for path in image_paths]
 
+        if not PIL_AVAILABLE:
+            for path in paths:
+                yield path, self._default_analysis()
+            return
+
+        if max_workers == 1:
+            local_pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            from concurrent.futures import ProcessPoolExecutor  # multiprocessing is only needed here
+            local_pool = ProcessPoolExecutor(max_workers=max_workers)
+        vision_pool = ThreadPoolExecutor(max_workers=vision_concurrency) if self.use_gemini else None
+        limiter = RateLimiter(requests_per_minute)
+
+        futures = {}
+        partial: Dict[int, Dict] = {}
+        parts_needed = 2 if vision_pool else 1
+
+        try:
+            for index, path in enumerate(paths):
+                futures[local_pool.submit(_analyze_local_worker, path)] = ('local', index)
+                if vision_pool:
+                    future = vision_pool.submit(self._query_style, path, limiter)
+                    futures[future] = ('vision', index)
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, index = futures.pop(future)
+                    parts = partial.setdefault(index, {})
+                    try:
+                        parts[kind] = future.result()
+                    except Exception as e:
+                        # 1枚の失敗でストリーム全体を止めない
+                        logger.warning("Failed to analyze %s (%s): %s", paths[index], kind, e)
+                        parts[kind] = self._default_analysis().to_dict() if kind == 'local' else None
+
+                    if len(parts) == parts_needed:
+                        del partial[index]
+                        local = parts['local']
+                        fallback_style = local.pop('style')
+                        style = parts.get('vision') or fallback_style
+                        yield paths[index], VisualAnalysis(style=style, **local)
+        finally:
+            local_pool.shutdown(wait=False, cancel_futures=True)
+            if vision_pool:
+                vision_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _default_analysis(self) -> VisualAnalysis:
+        """Default analysis used when image libraries are unavailable"""
         return VisualAnalysis(
-            style=style,
-            colors=colors,
-            mood=mood,
-            composition=composition,
-            lighting=lighting,
-            elements=elements,
-            texture=texture,
-            camera_angle=camera_angle,
-            depth=depth,
-            contrast=contrast,
-            saturation=saturation
+            style="digital illustration",
+            colors=['#FFE4B5', '#87CEEB', '#FF6B6B'],
+            mood="neutral",
+            composition="rule_of_thirds",
+            lighting="natural lighting",
+            elements=["characters", "background"],
+            texture="medium detail",
+            camera_angle="eye level",
+            depth="moderate depth",
+            contrast="medium contrast",
+            saturation="medium saturation"
         )
 
+    def _analyze_local(self, image) -> Dict:
+        """
+        Run every analysis that does not need the vision API
+
+        Args:
+            image: Downsampled RGB image from _downsample()
+        """
+        pixels = np.asarray(image) if NUMPY_AVAILABLE else None
+
+        return {
+            'colors': self._extract_color_palette(image),
+            'mood': self._analyze_mood(pixels),
+            'composition': self._analyze_composition(image),
+            'lighting': self._detect_lighting(pixels),
+            'elements': self._identify_elements(image),
+            'texture': self._analyze_texture(image),
+            'camera_angle': self._detect_camera_angle(image),
+            'depth': self._analyze_depth(pixels),
+            'contrast': self._analyze_contrast(pixels),
+            'saturation': self._analyze_saturation(pixels)
+        }
+
+    def _downsample(self, image_path: str):
+        """
+        Decode the image once at analysis resolution
+
+        JPEG files are decoded directly at a reduced scale (draft mode), so
+        no local feature (palette included) touches the full-resolution
+        bitmap. Single-image and batch analysis both start from this copy,
+        which is why they agree.
+
+        Args:
+            image_path: Path to the image
+
+        Returns:
+            RGB image whose longest side is at most ANALYSIS_SIZE
+        """
+        size = (self.ANALYSIS_SIZE, self.ANALYSIS_SIZE)
+        with Image.open(image_path) as image:
+            image.draft('RGB', size)
+            small = image.convert('RGB')
+        small.thumbnail(size, Image.Resampling.BILINEAR)
+        return small
+
+    @staticmethod
+    def _luminance(pixels: 'np.ndarray') -> 'np.ndarray':
+        """ITU-R 601 luma as float32"""
+        return pixels.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
     def _detect_art_style(self, image, image_path: str) -> str:
         """Detect art style"""
+        if self.use_gemini:
+            response = self._query_gemini_vision(image_path, self.STYLE_PROMPT)
+            return response if response else self._fallback_style_detection(image)
+
         return self._fallback_style_detection(image)
 
+    def _query_style(self, image_path: str, limiter: RateLimiter) -> Optional[str]:
+        """Rate-limited art style query used by analyze_many"""
+        limiter.acquire()
+        return self._query_gemini_vision(image_path, self.STYLE_PROMPT)
+
+    def _query_gemini_vision(self, image_path: str, prompt: str) -> Optional[str]:
+        """Query Gemini Vision API"""
+        if not self.use_gemini:
+            return None
+
+        try:
+            image_data = self._encode_for_vision(image_path)
+
+            model = genai.GenerativeModel(self.vision_model)
+            response = model.generate_content([
+                prompt,
+                {
+                    'mime_type': 'image/jpeg',
+                    'data': base64.b64encode(image_data).decode()
+                }
+            ])
+
+            return response.text.strip() if response else None
+
+        except Exception as e:
+            logger.warning("Gemini Vision API error for %s: %s", image_path, e)
+            return None
+
+    def _encode_for_vision(self, image_path: str) -> bytes:
+        """
+        Re-encode the image as a downsampled JPEG for the vision API
+
+        Any input format (PNG, WebP, ...) is sent as real JPEG data, and JPEG
+        input is decoded at reduced scale instead of reading the full file.
+
+        Args:
+            image_path: Path to the image
+
+        Returns:
+            JPEG bytes whose longest side is at most VISION_SIZE
+        """
+        size = (self.VISION_SIZE, self.VISION_SIZE)
+        with Image.open(image_path) as image:
+            image.draft('RGB', size)
+            small = image.convert('RGB')
+        small.thumbnail(size, Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        small.save(buffer, format='JPEG', quality=90)
+        return buffer.getvalue()
+
     def _fallback_style_detection(self, image) -> str:
         """Fallback style detection"""
         return "digital illustration"
@@ -172,17 +352,51 @@ class VisualAnalyzer:
         except ImportError:
             return ['#FFE4B5', '#87CEEB', '#FF6B6B', '#4ECDC4', '#95E1D3']
 
-    def _analyze_mood(self, image) -> str:
-        """Analyze mood"""
-        return "neutral"
+    def _analyze_mood(self, pixels) -> str:
+        """Analyze mood from brightness and color warmth"""
+        if pixels is None:
+            return "neutral"
+
+        brightness = pixels.mean()
+        channel_means = pixels.reshape(-1, 3).mean(axis=0)
+        warmth = channel_means[0] - channel_means[2]
+
+        if brightness > 180:
+            return "bright cheerful" if warmth > 20 else "light airy"
+        elif brightness < 80:
+            return "dark mysterious" if warmth < -20 else "moody dramatic"
+        elif abs(warmth) < 20:
+            return "balanced neutral"
+        elif warmth > 0:
+            return "warm inviting"
+        else:
+            return "cool calm"
 
     def _analyze_composition(self, image) -> str:
         """Analyze composition"""
         return "rule_of_thirds"
 
-    def _detect_lighting(self, image) -> str:
-        """Detect lighting"""
-        return "natural lighting"
+    def _detect_lighting(self, pixels) -> str:
+        """Detect lighting from the brightness distribution"""
+        if pixels is None:
+            return "natural lighting"
+
+        brightness = self._luminance(pixels)
+        height, width = brightness.shape
+
+        left = brightness[:, :width // 2].mean()
+        right = brightness[:, width // 2:].mean()
+        top = brightness[:height // 2, :].mean()
+        bottom = brightness[height // 2:, :].mean()
+
+        if abs(left - right) > 20:
+            return "side lighting"
+        elif top > bottom + 20:
+            return "top lighting"
+        elif brightness.std() < 30:
+            return "soft even lighting"
+        else:
+            return "natural lighting"
 
     def _identify_elements(self, image) -> List[str]:
         """Identify visual elements"""
@@ -196,14 +410,62 @@ class VisualAnalyzer:
         """Detect camera angle"""
         return "eye level"
 
-    def _analyze_depth(self, image) -> str:
-        """Analyze depth"""
-        return "moderate depth"
-
-    def _analyze_contrast(self, image) -> str:
-        """Analyze contrast"""
-        return "medium contrast"
-
-    def _analyze_saturation(self, image) -> str:
-        """Analyze saturation"""
-        return "medium saturation"
+    def _analyze_depth(self, pixels) -> str:
+        """Estimate depth of field from edge density (sharp detail everywhere = deep)"""
+        if pixels is None:
+            return "moderate depth"
+
+        density = _edge_detector.edge_density(_edge_detector.downsample_luminance(pixels), self.EDGE_THRESHOLD)
+
+        if density < 0.05:
+            return "shallow depth"
+        elif density > 0.15:
+            return "deep depth"
+        else:
+            return "moderate depth"
+
+    def _analyze_contrast(self, pixels) -> str:
+        """Analyze contrast from the luminance spread"""
+        if pixels is None:
+            return "medium contrast"
+
+        std_dev = self._luminance(pixels).std()
+
+        if std_dev < 30:
+            return "low contrast"
+        elif std_dev > 60:
+            return "high contrast"
+        else:
+            return "medium contrast"
+
+    def _analyze_saturation(self, pixels) -> str:
+        """Analyze average HSV saturation"""
+        if pixels is None:
+            return "medium saturation"
+
+        high = pixels.max(axis=2).astype(np.float32)
+        low = pixels.min(axis=2).astype(np.float32)
+        saturation = np.divide(high - low, high, out=np.zeros_like(high), where=high > 0)
+        avg_saturation = saturation.mean()
+
+        if avg_saturation < 0.3:
+            return "low saturation"
+        elif avg_saturation > 0.7:
+            return "high saturation"
+        else:
+            return "medium saturation"
+
+
+_worker_analyzer: Optional[VisualAnalyzer] = None
+
+
+def _analyze_local_worker(image_path: str) -> Dict:
+    """Process pool entry point: local analysis of a single image"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = VisualAnalyzer()
+
+    image = _worker_analyzer._downsample(image_path)
+    local = _worker_analyzer._analyze_local(image)
+    local['style'] = _worker_analyzer._fallback_style_detection(image)
+    return local
@@ -3,15 +3,18 @@
 Voice Generator using Google Cloud Text-to-Speech API
 Generates voice audio for storyboard narration, monologue, and dialogue
 """
+import logging
 import os
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 
-try:
-    from google.cloud import texttospeech
-    GOOGLE_TTS_AVAILABLE = True
-except ImportError:
-    GOOGLE_TTS_AVAILABLE = False
+from ..base import LazyModule, ProgressCallback, module_available, report_progress
+
+# Cloud TTSクライアントは音声を合成するまで読み込まない
+texttospeech = LazyModule('google.cloud.texttospeech')
+GOOGLE_TTS_AVAILABLE = module_available('google.cloud.texttospeech')
+
+logger = logging.getLogger(__name__)
 
 
 class VoiceGenerator:
@@ -25,65 +28,67 @@ class VoiceGenerator:
     """
 
     # Voice mappings for Japanese (Neural2 voices for best quality)
+    # gender: texttospeech.SsmlVoiceGender member name
     VOICE_PROFILES = {
         'narrator_male': {
             'voice_name': 'ja-JP-Neural2-C',
-            'gender': texttospeech.SsmlVoiceGender.MALE if GOOGLE_TTS_AVAILABLE else None,
+            'gender': 'MALE',
             'pitch': 0.0,
             'speaking_rate': 1.0,
             'description': 'Documentary-style male narrator'
         },
         'narrator_female': {
             'voice_name': 'ja-JP-Neural2-A',
-            'gender': texttospeech.SsmlVoiceGender.FEMALE if GOOGLE_TTS_AVAILABLE else None,
+            'gender': 'FEMALE',
             'pitch': 0.0,
             'speaking_rate': 1.0,
             'description': 'Documentary-style female narrator'
         },
         'character_male_young': {
             'voice_name': 'ja-JP-Neural2-D',
-            'gender': texttospeech.SsmlVoiceGender.MALE if GOOGLE_TTS_AVAILABLE else None,
+            'gender': 'MALE',
             'pitch': 2.0,
             'speaking_rate': 1.1,
             'description': 'Young energetic male'
         },
         'character_male_mature': {
             'voice_name': 'ja-JP-Neural2-C',
-            'gender': texttospeech.SsmlVoiceGender.MALE if GOOGLE_TTS_AVAILABLE else None,
+            'gender': 'MALE',
             'pitch': -2.0,
             'speaking_rate': 0.95,
             'description': 'Mature calm male'
         },
         'character_female_young': {
             'voice_name': 'ja-JP-Neural2-A',
-            'gender': texttospeech.SsmlVoiceGender.FEMALE if GOOGLE_TTS_AVAILABLE else None,
+            'gender': 'FEMALE',
             'pitch': 3.0,
             'speaking_rate': 1.05,
             'description': 'Young cheerful female'
         },
         'character_female_mature': {
             'voice_name': 'ja-JP-Neural2-A',
-            'gender': texttospeech.SsmlVoiceGender.FEMALE if GOOGLE_TTS_AVAILABLE else None,
+            'gender': 'FEMALE',
             'pitch': -1.0,
             'speaking_rate': 0.95,
             'description': 'Mature gentle female'
         }
     }
 
-    def __init__(self, credentials_path: Optional[str] = None):
+    def __init__(self, credentials_path: Optional[str] = None, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize voice generator
 
         Args:
             credentials_path: Path to Google Cloud credentials JSON file
                             (defaults to GOOGLE_APPLICATION_CREDENTIALS env var)
+            progress_callback: Receives a ProgressEvent per cut (generate_voices_for_storyboard)
         """
         self.use_google_tts = GOOGLE_TTS_AVAILABLE
         self.client = None
+        self.progress_callback = progress_callback
 
         if not self.use_google_tts:
-            print("⚠️  Google Cloud Text-to-Speech not available")
-            print("    Install: pip install google-cloud-texttospeech")
+            logger.warning("⚠️  Google Cloud Text-to-Speech not available\n    Install: pip install google-cloud-texttospeech")
             return
 
         # Set credentials if provided
@@ -92,9 +97,9 @@ class VoiceGenerator:
 
         try:
             self.client = texttospeech.TextToSpeechClient()
-            print("✅ Google Cloud Text-to-Speech initialized")
+            logger.info("✅ Google Cloud Text-to-Speech initialized")
         except Exception as e:
-            print(f"⚠️  Failed to initialize Google TTS: {e}")
+            logger.warning("⚠️  Failed to initialize Google TTS: %s", e)
             self.use_google_tts = False
 
     def select_voice_profile(
@@ -238,7 +243,7 @@ class VoiceGenerator:
             True if successful, False otherwise
         """
         if not self.use_google_tts or not self.client:
-            print("⚠️  Google TTS not available")
+            logger.warning("⚠️  Google TTS not available")
             return False
 
         try:
@@ -283,7 +288,7 @@ class VoiceGenerator:
             return True
 
         except Exception as e:
-            print(f"❌ Error generating voice: {e}")
+            logger.error("❌ Error generating voice: %s", e)
             return False
 
     def generate_voices_for_storyboard(
@@ -308,11 +313,10 @@ class VoiceGenerator:
             {'narration': [...], 'monologue': [...], 'dialogue': [...]}
         """
         if not self.use_google_tts:
-            print("⚠️  Google TTS not available, skipping voice generation")
+            logger.warning("⚠️  Google TTS not available, skipping voice generation")
             return {'narration': [], 'monologue': [], 'dialogue': []}
 
-        print(f"\n🎤 Generating voices for storyboard...")
-        print(f"   Output directory: {output_dir}")
+        logger.info("\n🎤 Generating voices for storyboard...\n   Output directory: %s", output_dir)
 
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -323,57 +327,140 @@ class VoiceGenerator:
             'dialogue': []
         }
 
-        for cut in cuts:
-            mode = cut.dialogue_mode
+        for i, cut in enumerate(cuts):
+            for mode, files in self.generate_voices_for_cut(
+                cut, str(output_dir), character_voices, use_ssml
+            ).items():
+                generated_files[mode].extend(files)
+            report_progress(self.progress_callback, 'voices', i + 1, len(cuts), cut_number=cut.cut_number)
+
+        # Summary
+        total_files = sum(len(files) for files in generated_files.values())
+        logger.info(
+            "\n✅ Generated %d voice files\n   Narration: %d\n   Monologue: %d\n   Dialogue: %d",
+            total_files,
+            len(generated_files['narration']),
+            len(generated_files['monologue']),
+            len(generated_files['dialogue'])
+        )
+
+        return generated_files
+
+    def generate_voices_for_cut(
+        self,
+        cut: Any,
+        output_dir: str,
+        character_voices: Optional[Dict[str, Dict]] = None,
+        use_ssml: bool = True
+    ) -> Dict[str, List[str]]:
+        """
+        Generate voice audio for a single cut
+
+        Args:
+            cut: CutData object
+            output_dir: Directory to save audio files
+            character_voices: Optional manual voice profile mapping
+            use_ssml: Whether to use SSML for enhanced synthesis
+
+        Returns:
+            {'narration': [...], 'monologue': [...], 'dialogue': [...]}
+        """
+        generated_files = {
+            'narration': [],
+            'monologue': [],
+            'dialogue': []
+        }
+        if not self.use_google_tts:
+            return generated_files
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        mode = cut.dialogue_mode
+
+        # Mode 1: Narration
+        if mode == 'narration' and cut.narration_text:
+            logger.debug("\n  Cut %d - Narration:", cut.cut_number)
 
-            # Mode 1: Narration
-            if mode == 'narration' and cut.narration_text:
-                print(f"\n  Cut {cut.cut_number} - Narration:")
+            voice_profile = self.select_voice_profile(
+                'narration',
+                mood=cut.mood
+            )
+
+            filename = f"cut_{cut.cut_number:02d}_narration.mp3"
+            output_path = output_dir / filename
+
+            success = self.generate_voice(
+                cut.narration_text,
+                str(output_path),
+                voice_profile,
+                use_ssml=use_ssml,
+                mood=cut.mood
+            )
 
+            if success:
+                logger.debug("    ✓ Generated: %s", filename, extra={'cut_number': cut.cut_number})
+                generated_files['narration'].append(str(output_path))
+            else:
+                logger.error("    ✗ Failed to generate: %s", filename, extra={'cut_number': cut.cut_number})
+
+        # Mode 2: Monologue
+        elif mode == 'monologue' and cut.monologue_text:
+            logger.debug("\n  Cut %d - Monologue (%s):", cut.cut_number, cut.monologue_character)
+
+            # Use custom voice if provided, otherwise auto-select
+            if character_voices and cut.monologue_character in character_voices:
+                voice_profile = character_voices[cut.monologue_character]
+            else:
+                # Try to extract character context from somewhere
+                # For now, we'll use the cut's action/scene description as context
+                character_context = f"{cut.scene_description} {cut.action}"
                 voice_profile = self.select_voice_profile(
-                    'narration',
+                    'monologue',
+                    character_context=character_context,
                     mood=cut.mood
                 )
 
-                filename = f"cut_{cut.cut_number:02d}_narration.mp3"
-                output_path = output_dir / filename
+            filename = f"cut_{cut.cut_number:02d}_monologue_{cut.monologue_character}.mp3"
+            output_path = output_dir / filename
 
-                success = self.generate_voice(
-                    cut.narration_text,
-                    str(output_path),
-                    voice_profile,
-                    use_ssml=use_ssml,
-                    mood=cut.mood
-                )
+            success = self.generate_voice(
+                cut.monologue_text,
+                str(output_path),
+                voice_profile,
+                use_ssml=use_ssml,
+                mood=cut.mood
+            )
 
-                if success:
-                    print(f"    ✓ Generated: {filename}")
-                    generated_files['narration'].append(str(output_path))
-                else:
-                    print(f"    ✗ Failed to generate: {filename}")
+            if success:
+                logger.debug("    ✓ Generated: %s", filename, extra={'cut_number': cut.cut_number})
+                generated_files['monologue'].append(str(output_path))
+            else:
+                logger.error("    ✗ Failed to generate: %s", filename, extra={'cut_number': cut.cut_number})
 
-            # Mode 2: Monologue
-            elif mode == 'monologue' and cut.monologue_text:
-                print(f"\n  Cut {cut.cut_number} - Monologue ({cut.monologue_character}):")
+        # Mode 3: Dialogue
+        elif mode == 'dialogue' and cut.dialogue_lines:
+            logger.debug("\n  Cut %d - Dialogue (%s):", cut.cut_number, ' & '.join(cut.dialogue_characters))
+
+            for i, line in enumerate(cut.dialogue_lines):
+                speaker = line.speaker
 
                 # Use custom voice if provided, otherwise auto-select
-                if character_voices and cut.monologue_character in character_voices:
-                    voice_profile = character_voices[cut.monologue_character]
+                if character_voices and speaker in character_voices:
+                    voice_profile = character_voices[speaker]
                 else:
-                    # Try to extract character context from somewhere
-                    # For now, we'll use the cut's action/scene description as context
-                    character_context = f"{cut.scene_description} {cut.action}"
+                    character_context = f"{cut.scene_description}"
                     voice_profile = self.select_voice_profile(
-                        'monologue',
+                        'dialogue',
                         character_context=character_context,
                         mood=cut.mood
                     )
 
-                filename = f"cut_{cut.cut_number:02d}_monologue_{cut.monologue_character}.mp3"
+                filename = f"cut_{cut.cut_number:02d}_dialogue_{i+1}_{speaker}.mp3"
                 output_path = output_dir / filename
 
                 success = self.generate_voice(
-                    cut.monologue_text,
+                    line.text,
                     str(output_path),
                     voice_profile,
                     use_ssml=use_ssml,
@@ -381,51 +468,11 @@ class VoiceGenerator:
                 )
 
                 if success:
-                    print(f"    ✓ Generated: {filename}")
-                    generated_files['monologue'].append(str(output_path))
+                    logger.debug("    ✓ Generated line %d (%s): %s", i + 1, speaker, filename,
+                                 extra={'cut_number': cut.cut_number})
+                    generated_files['dialogue'].append(str(output_path))
                 else:
-                    print(f"    ✗ Failed to generate: {filename}")
-
-            # Mode 3: Dialogue
-            elif mode == 'dialogue' and cut.dialogue_lines:
-                print(f"\n  Cut {cut.cut_number} - Dialogue ({' & '.join(cut.dialogue_characters)}):")
-
-                for i, line in enumerate(cut.dialogue_lines):
-                    speaker = line.speaker
-
-                    # Use custom voice if provided, otherwise auto-select
-                    if character_voices and speaker in character_voices:
-                        voice_profile = character_voices[speaker]
-                    else:
-                        character_context = f"{cut.scene_description}"
-                        voice_profile = self.select_voice_profile(
-                            'dialogue',
-                            character_context=character_context,
-                            mood=cut.mood
-                        )
-
-                    filename = f"cut_{cut.cut_number:02d}_dialogue_{i+1}_{speaker}.mp3"
-                    output_path = output_dir / filename
-
-                    success = self.generate_voice(
-                        line.text,
-                        str(output_path),
-                        voice_profile,
-                        use_ssml=use_ssml,
-                        mood=cut.mood
-                    )
-
-                    if success:
-                        print(f"    ✓ Generated line {i+1} ({speaker}): {filename}")
-                        generated_files['dialogue'].append(str(output_path))
-                    else:
-                        print(f"    ✗ Failed to generate line {i+1}: {filename}")
-
-        # Summary
-        total_files = sum(len(files) for files in generated_files.values())
-        print(f"\n✅ Generated {total_files} voice files")
-        print(f"   Narration: {len(generated_files['narration'])}")
-        print(f"   Monologue: {len(generated_files['monologue'])}")
-        print(f"   Dialogue: {len(generated_files['dialogue'])}")
+                    logger.error("    ✗ Failed to generate line %d: %s", i + 1, filename,
+                                 extra={'cut_number': cut.cut_number})
 
         return generated_files
@@ -3,5 +3,30 @@ Base classes for video generation system
 """
 from .generator import BaseVideoGenerator, GeneratorConfig
 from .plugin import BasePlugin
+from .rate_limiter import RateLimiter
+from .pipeline import StagePipeline, PipelineReport
+from .streaming import CutStream, StreamReport
+from .config_cache import ConfigCache, load_config, get_config_cache, thaw
+from .lazy_import import LazyModule, module_available
+from .log import configure_logging, ProgressEvent, ProgressCallback, report_progress
 
-__all__ = ['BaseVideoGenerator', 'GeneratorConfig', 'BasePlugin']
+__all__ = [
+    'BaseVideoGenerator',
+    'GeneratorConfig',
+    'BasePlugin',
+    'RateLimiter',
+    'StagePipeline',
+    'PipelineReport',
+    'CutStream',
+    'StreamReport',
+    'ConfigCache',
+    'load_config',
+    'get_config_cache',
+    'thaw',
+    'LazyModule',
+    'module_available',
+    'configure_logging',
+    'ProgressEvent',
+    'ProgressCallback',
+    'report_progress',
+]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Config Cache
+Process-wide cache of parsed YAML/JSON configs, keyed on file modification time
+"""
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple, Union
+
+from .lazy_import import LazyModule, module_available
+
+yaml = LazyModule('yaml')
+YAML_AVAILABLE = module_available('yaml')
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen view (dicts and lists again)"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ConfigCache:
+    """Parse each config file once per modification; hand out shared immutable views"""
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int], Mapping]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: Union[str, Path]) -> Mapping:
+        """
+        Load a config file (parsed again only when its mtime or size changes)
+
+        Args:
+            path: YAML (.yaml/.yml) or JSON file
+
+        Returns:
+            Read-only view of the top-level mapping
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+        view = freeze(self._parse(path))
+
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = (key, view)
+        return view
+
+    def _parse(self, path: Path) -> Dict:
+        """Parse and validate that the file holds a mapping"""
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix == '.json':
+                data = json.load(f)
+            elif YAML_AVAILABLE:
+                data = yaml.safe_load(f)
+            else:
+                raise ImportError(f"PyYAML is required to load {path}")
+
+        if data is None:
+            return {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Config must be a mapping at the top level: {path}")
+        return data
+
+    def invalidate(self, path: Union[str, Path, None] = None):
+        """
+        Drop cached entries
+
+        Args:
+            path: Config file to drop (None drops everything)
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path).resolve(), None)
+
+
+# Shared by every generator, batch run and worker in the process
+_CACHE = ConfigCache()
+
+
+def load_config(path: Union[str, Path]) -> Mapping:
+    """
+    Load a config file through the process-wide cache
+
+    Args:
+        path: YAML (.yaml/.yml) or JSON file
+
+    Returns:
+        Read-only view of the top-level mapping (use thaw() for a mutable copy)
+    """
+    return _CACHE.load(path)
+
+
+def get_config_cache() -> ConfigCache:
+    """Process-wide config cache"""
+    return _CACHE
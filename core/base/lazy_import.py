@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Lazy Import
+Defer heavy optional dependencies (Gemini, Cloud TTS, Anthropic, PIL) until first use
+"""
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+def module_available(name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it
+
+    Args:
+        name: Dotted module name (parent packages are imported, the module itself is not)
+
+    Returns:
+        True if the module is installed
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """
+    Module proxy that imports on first attribute access
+
+    Use in place of a top-level ``import x as y``::
+
+        genai = LazyModule('google.generativeai')
+        GEMINI_AVAILABLE = module_available('google.generativeai')
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule '{self._name}' ({state})>"
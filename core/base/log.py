@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Logging
+Leveled console output, an optional JSON Lines sink, and per-cut progress events
+
+Modules log through ``logging.getLogger(__name__)``:
+    DEBUG   per-cut chatter (✓ Cut 3 ..., Generating image for Cut 3 ...)
+    INFO    stage headlines and summaries
+    WARNING degraded results (API unavailable, narration too long, ...)
+    ERROR   failures
+
+Until a script calls configure_logging() only warnings reach stderr, so batch
+runs and services only pay for the levels they enable.
+"""
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, IO, Optional, Union
+
+# Loggers configured by configure_logging (module loggers propagate to these)
+PACKAGE_LOGGERS = ('core', 'tools')
+
+# LogRecord attributes that are not structured fields passed via ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Message only, matching the existing emoji progress output"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields (cut_number, stage, ...) become keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(
+    level: Union[int, str] = logging.INFO,
+    json_path: Optional[Union[str, Path]] = None,
+    json_level: Union[int, str] = logging.DEBUG,
+    stream: Optional[IO] = None
+):
+    """
+    Configure output for the core and tools packages (replaces a previous configuration)
+
+    Args:
+        level: Console level (DEBUG shows per-cut progress, INFO stage summaries only)
+        json_path: Also write JSON Lines records to this file
+        json_level: Level for the JSON sink
+        stream: Console stream (default: stdout)
+    """
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(ConsoleFormatter())
+    console.setLevel(level)
+    handlers = [console]
+
+    if json_path:
+        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+        sink = logging.FileHandler(json_path, encoding='utf-8')
+        sink.setFormatter(JsonFormatter())
+        sink.setLevel(json_level)
+        handlers.append(sink)
+
+    lowest = min(handler.level for handler in handlers)
+    for name in PACKAGE_LOGGERS:
+        logger = logging.getLogger(name)
+        for handler in [h for h in logger.handlers if getattr(h, '_configured_here', False)]:
+            logger.removeHandler(handler)
+            handler.close()
+        for handler in handlers:
+            handler._configured_here = True
+            logger.addHandler(handler)
+        logger.setLevel(lowest)
+        logger.propagate = False
+
+
+@contextmanager
+def log_level_at_least(level: int):
+    """
+    Temporarily raise the package loggers to at least ``level`` (e.g. to mute per-cut DEBUG in batch runs)
+
+    The level is process-wide, so other threads logging meanwhile are filtered too.
+
+    Args:
+        level: Minimum level while the block runs
+    """
+    loggers = [logging.getLogger(name) for name in PACKAGE_LOGGERS]
+    previous = [logger.level for logger in loggers]
+    for logger in loggers:
+        if logger.getEffectiveLevel() < level:
+            logger.setLevel(level)
+    try:
+        yield
+    finally:
+        for logger, old in zip(loggers, previous):
+            logger.setLevel(old)
+
+
+@dataclass
+class ProgressEvent:
+    """Progress of a per-cut stage"""
+    stage: str               # storyboard / images / narration / dialogue / voices / materials
+    current: int             # Items finished so far (1-based)
+    total: int
+    cut_number: Optional[int] = None
+    status: str = 'ok'       # ok / failed / skipped
+    message: str = ''
+    time: float = 0.0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+def report_progress(callback: Optional[ProgressCallback], stage: str, current: int, total: int, **kwargs):
+    """
+    Send a progress event if a callback is registered
+
+    Args:
+        callback: Progress callback (None = no-op)
+        stage: Stage name
+        current: Items finished so far
+        total: Total items
+        **kwargs: cut_number, status, message
+    """
+    if callback is not None:
+        callback(ProgressEvent(stage=stage, current=current, total=total, time=time.time(), **kwargs))
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Stage Pipeline
+Declarative stage graph with per-cut scheduling, stage timings and critical-path reporting
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# A schedulable unit: (stage name, cut index) — cut index is None for whole stages
+TaskKey = Tuple[str, Optional[int]]
+
+
+@dataclass
+class Stage:
+    """A pipeline stage"""
+    name: str
+    func: Callable
+    depends_on: Tuple[str, ...] = ()
+    per_cut: bool = False  # func(context, cut) per cut instead of func(context)
+
+
+@dataclass
+class StageTiming:
+    """Measured execution of one stage"""
+    name: str
+    start: float = 0.0      # Offset from pipeline start (seconds)
+    end: float = 0.0
+    busy: float = 0.0       # Sum of task durations (exceeds end - start when cuts overlap)
+    tasks: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class PipelineReport:
+    """Timings and critical path of a pipeline run"""
+    total_time: float
+    stages: Dict[str, StageTiming] = field(default_factory=dict)
+    critical_path: List[Tuple[TaskKey, float]] = field(default_factory=list)
+
+    def format(self) -> str:
+        """Human-readable timing table and critical path"""
+        lines = [f"⏱️  Pipeline: {self.total_time:.2f}s"]
+        width = max((len(name) for name in self.stages), default=0)
+        for timing in sorted(self.stages.values(), key=lambda t: t.start):
+            tasks = f" ({timing.tasks} cuts)" if timing.tasks > 1 else ""
+            lines.append(
+                f"  {timing.name:<{width}} {timing.start:7.2f}s → {timing.end:7.2f}s"
+                f"  busy {timing.busy:6.2f}s{tasks}"
+            )
+        if self.critical_path:
+            path = " → ".join(
+                name if index is None else f"{name}[{index + 1}]"
+                for (name, index), _ in self.critical_path
+            )
+            length = sum(duration for _, duration in self.critical_path)
+            lines.append(f"  Critical path ({length:.2f}s): {path}")
+        return "\n".join(lines)
+
+
+class StagePipeline:
+    """
+    Run a graph of stages, overlapping everything the dependencies allow
+
+    Whole stages run once. Per-cut stages run once per cut; when both a stage and its
+    dependency are per-cut, cut N only waits for cut N of the dependency, so e.g. TTS for
+    a cut starts as soon as that cut's narration text exists.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize pipeline
+
+        Args:
+            max_workers: Worker threads shared by all stages
+        """
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable,
+        depends_on: Sequence[str] = (),
+        per_cut: bool = False
+    ) -> 'StagePipeline':
+        """
+        Register a stage (dependencies must already be registered, so the graph stays acyclic)
+
+        Args:
+            name: Stage name
+            func: func(context) for whole stages, func(context, cut) for per-cut stages
+            depends_on: Names of stages that must finish first
+            per_cut: Whether the stage runs once per cut
+
+        Returns:
+            self (for chaining)
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(missing)}")
+
+        self.stages[name] = Stage(name, func, tuple(depends_on), per_cut)
+        return self
+
+    def run(
+        self,
+        context: Dict[str, Any],
+        cuts: Optional[Callable[[Dict[str, Any]], List[Any]]] = None
+    ) -> PipelineReport:
+        """
+        Execute all stages
+
+        Args:
+            context: Shared state passed to every stage
+            cuts: Returns the cut list from the context (default: context['storyboard'].cuts);
+                  called once the first per-cut stage becomes runnable
+
+        Returns:
+            PipelineReport
+        """
+        get_cuts = cuts or (lambda ctx: ctx['storyboard'].cuts)
+        cut_list: Optional[List[Any]] = None
+
+        done: Dict[TaskKey, Tuple[float, float]] = {}  # task → (start, end)
+        remaining = {name: None for name in self.stages}  # stage → pending cut indices (None = not expanded)
+        running = {}
+        origin = time.perf_counter()
+
+        def execute(key: TaskKey, stage: Stage, cut: Any) -> Tuple[float, float]:
+            start = time.perf_counter() - origin
+            if stage.per_cut:
+                stage.func(context, cut)
+            else:
+                stage.func(context)
+            return start, time.perf_counter() - origin
+
+        def stage_done(name: str) -> bool:
+            return remaining[name] is not None and not remaining[name] and not any(
+                key[0] == name for key in running.values()
+            )
+
+        def ready(stage: Stage, index: Optional[int]) -> bool:
+            for dep in stage.depends_on:
+                if stage.per_cut and self.stages[dep].per_cut:
+                    if (dep, index) not in done:
+                        return False
+                elif not stage_done(dep):
+                    return False
+            return True
+
+        order = {name: i for i, name in enumerate(self.stages)}
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                if error is None:
+                    candidates = []
+                    for name, stage in self.stages.items():
+                        if remaining[name] is None:
+                            # Expand once the stage could run for at least one cut
+                            if not all(
+                                remaining[dep] is not None
+                                if stage.per_cut and self.stages[dep].per_cut else stage_done(dep)
+                                for dep in stage.depends_on
+                            ):
+                                continue
+                            if stage.per_cut:
+                                if cut_list is None:
+                                    cut_list = list(get_cuts(context))
+                                remaining[name] = list(range(len(cut_list)))
+                            else:
+                                remaining[name] = [None]
+
+                        candidates.extend((name, index) for index in remaining[name] if ready(stage, index))
+
+                    # Only fill idle workers: whole stages first, then the earliest cut,
+                    # downstream stages first, so early cuts finish before later ones start
+                    candidates.sort(key=lambda key: (
+                        key[1] is not None, key[1] or 0, -order[key[0]]
+                    ))
+                    for name, index in candidates[:self.max_workers - len(running)]:
+                        remaining[name].remove(index)
+                        stage = self.stages[name]
+                        cut = cut_list[index] if stage.per_cut else None
+                        future = executor.submit(execute, (name, index), stage, cut)
+                        running[future] = (name, index)
+
+                if not running:
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = running.pop(future)
+                    try:
+                        done[key] = future.result()
+                    except BaseException as exc:
+                        # Let running tasks finish, schedule nothing new
+                        if error is None:
+                            error = exc
+
+        if error is not None:
+            raise error
+
+        return self._report(done, time.perf_counter() - origin)
+
+    def _report(self, done: Dict[TaskKey, Tuple[float, float]], total_time: float) -> PipelineReport:
+        """Aggregate task times per stage and trace the critical path"""
+        report = PipelineReport(total_time=total_time)
+        for (name, _), (start, end) in done.items():
+            timing = report.stages.get(name)
+            if timing is None:
+                timing = report.stages[name] = StageTiming(name, start, end)
+            timing.start = min(timing.start, start)
+            timing.end = max(timing.end, end)
+            timing.busy += end - start
+            timing.tasks += 1
+
+        # Walk back from the last task through whichever prerequisite finished last
+        if done:
+            key = max(done, key=lambda k: done[k][1])
+            path = []
+            while key is not None:
+                start, end = done[key]
+                path.append((key, end - start))
+                key = max(
+                    self._prerequisites(key, done),
+                    key=lambda k: done[k][1],
+                    default=None
+                )
+            report.critical_path = list(reversed(path))
+        return report
+
+    def _prerequisites(self, key: TaskKey, done: Dict[TaskKey, Tuple[float, float]]) -> List[TaskKey]:
+        name, index = key
+        stage = self.stages[name]
+        prerequisites = []
+        for dep in stage.depends_on:
+            if stage.per_cut and self.stages[dep].per_cut:
+                prerequisites.append((dep, index))
+            else:
+                prerequisites.extend(k for k in done if k[0] == dep)
+        return [k for k in prerequisites if k in done]
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+Thread-safe pacing for external API calls shared by concurrent workers
+"""
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Space calls evenly so that at most `calls_per_minute` are issued"""
+
+    def __init__(self, calls_per_minute: Optional[float] = None):
+        """
+        Initialize rate limiter
+
+        Args:
+            calls_per_minute: Maximum call rate (None or <= 0 disables limiting)
+        """
+        self.calls_per_minute = calls_per_minute
+        self.interval = 60.0 / calls_per_minute if calls_per_minute and calls_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """
+        Block until the next call slot is available
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.interval <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def __enter__(self) -> 'RateLimiter':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
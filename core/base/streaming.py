@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Cut Stream
+Per-cut streaming through bounded queues instead of stage-at-a-time barriers
+"""
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+_END = object()  # End-of-stream marker
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB (None where unsupported)"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+@dataclass
+class StreamReport:
+    """Latency, throughput and memory of a streaming run"""
+    total_time: float
+    first_cut_time: Optional[float] = None   # Time to first fully processed cut
+    cut_times: List[float] = field(default_factory=list)  # Completion offsets in completion order
+    stage_busy: Dict[str, float] = field(default_factory=dict)
+    peak_in_flight: int = 0                  # Max cuts between source and last stage at once
+    peak_rss_mb: Optional[float] = None
+
+    def format(self) -> str:
+        """Human-readable summary"""
+        first = f"{self.first_cut_time:.2f}s" if self.first_cut_time is not None else "-"
+        lines = [
+            f"⏱️  Stream: {self.total_time:.2f}s, {len(self.cut_times)} cuts, first cut complete at {first}",
+            f"  Peak in flight: {self.peak_in_flight} cuts"
+            + (f", peak RSS {self.peak_rss_mb:.0f} MB" if self.peak_rss_mb is not None else "")
+        ]
+        for name, busy in self.stage_busy.items():
+            lines.append(f"  {name:<{max(map(len, self.stage_busy))}} busy {busy:6.2f}s")
+        return "\n".join(lines)
+
+
+class CutStream:
+    """
+    Chain of per-cut stages connected by bounded queues
+
+    Each cut moves to the next stage as soon as the current one finishes with it, so the
+    first cut completes while later cuts are still being produced. Bounded queues apply
+    backpressure: at most about (queue_size + workers) cuts wait or run per stage.
+    Branches get every cut straight from the source and run beside the chain.
+    """
+
+    def __init__(self, queue_size: int = 2):
+        """
+        Initialize stream
+
+        Args:
+            queue_size: Capacity of each queue between stages
+        """
+        self.queue_size = max(1, queue_size)
+        self.stages: List[Dict[str, Any]] = []
+        self.branches: List[Dict[str, Any]] = []
+
+    def add_stage(self, name: str, func: Callable[[Any], None], workers: int = 1) -> 'CutStream':
+        """
+        Append a stage
+
+        Args:
+            name: Stage name
+            func: func(cut), called once per cut
+            workers: Threads for this stage (cuts may finish out of order when > 1)
+
+        Returns:
+            self (for chaining)
+        """
+        self.stages.append({'name': name, 'func': func, 'workers': max(1, workers)})
+        return self
+
+    def add_branch(self, name: str, func: Callable[[Any], None], workers: int = 1) -> 'CutStream':
+        """
+        Add a stage that runs in parallel with the chain
+
+        The branch receives each cut from the source, independent of the chained stages.
+        A cut is complete once the chain and every branch have finished with it.
+
+        Args:
+            name: Stage name
+            func: func(cut), called once per cut
+            workers: Threads for this stage
+
+        Returns:
+            self (for chaining)
+        """
+        self.branches.append({'name': name, 'func': func, 'workers': max(1, workers)})
+        return self
+
+    def run(self, source: Iterable[Any], on_complete: Optional[Callable[[Any], None]] = None) -> StreamReport:
+        """
+        Pull cuts from the source and push each through every stage
+
+        Args:
+            source: Cut iterator (e.g. a generator producing cuts one by one)
+            on_complete: Called with each cut after the last stage
+
+        Returns:
+            StreamReport
+        """
+        origin = time.perf_counter()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        branch_queues = [queue.Queue(maxsize=self.queue_size) for _ in self.branches]
+        report = StreamReport(
+            total_time=0.0,
+            stage_busy={s['name']: 0.0 for s in self.stages + self.branches}
+        )
+        lock = threading.Lock()
+        errors: List[BaseException] = []
+        in_flight = [0]
+        pending: Dict[int, int] = {}  # id(cut) -> chain/branches still working on it
+
+        def finish(cut: Any):
+            with lock:
+                pending[id(cut)] -= 1
+                if pending[id(cut)]:
+                    return
+                del pending[id(cut)]
+                elapsed = time.perf_counter() - origin
+                report.cut_times.append(elapsed)
+                if report.first_cut_time is None:
+                    report.first_cut_time = elapsed
+                in_flight[0] -= 1
+            if on_complete:
+                on_complete(cut)
+
+        def worker(stage: Dict[str, Any], inbox: queue.Queue, outbox: Optional[queue.Queue], remaining: List[int]):
+            while True:
+                cut = inbox.get()
+                if cut is _END:
+                    inbox.put(_END)  # Let sibling workers see it too
+                    with lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last and outbox is not None:
+                        outbox.put(_END)
+                    return
+                if errors:
+                    continue  # Drain without processing so upstream never blocks
+
+                try:
+                    start = time.perf_counter()
+                    stage['func'](cut)
+                    with lock:
+                        report.stage_busy[stage['name']] += time.perf_counter() - start
+                except BaseException as exc:
+                    with lock:
+                        errors.append(exc)
+                    continue
+
+                if outbox is not None:
+                    outbox.put(cut)
+                else:
+                    finish(cut)
+
+        wiring = [
+            (stage, queues[index], queues[index + 1] if index + 1 < len(queues) else None)
+            for index, stage in enumerate(self.stages)
+        ] + [(branch, inbox, None) for branch, inbox in zip(self.branches, branch_queues)]
+
+        threads = []
+        for stage, inbox, outbox in wiring:
+            remaining = [stage['workers']]
+            for _ in range(stage['workers']):
+                thread = threading.Thread(target=worker, args=(stage, inbox, outbox, remaining), daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for cut in source:
+                if errors:
+                    break
+                with lock:
+                    in_flight[0] += 1
+                    report.peak_in_flight = max(report.peak_in_flight, in_flight[0])
+                    pending[id(cut)] = 1 + len(branch_queues)
+                if queues:
+                    queues[0].put(cut)
+                else:
+                    finish(cut)
+                for inbox in branch_queues:
+                    inbox.put(cut)
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            for inbox in queues[:1] + branch_queues:
+                inbox.put(_END)
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        report.total_time = time.perf_counter() - origin
+        report.peak_rss_mb = peak_rss_mb()
+        return report
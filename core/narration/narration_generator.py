@@ -8,14 +8,17 @@ Modes:
 2. Monologue: Single character speaking
 3. Dialogue: Two characters conversing
 """
+import logging
 import os
 from typing import List, Optional, Dict, Any
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+from ..base import LazyModule, ProgressCallback, module_available, report_progress
+
+# anthropic はAPIキーがある場合のみ、クライアント生成時に読み込む
+anthropic = LazyModule('anthropic')
+ANTHROPIC_AVAILABLE = module_available('anthropic')
+
+logger = logging.getLogger(__name__)
 
 
 class NarrationGenerator:
@@ -28,18 +31,20 @@ class NarrationGenerator:
     - dialogue: Two characters conversing
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize narration generator
 
         Args:
             api_key: Anthropic API key (defaults to env ANTHROPIC_API_KEY)
+            progress_callback: Receives a ProgressEvent per cut (storyboard-wide generation)
         """
         self.api_key = api_key or os.environ.get('ANTHROPIC_API_KEY')
+        self.progress_callback = progress_callback
         self.use_claude = ANTHROPIC_AVAILABLE and self.api_key is not None
 
         if self.use_claude:
-            self.client = Anthropic(api_key=self.api_key)
+            self.client = anthropic.Anthropic(api_key=self.api_key)
             self.model = "claude-3-5-sonnet-20241022"
 
     def analyze_narration_needs(
@@ -60,7 +65,7 @@ class NarrationGenerator:
             List of boolean flags indicating narration need
         """
         if not self.use_claude:
-            print("Claude API not available, skipping narration analysis")
+            logger.warning("Claude API not available, skipping narration analysis")
             return [False] * len(cuts)
 
         # Build analysis prompt
@@ -115,7 +120,7 @@ Example: [true, false, true, false, false, true]
                 return [False] * len(cuts)
 
         except Exception as e:
-            print(f"Error analyzing narration needs: {e}")
+            logger.error("Error analyzing narration needs: %s", e)
             return [False] * len(cuts)
 
     def generate_narration_text(
@@ -189,7 +194,8 @@ Respond with ONLY the narration text, nothing else.
             return narration
 
         except Exception as e:
-            print(f"Error generating narration for Cut {cut.cut_number}: {e}")
+            logger.error("Error generating narration for Cut %d: %s", cut.cut_number, e,
+                         extra={'cut_number': cut.cut_number})
             return None
 
     def calculate_narration_timing(
@@ -252,57 +258,90 @@ Respond with ONLY the narration text, nothing else.
             Updated cuts with narrations
         """
         if not self.use_claude:
-            print("⚠️  Claude API not available, skipping narration generation")
+            logger.warning("⚠️  Claude API not available, skipping narration generation")
             return cuts
 
-        print(f"\n🎙️  Analyzing narration needs (style: {style})...")
+        logger.info("\n🎙️  Analyzing narration needs (style: %s)...", style)
 
         # Analyze which cuts need narration
         narration_needs = self.analyze_narration_needs(cuts, story_context, style)
 
-        print(f"  ✓ {sum(narration_needs)}/{len(cuts)} cuts identified for narration")
+        logger.info("  ✓ %d/%d cuts identified for narration", sum(narration_needs), len(cuts))
 
         # Generate narrations for selected cuts
-        print("\n🎙️  Generating narration text...")
+        logger.info("\n🎙️  Generating narration text...")
         previous_cuts = []
 
         for i, (cut, needs_narration) in enumerate(zip(cuts, narration_needs)):
-            cut.narration_needed = needs_narration
+            narration = self.generate_narration_for_cut(cut, story_context, previous_cuts, style, needs_narration)
+            previous_cuts.append(cut)
+            report_progress(self.progress_callback, 'narration', i + 1, len(cuts), cut_number=cut.cut_number,
+                            status='skipped' if not needs_narration else 'ok' if narration else 'failed')
 
-            if needs_narration:
-                print(f"  Generating narration for Cut {cut.cut_number}...")
+        narration_count = sum(1 for cut in cuts if cut.narration_text)
+        logger.info("\n✅ Generated %d narrations", narration_count)
 
-                narration = self.generate_narration_text(
-                    cut,
-                    story_context,
-                    previous_cuts,
-                    style
-                )
+        return cuts
 
-                if narration:
-                    cut.narration_text = narration
-                    cut.narration_style = style
+    def generate_narration_for_cut(
+        self,
+        cut: Any,
+        story_context: str,
+        previous_cuts: List[Any],
+        style: str = "documentary",
+        needs_narration: bool = True
+    ) -> Optional[str]:
+        """
+        Generate narration for a single cut and store it on the cut
 
-                    # Calculate timing
-                    timing_info = self.calculate_narration_timing(
-                        narration,
-                        cut.duration
-                    )
+        Only the scene descriptions of previous cuts are used, so cuts can be
+        processed independently once the storyboard structure exists.
 
-                    cut.narration_duration = timing_info['duration']
-                    cut.narration_timing = timing_info['timing']
+        Args:
+            cut: Cut data
+            story_context: Overall story description
+            previous_cuts: Previous cuts for context
+            style: Narration style
+            needs_narration: Result of analyze_narration_needs for this cut
 
-                    if not timing_info['fits_in_cut']:
-                        print(f"    ⚠️  Warning: Narration ({timing_info['duration']}s) exceeds cut duration ({cut.duration}s)")
-                    else:
-                        print(f"    ✓ Generated ({timing_info['duration']}s, {timing_info['char_count']} chars)")
+        Returns:
+            Generated narration text or None
+        """
+        cut.narration_needed = needs_narration
+        if not needs_narration:
+            return None
 
-            previous_cuts.append(cut)
+        logger.debug("  Generating narration for Cut %d...", cut.cut_number, extra={'cut_number': cut.cut_number})
 
-        narration_count = sum(1 for cut in cuts if cut.narration_text)
-        print(f"\n✅ Generated {narration_count} narrations")
+        narration = self.generate_narration_text(
+            cut,
+            story_context,
+            previous_cuts,
+            style
+        )
 
-        return cuts
+        if narration:
+            cut.narration_text = narration
+            cut.narration_style = style
+
+            # Calculate timing
+            timing_info = self.calculate_narration_timing(
+                narration,
+                cut.duration
+            )
+
+            cut.narration_duration = timing_info['duration']
+            cut.narration_timing = timing_info['timing']
+
+            if not timing_info['fits_in_cut']:
+                logger.warning("    ⚠️  Warning: Cut %d narration (%ss) exceeds cut duration (%ss)",
+                               cut.cut_number, timing_info['duration'], cut.duration,
+                               extra={'cut_number': cut.cut_number})
+            else:
+                logger.debug("    ✓ Generated (%ss, %d chars)", timing_info['duration'], timing_info['char_count'],
+                             extra={'cut_number': cut.cut_number})
+
+        return narration
 
     def generate_monologue_text(
         self,
@@ -381,7 +420,8 @@ Respond with ONLY the monologue text, nothing else.
             return monologue
 
         except Exception as e:
-            print(f"Error generating monologue for Cut {cut.cut_number}: {e}")
+            logger.error("Error generating monologue for Cut %d: %s", cut.cut_number, e,
+                         extra={'cut_number': cut.cut_number})
             return None
 
     def generate_dialogue_text(
@@ -479,11 +519,13 @@ Respond with ONLY the JSON array, nothing else.
                 dialogue_lines = json.loads(json_match.group())
                 return dialogue_lines
             else:
-                print(f"Warning: Could not parse dialogue JSON for Cut {cut.cut_number}")
+                logger.warning("Warning: Could not parse dialogue JSON for Cut %d", cut.cut_number,
+                               extra={'cut_number': cut.cut_number})
                 return None
 
         except Exception as e:
-            print(f"Error generating dialogue for Cut {cut.cut_number}: {e}")
+            logger.error("Error generating dialogue for Cut %d: %s", cut.cut_number, e,
+                         extra={'cut_number': cut.cut_number})
             return None
 
     def generate_dialogue_for_storyboard(
@@ -510,10 +552,10 @@ Respond with ONLY the JSON array, nothing else.
             Updated cuts with dialogue/narration
         """
         if not self.use_claude:
-            print("⚠️  Claude API not available, skipping dialogue generation")
+            logger.warning("⚠️  Claude API not available, skipping dialogue generation")
             return cuts
 
-        print(f"\n🎙️  Generating dialogue (mode: {dialogue_mode})...")
+        logger.info("\n🎙️  Generating dialogue (mode: %s)...", dialogue_mode)
 
         if dialogue_mode == 'narration':
             # Use existing narration generation
@@ -521,7 +563,7 @@ Respond with ONLY the JSON array, nothing else.
 
         # Validate character_info for monologue/dialogue modes
         if not character_info:
-            print("⚠️  Character info required for monologue/dialogue mode")
+            logger.warning("⚠️  Character info required for monologue/dialogue mode")
             return cuts
 
         previous_cuts = []
@@ -535,7 +577,8 @@ Respond with ONLY the JSON array, nothing else.
                 char_name = char1.get('name', '主人公')
                 char_context = char1.get('context', '')
 
-                print(f"  Generating monologue for Cut {cut.cut_number} ({char_name})...")
+                logger.debug("  Generating monologue for Cut %d (%s)...", cut.cut_number, char_name,
+                             extra={'cut_number': cut.cut_number})
 
                 monologue = self.generate_monologue_text(
                     cut,
@@ -557,9 +600,12 @@ Respond with ONLY the JSON array, nothing else.
                     cut.monologue_duration = timing_info['duration']
 
                     if not timing_info['fits_in_cut']:
-                        print(f"    ⚠️  Warning: Monologue ({timing_info['duration']}s) exceeds cut duration ({cut.duration}s)")
+                        logger.warning("    ⚠️  Warning: Cut %d monologue (%ss) exceeds cut duration (%ss)",
+                                       cut.cut_number, timing_info['duration'], cut.duration,
+                                       extra={'cut_number': cut.cut_number})
                     else:
-                        print(f"    ✓ Generated ({timing_info['duration']}s, {timing_info['char_count']} chars)")
+                        logger.debug("    ✓ Generated (%ss, %d chars)", timing_info['duration'],
+                                     timing_info['char_count'], extra={'cut_number': cut.cut_number})
 
             elif dialogue_mode == 'dialogue':
                 # Generate dialogue
@@ -571,7 +617,8 @@ Respond with ONLY the JSON array, nothing else.
                 char2_name = char2.get('name', 'キャラB')
                 char2_context = char2.get('context', '')
 
-                print(f"  Generating dialogue for Cut {cut.cut_number} ({char1_name} & {char2_name})...")
+                logger.debug("  Generating dialogue for Cut %d (%s & %s)...", cut.cut_number, char1_name, char2_name,
+                             extra={'cut_number': cut.cut_number})
 
                 dialogue_lines = self.generate_dialogue_text(
                     cut,
@@ -607,9 +654,11 @@ Respond with ONLY the JSON array, nothing else.
                     cut.dialogue_characters = [char1_name, char2_name]
 
                     total_duration_calc = sum(d.duration for d in dialogue_objs if d.duration)
-                    print(f"    ✓ Generated {len(dialogue_objs)} lines ({total_duration_calc:.1f}s total)")
+                    logger.debug("    ✓ Generated %d lines (%.1fs total)", len(dialogue_objs), total_duration_calc,
+                                 extra={'cut_number': cut.cut_number})
 
             previous_cuts.append(cut)
+            report_progress(self.progress_callback, 'dialogue', i + 1, len(cuts), cut_number=cut.cut_number)
 
         # Count generated dialogues
         dialogue_count = 0
@@ -618,6 +667,6 @@ Respond with ONLY the JSON array, nothing else.
         elif dialogue_mode == 'dialogue':
             dialogue_count = sum(1 for cut in cuts if cut.dialogue_lines)
 
-        print(f"\n✅ Generated {dialogue_count} {dialogue_mode}s")
+        logger.info("\n✅ Generated %d %ss", dialogue_count, dialogue_mode)
 
         return cuts
@@ -0,0 +1,6 @@
+"""
+Long-running storyboard generation service
+"""
+from .storyboard_service import StoryboardService, StoryboardJob, WarmWorker, create_server
+
+__all__ = ['StoryboardService', 'StoryboardJob', 'WarmWorker', 'create_server']
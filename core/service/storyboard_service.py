@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Storyboard Service
+Long-running storyboard generation with a job queue and warm workers, served over HTTP
+"""
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from ..base import GeneratorConfig, RateLimiter
+
+
+@dataclass
+class StoryboardJob:
+    """A queued storyboard request"""
+    job_id: str
+    request: Dict[str, Any]
+    status: str = 'queued'  # queued / running / done / failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error
+        }
+
+
+class WarmWorker:
+    """Worker thread state kept across jobs: API clients and analyzers are created once"""
+
+    def __init__(self, rate_limiter: RateLimiter):
+        # Heavy imports (google.generativeai, anthropic, sklearn) happen here, once per process
+        from ..analysis import VisualAnalyzer
+        from ..music import MusicGenerator
+        from ..narration import NarrationGenerator
+        from ..video import ImageGenerator
+
+        self.image_generator = ImageGenerator(rate_limiter=rate_limiter)
+        self.narration_generator = NarrationGenerator()
+        self.music_generator = MusicGenerator()
+        self._visual_analyzer_class = VisualAnalyzer
+        self._visual_analyzer = None
+
+    @property
+    def visual_analyzer(self):
+        if self._visual_analyzer is None:
+            self._visual_analyzer = self._visual_analyzer_class()
+        return self._visual_analyzer
+
+    def run(self, request: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate one storyboard
+
+        Args:
+            request: Same options as scripts/generate_storyboard_v2.py
+                     (story, duration, cuts, title, style, output, images, music,
+                      narration, narration_style, narration_language, reference_images,
+                      auto_naming, overwrite)
+            job_id: Appended to auto-named output directories
+
+        Returns:
+            Result with output path, storyboard and stage timings
+        """
+        from ..video import CoreStoryboardGenerator
+
+        story = request.get('story')
+        if not story:
+            raise ValueError("'story' is required")
+
+        config = GeneratorConfig(
+            duration=int(request.get('duration', 60)),
+            num_cuts=request.get('cuts'),
+            visual_style=request.get('style') or 'cinematic',
+            generate_images=bool(request.get('images', True)),
+            generate_music=bool(request.get('music', True)),
+            output_dir=request.get('output', 'outputs'),
+            title=request.get('title') or 'AI Generated Storyboard',
+            auto_naming=bool(request.get('auto_naming', True)),
+            overwrite=bool(request.get('overwrite', False)),
+            generate_narrations=bool(request.get('narration', False)),
+            narration_style=request.get('narration_style', 'documentary'),
+            narration_language=request.get('narration_language', 'ja')
+        )
+
+        reference_images = list(request.get('reference_images') or [])[:3]
+        visual_analysis = None
+        if reference_images:
+            visual_analysis = self.visual_analyzer.analyze_key_visual(reference_images[0]).to_dict()
+
+        self.image_generator.reset()
+        generator = CoreStoryboardGenerator(config)
+
+        if config.auto_naming:
+            # Resolve the job's own directory up front: concurrent jobs with the same title and
+            # second would otherwise share it, and frames/ is written before the storyboard is saved
+            config.output_dir = str(generator._generate_output_dir(
+                config.title, config.output_dir, suffix=job_id or uuid.uuid4().hex[:12]
+            ))
+            config.auto_naming = False
+            config.overwrite = True
+        pipeline = generator.build_pipeline(
+            {
+                'story_description': story,
+                'key_visual_path': reference_images[0] if reference_images else None,
+                'reference_images': reference_images or None,
+                'visual_analysis': visual_analysis
+            },
+            image_generator=self.image_generator if config.generate_images else None,
+            narration_generator=self.narration_generator if config.generate_narrations else None,
+            music_generator=self.music_generator if config.generate_music else None,
+            output_dir=config.output_dir,
+            max_workers=int(request.get('workers', 4))
+        )
+
+        context = {}
+        report = pipeline.run(context)
+        return {
+            'output_path': str(context['output_path']),
+            'storyboard': context['storyboard'].to_dict(),
+            'timings': {
+                'total': report.total_time,
+                'stages': {name: t.elapsed for name, t in report.stages.items()}
+            }
+        }
+
+
+class StoryboardService:
+    """
+    Job queue served by a pool of warm worker threads
+
+    Workers are created once and reuse their generators, API clients and the
+    process-wide config cache for every job, so per-request cost is just the work.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        requests_per_minute: Optional[float] = None,
+        max_finished_jobs: int = 1000,
+        worker_factory=None
+    ):
+        """
+        Initialize service
+
+        Args:
+            num_workers: Warm worker threads
+            requests_per_minute: Image API rate limit shared by all workers (None = unlimited)
+            max_finished_jobs: Finished jobs kept for status/result lookups
+            worker_factory: Creates per-thread worker state (default: WarmWorker)
+        """
+        self.num_workers = num_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.worker_factory = worker_factory or (lambda: WarmWorker(self.rate_limiter))
+
+        self.jobs: 'OrderedDict[str, StoryboardJob]' = OrderedDict()
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._ready = threading.Barrier(num_workers + 1)
+
+    def start(self) -> 'StoryboardService':
+        """Start workers and wait until all of them are warm"""
+        for index in range(self.num_workers):
+            thread = threading.Thread(target=self._work, name=f"storyboard-worker-{index + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """Stop workers after the jobs already queued"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, request: Dict[str, Any]) -> StoryboardJob:
+        """
+        Queue a storyboard request
+
+        Args:
+            request: Job options (see WarmWorker.run)
+
+        Returns:
+            StoryboardJob
+        """
+        job = StoryboardJob(job_id=uuid.uuid4().hex[:12], request=request)
+        with self._lock:
+            self.jobs[job.job_id] = job
+            self._evict()
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[StoryboardJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'workers': len(self._threads), 'queued': self._queue.qsize(), 'jobs': counts}
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond the retention limit"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done.is_set()]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    def _work(self):
+        worker = None
+        try:
+            worker = self.worker_factory()
+        except Exception:
+            traceback.print_exc()  # Jobs taken by this worker fail instead of hanging
+        finally:
+            self._ready.wait()
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                if worker is None:
+                    raise RuntimeError("Worker failed to start")
+                job.result = worker.run(job.request, job_id=job.job_id)
+                job.status = 'done'
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = 'failed'
+                traceback.print_exc()
+            finally:
+                job.finished_at = time.time()
+                job.done.set()
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs               submit (JSON body) → 202 {"job_id", "status"}
+    GET  /jobs/<id>          status
+    GET  /jobs/<id>/result   result (?wait=seconds to long-poll; 409 while pending)
+    GET  /health             worker and queue counts
+    """
+
+    service: StoryboardService = None
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/') != '/jobs':
+            return self._send(404, {'error': 'not found'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+        except ValueError as e:
+            return self._send(400, {'error': str(e)})
+
+        job = self.service.submit(request)
+        self._send(202, {'job_id': job.job_id, 'status': job.status})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+
+        if parts == ['health']:
+            return self._send(200, self.service.stats())
+        if len(parts) < 2 or parts[0] != 'jobs':
+            return self._send(404, {'error': 'not found'})
+
+        job = self.service.get(parts[1])
+        if job is None:
+            return self._send(404, {'error': f"unknown job: {parts[1]}"})
+
+        if len(parts) == 2:
+            return self._send(200, job.to_dict())
+        if parts[2:] != ['result']:
+            return self._send(404, {'error': 'not found'})
+
+        try:
+            wait = float(parse_qs(url.query).get('wait', ['0'])[0])
+        except ValueError:
+            return self._send(400, {'error': "'wait' must be a number of seconds"})
+        if wait > 0:
+            job.done.wait(min(wait, 300))
+        if job.status == 'done':
+            return self._send(200, {**job.to_dict(), 'result': job.result})
+        if job.status == 'failed':
+            return self._send(500, job.to_dict())
+        return self._send(409, job.to_dict())
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix sockets have no client host
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = 'localhost', 0
+
+
+def create_server(
+    service: StoryboardService,
+    host: str = '127.0.0.1',
+    port: int = 8765,
+    socket_path: Optional[str] = None
+) -> socketserver.BaseServer:
+    """
+    Create the HTTP server for a service (call serve_forever() to run it)
+
+    Args:
+        service: Started StoryboardService
+        host: Bind address for TCP
+        port: TCP port (0 = any free port)
+        socket_path: Serve on this Unix socket instead of TCP
+
+    Returns:
+        HTTP server
+    """
+    handler = type('StoryboardServiceHandler', (_ServiceHandler,), {'service': service})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return _ThreadingUnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
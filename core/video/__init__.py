@@ -1,16 +1,27 @@
 """
 Video generation core functionality
 """
+import importlib
+
 from .storyboard_generator import CoreStoryboardGenerator
 
-try:
-    from .enhanced_storyboard_generator import EnhancedStoryboardGenerator
-    __all__ = ['CoreStoryboardGenerator', 'EnhancedStoryboardGenerator']
-except ImportError:
-    __all__ = ['CoreStoryboardGenerator']
+# 重い依存を持つクラスは初回アクセス時に読み込む（名前 → サブモジュール）
+_LAZY_ATTRIBUTES = {
+    'EnhancedStoryboardGenerator': '.enhanced_storyboard_generator',
+    'ImageGenerator': '.image_generator',
+}
+
+__all__ = ['CoreStoryboardGenerator', 'EnhancedStoryboardGenerator', 'ImageGenerator']
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-try:
-    from .image_generator import ImageGenerator
-    __all__.append('ImageGenerator')
-except ImportError:
-    pass
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,17 +4,12 @@ Claude Skills Enhanced Storyboard Generator
 Claude Skills前提に最適化された高度化システム
 """
 
-try:
-    import yaml
-    YAML_AVAILABLE = True
-except ImportError:
-    YAML_AVAILABLE = False
-    print("⚠️  PyYAML not available. Claude Skills config loading disabled.")
-
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass
 
+from ..base import StagePipeline, PipelineReport, load_config, thaw
+from ..base.config_cache import YAML_AVAILABLE
 from .enhanced_storyboard_generator import (
     EnhancedStoryboardGenerator,
     VideoGenre, 
@@ -113,11 +108,37 @@ class SkillsPluginManager:
 
 class SkillsWorkflowManager:
     """Claude Skills ワークフロー管理"""
+
+    # フェーズの依存関係（宣言的なステージグラフ）
+    PHASE_DEPENDENCIES = {
+        'phase1_preparation': [],
+        'phase2_background': ['phase1_preparation'],
+        'phase3_storyboard': ['phase2_background'],
+        'phase4_generation': ['phase3_storyboard'],
+        'phase5_finalization': ['phase4_generation']
+    }
     
     def __init__(self, config: ProjectConfig):
         self.config = config
         self.current_phase = 'phase1_preparation'
         self.phase_progress = {}
+        self.last_report: Optional[PipelineReport] = None
+    
+    def build_pipeline(self) -> StagePipeline:
+        """フェーズ依存関係からステージグラフを構築"""
+        pipeline = StagePipeline(max_workers=2)
+        for phase_name, depends_on in self.PHASE_DEPENDENCIES.items():
+            def run_phase(context, phase_name=phase_name):
+                context['data'] = self.execute_phase(phase_name, context['data'])
+            pipeline.add_stage(phase_name, run_phase, depends_on)
+        return pipeline
+    
+    def run_all_phases(self, data: Dict) -> Dict:
+        """全フェーズを依存関係に従って実行（フェーズごとの処理時間を記録）"""
+        context = {'data': data}
+        self.last_report = self.build_pipeline().run(context)
+        print(self.last_report.format())
+        return context['data']
     
     def execute_phase(self, phase_name: str, data: Dict) -> Dict:
         """フェーズ実行"""
@@ -132,7 +153,10 @@ class SkillsWorkflowManager:
         }
         
         if phase_name in workflow_phases:
-            return workflow_phases[phase_name](data)
+            self.current_phase = phase_name
+            data = workflow_phases[phase_name](data)
+            self.phase_progress[phase_name] = True
+            return data
         else:
             print(f"⚠️  Unknown phase: {phase_name}")
             return data
@@ -231,8 +255,8 @@ class CloudeSkillsEnhancedGenerator(EnhancedStoryboardGenerator):
                 video_duration=10
             )
         
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        # 解析結果はプロセス内でキャッシュ（更新時刻が変わったときだけ再解析）
+        config_data = load_config(config_file)
         
         project = config_data.get('project', {})
         requirements = config_data.get('requirements', {})
@@ -245,8 +269,8 @@ class CloudeSkillsEnhancedGenerator(EnhancedStoryboardGenerator):
             num_videos=requirements.get('num_videos', 1),
             video_duration=requirements.get('video_duration', 30),
             materials_path=config_data.get('materials_path'),
-            hooks=config_data.get('hooks'),
-            plugins=config_data.get('plugins')
+            hooks=thaw(config_data.get('hooks')),
+            plugins=thaw(config_data.get('plugins'))
         )
 
     def _adapt_to_skills_config(self, base_config: Dict) -> Dict:
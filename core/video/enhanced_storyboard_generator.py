@@ -3,7 +3,9 @@
 Enhanced Storyboard Generator
 PDFガイドとリファレンス統合による高度化システム
 """
+import hashlib
 import json
+import logging
 import re
 import random
 from pathlib import Path
@@ -12,8 +14,11 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
 
+from ..base.log import report_progress
 from .storyboard_generator import CoreStoryboardGenerator, CutData, StoryboardData
 
+logger = logging.getLogger(__name__)
+
 
 class EmotionalPhase(Enum):
     """J-pop構成による感情フェーズ"""
@@ -53,6 +58,79 @@ class SceneContext:
     target_audience: str = "general"
 
 
+# 選択テーブルの作成（IntelligentSelectionEngine のクラス定義時に実行）
+
+def _angle_candidates(mood_prefs: Dict, intensity_bucket: int) -> Tuple[str, ...]:
+    """カメラアングル候補（intensity_bucket: 0 = 低強度 <0.3, 1 = 中, 2 = 高強度 >0.7）"""
+    candidates = list(mood_prefs['primary'])
+    if intensity_bucket == 2:  # 高強度
+        if 'CU' in candidates or 'ECU' in candidates:
+            candidates = [c for c in candidates if c in ['CU', 'ECU']]
+        else:
+            candidates.append('CU')
+    elif intensity_bucket == 0:  # 低強度
+        candidates = [c for c in candidates if c in ['ELS', 'LS', 'MS']]
+    return tuple(candidates)
+
+
+def _composition_candidates(mood_prefs: Optional[Dict], genre_prefs: Any, ratio_prefs: Optional[Dict]) -> Tuple[str, ...]:
+    """構図候補（ムード優先 → ジャンル調整 → アスペクト比最適化）"""
+    candidates = list(mood_prefs['primary']) if mood_prefs else []
+    if genre_prefs is not None and genre_prefs != 'all_types':
+        candidates = [c for c in candidates if c in genre_prefs]
+    if ratio_prefs is not None:
+        preferred = ratio_prefs['preferred_compositions']
+        candidates = [c for c in candidates if c in preferred] or candidates
+    return tuple(candidates)
+
+
+def _movement_candidates(mood_prefs: Optional[Dict], pacing: Optional[str], intense: bool) -> Tuple[str, ...]:
+    """カメラムーブメント候補（ムード優先 → ペーシング調整 → 強度調整）"""
+    candidates = list(mood_prefs['primary']) if mood_prefs else []
+    if pacing == 'fast':
+        fast_movements = ['tracking', 'handheld', 'quick_pan', 'fast_zoom']
+        candidates = [c for c in candidates if c in fast_movements] or fast_movements[:2]
+    elif pacing == 'slow':
+        slow_movements = ['static', 'slow_dolly', 'slow_zoom_in', 'gentle_pan']
+        candidates = [c for c in candidates if c in slow_movements] or slow_movements[:2]
+    if intense:
+        candidates.extend(['handheld', 'fast_zoom', 'dynamic_tracking'])
+    return tuple(candidates)
+
+
+def _compile_angle_table(matrix: Dict) -> Dict[str, Tuple[Tuple[str, ...], ...]]:
+    """{ムード: (低強度, 中, 高強度の候補)}"""
+    return {
+        mood: tuple(_angle_candidates(prefs, bucket) for bucket in range(3))
+        for mood, prefs in matrix.items()
+    }
+
+
+def _compile_composition_table(matrix: Dict, genre_preferences: Dict, ratio_optimizations: Dict) -> Dict:
+    """{ムード: {ジャンル: {アスペクト比: 候補}}}"""
+    return {
+        mood: {
+            genre: {
+                ratio: _composition_candidates(prefs, genre_preferences.get(genre), ratio_optimizations.get(ratio))
+                for ratio in AspectRatio
+            }
+            for genre in VideoGenre
+        }
+        for mood, prefs in matrix.items()
+    }
+
+
+def _compile_movement_table(matrix: Dict) -> Dict:
+    """{ムード: {ペーシング: (通常, 高強度 >0.8 の候補)}}（None は行列にないムード / fast・slow 以外）"""
+    return {
+        mood: {
+            pacing: tuple(_movement_candidates(matrix.get(mood), pacing, intense) for intense in (False, True))
+            for pacing in ('fast', 'slow', None)
+        }
+        for mood in [*matrix, None]
+    }
+
+
 class IntelligentSelectionEngine:
     """インテリジェント選択エンジン"""
     
@@ -114,90 +192,80 @@ class IntelligentSelectionEngine:
         }
     }
 
-    def select_camera_angle(self, context: SceneContext, scene_type: str) -> str:
+    # 行列にないムードのカメラアングル（シーンタイプ別）
+    BASIC_ANGLE_RULES = {
+        'establishing': 'ELS', 'character_intro': 'MS', 'dialogue': 'MS',
+        'action': 'LS', 'emotion': 'CU', 'conclusion': 'LS'
+    }
+
+    # 選択テーブル（上の行列からクラス定義時に1回だけ作成。カットごとの選択は辞書引きのみ）
+    _ANGLE_TABLE = _compile_angle_table(MOOD_CAMERA_MATRIX)
+    _COMPOSITION_TABLE = _compile_composition_table(
+        MOOD_COMPOSITION_MATRIX, GENRE_COMPOSITION_PREFERENCES, ASPECT_RATIO_OPTIMIZATIONS
+    )
+    _MOVEMENT_TABLE = _compile_movement_table(MOOD_MOVEMENT_MATRIX)
+
+    # ムード文字列 → キーのキャッシュ（語彙は少数なので上限つき）
+    _MOOD_KEYS: Dict[str, str] = {}
+    MOOD_KEYS_LIMIT = 1024
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Args:
+            rng: 選択に使う乱数生成器（省略時は専用のrandom.Randomを作成。グローバルの乱数は使わない）
+        """
+        self.rng = rng or random.Random()
+
+    def select_camera_angle(self, context: SceneContext, scene_type: str, rng: Optional[random.Random] = None) -> str:
         """文脈に基づいたインテリジェントなカメラアングル選択"""
-        mood = context.mood.lower()
-        intensity = context.intensity
-        
-        # ムード優先選択
-        if mood in self.MOOD_CAMERA_MATRIX:
-            mood_prefs = self.MOOD_CAMERA_MATRIX[mood]
-            candidates = mood_prefs['primary'].copy()
-            
-            # 強度に基づく調整
-            if intensity > 0.7:  # 高強度
-                if 'CU' in candidates or 'ECU' in candidates:
-                    candidates = [c for c in candidates if c in ['CU', 'ECU']]
-                else:
-                    candidates.append('CU')
-            elif intensity < 0.3:  # 低強度
-                candidates = [c for c in candidates if c in ['ELS', 'LS', 'MS']]
-        else:
+        by_intensity = self._ANGLE_TABLE.get(self._mood_key(context.mood))
+        if by_intensity is None:
             # フォールバック：従来の基本ルール
-            basic_rules = {
-                'establishing': 'ELS', 'character_intro': 'MS', 'dialogue': 'MS',
-                'action': 'LS', 'emotion': 'CU', 'conclusion': 'LS'
-            }
-            return basic_rules.get(scene_type, 'MS')
-        
+            return self.BASIC_ANGLE_RULES.get(scene_type, 'MS')
+
+        intensity = context.intensity
+        candidates = by_intensity[2 if intensity > 0.7 else 0 if intensity < 0.3 else 1]
+
         # ランダム選択（重み付きできる）
-        return random.choice(candidates) if candidates else 'MS'
+        return (rng or self.rng).choice(candidates) if candidates else 'MS'
 
-    def select_composition(self, context: SceneContext, scene_type: str) -> str:
+    def select_composition(self, context: SceneContext, scene_type: str, rng: Optional[random.Random] = None) -> str:
         """文脈に基づいたインテリジェントな構図選択"""
-        mood = context.mood.lower()
-        genre = context.genre
-        aspect_ratio = context.aspect_ratio
-        
-        candidates = []
-        
-        # ムード優先
-        if mood in self.MOOD_COMPOSITION_MATRIX:
-            mood_prefs = self.MOOD_COMPOSITION_MATRIX[mood]
-            candidates.extend(mood_prefs['primary'])
-        
-        # ジャンル調整
-        if genre in self.GENRE_COMPOSITION_PREFERENCES:
-            genre_prefs = self.GENRE_COMPOSITION_PREFERENCES[genre]
-            if genre_prefs != 'all_types':
-                candidates = [c for c in candidates if c in genre_prefs]
-        
-        # アスペクト比最適化
-        if aspect_ratio in self.ASPECT_RATIO_OPTIMIZATIONS:
-            ratio_prefs = self.ASPECT_RATIO_OPTIMIZATIONS[aspect_ratio]
-            preferred = ratio_prefs['preferred_compositions']
-            candidates = [c for c in candidates if c in preferred] or candidates
-        
-        return random.choice(candidates) if candidates else 'rule_of_thirds'
+        mood = self._mood_key(context.mood)
+        by_genre = self._COMPOSITION_TABLE.get(mood)
+        if by_genre is None:
+            # 行列にないムードは候補なし
+            return 'rule_of_thirds'
+
+        by_ratio = by_genre.get(context.genre)
+        candidates = by_ratio.get(context.aspect_ratio) if by_ratio is not None else None
+        if candidates is None:
+            # Enum以外のジャンル・アスペクト比（テーブル外）はその場で計算
+            candidates = _composition_candidates(
+                self.MOOD_COMPOSITION_MATRIX[mood],
+                self.GENRE_COMPOSITION_PREFERENCES.get(context.genre),
+                self.ASPECT_RATIO_OPTIMIZATIONS.get(context.aspect_ratio)
+            )
 
-    def select_camera_movement(self, context: SceneContext, scene_type: str) -> str:
-        """文脈に基づいたインテリジェントなカメラムーブメント選択"""
-        mood = context.mood.lower()
-        pacing = context.pacing
-        intensity = context.intensity
-        
-        candidates = []
-        
-        # ムード優先選択
-        if mood in self.MOOD_MOVEMENT_MATRIX:
-            mood_prefs = self.MOOD_MOVEMENT_MATRIX[mood]
-            candidates.extend(mood_prefs['primary'])
-        
-        # ペーシング調整
-        if pacing == 'fast':
-            fast_movements = ['tracking', 'handheld', 'quick_pan', 'fast_zoom']
-            candidates = [c for c in candidates if c in fast_movements] or fast_movements[:2]
-        elif pacing == 'slow':
-            slow_movements = ['static', 'slow_dolly', 'slow_zoom_in', 'gentle_pan']
-            candidates = [c for c in candidates if c in slow_movements] or slow_movements[:2]
-        
-        # 強度調整
-        if intensity > 0.8:
-            intense_movements = ['handheld', 'fast_zoom', 'dynamic_tracking']
-            candidates.extend(intense_movements)
-        
-        return random.choice(candidates) if candidates else 'static'
+        return (rng or self.rng).choice(candidates) if candidates else 'rule_of_thirds'
 
+    def select_camera_movement(self, context: SceneContext, scene_type: str, rng: Optional[random.Random] = None) -> str:
+        """文脈に基づいたインテリジェントなカメラムーブメント選択"""
+        by_pacing = self._MOVEMENT_TABLE.get(self._mood_key(context.mood)) or self._MOVEMENT_TABLE[None]
+        by_intensity = by_pacing.get(context.pacing) or by_pacing[None]
+        candidates = by_intensity[context.intensity > 0.8]
+
+        return (rng or self.rng).choice(candidates) if candidates else 'static'
+
+    @classmethod
+    def _mood_key(cls, mood: str) -> str:
+        """ムード文字列をテーブルのキー（小文字）に変換（同じ文字列は2回目以降小文字化しない）"""
+        key = cls._MOOD_KEYS.get(mood)
+        if key is None:
+            key = mood.lower()
+            if len(cls._MOOD_KEYS) < cls.MOOD_KEYS_LIMIT:
+                cls._MOOD_KEYS[mood] = key
+        return key
 
 class JPOPEmotionalStructure:
     """J-pop構成による感情設計システム"""
@@ -388,14 +456,15 @@ class EmotionalEngagementEnhancer:
     }
     
     @staticmethod
-    def enhance_emotional_connection(cut_data: Dict, context: SceneContext) -> Dict:
-        """感情的接続の強化"""
+    def enhance_emotional_connection(cut_data: Dict, context: SceneContext, rng: Optional[random.Random] = None) -> Dict:
+        """感情的接続の強化（rng省略時はグローバルの乱数）"""
+        rng = rng or random
         phase = cut_data.get('emotional_phase', EmotionalPhase.A_MELO)
         
         if phase == EmotionalPhase.SABI_HOOK:
             # 冒頭で共感起点を設定
-            empathy_type = random.choice(list(EmotionalEngagementEnhancer.EMPATHY_HOOKS.keys()))
-            hook = random.choice(EmotionalEngagementEnhancer.EMPATHY_HOOKS[empathy_type])
+            empathy_type = rng.choice(list(EmotionalEngagementEnhancer.EMPATHY_HOOKS.keys()))
+            hook = rng.choice(EmotionalEngagementEnhancer.EMPATHY_HOOKS[empathy_type])
             cut_data['empathy_hook'] = hook
             cut_data['scene_description'] = f"Opening with relatable moment: {hook}"
         
@@ -513,6 +582,7 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
         
         Args:
             config: 設定辞書（従来のGeneratorConfigに加えて新機能設定）
+                'seed' を指定すると同じ入力でも別のバリエーションになる（省略時は入力と設定のみで決定）
         """
         # デフォルト設定の拡張
         default_enhanced_config = {
@@ -522,7 +592,8 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
             'intelligence_level': 'high',  # low, medium, high
             'empathy_enhancement': True,
             'three_layer_stimulation': True,
-            'vertical_optimization': True
+            'vertical_optimization': True,
+            'seed': None
         }
         
         if config:
@@ -532,6 +603,26 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
         self.enhanced_config = default_enhanced_config
         self.selection_engine = IntelligentSelectionEngine()
         
+    def _rng_for(self, input_data: Dict) -> random.Random:
+        """
+        入力と設定から決まる乱数生成器を作成
+
+        呼び出しごとに新しく作るため、同じ生成器をスレッドやプロセスで並行利用しても
+        結果は直列実行と一致し、同じ入力は常に同じ絵コンテになる（下流のキャッシュにも当たる）。
+
+        Args:
+            input_data: 入力データ
+
+        Returns:
+            random.Random
+        """
+        material = json.dumps(
+            {'input': input_data, 'config': self.enhanced_config},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        digest = hashlib.sha256(material.encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
     def generate_storyboard(self, input_data: Dict) -> StoryboardData:
         """高度化されたストーリーボード生成"""
         story_description = input_data.get('story_description', '')
@@ -540,16 +631,17 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
         # 入力データの拡張解析
         context = self._analyze_enhanced_context(input_data)
         
-        print("\n🧠 Enhanced analysis...")
-        print(f"  📊 Genre: {context.genre.value}")
-        print(f"  📱 Aspect Ratio: {context.aspect_ratio.value}")
-        print(f"  💡 Intelligence Level: {self.enhanced_config['intelligence_level']}")
+        logger.debug("\n🧠 Enhanced analysis...")
+        logger.debug("  📊 Genre: %s", context.genre.value)
+        logger.debug("  📱 Aspect Ratio: %s", context.aspect_ratio.value)
+        logger.debug("  💡 Intelligence Level: %s", self.enhanced_config['intelligence_level'])
         
         # フックの事前生成
         input_data = self.trigger_hook('pre_generation', input_data)
+        rng = self._rng_for(input_data)
         
         # J-pop構成による感情設計
-        print("\n🎵 Applying J-pop emotional structure...")
+        logger.debug("\n🎵 Applying J-pop emotional structure...")
         cuts_data = JPOPEmotionalStructure.analyze_story_for_jpop_structure(
             story_description, 
             self.enhanced_config.get('duration', 30), 
@@ -557,7 +649,7 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
         )
         
         # インテリジェント選択による高度化
-        print(f"\n🎯 Creating {len(cuts_data)} cuts with intelligent selection...")
+        logger.debug("\n🎯 Creating %d cuts with intelligent selection...", len(cuts_data))
         cuts = []
         for i, cut_info in enumerate(cuts_data):
             # シーンコンテキストの作成
@@ -575,14 +667,15 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
                 i + 1,
                 cut_info,
                 scene_context,
-                visual_analysis
+                visual_analysis,
+                rng
             )
             
             # 感情移入促進機能
             if self.enhanced_config.get('empathy_enhancement', True):
                 cut_dict = cut.to_dict()
                 cut_dict = EmotionalEngagementEnhancer.enhance_emotional_connection(
-                    cut_dict, scene_context
+                    cut_dict, scene_context, rng
                 )
                 
                 if self.enhanced_config.get('three_layer_stimulation', True):
@@ -595,7 +688,8 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
             
             cuts.append(cut)
             phase_name = cut_info.get('emotional_phase', EmotionalPhase.A_MELO).value.replace('_', ' ').title()
-            print(f"  ✓ Cut {i + 1} ({phase_name}): {cut.scene_description[:50]}...")
+            logger.debug("  ✓ Cut %d (%s): %s...", i + 1, phase_name, cut.scene_description[:50], extra={'cut_number': i + 1})
+            report_progress(self.progress_callback, 'storyboard', i + 1, len(cuts_data), cut_number=i + 1)
         
         # 高度化されたストーリーボード作成
         storyboard = StoryboardData(
@@ -608,14 +702,14 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
             created_at=datetime.now().isoformat()
         )
         
-        # ポスト生成フック
-        storyboard_dict = storyboard.to_dict()
-        storyboard_dict = self.trigger_hook('post_generation', storyboard_dict)
+        # ポスト生成フック（to_dict() は全カットのコピーなので、登録がある場合のみ）
+        if self.hooks.get('post_generation'):
+            self.trigger_hook('post_generation', storyboard.to_dict())
         
-        print(f"\n✅ Enhanced storyboard generation complete!")
-        print(f"   📱 Optimized for {context.aspect_ratio.value}")
-        print(f"   🎭 {context.genre.value.title()} genre")
-        print(f"   🎵 J-pop emotional structure applied")
+        logger.info("\n✅ Enhanced storyboard generation complete! (%d cuts)", len(cuts))
+        logger.info("   📱 Optimized for %s", context.aspect_ratio.value)
+        logger.info("   🎭 %s genre", context.genre.value.title())
+        logger.info("   🎵 J-pop emotional structure applied")
         
         return storyboard
 
@@ -653,15 +747,16 @@ class EnhancedStoryboardGenerator(CoreStoryboardGenerator):
         cut_number: int, 
         cut_info: Dict, 
         context: SceneContext, 
-        visual_analysis: Optional[Dict]
+        visual_analysis: Optional[Dict],
+        rng: Optional[random.Random] = None
     ) -> CutData:
         """高度化されたカット作成"""
         scene_type = cut_info.get('scene_type', 'dialogue')
         
         # インテリジェント選択
-        camera_angle = self.selection_engine.select_camera_angle(context, scene_type)
-        composition = self.selection_engine.select_composition(context, scene_type)
-        camera_movement = self.selection_engine.select_camera_movement(context, scene_type)
+        camera_angle = self.selection_engine.select_camera_angle(context, scene_type, rng)
+        composition = self.selection_engine.select_composition(context, scene_type, rng)
+        camera_movement = self.selection_engine.select_camera_movement(context, scene_type, rng)
         
         # 高度化画像プロンプト生成
         image_prompt = self._generate_enhanced_image_prompt(
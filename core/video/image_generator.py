@@ -5,48 +5,73 @@ Handles image generation using Gemini API
 """
 import os
 import base64
+import logging
+import threading
+import time
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import List, Optional
-from PIL import Image
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+from ..base import LazyModule, ProgressCallback, RateLimiter, module_available, report_progress
+
+# google.generativeai の読み込みは約1秒かかるため、画像を生成するまで遅延させる
+Image = LazyModule('PIL.Image')
+genai = LazyModule('google.generativeai')
+GEMINI_AVAILABLE = module_available('google.generativeai')
+
+logger = logging.getLogger(__name__)
 
 
 class ImageGenerator:
     """Image generation using Gemini API"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
         """
         Initialize image generator
 
         Args:
             api_key: Gemini API key
+            rate_limiter: Limiter shared by every generator calling the image API
+            progress_callback: Receives a ProgressEvent as each cut's image finishes (generate_images)
         """
         self.api_key = api_key or os.environ.get('GEMINI_API_KEY')
+        self.rate_limiter = rate_limiter
+        self.progress_callback = progress_callback
         self.use_gemini = GEMINI_AVAILABLE and self.api_key
         self.generation_errors = []  # Track generation errors
         self.images_generated_count = 0
         self.images_failed_count = 0
+        self.busy_time = 0.0  # Seconds inside generate_image, excluding rate-limiter waits
+        self._busy_lock = threading.Lock()
 
         if self.use_gemini:
             genai.configure(api_key=self.api_key)
             self.image_model = "gemini-2.5-flash-image"
 
-    def generate_images(self, cuts: List, output_dir: str):
+    def reset(self):
+        """Clear counters and errors (when one generator is reused across storyboards)"""
+        self.generation_errors = []
+        self.images_generated_count = 0
+        self.images_failed_count = 0
+        self.busy_time = 0.0
+
+    def generate_images(self, cuts: List, output_dir: str, executor: Optional[Executor] = None):
         """
         Generate images for cuts
 
         Args:
             cuts: List of cut data
             output_dir: Output directory
+            executor: Shared worker pool (cuts are generated concurrently when given)
         """
         if not self.use_gemini:
             error_msg = "Gemini API not available (library not installed or API key not set)"
-            print(error_msg)
+            logger.warning(error_msg)
             self.generation_errors.append({
                 'type': 'api_unavailable',
                 'message': error_msg,
@@ -57,86 +82,132 @@ class ImageGenerator:
         frames_dir = Path(output_dir) / 'frames'
         frames_dir.mkdir(parents=True, exist_ok=True)
 
-        for cut in cuts:
-            try:
-                print(f"  Generating image for Cut {cut.cut_number}...")
-
-                model = genai.GenerativeModel(self.image_model)
-
-                # 参照画像がある場合は画像とプロンプトを組み合わせる
-                content_parts = []
-                if hasattr(cut, 'reference_images') and cut.reference_images:
-                    # 参照画像を読み込み（最大3枚）
-                    reference_count = 0
-                    for ref_img_path in cut.reference_images[:3]:  # Gemini 2.5 Flash Image limit
-                        ref_path = Path(ref_img_path)
-                        if ref_path.exists():
-                            try:
-                                # PIL.Imageで画像を読み込み
-                                img = Image.open(ref_path)
-                                content_parts.append(img)
-                                reference_count += 1
-                                print(f"    + Reference image {reference_count}: {ref_path.name}")
-                            except Exception as img_error:
-                                print(f"    ⚠️  Failed to load reference image {ref_path.name}: {img_error}")
-                        else:
-                            print(f"    ⚠️  Reference image not found: {ref_path}")
-
-                    if reference_count > 0:
-                        print(f"    → Using {reference_count} reference image(s)")
-
-                # プロンプトを追加
-                content_parts.append(cut.image_prompt)
-
-                # 画像生成リクエスト
-                response = model.generate_content(content_parts)
-
-                if response.candidates and response.candidates[0].content.parts:
-                    for part in response.candidates[0].content.parts:
-                        if hasattr(part, 'inline_data') and part.inline_data:
-                            image_path = frames_dir / f"cut_{cut.cut_number:02d}.jpg"
-
-                            image_data = base64.b64decode(part.inline_data.data)
-                            with open(image_path, 'wb') as f:
-                                f.write(image_data)
-
-                            cut.generated_image_path = str(image_path)
-                            self.images_generated_count += 1
-                            print(f"    ✓ Saved to {image_path}")
-                            break
-                    else:
-                        # No inline_data found
-                        error_msg = "No image data in response"
-                        print(f"    ✗ {error_msg}")
-                        self.images_failed_count += 1
-                        self.generation_errors.append({
-                            'cut_number': cut.cut_number,
-                            'type': 'no_image_data',
-                            'message': error_msg
-                        })
-                else:
-                    # No candidates
-                    error_msg = "No candidates in response"
-                    print(f"    ✗ {error_msg}")
-                    self.images_failed_count += 1
-                    self.generation_errors.append({
-                        'cut_number': cut.cut_number,
-                        'type': 'no_candidates',
-                        'message': error_msg
-                    })
-
-            except Exception as e:
-                error_type = self._classify_error(e)
-                error_msg = str(e)
-                print(f"    ✗ Error generating image for Cut {cut.cut_number}: {error_msg}")
+        if executor is None:
+            futures = None
+        else:
+            futures = [executor.submit(self.generate_image, cut, frames_dir) for cut in cuts]
 
+        results = []
+        for i, cut in enumerate(cuts):
+            error = self.generate_image(cut, frames_dir) if futures is None else futures[i].result()
+            results.append(error)
+            report_progress(self.progress_callback, 'images', i + 1, len(cuts), cut_number=cut.cut_number,
+                            status='ok' if error is None else 'failed')
+
+        self.record_results(results)
+
+    def record_results(self, results: List[Optional[dict]]):
+        """
+        Add per-cut results from generate_image to the counters
+
+        Args:
+            results: Error records (None for success) in cut order, so the summary is deterministic
+        """
+        for error in results:
+            if error is None:
+                self.images_generated_count += 1
+            else:
                 self.images_failed_count += 1
-                self.generation_errors.append({
+                self.generation_errors.append(error)
+
+    def generate_image(self, cut, frames_dir: Path) -> Optional[dict]:
+        """
+        Generate the image for a single cut
+
+        Args:
+            cut: Cut data
+            frames_dir: Directory for generated frames
+
+        Returns:
+            Error record, or None on success
+        """
+        start = time.perf_counter()
+        # 共有のレート制限（待ち時間は busy_time に含めない）
+        waited = self.rate_limiter.acquire() if self.rate_limiter else 0.0
+        try:
+            return self._generate_image(cut, frames_dir)
+        finally:
+            with self._busy_lock:
+                self.busy_time += time.perf_counter() - start - waited
+
+    def _generate_image(self, cut, frames_dir: Path) -> Optional[dict]:
+        """Request, decode and save one cut's image (body of generate_image)"""
+        try:
+            logger.debug("  Generating image for Cut %d...", cut.cut_number, extra={'cut_number': cut.cut_number})
+
+            model = genai.GenerativeModel(self.image_model)
+
+            # 参照画像がある場合は画像とプロンプトを組み合わせる
+            content_parts = []
+            if hasattr(cut, 'reference_images') and cut.reference_images:
+                # 参照画像を読み込み（最大3枚）
+                reference_count = 0
+                for ref_img_path in cut.reference_images[:3]:  # Gemini 2.5 Flash Image limit
+                    ref_path = Path(ref_img_path)
+                    if ref_path.exists():
+                        try:
+                            # PIL.Imageで画像を読み込み
+                            img = Image.open(ref_path)
+                            content_parts.append(img)
+                            reference_count += 1
+                            logger.debug("    + Reference image %d: %s", reference_count, ref_path.name)
+                        except Exception as img_error:
+                            logger.warning("    ⚠️  Failed to load reference image %s: %s", ref_path.name, img_error)
+                    else:
+                        logger.warning("    ⚠️  Reference image not found: %s", ref_path)
+
+                if reference_count > 0:
+                    logger.debug("    → Using %d reference image(s)", reference_count)
+
+            # プロンプトを追加
+            content_parts.append(cut.image_prompt)
+
+            # 画像生成リクエスト
+            response = model.generate_content(content_parts)
+
+            if response.candidates and response.candidates[0].content.parts:
+                for part in response.candidates[0].content.parts:
+                    if hasattr(part, 'inline_data') and part.inline_data:
+                        image_path = frames_dir / f"cut_{cut.cut_number:02d}.jpg"
+
+                        image_data = base64.b64decode(part.inline_data.data)
+                        with open(image_path, 'wb') as f:
+                            f.write(image_data)
+
+                        cut.generated_image_path = str(image_path)
+                        logger.debug("    ✓ Saved to %s", image_path, extra={'cut_number': cut.cut_number})
+                        return None
+
+                # No inline_data found
+                error_msg = "No image data in response"
+                logger.error("    ✗ Cut %d: %s", cut.cut_number, error_msg, extra={'cut_number': cut.cut_number})
+                return {
                     'cut_number': cut.cut_number,
-                    'type': error_type,
-                    'message': error_msg,
-                    'exception_type': type(e).__name__
-                })
+                    'type': 'no_image_data',
+                    'message': error_msg
+                }
+
+            # No candidates
+            error_msg = "No candidates in response"
+            logger.error("    ✗ Cut %d: %s", cut.cut_number, error_msg, extra={'cut_number': cut.cut_number})
+            return {
+                'cut_number': cut.cut_number,
+                'type': 'no_candidates',
+                'message': error_msg
+            }
+
+        except Exception as e:
+            error_type = self._classify_error(e)
+            error_msg = str(e)
+            logger.error("    ✗ Error generating image for Cut %d: %s", cut.cut_number, error_msg,
+                         extra={'cut_number': cut.cut_number, 'error_type': error_type})
+
+            return {
+                'cut_number': cut.cut_number,
+                'type': error_type,
+                'message': error_msg,
+                'exception_type': type(e).__name__
+            }
 
     def _classify_error(self, exception: Exception) -> str:
         """Classify error type for better reporting"""
@@ -4,13 +4,23 @@ Core Storyboard Generator
 Modularized storyboard generation functionality
 """
 import json
+import logging
+import os
+import pickle
 import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
-from ..base import BaseVideoGenerator, GeneratorConfig
+from ..base import (
+    BaseVideoGenerator, GeneratorConfig, StagePipeline, CutStream, StreamReport,
+    ProgressCallback, report_progress
+)
+from ..base.log import PACKAGE_LOGGERS, log_level_at_least
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -176,14 +186,85 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         'conclusion': 'slow_pull_back'
     }
 
-    def __init__(self, config: Optional[GeneratorConfig] = None):
+    # Cut count written in the prompt ("4カット", "6 cuts", ...), checked in order
+    CUT_COUNT_PATTERNS = tuple(
+        re.compile(pattern, re.IGNORECASE) for pattern in (
+            r'(\d+)\s*カット',
+            r'(\d+)\s*つのカット',
+            r'(\d+)\s*つのストーリー',
+            r'(\d+)\s*個のカット',
+            r'(\d+)\s*個のストーリー',
+            r'(\d+)\s*cuts',
+            r'(\d+)\s*stories'
+        )
+    )
+
+    DEFAULT_SCENE_TYPES = ('opening', 'character', 'dialogue', 'action',
+                           'emotion', 'action', 'emotion', 'conclusion')
+
+    ANGLE_DESCRIPTIONS = {
+        'ELS': 'extreme wide shot',
+        'LS': 'wide shot',
+        'MS': 'medium shot',
+        'CU': 'close-up shot',
+        'ECU': 'extreme close-up'
+    }
+
+    # Veo 3用のカメラムーブメント記述
+    VEO3_MOVEMENTS = {
+        'static': 'Camera: Static shot with minimal natural drift',
+        'slow_zoom_in': 'Camera: Slow zoom in, gradually revealing details',
+        'slow_pull_back': 'Camera: Slow pull back, revealing wider context',
+        'tracking': 'Camera: Smooth tracking shot following the action',
+        'dolly_in': 'Camera: Dolly forward toward subject',
+        'pan': 'Camera: Smooth pan across scene',
+        'slow_pan': 'Camera: Slow pan movement',
+        'pan_left': 'Camera: Pan left across scene',
+        'pan_right': 'Camera: Pan right across scene',
+        'zoom_in': 'Camera: Zoom in on subject',
+        'zoom_out': 'Camera: Zoom out revealing context',
+        'tilt_up': 'Camera: Tilt up movement',
+        'tilt_down': 'Camera: Tilt down movement'
+    }
+
+    # Sora 2用のカメラムーブメント記述（より自然言語的）
+    SORA2_MOVEMENTS = {
+        'static': 'The camera remains still, capturing a static moment with only slight natural movement',
+        'slow_zoom_in': 'The camera slowly zooms in, gradually revealing finer details of the scene',
+        'slow_pull_back': 'The camera pulls back slowly, expanding the view to show more context',
+        'tracking': 'The camera smoothly tracks the movement, following the action through the scene',
+        'dolly_in': 'The camera dollies forward, moving closer to the subject',
+        'pan': 'The camera pans smoothly across the scene',
+        'slow_pan': 'The camera pans slowly and deliberately across the frame',
+        'pan_left': 'The camera pans left, sweeping across the scene',
+        'pan_right': 'The camera pans right, revealing the environment',
+        'zoom_in': 'The camera zooms in on the subject',
+        'zoom_out': 'The camera zooms out, showing the broader context',
+        'tilt_up': 'The camera tilts upward',
+        'tilt_down': 'The camera tilts downward'
+    }
+
+    LIGHTING_BY_MOOD = {
+        'hopeful': 'soft morning sunlight',
+        'energetic': 'bright dynamic lighting',
+        'tense': 'dramatic shadows',
+        'peaceful': 'warm golden hour',
+        'mysterious': 'low key lighting',
+        'joyful': 'bright even lighting',
+        'dramatic': 'high contrast lighting',
+        'neutral': 'natural lighting'
+    }
+
+    def __init__(self, config: Optional[GeneratorConfig] = None, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize core storyboard generator
 
         Args:
             config: Generator configuration
+            progress_callback: Receives a ProgressEvent for each created cut
         """
         super().__init__(config)
+        self.progress_callback = progress_callback
 
     def generate_storyboard(self, input_data: Dict) -> StoryboardData:
         """
@@ -195,6 +276,75 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         Returns:
             Complete storyboard data
         """
+        cuts = list(self.stream_cuts(input_data))
+        return self._assemble_storyboard(cuts, input_data.get('visual_analysis'))
+
+    def generate_many(
+        self,
+        inputs: Iterable[Dict],
+        max_workers: Optional[int] = None,
+        quiet: bool = True,
+        chunksize: Optional[int] = None
+    ) -> Iterator[StoryboardData]:
+        """
+        Generate storyboards for many inputs (A/B prompt variants, etc.)
+
+        Each worker process unpickles this generator once and reuses it (with its
+        selection tables, compiled patterns and registered hooks) for every input.
+
+        Args:
+            inputs: Input data for each storyboard (same format as generate_storyboard)
+            max_workers: Worker processes (None = CPU count, 1 = run in this process)
+            quiet: Silence per-cut progress output
+            chunksize: Inputs sent to a worker at a time (None = split evenly)
+
+        Yields:
+            StoryboardData in input order
+        """
+        inputs = list(inputs)
+        max_workers = min(max_workers or os.cpu_count() or 1, max(len(inputs), 1))
+
+        if max_workers > 1:
+            try:
+                payload = pickle.dumps(self)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                # ラムダのフックなどはプロセスへ送れないため、このプロセスで実行
+                logger.warning("⚠️  Generator cannot be sent to worker processes (%s); running in-process", e)
+                max_workers = 1
+
+        if max_workers == 1:
+            for input_data in inputs:
+                if quiet:
+                    with log_level_at_least(logging.WARNING):
+                        storyboard = self.generate_storyboard(input_data)
+                else:
+                    storyboard = self.generate_storyboard(input_data)
+                yield storyboard
+            return
+
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing is only needed here
+
+        chunksize = chunksize or max(1, len(inputs) // (max_workers * 4))
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(payload, quiet)
+        )
+        try:
+            yield from pool.map(_generate_batch_item, inputs, chunksize=chunksize)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def stream_cuts(self, input_data: Dict) -> Iterator[CutData]:
+        """
+        Yield cuts one by one as they are created
+
+        Args:
+            input_data: Input data containing story description and optional key visual
+
+        Yields:
+            CutData in cut order
+        """
         story_description = input_data.get('story_description', '')
         visual_analysis = input_data.get('visual_analysis')
 
@@ -202,7 +352,7 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         input_data = self.trigger_hook('pre_generation', input_data)
 
         # Step 1: Analyze story structure
-        print("\n📝 Analyzing story structure...")
+        logger.debug("\n📝 Analyzing story structure...")
         cuts_data = self._analyze_story_structure(
             story_description,
             self.config.duration,
@@ -211,17 +361,19 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         )
 
         # Step 2: Create detailed cuts
-        print(f"\n🎬 Creating {len(cuts_data)} cuts...")
-        cuts = []
+        logger.debug("\n🎬 Creating %d cuts...", len(cuts_data))
         for i, cut_info in enumerate(cuts_data):
             cut = self._create_cut(
                 i + 1,
                 cut_info,
                 visual_analysis
             )
-            cuts.append(cut)
-            print(f"  ✓ Cut {i + 1}: {cut.scene_description[:50]}...")
+            logger.debug("  ✓ Cut %d: %s...", i + 1, cut.scene_description[:50], extra={'cut_number': i + 1})
+            report_progress(self.progress_callback, 'storyboard', i + 1, len(cuts_data), cut_number=i + 1)
+            yield cut
 
+    def _assemble_storyboard(self, cuts: List[CutData], visual_analysis: Optional[Dict]) -> StoryboardData:
+        """Create storyboard data from finished cuts and trigger post-generation hooks"""
         # Step 3: Create storyboard data
         storyboard = StoryboardData(
             title=self.config.title,
@@ -233,13 +385,259 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
             created_at=datetime.now().isoformat()
         )
 
-        # Trigger post-generation hooks
-        storyboard_dict = storyboard.to_dict()
-        storyboard_dict = self.trigger_hook('post_generation', storyboard_dict)
+        # Trigger post-generation hooks (to_dict() is a deep copy, so only when someone listens)
+        if self.hooks.get('post_generation'):
+            self.trigger_hook('post_generation', storyboard.to_dict())
 
-        print("\n✅ Storyboard generation complete!")
+        logger.info("\n✅ Storyboard generation complete! (%d cuts)", len(cuts))
         return storyboard
 
+    def generate_storyboard_streaming(
+        self,
+        input_data: Dict,
+        image_generator: Optional[Any] = None,
+        narration_generator: Optional[Any] = None,
+        voice_generator: Optional[Any] = None,
+        subtitle_generator: Optional[Any] = None,
+        music_generator: Optional[Any] = None,
+        output_dir: Optional[str] = None,
+        queue_size: int = 2,
+        workers: int = 2,
+        narrate_all: bool = False
+    ) -> Tuple[StoryboardData, StreamReport]:
+        """
+        Generate a storyboard with each cut streaming through narration → voice → subtitles
+
+        Unlike build_pipeline there is no whole-storyboard barrier before the per-cut stages:
+        each cut moves on as soon as its previous stage is done. Images run as a parallel
+        branch, so voices never wait for image generation. Narration needs are analyzed
+        once over all cuts, as in build_pipeline; the cut structure needs no API, so it
+        is built up front in that case. With narrate_all every cut is narrated without the
+        analysis, and cuts are created one by one as they stream.
+        The music plan and saving run after the stream, once the storyboard is complete.
+
+        Args:
+            input_data: Input for the storyboard
+            image_generator: ImageGenerator
+            narration_generator: NarrationGenerator (uses config.narration_style)
+            voice_generator: VoiceGenerator (writes to <output_dir>/audio)
+            subtitle_generator: SubtitleGenerator
+            music_generator: MusicGenerator
+            output_dir: Output directory (default: config.output_dir)
+            queue_size: Capacity of each queue between stages
+            workers: Threads per API-bound stage (images, narration, voices)
+            narrate_all: Narrate every cut instead of analyzing which cuts need narration
+
+        Returns:
+            (StoryboardData, StreamReport)
+        """
+        output_dir = output_dir or self.config.output_dir
+        story_context = input_data.get('story_description', '')
+        stream = CutStream(queue_size=queue_size)
+        created: List[CutData] = []  # Cuts in creation order (previous-cut context for narration)
+        image_results: Dict[int, Optional[dict]] = {}
+
+        narrate = narration_generator is not None and narration_generator.use_claude
+        analyze_needs = narrate and not narrate_all
+        if narration_generator is not None and not narrate:
+            logger.warning("⚠️  Claude API not available, skipping narration generation")
+
+        def source():
+            if analyze_needs:
+                # 要否分析は全カットを見るため、構成（API不要）を先にすべて作る
+                created.extend(self.stream_cuts(input_data))
+                yield from created
+            else:
+                for cut in self.stream_cuts(input_data):
+                    created.append(cut)
+                    yield cut
+
+        if narrate:
+            style = self.config.narration_style
+            needs: List[bool] = []
+            needs_lock = threading.Lock()
+
+            def narration_stage(cut):
+                needs_narration = True
+                if analyze_needs:
+                    with needs_lock:
+                        if not needs:
+                            needs.extend(narration_generator.analyze_narration_needs(created, story_context, style))
+                            logger.info("  ✓ %d/%d cuts identified for narration", sum(needs), len(needs))
+                    needs_narration = needs[cut.cut_number - 1]
+                narration_generator.generate_narration_for_cut(
+                    cut, story_context, created[:cut.cut_number - 1], style, needs_narration
+                )
+
+            stream.add_stage('narration', narration_stage, workers)
+
+        if voice_generator is not None:
+            audio_dir = str(Path(output_dir) / 'audio')
+            stream.add_stage('voices', lambda cut: voice_generator.generate_voices_for_cut(cut, audio_dir), workers)
+
+        if subtitle_generator is not None:
+            def subtitle_stage(cut):
+                if cut.subtitle_enabled:
+                    cut.subtitle_lines = subtitle_generator.generate_subtitles_for_cut(cut, 'auto')
+
+            stream.add_stage('subtitles', subtitle_stage)
+
+        if image_generator is not None and image_generator.use_gemini:
+            frames_dir = Path(output_dir) / 'frames'
+            frames_dir.mkdir(parents=True, exist_ok=True)
+
+            def image_stage(cut):
+                image_results[cut.cut_number] = image_generator.generate_image(cut, frames_dir)
+
+            # 画像は音声・字幕と独立しているので並行するブランチにする
+            stream.add_branch('images', image_stage, workers)
+
+        report = stream.run(source())
+
+        storyboard = self._assemble_storyboard(list(created), input_data.get('visual_analysis'))
+
+        if image_generator is not None:
+            if image_generator.use_gemini:
+                image_generator.record_results([image_results[cut.cut_number] for cut in storyboard.cuts])
+            else:
+                image_generator.generate_images(storyboard.cuts, output_dir)
+            error_summary = image_generator.get_error_summary()
+            if error_summary['has_errors']:
+                storyboard.image_generation_errors = error_summary
+
+        if music_generator is not None:
+            logger.info("\n🎵 Generating BGM prompts...")
+            music_plan = music_generator.generate_music_plan(storyboard.to_dict())
+            storyboard.music_sections = music_plan['sections']
+            logger.info("  ✓ Created %d music sections", len(music_plan['sections']))
+
+        self.save_storyboard(storyboard, output_dir)
+        return storyboard, report
+
+    def build_pipeline(
+        self,
+        input_data: Dict,
+        image_generator: Optional[Any] = None,
+        narration_generator: Optional[Any] = None,
+        voice_generator: Optional[Any] = None,
+        subtitle_generator: Optional[Any] = None,
+        music_generator: Optional[Any] = None,
+        output_dir: Optional[str] = None,
+        max_workers: int = 4
+    ) -> StagePipeline:
+        """
+        Build the stage graph for a complete storyboard run
+
+        storyboard → images / narration → voices / subtitles (per cut), music plan → save.
+        Only stages whose generator is given are added. Images and narration overlap,
+        and each cut's voice and subtitles start as soon as that cut's narration exists.
+        Run it with pipeline.run(context); the storyboard ends up in context['storyboard'].
+
+        Args:
+            input_data: Input for generate_storyboard
+            image_generator: ImageGenerator
+            narration_generator: NarrationGenerator (uses config.narration_style)
+            voice_generator: VoiceGenerator (writes to <output_dir>/audio)
+            subtitle_generator: SubtitleGenerator
+            music_generator: MusicGenerator
+            output_dir: Output directory (default: config.output_dir)
+            max_workers: Worker threads shared by all stages
+
+        Returns:
+            StagePipeline
+        """
+        output_dir = output_dir or self.config.output_dir
+        story_context = input_data.get('story_description', '')
+        pipeline = StagePipeline(max_workers=max_workers)
+
+        def storyboard_stage(context):
+            context['storyboard'] = self.generate_storyboard(input_data)
+            context['cut_index'] = {id(cut): i for i, cut in enumerate(context['storyboard'].cuts)}
+
+        pipeline.add_stage('storyboard', storyboard_stage)
+        text_stage = 'storyboard'
+
+        if image_generator is not None:
+            frames_dir = Path(output_dir) / 'frames'
+
+            def image_stage(context, cut):
+                if image_generator.use_gemini:
+                    frames_dir.mkdir(parents=True, exist_ok=True)
+                    context.setdefault('image_results', {})[cut.cut_number] = \
+                        image_generator.generate_image(cut, frames_dir)
+
+            pipeline.add_stage('images', image_stage, ['storyboard'], per_cut=True)
+
+        if narration_generator is not None:
+            style = self.config.narration_style
+
+            def narration_plan_stage(context):
+                cuts = context['storyboard'].cuts
+                if narration_generator.use_claude:
+                    context['narration_needs'] = narration_generator.analyze_narration_needs(
+                        cuts, story_context, style
+                    )
+                else:
+                    logger.warning("⚠️  Claude API not available, skipping narration generation")
+                    context['narration_needs'] = [False] * len(cuts)
+
+            def narration_stage(context, cut):
+                index = context['cut_index'][id(cut)]
+                narration_generator.generate_narration_for_cut(
+                    cut,
+                    story_context,
+                    context['storyboard'].cuts[:index],
+                    style,
+                    context['narration_needs'][index]
+                )
+
+            pipeline.add_stage('narration_plan', narration_plan_stage, ['storyboard'])
+            pipeline.add_stage('narration', narration_stage, ['narration_plan'], per_cut=True)
+            text_stage = 'narration'
+
+        if voice_generator is not None:
+            audio_dir = str(Path(output_dir) / 'audio')
+
+            def voice_stage(context, cut):
+                context.setdefault('voice_files', {})[cut.cut_number] = \
+                    voice_generator.generate_voices_for_cut(cut, audio_dir)
+
+            pipeline.add_stage('voices', voice_stage, [text_stage], per_cut=True)
+
+        if subtitle_generator is not None:
+            def subtitle_stage(context, cut):
+                if cut.subtitle_enabled:
+                    cut.subtitle_lines = subtitle_generator.generate_subtitles_for_cut(cut, 'auto')
+
+            pipeline.add_stage('subtitles', subtitle_stage, [text_stage], per_cut=True)
+
+        if music_generator is not None:
+            def music_stage(context):
+                logger.info("\n🎵 Generating BGM prompts...")
+                storyboard = context['storyboard']
+                music_plan = music_generator.generate_music_plan(storyboard.to_dict())
+                storyboard.music_sections = music_plan['sections']
+                logger.info("  ✓ Created %d music sections", len(music_plan['sections']))
+
+            pipeline.add_stage('music', music_stage, ['storyboard'])
+
+        def save_stage(context):
+            storyboard = context['storyboard']
+            if image_generator is not None:
+                if image_generator.use_gemini:
+                    results = context.get('image_results', {})
+                    image_generator.record_results([results[cut.cut_number] for cut in storyboard.cuts])
+                else:
+                    image_generator.generate_images(storyboard.cuts, output_dir)
+
+                error_summary = image_generator.get_error_summary()
+                if error_summary['has_errors']:
+                    storyboard.image_generation_errors = error_summary
+            context['output_path'] = self.save_storyboard(storyboard, output_dir)
+
+        pipeline.add_stage('save', save_stage, list(pipeline.stages))
+        return pipeline
+
     def _analyze_story_structure(
         self,
         story: str,
@@ -270,30 +668,18 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         """Create basic story structure"""
         # プロンプトからカット数を抽出（優先）
         if num_cuts is None:
-            import re
-            # パターン: "4カット", "4つのカット", "4つのストーリー", "4個のカット" など
-            patterns = [
-                r'(\d+)\s*カット',
-                r'(\d+)\s*つのカット',
-                r'(\d+)\s*つのストーリー',
-                r'(\d+)\s*個のカット',
-                r'(\d+)\s*個のストーリー',
-                r'(\d+)\s*cuts',
-                r'(\d+)\s*stories'
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, story, re.IGNORECASE)
+            for pattern in self.CUT_COUNT_PATTERNS:
+                match = pattern.search(story)
                 if match:
                     num_cuts = int(match.group(1))
-                    print(f"  ℹ️  プロンプトから検出: {num_cuts}カット構成")
+                    logger.debug("  ℹ️  プロンプトから検出: %dカット構成", num_cuts)
                     break
 
         # デフォルト値を適用
         num_cuts = num_cuts or 8
         cut_duration = duration // num_cuts
 
-        scene_types = ['opening', 'character', 'dialogue', 'action',
-                      'emotion', 'action', 'emotion', 'conclusion']
+        scene_types = self.DEFAULT_SCENE_TYPES
 
         cuts = []
         for i in range(num_cuts):
@@ -367,13 +753,7 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         visual_analysis: Optional[Dict]
     ) -> str:
         """Generate image generation prompt"""
-        angle_desc = {
-            'ELS': 'extreme wide shot',
-            'LS': 'wide shot',
-            'MS': 'medium shot',
-            'CU': 'close-up shot',
-            'ECU': 'extreme close-up'
-        }.get(camera_angle, 'medium shot')
+        angle_desc = self.ANGLE_DESCRIPTIONS.get(camera_angle, 'medium shot')
 
         comp_desc = composition.replace('_', ' ')
 
@@ -405,22 +785,7 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         duration: int
     ) -> str:
         """Generate Veo 3 prompt for video generation"""
-        # Veo 3用のカメラムーブメント記述
-        movement_desc = {
-            'static': 'Camera: Static shot with minimal natural drift',
-            'slow_zoom_in': 'Camera: Slow zoom in, gradually revealing details',
-            'slow_pull_back': 'Camera: Slow pull back, revealing wider context',
-            'tracking': 'Camera: Smooth tracking shot following the action',
-            'dolly_in': 'Camera: Dolly forward toward subject',
-            'pan': 'Camera: Smooth pan across scene',
-            'slow_pan': 'Camera: Slow pan movement',
-            'pan_left': 'Camera: Pan left across scene',
-            'pan_right': 'Camera: Pan right across scene',
-            'zoom_in': 'Camera: Zoom in on subject',
-            'zoom_out': 'Camera: Zoom out revealing context',
-            'tilt_up': 'Camera: Tilt up movement',
-            'tilt_down': 'Camera: Tilt down movement'
-        }.get(camera_movement, 'Camera: Subtle movement')
+        movement_desc = self.VEO3_MOVEMENTS.get(camera_movement, 'Camera: Subtle movement')
 
         # Veo 3プロンプト構築
         prompt_parts = [
@@ -441,22 +806,7 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         duration: int
     ) -> str:
         """Generate Sora 2 prompt for video generation"""
-        # Sora 2用のカメラムーブメント記述（より自然言語的）
-        movement_desc = {
-            'static': 'The camera remains still, capturing a static moment with only slight natural movement',
-            'slow_zoom_in': 'The camera slowly zooms in, gradually revealing finer details of the scene',
-            'slow_pull_back': 'The camera pulls back slowly, expanding the view to show more context',
-            'tracking': 'The camera smoothly tracks the movement, following the action through the scene',
-            'dolly_in': 'The camera dollies forward, moving closer to the subject',
-            'pan': 'The camera pans smoothly across the scene',
-            'slow_pan': 'The camera pans slowly and deliberately across the frame',
-            'pan_left': 'The camera pans left, sweeping across the scene',
-            'pan_right': 'The camera pans right, revealing the environment',
-            'zoom_in': 'The camera zooms in on the subject',
-            'zoom_out': 'The camera zooms out, showing the broader context',
-            'tilt_up': 'The camera tilts upward',
-            'tilt_down': 'The camera tilts downward'
-        }.get(camera_movement, 'The camera moves subtly')
+        movement_desc = self.SORA2_MOVEMENTS.get(camera_movement, 'The camera moves subtly')
 
         # Sora 2プロンプト構築（より詳細な記述）
         scene_desc = cut_info.get('scene_description', '')
@@ -470,17 +820,7 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
 
     def _determine_lighting(self, mood: str) -> str:
         """Determine lighting based on mood"""
-        lighting_map = {
-            'hopeful': 'soft morning sunlight',
-            'energetic': 'bright dynamic lighting',
-            'tense': 'dramatic shadows',
-            'peaceful': 'warm golden hour',
-            'mysterious': 'low key lighting',
-            'joyful': 'bright even lighting',
-            'dramatic': 'high contrast lighting',
-            'neutral': 'natural lighting'
-        }
-        return lighting_map.get(mood.lower(), 'natural lighting')
+        return self.LIGHTING_BY_MOOD.get(mood.lower(), 'natural lighting')
 
     def _create_style_guide(self, visual_analysis: Optional[Dict]) -> Dict:
         """Create style guide for storyboard"""
@@ -528,13 +868,14 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
 
         return sanitized.lower()
 
-    def _generate_output_dir(self, title: str, base_dir: str) -> Path:
+    def _generate_output_dir(self, title: str, base_dir: str, suffix: Optional[str] = None) -> Path:
         """
         Generate timestamped output directory name
 
         Args:
             title: Storyboard title
             base_dir: Base output directory
+            suffix: Appended to the name (e.g. a job id, so concurrent runs never share a directory)
 
         Returns:
             Path object for output directory
@@ -542,6 +883,8 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         sanitized_title = self._sanitize_title(title)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         dir_name = f"{sanitized_title}_{timestamp}"
+        if suffix:
+            dir_name = f"{dir_name}_{suffix}"
 
         return Path(base_dir) / dir_name
 
@@ -568,7 +911,7 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
                     versioned_path = Path(f"{requested_dir}_v{version}")
                     if not versioned_path.exists():
                         output_path = versioned_path
-                        print(f"⚠️  Directory exists. Using: {output_path}")
+                        logger.warning("⚠️  Directory exists. Using: %s", output_path)
                         break
                     version += 1
 
@@ -577,8 +920,8 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
             # Auto-naming mode: generate timestamped directory
             return self._generate_output_dir(storyboard.title, requested_dir)
 
-    def save_storyboard(self, storyboard: StoryboardData, output_dir: str):
-        """Save storyboard to JSON with automatic naming to prevent overwrites"""
+    def save_storyboard(self, storyboard: StoryboardData, output_dir: str) -> Path:
+        """Save storyboard to JSON with automatic naming to prevent overwrites (returns the directory used)"""
         output_path = self._resolve_output_path(storyboard, output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
@@ -586,9 +929,10 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(storyboard.to_dict(), f, ensure_ascii=False, indent=2)
 
-        print(f"\n💾 Saved storyboard to {json_path}")
+        logger.info("\n💾 Saved storyboard to %s", json_path)
 
         self._create_markdown_report(storyboard, output_path)
+        return output_path
 
     def _create_markdown_report(self, storyboard: StoryboardData, output_dir: Path):
         """Create visual markdown report"""
@@ -788,4 +1132,23 @@ class CoreStoryboardGenerator(BaseVideoGenerator):
         with open(report_path, 'w', encoding='utf-8') as f:
             f.write(''.join(report))
 
-        print(f"📄 Saved report to {report_path}")
+        logger.info("📄 Saved report to %s", report_path)
+
+
+_batch_generator: Optional[CoreStoryboardGenerator] = None
+
+
+def _init_batch_worker(payload: bytes, quiet: bool):
+    """Process pool initializer: restore the generator once per worker"""
+    global _batch_generator
+    _batch_generator = pickle.loads(payload)
+    if quiet:
+        # ワーカーのログはこのプロセス専用なので、core だけでなく tools.* やルートも WARNING に
+        for name in PACKAGE_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        logging.getLogger().setLevel(logging.WARNING)
+
+
+def _generate_batch_item(input_data: Dict) -> StoryboardData:
+    """Process pool entry point: one storyboard"""
+    return _batch_generator.generate_storyboard(input_data)
@@ -16,18 +16,24 @@
 
     # 参照画像複数枚（最大3枚）
     python generate_tourism_videos_v2.py "白浜旅行" --character-ref char1.png char2.png style.png
+
+    # バッチモード（4本を並列生成、画像生成ワーカー6、API 30回/分）
+    python generate_tourism_videos_v2.py "白浜旅行" --parallel 4 --image-workers 6 --requests-per-minute 30
 """
 
 import sys
+import time
+import logging
 import argparse
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from core.base import GeneratorConfig
+from core.base import GeneratorConfig, RateLimiter, configure_logging, load_config, thaw
 from core.video import CoreStoryboardGenerator, ImageGenerator
 
 # 南紀白浜プロジェクトのモジュール
@@ -47,7 +53,10 @@ class ShirahamaTourismVideoGenerator:
         duration: int = 30,
         num_videos: int = 4,
         character_reference: Optional[list] = None,
-        output_dir: Optional[Path] = None
+        output_dir: Optional[Path] = None,
+        parallel_videos: int = 1,
+        image_workers: int = 4,
+        requests_per_minute: Optional[float] = None
     ):
         """
         初期化
@@ -58,10 +67,22 @@ class ShirahamaTourismVideoGenerator:
             num_videos: 動画本数
             character_reference: キャラクター参照画像リスト（最大3枚、Gemini 2.5 Flash Image仕様）
             output_dir: 出力ディレクトリ
+            parallel_videos: 同時に生成する動画数（1 = 従来の逐次生成）
+            image_workers: バッチモードで全動画が共有する画像生成ワーカー数
+            requests_per_minute: 画像生成APIの全体レート上限（None = 制限なし）
         """
         self.story_description = story_description
         self.total_duration = duration
         self.num_videos = num_videos
+        self.parallel_videos = max(1, parallel_videos)
+        self.image_workers = max(1, image_workers)
+        self.requests_per_minute = requests_per_minute
+        # 画像生成APIのレート制限（逐次・並列のどちらでも全動画で共有）
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.video_timings: Dict[int, float] = {}  # 動画ID → 経過時間（秒）
+        # 動画ID → 処理時間（秒）。絵コンテ・画像生成API・保存の時間で、プール・レート制限の待ちを除く
+        self.video_busy: Dict[int, float] = {}
+        self.wall_clock_time = 0.0
         self.video_duration = duration // num_videos  # 各動画の時間
         # 参照画像は最大3枚に制限（Gemini 2.5 Flash Image の仕様）
         if character_reference:
@@ -92,12 +113,19 @@ class ShirahamaTourismVideoGenerator:
         self._load_and_validate_materials()
         print()
 
-        # 動画ごとに生成
-        for video_id in range(1, self.num_videos + 1):
-            print(f"[Step 2-4/5] Video {video_id}/{self.num_videos} 生成中...")
-            print("-" * 70)
-            self._generate_single_video(video_id)
-            print()
+        start = time.perf_counter()
+        if self.parallel_videos > 1 and self.num_videos > 1:
+            self._generate_videos_batch()
+        else:
+            # 動画ごとに生成
+            for video_id in range(1, self.num_videos + 1):
+                print(f"[Step 2-4/5] Video {video_id}/{self.num_videos} 生成中...")
+                print("-" * 70)
+                video_start = time.perf_counter()
+                self.video_busy[video_id] = self._generate_single_video(video_id)
+                self.video_timings[video_id] = time.perf_counter() - video_start
+                print()
+        self.wall_clock_time = time.perf_counter() - start
 
         # サマリー
         print("[Step 5/5] 完了")
@@ -125,8 +153,58 @@ class ShirahamaTourismVideoGenerator:
         for key, value in self.tourism_plugin.material_constraints.items():
             print(f"  - {key}: {value}")
 
-    def _generate_single_video(self, video_id: int):
-        """単一動画を生成"""
+    def _generate_single_video(self, video_id: int) -> float:
+        """単一動画を生成（処理時間を返す）"""
+        plan_start = time.perf_counter()
+        job = self._plan_video(video_id)
+        busy = time.perf_counter() - plan_start
+        busy += self._render_images(job, rate_limiter=self.rate_limiter)
+        return busy + self._timed_finalize(job)
+
+    def _timed_finalize(self, job: dict) -> float:
+        """絵コンテを保存し、かかった時間を返す"""
+        start = time.perf_counter()
+        self._finalize_video(job)
+        return time.perf_counter() - start
+
+    def _generate_videos_batch(self):
+        """
+        複数動画を並列生成（バッチモード）
+
+        素材の割り当てまでは動画順に逐次実行し（逐次生成と同じ素材配分）、
+        画像生成以降を動画ごとに並列実行する。画像生成ワーカーとAPIレート制限は全動画で共有。
+        """
+        print(f"[Step 2/5] 絵コンテ生成・素材割り当て（{self.num_videos}本、動画順）")
+        print("-" * 70)
+        jobs = []
+        for video_id in range(1, self.num_videos + 1):
+            plan_start = time.perf_counter()
+            jobs.append(self._plan_video(video_id))
+            self.video_timings[video_id] = time.perf_counter() - plan_start
+            self.video_busy[video_id] = self.video_timings[video_id]
+            print()
+
+        print(f"[Step 3-4/5] 画像生成・保存（動画 {self.parallel_videos} 並列, "
+              f"画像ワーカー {self.image_workers}, レート上限 {self.requests_per_minute or '-'} 回/分）")
+        print("-" * 70)
+        def run(job: dict) -> Tuple[float, float]:
+            job_start = time.perf_counter()
+            busy = self._render_images(job, executor=image_pool, rate_limiter=self.rate_limiter)
+            busy += self._timed_finalize(job)
+            return time.perf_counter() - job_start, busy
+
+        with ThreadPoolExecutor(max_workers=self.image_workers) as image_pool:
+            with ThreadPoolExecutor(max_workers=self.parallel_videos) as video_pool:
+                futures = [(job['video_id'], video_pool.submit(run, job)) for job in jobs]
+                # 動画順に結果を回収（例外はここで再送出）
+                for video_id, future in futures:
+                    elapsed, busy = future.result()
+                    self.video_timings[video_id] += elapsed
+                    self.video_busy[video_id] += busy
+        print()
+
+    def _plan_video(self, video_id: int) -> dict:
+        """絵コンテ生成から素材割り当て・参照画像の設定まで（共有の素材状態を更新するため逐次実行）"""
         # ビデオ情報をロード（config.yamlから）
         video_config = self._load_video_config(video_id)
 
@@ -181,12 +259,8 @@ class ShirahamaTourismVideoGenerator:
         # プラグイン: バリデーション
         storyboard = generator.process_plugins(storyboard, 'validation')
 
-        # 画像生成（コアシステムのエラーハンドリングを活用）
+        # 各カットに対して、キャラ参照（最大2枚）+背景素材（1枚）を準備
         if config.generate_images:
-            print("  🎨 画像生成中...")
-            image_gen = ImageGenerator()
-
-            # 各カットに対して、キャラ参照（最大2枚）+背景素材（1枚）を準備
             for cut in storyboard.cuts:
                 # 参照画像リストを構築（合計最大3枚）
                 cut_reference_images = []
@@ -207,16 +281,44 @@ class ShirahamaTourismVideoGenerator:
                 # カットに参照画像リストを設定（ImageGeneratorで使用）
                 cut.reference_images = cut_reference_images
 
-            image_gen.generate_images(storyboard.cuts, str(self.output_dir / f"video{video_id}"))
+        return {
+            'video_id': video_id,
+            'config': config,
+            'generator': generator,
+            'storyboard': storyboard,
+            'output_path': self.output_dir / f"video{video_id}"
+        }
 
-            # エラーサマリーを取得して絵コンテに追加
-            error_summary = image_gen.get_error_summary()
-            if error_summary['has_errors']:
-                storyboard.image_generation_errors = error_summary
-                print(f"  ⚠️  画像生成: {error_summary['total_generated']} 成功, {error_summary['total_failed']} 失敗")
+    def _render_images(
+        self,
+        job: dict,
+        executor: Optional[Executor] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ) -> float:
+        """画像生成（コアシステムのエラーハンドリングを活用）。画像生成APIの処理時間（待ちを除く）を返す"""
+        storyboard = job['storyboard']
+        if not job['config'].generate_images:
+            return 0.0
+
+        print(f"  🎨 Video {job['video_id']}: 画像生成中...")
+        image_gen = ImageGenerator(rate_limiter=rate_limiter)
+        image_gen.generate_images(storyboard.cuts, str(job['output_path']), executor=executor)
+
+        # エラーサマリーを取得して絵コンテに追加
+        error_summary = image_gen.get_error_summary()
+        if error_summary['has_errors']:
+            storyboard.image_generation_errors = error_summary
+            print(f"  ⚠️  Video {job['video_id']} 画像生成: {error_summary['total_generated']} 成功, {error_summary['total_failed']} 失敗")
+        return image_gen.busy_time
+
+    def _finalize_video(self, job: dict):
+        """絵コンテとI2Vプロンプトの保存"""
+        video_id = job['video_id']
+        generator = job['generator']
+        storyboard = job['storyboard']
 
         # 保存
-        output_path = self.output_dir / f"video{video_id}"
+        output_path = job['output_path']
         output_path.mkdir(parents=True, exist_ok=True)
 
         # コアシステムのsave_storyboard()はディレクトリパスを受け取る
@@ -234,15 +336,11 @@ class ShirahamaTourismVideoGenerator:
         self._generate_i2v_prompts(video_id, storyboard, output_path)
 
     def _load_video_config(self, video_id: int) -> dict:
-        """config.yamlから動画設定をロード"""
-        import yaml
-        config_file = self.project_dir / "config.yaml"
-
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        """config.yamlから動画設定をロード（解析は全動画で1回）"""
+        config = load_config(self.project_dir / "config.yaml")
 
         video_key = f"video{video_id}"
-        return config['story_structure']['videos'][video_key]
+        return thaw(config['story_structure']['videos'][video_key])
 
     def _build_story_for_video(self, video_id: int, video_config: dict) -> str:
         """動画用のストーリー記述を構築"""
@@ -323,6 +421,17 @@ class ShirahamaTourismVideoGenerator:
         usage = stats['usage_rate']
         print(f"素材使用率: {usage['rate']} ({usage['used']}/{usage['total']})")
 
+        # 処理時間
+        # 逐次実行の見積もりは動画ごとの処理時間（プール・レート制限の待ちを除く）の合計。
+        # 経過時間は並列実行時に共有プールの待ちを含むため、合計しても逐次時間にはならない
+        if self.video_timings:
+            print()
+            serial_estimate = sum(self.video_busy.values())
+            print(f"処理時間: {self.wall_clock_time:.1f}秒（逐次実行の見積もり: {serial_estimate:.1f}秒）")
+            print("動画ごとの経過時間 / 処理時間（待ちを除く）:")
+            for video_id, elapsed in sorted(self.video_timings.items()):
+                print(f"  - video{video_id}: {elapsed:.1f}秒 / {self.video_busy.get(video_id, 0.0):.1f}秒")
+
 
 def main():
     """メイン関数"""
@@ -357,9 +466,34 @@ def main():
         type=str,
         help='出力ディレクトリ'
     )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=1,
+        help='同時に生成する動画数（バッチモード）。デフォルト: 1'
+    )
+    parser.add_argument(
+        '--image-workers',
+        type=int,
+        default=4,
+        help='全動画で共有する画像生成ワーカー数。デフォルト: 4'
+    )
+    parser.add_argument(
+        '--requests-per-minute',
+        type=float,
+        help='画像生成APIの全体レート上限（回/分）'
+    )
+    parser.add_argument(
+        '--log-json',
+        type=str,
+        help='構造化ログ（JSON Lines）の出力先'
+    )
 
     args = parser.parse_args()
 
+    # バッチモードではカットごとの進捗を出さない（要約のみ）
+    configure_logging(logging.INFO if args.parallel > 1 else logging.DEBUG, json_path=args.log_json)
+
     # 参照画像をPathオブジェクトのリストに変換
     character_ref = None
     if args.character_ref:
@@ -375,7 +509,10 @@ def main():
             duration=args.duration,
             num_videos=args.num_videos,
             character_reference=character_ref,
-            output_dir=output_dir
+            output_dir=output_dir,
+            parallel_videos=args.parallel,
+            image_workers=args.image_workers,
+            requests_per_minute=args.requests_per_minute
         )
 
         generator.generate_all_videos()
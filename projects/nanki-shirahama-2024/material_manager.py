@@ -5,13 +5,18 @@
 制約: 素材の拡大/縮小のみ許可、形状変更は禁止
 """
 
+import sys
 import json
-import yaml
 import re
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 
+# リポジトリルートをパスに追加（tools パッケージ用）
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tools.metadata_store import open_metadata_store
+
 
 @dataclass
 class Material:
@@ -53,7 +58,8 @@ class MaterialManager:
     def __init__(self, project_root: Path):
         self.project_root = Path(project_root)
         self.materials_root = self.project_root / "source_materials"
-        self.metadata_file = self.materials_root / "metadata" / "photo_descriptions.yaml"
+        # photo_descriptions.db があればSQLite、なければYAML
+        self.metadata_store = open_metadata_store(self.materials_root / "metadata")
         self.analysis_file = self.materials_root / "analyzed" / "material_analysis.json"
         self.mapping_file = self.materials_root / "analyzed" / "material_mapping.json"
 
@@ -64,7 +70,7 @@ class MaterialManager:
     def load_materials(self) -> List[Material]:
         """素材メタデータを読み込む"""
         # メタデータファイルがある場合は読み込む
-        if self.metadata_file.exists():
+        if self.metadata_store.exists():
             return self._load_from_metadata()
         else:
             # メタデータがない場合はファイルから自動検出
@@ -73,8 +79,7 @@ class MaterialManager:
 
     def _load_from_metadata(self) -> List[Material]:
         """メタデータファイルから素材を読み込む"""
-        with open(self.metadata_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        data = self.metadata_store.load()
 
         self.materials = []
         for photo in data.get('photos', []):
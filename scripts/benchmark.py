@@ -0,0 +1,781 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks
+Synthetic workloads for the analysis, material and storyboard pipelines
+
+Usage:
+    python scripts/benchmark.py visual --images 32
+    python scripts/benchmark.py edges --width 4000 --height 3000
+    python scripts/benchmark.py features --source projects/nanki-shirahama-2024/source_materials/raw
+    python scripts/benchmark.py rescan --images 5000
+    python scripts/benchmark.py metadata --materials 50000
+    python scripts/benchmark.py match --materials 10000 --cuts 200
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _make_images(directory: Path, count: int, width: int, height: int) -> list:
+    """Write synthetic JPEG images (gradients + noise) for benchmarking"""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:height, 0:width]
+    paths = []
+    for i in range(count):
+        base = np.stack([
+            (xx * (i + 1)) % 256,
+            (yy * (i + 2)) % 256,
+            ((xx + yy) // 2) % 256
+        ], axis=-1)
+        noise = rng.integers(0, 12, size=(height, width, 3))
+        pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+        path = directory / f"bench_{i:04d}.jpg"
+        Image.fromarray(pixels).save(path, quality=90)
+        paths.append(str(path))
+    return paths
+
+
+def bench_visual(args):
+    """VisualAnalyzer.analyze_many scaling across process pool sizes"""
+    from core.analysis import VisualAnalyzer
+
+    analyzer = VisualAnalyzer()
+    analyzer.use_gemini = False  # local analysis only
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({w for w in (1, 2, 4, 8, 16, 32) if w <= cpu_count} | {cpu_count})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_images(Path(tmp), args.images, args.width, args.height)
+
+        print(f"VisualAnalyzer.analyze_many: {args.images} images "
+              f"({args.width}x{args.height}), {cpu_count} cores")
+        print(f"{'workers':>8} {'seconds':>9} {'img/s':>8} {'speedup':>8} {'efficiency':>11}")
+
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            results = list(analyzer.analyze_many(paths, max_workers=workers))
+            elapsed = time.perf_counter() - start
+            assert len(results) == len(paths)
+
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {len(paths) / elapsed:>8.1f} "
+                  f"{speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+
+def bench_features(args):
+    """Per-image cost of the cheap local style features (mood, lighting, depth, contrast, saturation)"""
+    import numpy as np
+    from core.analysis import VisualAnalyzer
+
+    analyzer = VisualAnalyzer()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.source:
+            paths = sorted(str(p) for p in Path(args.source).rglob('*')
+                           if p.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+        else:
+            paths = _make_images(Path(tmp), args.images, args.width, args.height)
+
+        timings = []
+        for path in paths:
+            start = time.perf_counter()
+            pixels = np.asarray(analyzer._downsample(path))
+            analyzer._analyze_mood(pixels)
+            analyzer._detect_lighting(pixels)
+            analyzer._analyze_depth(pixels)
+            analyzer._analyze_contrast(pixels)
+            analyzer._analyze_saturation(pixels)
+            timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    source = args.source or f"synthetic {args.width}x{args.height} JPEG"
+    print(f"Local style features: {len(timings)} images ({source})")
+    print(f"  median: {timings[len(timings) // 2] * 1000:.1f} ms/image")
+    print(f"  max:    {timings[-1] * 1000:.1f} ms/image")
+
+
+def _measure(fn, repeats: int = 3):
+    """Best wall time (seconds) and peak traced allocation (bytes) of fn()"""
+    import tracemalloc
+
+    best = float('inf')
+    peak = 0
+    for _ in range(repeats):
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best, peak
+
+
+def bench_edges(args):
+    """Edge detection: integer separable Sobel engine vs full-resolution scipy Sobel"""
+    import numpy as np
+    from core.analysis.edge_detector import downsample_luminance, edge_mask
+
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8)
+    megapixels = args.width * args.height / 1e6
+
+    def engine():
+        return edge_mask(downsample_luminance(pixels))
+
+    candidates = [('separable int16 (downsampled)', engine)]
+
+    try:
+        from scipy import ndimage
+
+        def scipy_sobel():
+            gray = pixels.mean(axis=2)
+            sx = ndimage.sobel(gray, axis=0, mode='constant')
+            sy = ndimage.sobel(gray, axis=1, mode='constant')
+            edges = np.hypot(sx, sy)
+            return edges > np.mean(edges)
+
+        candidates.append(('scipy float64 (full resolution)', scipy_sobel))
+    except ImportError:
+        print("scipy not installed: skipping full-resolution baseline")
+
+    print(f"Edge detection on {args.width}x{args.height} ({megapixels:.1f} MP)")
+    print(f"{'engine':<32} {'ms/MP':>8} {'peak MiB/MP':>12}")
+    for name, fn in candidates:
+        seconds, peak = _measure(fn)
+        print(f"{name:<32} {seconds * 1000 / megapixels:>8.2f} "
+              f"{peak / 2 ** 20 / megapixels:>12.2f}")
+
+
+def bench_rescan(args):
+    """Incremental material rescan of an unchanged (or slightly changed) library"""
+    import contextlib
+    import io
+    from tools.material_system import MaterialConfig, MaterialSystem
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        raw = root / "source_materials" / "raw" / "bench"
+        raw.mkdir(parents=True)
+        _make_images(raw, 1, args.width, args.height)
+        template = (raw / "bench_0000.jpg").read_bytes()
+        for i in range(1, args.images):
+            # Distinct contents so every file gets its own hash
+            (raw / f"bench_{i:04d}.jpg").write_bytes(template + i.to_bytes(4, 'big'))
+
+        config = MaterialConfig(
+            project_root=root,
+            project_type='custom',
+            categories=['bench'],
+            usage_requirements={},
+            constraints={},
+            scoring_weights=MaterialConfig._default_weights()
+        )
+
+        def load(rescan: bool) -> float:
+            with contextlib.redirect_stdout(io.StringIO()):
+                system = MaterialSystem(config)
+                system.analyzer.use_gemini = False
+                start = time.perf_counter()
+                system.load_materials(rescan=rescan)
+            return time.perf_counter() - start
+
+        print(f"Material scan: {args.images} images ({args.width}x{args.height})")
+        print(f"  initial scan:          {load(rescan=False):.2f} s")
+        print(f"  rescan (unchanged):    {load(rescan=True):.2f} s")
+
+        for i in range(0, args.images, max(1, args.images // args.changed)):
+            (raw / f"bench_{i:04d}.jpg").write_bytes(template + b'changed' + i.to_bytes(4, 'big'))
+        print(f"  rescan ({args.changed} changed): {load(rescan=True):.2f} s")
+
+
+def _make_material_records(count: int) -> list:
+    """Synthetic photo metadata records shaped like MaterialAnalyzer output"""
+    categories = ['beach', 'nature', 'attractions', 'culture']
+    records = []
+    for i in range(count):
+        category = categories[i % len(categories)]
+        records.append({
+            'id': f"{category}_photo{i:06d}",
+            'filename': f"photo{i:06d}.jpg",
+            'path': f"source_materials/raw/{category}/photo{i:06d}.jpg",
+            'category': category,
+            'width': 4000,
+            'height': 3000,
+            'file_size': 3_000_000 + i,
+            'description': f"白良浜の景色 {i}: white sand beach and emerald sea under a clear sky",
+            'main_subject': 'beach',
+            'location': '白良浜',
+            'time_of_day': 'afternoon',
+            'weather': 'sunny',
+            'color_tone': 'blue_white',
+            'composition': 'rule_of_thirds',
+            'quality_score': 0.8,
+            'mtime': 1700000000.0 + i,
+            'content_hash': f"{i:064x}",
+            'phash': f"{i:016x}",
+        })
+    return records
+
+
+def bench_metadata(args):
+    """Metadata backends: full load into Material objects and single-record update"""
+    from tools.material_system import Material
+    from tools.metadata_store import SQLiteMetadataStore, YamlMetadataStore
+
+    records = _make_material_records(args.materials)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        stores = [('sqlite', SQLiteMetadataStore(root / "photo_descriptions.db"))]
+        if not args.skip_yaml:
+            stores.append(('yaml', YamlMetadataStore(root / "photo_descriptions.yaml")))
+
+        print(f"Metadata store: {args.materials} materials")
+        print(f"{'backend':<8} {'save s':>8} {'load s':>8} {'update ms':>10}")
+        for name, store in stores:
+            start = time.perf_counter()
+            store.save(records, {'project_type': 'tourism'})
+            saved = time.perf_counter() - start
+
+            start = time.perf_counter()
+            materials = [Material.from_dict(item, root) for item in store.load()['photos']]
+            loaded = time.perf_counter() - start
+            assert len(materials) == args.materials
+
+            updated = dict(records[args.materials // 2], description='updated')
+            start = time.perf_counter()
+            store.upsert([updated])
+            update = time.perf_counter() - start
+
+            print(f"{name:<8} {saved:>8.2f} {loaded:>8.2f} {update * 1000:>10.1f}")
+
+
+def _make_cuts(count: int) -> list:
+    """Synthetic storyboard cuts"""
+    import random
+
+    rng = random.Random(0)
+    scenes = [
+        '白良浜 white sand beach with emerald sea',
+        'sunset over engetsu island arch',
+        'hot spring bath by the ocean at dusk',
+        'rocky cliffs of sandanbeki with crashing waves',
+        'kumano kodo forest trail in the morning mist',
+    ]
+    moods = ['hopeful', 'peaceful', 'romantic', 'nostalgic', 'energetic']
+    categories = ['beach', 'nature', 'attractions', 'culture']
+    return [
+        {
+            'cut_number': i + 1,
+            'scene_description': f"{rng.choice(scenes)} {rng.randrange(50)}",
+            'categories': [rng.choice(categories)],
+            'time_of_day': rng.choice(['afternoon', 'evening', 'morning']),
+            'mood': rng.choice(moods),
+        }
+        for i in range(count)
+    ]
+
+
+def _make_match_fixture(material_count: int, cut_count: int):
+    """Synthetic materials with varied descriptions, cuts and a tourism config"""
+    import contextlib
+    import io
+    import random
+    from tools.material_system import Material, MaterialConfig
+
+    words = ('white sand beach emerald sea engetsu island arch sunset hot spring ocean '
+             'rocky cliffs waves forest trail morning mist shrine festival lantern').split()
+    rng = random.Random(0)
+    records = _make_material_records(material_count)
+    for record in records:
+        record['description'] = ' '.join(rng.choices(words, k=12))
+    materials = [Material.from_dict(record, Path('.')) for record in records]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        config = MaterialConfig(
+            project_root=Path('.'),
+            project_type='tourism',
+            categories=[],
+            usage_requirements={},
+            constraints={},
+            scoring_weights=MaterialConfig._default_weights()
+        )
+    return materials, _make_cuts(cut_count), config
+
+
+def bench_match(args):
+    """MaterialMatcher keyword scoring: token inverted index vs per-pair comparison"""
+    from tools.material_matcher import MaterialMatcher
+
+    materials, cuts, config = _make_match_fixture(args.materials, args.cuts)
+    matcher = MaterialMatcher(config)
+
+    def legacy_keyword_scores():
+        # Per-pair reference: tokenize the scene and each material for every pair
+        totals = []
+        for cut in cuts:
+            scene_desc = cut['scene_description'].lower()
+            for material in materials:
+                keywords = set(matcher.tokenizer.tokenize(scene_desc))
+                text = f"{material.description} {material.main_subject} {material.location or ''}"
+                tokens = set(matcher.tokenizer.tokenize(text))
+                totals.append(len(keywords & tokens))
+        return totals
+
+    print(f"Keyword scoring: {args.materials} materials x {args.cuts} cuts")
+    start = time.perf_counter()
+    legacy = legacy_keyword_scores()
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher.index_materials(materials)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sparse = [matcher.keyword_matches(cut['scene_description'].lower()) for cut in cuts]
+    query_time = time.perf_counter() - start
+
+    indexed = [matches.get(material.id, 0) for matches in sparse for material in materials]
+    assert indexed == legacy, "Indexed scores must match the per-pair comparison"
+
+    start = time.perf_counter()
+    for cut in cuts:
+        for material in materials:
+            matcher.score_material(material, cut)
+    full_time = time.perf_counter() - start
+
+    print(f"  per-pair comparison:   {legacy_time:.2f} s")
+    print(f"  index build:           {build_time:.2f} s")
+    print(f"  sparse accumulation:   {query_time:.2f} s  "
+          f"({legacy_time / (build_time + query_time):.1f}x incl. build)")
+    print(f"  full score_material:   {full_time:.2f} s")
+
+
+def bench_scores(args):
+    """Cut x material scoring: per-pair loop vs vectorized score matrix"""
+    import numpy as np
+    from tools.material_matcher import MaterialMatcher
+    from tools.matching_strategies import TourismMatchingStrategy
+
+    materials, cuts, config = _make_match_fixture(args.materials, args.cuts)
+    matcher = MaterialMatcher(config)
+    matcher.index_materials(materials)
+    strategy = TourismMatchingStrategy(config)
+
+    def tourism_bonus(material, cut):
+        # Previous per-pair closure of TourismMatchingStrategy
+        bonus = 0.0
+        if material.location and len(material.location) > 0:
+            bonus += 10.0
+        if material.weather and material.weather.lower() in ['sunny', 'clear']:
+            bonus += 5.0
+        if material.time_of_day and material.time_of_day.lower() in ['golden_hour', 'blue_hour']:
+            bonus += 5.0
+        if material.location and material.location.lower() in cut.get('scene_description', '').lower():
+            bonus += 15.0
+        return bonus
+
+    print(f"Tourism scoring: {args.materials} materials x {args.cuts} cuts, top {args.k}")
+    start = time.perf_counter()
+    loop_scores = np.array([
+        [matcher.score_material(material, cut) + tourism_bonus(material, cut) for material in materials]
+        for cut in cuts
+    ])
+    loop_best = [
+        sorted((score for material, score in zip(materials, row) if material.category in cut['categories']),
+               reverse=True)[:args.k]
+        for cut, row in zip(cuts, loop_scores)
+    ]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = matcher.score_matrix(cuts, bonus_terms=strategy.bonus_terms)
+    matrix_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = strategy.top_k_matches(cuts, None, matcher, k=args.k)
+    top_time = time.perf_counter() - start
+
+    assert np.array_equal(scores, loop_scores), "Score matrix must equal the per-pair scores"
+    assert [[score for _, score in row] for row in top] == loop_best
+
+    print(f"  per-pair loop + sort:  {loop_time:.2f} s")
+    print(f"  score matrix:          {matrix_time:.2f} s  ({loop_time / matrix_time:.1f}x)")
+    print(f"  top-k (mask + argpartition): {top_time:.2f} s")
+
+
+def bench_best(args):
+    """Best material per cut: scoring every candidate vs pruned top-k"""
+    import dataclasses
+    from tools.material_matcher import MaterialMatcher
+    from tools.matching_strategies import CompetitionMatchingStrategy, TourismMatchingStrategy
+
+    print(f"Best match for {args.cuts} cuts")
+    print(f"  {'strategy':<12} {'materials':>9}  {'all candidates':>14}  {'pruned':>8}  speedup")
+    for count in args.materials:
+        materials, cuts, config = _make_match_fixture(count, args.cuts)
+        config = dataclasses.replace(config, usage_requirements={'allow_reuse': True})
+        for i, material in enumerate(materials):
+            material.location = ['白良浜', '円月島', None][i % 3]
+
+        for strategy_class in (TourismMatchingStrategy, CompetitionMatchingStrategy):
+            matcher = MaterialMatcher(config)
+            matcher.index_materials(materials)
+            strategy = strategy_class(config)
+
+            start = time.perf_counter()
+            full = []
+            for cut in cuts:
+                best = strategy._score_and_select(matcher.find_candidates(cut, materials), cut, matcher)
+                full.append((best.id, best.match_score))
+            full_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            pruned = []
+            for cut in cuts:
+                best = strategy.find_best_match(cut, materials, matcher)
+                pruned.append((best.id, best.match_score))
+            pruned_time = time.perf_counter() - start
+
+            assert pruned == full, "Pruned top-k must pick the same material and score"
+            name = strategy_class.__name__.replace('MatchingStrategy', '')
+            print(f"  {name:<12} {count:>9}  {full_time:13.2f}s  {pruned_time:7.2f}s  "
+                  f"{full_time / pruned_time:6.1f}x")
+
+
+def bench_assign(args):
+    """Material assignment across a batch: greedy per cut vs global optimum"""
+    import contextlib
+    import io
+    import dataclasses
+    from tools.material_system import MaterialSystem
+
+    materials, cuts, config = _make_match_fixture(args.materials, args.cuts)
+    categories = sorted({m.category for m in materials})
+    quota = args.cuts // len(categories)
+    variants = [
+        ('greedy', 'greedy', {}),
+        ('global', 'global', {}),
+        ('global + quotas', 'global', {
+            'minimum_usage_rate': min(1.0, args.cuts / len(materials)),
+            'category_quotas': {category: f"{quota - 5}-{quota + 5}" for category in categories},
+        }),
+    ]
+
+    print(f"Assignment: {args.materials} materials x {args.cuts} cuts (no reuse)")
+    for label, method, usage_requirements in variants:
+        with contextlib.redirect_stdout(io.StringIO()):
+            system = MaterialSystem(dataclasses.replace(config, usage_requirements=usage_requirements))
+            system.materials = [dataclasses.replace(m, assigned_to=None) for m in materials]
+            system.matcher.index_materials(system.materials)
+
+            start = time.perf_counter()
+            mapped = system.map_to_storyboard({'cuts': [dict(cut) for cut in cuts]}, method=method)
+            elapsed = time.perf_counter() - start
+
+        assigned = [cut['source_material'] for cut in mapped['cuts'] if 'source_material' in cut]
+        total = sum(material['confidence'] for material in assigned)
+        print(f"  {label:<16} {elapsed:6.2f} s  assigned {len(assigned)}/{len(cuts)}  "
+              f"total score {total:.1f}")
+
+
+def _legacy_research_bonus(db, material, cut):
+    """ResearchAwareStrategy._research_bonus before per-cut memoization (tokenizing per pair)"""
+    bonus = 0.0
+    scene_desc = cut.get('scene_description', '').lower()
+    mood = cut.get('mood', '')
+    time_of_day = cut.get('time_of_day', '')
+
+    if material.location:
+        location = db.get_location_by_name(material.location)
+        if location:
+            scene_terms = set(db.tokenizer.tokenize(scene_desc))
+            for word in db.tokenizer.tokenize(location.core_narrative):
+                if word in scene_terms:
+                    bonus += 8.0
+            for word in db.tokenizer.tokenize(location.storytelling_theme):
+                if word in scene_terms:
+                    bonus += 6.0
+            visual_primary = location.visual_elements.get('primary', '')
+            if visual_primary:
+                bonus += sum(1 for w in db.tokenizer.tokenize(visual_primary) if w in scene_terms) * 4.0
+            best_time = location.filming_tips.get('best_time', '')
+            if isinstance(best_time, str) and time_of_day:
+                if time_of_day.lower() in best_time.lower():
+                    bonus += 12.0
+            priority_locations = [p['location'] for p in db.get_filming_priority_locations()]
+            if location.name in priority_locations:
+                bonus += 10.0
+
+    suggested = db.suggest_locations_for_scene(scene_description=scene_desc, mood=mood, time_of_day=time_of_day)
+    if material.location and suggested:
+        suggested_names = [loc.name for loc in suggested[:3]]
+        if material.location in suggested_names:
+            bonus += 20.0 / (suggested_names.index(material.location) + 1)
+    return bonus
+
+
+def _make_research_db(directory: Path, copies: int):
+    """Shirahama research database with every location repeated `copies` times"""
+    import yaml
+    from tools.research_loader import ResearchDatabase
+
+    source = Path(__file__).parent.parent / "projects" / "nanki-shirahama-2024" / "data" / "shirahama-locations-database.yaml"
+    with open(source, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+
+    base = data['locations']
+    data['locations'] = [
+        {**location, 'id': f"{location['id']}_{i}", 'name': location['name'] if i == 0 else f"{location['name']}{i}"}
+        for i in range(copies) for location in base
+    ]
+    path = directory / f"research_{copies}.yaml"
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, allow_unicode=True)
+    return ResearchDatabase(path)
+
+
+def bench_research(args):
+    """ResearchAwareStrategy research bonus: per pair vs per-cut tables"""
+    import contextlib
+    import io
+    import random
+    import tempfile
+    from tools.research_aware_strategy import ResearchAwareStrategy
+
+    base_materials, base_cuts, config = _make_match_fixture(max(args.materials), args.cuts)
+    scenes = ['白良浜の白い砂浜と青い海', '円月島に沈む夕日 sunset', '崎の湯 露天風呂 早朝の波',
+              '三段壁の断崖と荒波', '熊野古道の森 午前中の木漏れ日', '千畳敷 日没時の地層']
+    rng = random.Random(1)
+    for cut in base_cuts:
+        cut['scene_description'] = rng.choice(scenes)
+
+    print(f"Research bonus for {args.cuts} cuts")
+    print(f"  {'locations':>9} {'materials':>9}  {'per pair':>9}  {'per cut':>8}  speedup")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.location_copies:
+            with contextlib.redirect_stdout(io.StringIO()):
+                db = _make_research_db(Path(tmp), copies)
+            names = [location.name for location in db.locations.values()]
+            for count in args.materials:
+                materials = base_materials[:count]
+                for i, material in enumerate(materials):
+                    material.location = names[i % len(names)]
+
+                start = time.perf_counter()
+                legacy = [_legacy_research_bonus(db, m, cut) for cut in base_cuts for m in materials]
+                legacy_time = time.perf_counter() - start
+
+                with contextlib.redirect_stdout(io.StringIO()):
+                    strategy = ResearchAwareStrategy(config)
+                strategy.research_db = db
+                start = time.perf_counter()
+                memoized = [strategy._research_bonus(m, cut) for cut in base_cuts for m in materials]
+                memo_time = time.perf_counter() - start
+
+                assert memoized == legacy, "Per-cut tables must give the per-pair bonus"
+                print(f"  {len(names):>9} {count:>9}  {legacy_time:8.2f}s  {memo_time:7.3f}s  "
+                      f"{legacy_time / memo_time:6.0f}x")
+
+
+def _legacy_suggest(db, scene_description, mood=None, time_of_day=None):
+    """ResearchDatabase.suggest_locations_for_scene before load-time indexes (tokenizing per location)"""
+    desc_lower = scene_description.lower()
+    scene_terms = set(db.tokenizer.tokenize(scene_description))
+    scored = []
+    for location in db.locations.values():
+        score = 0.0
+        if location.name.lower() in desc_lower:
+            score += 20.0
+        for word in db.tokenizer.tokenize(location.core_narrative):
+            if word in scene_terms:
+                score += 5.0
+        for word in db.tokenizer.tokenize(' '.join(location.key_features)):
+            if word in scene_terms:
+                score += 3.0
+        if mood and mood.lower() in db.MOOD_KEYWORDS:
+            theme_text = f"{location.storytelling_theme} {location.core_narrative}".lower()
+            for keyword in db.MOOD_KEYWORDS[mood.lower()]:
+                if keyword in theme_text:
+                    score += 10.0
+                    break
+        best_time = location.filming_tips.get('best_time', '')
+        if time_of_day and isinstance(best_time, str) and time_of_day.lower() in best_time.lower():
+            score += 8.0
+        if score > 0:
+            scored.append((score, location))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [loc for score, loc in scored]
+
+
+def bench_research_db(args):
+    """ResearchDatabase queries: linear scans vs load-time indexes"""
+    import contextlib
+    import io
+    import tempfile
+
+    queries = [
+        ('円月島に沈む夕日', 'romantic', None),
+        ('白良浜の白い砂浜と日本最古級の露天風呂', None, '日中'),
+        ('熊野古道・富田坂 森林の木漏れ日', 'spiritual', '午前中'),
+        ('三段壁の断崖に打ち寄せる波', 'natural', None),
+    ] * (args.queries // 4)
+
+    print(f"ResearchDatabase: {len(queries)} suggestion queries, {len(queries)} name lookups")
+    print(f"  {'locations':>9}  {'index build':>11}  {'scan':>8}  {'indexed':>8}  speedup")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.location_copies:
+            with contextlib.redirect_stdout(io.StringIO()):
+                db = _make_research_db(Path(tmp), copies)
+            names = [location.name for location in db.locations.values()]
+
+            start = time.perf_counter()
+            db._build_indexes()
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            legacy = [_legacy_suggest(db, *query) for query in queries]
+            legacy_lookups = [next((loc for loc in db.locations.values() if loc.name == name), None)
+                              for name in names[-len(queries):]]
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            indexed = [db.suggest_locations_for_scene(*query) for query in queries]
+            lookups = [db.get_location_by_name(name) for name in names[-len(queries):]]
+            indexed_time = time.perf_counter() - start
+
+            assert indexed == legacy and lookups == legacy_lookups
+            print(f"  {len(names):>9}  {build_time:10.3f}s  {legacy_time:7.3f}s  {indexed_time:7.3f}s  "
+                  f"{legacy_time / indexed_time:6.1f}x")
+
+
+def bench_research_load(args):
+    """ResearchDatabase startup: pure-Python YAML vs libyaml vs snapshot"""
+    import contextlib
+    import io
+    import tempfile
+    import yaml
+    from tools.research_loader import ResearchDatabase
+
+    def best_of(fn):
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def parse(loader):
+        with open(path, 'r', encoding='utf-8') as f:
+            yaml.load(f, Loader=loader)
+
+    print(f"ResearchDatabase startup (best of {args.repeats})")
+    print(f"  {'locations':>9}  {'SafeLoader':>10}  {'CSafeLoader':>11}  {'full build':>10}  {'snapshot':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.location_copies:
+            with contextlib.redirect_stdout(io.StringIO()):
+                db = _make_research_db(Path(tmp), copies)
+            path = db.yaml_path
+
+            pure_time = best_of(lambda: parse(yaml.SafeLoader))
+            c_time = best_of(lambda: parse(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)))
+            build_time = best_of(lambda: ResearchDatabase(path, use_snapshot=False))
+            snapshot_time = best_of(lambda: ResearchDatabase(path))
+
+            print(f"  {len(db.locations):>9}  {pure_time:9.3f}s  {c_time:10.3f}s  "
+                  f"{build_time:9.3f}s  {snapshot_time:8.4f}s")
+
+
+def main():
+    """Main CLI entry point"""
+    parser = argparse.ArgumentParser(description='Performance benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    visual = subparsers.add_parser('visual', help='VisualAnalyzer batch scaling')
+    visual.add_argument('--images', type=int, default=32, help='Number of synthetic images')
+    visual.add_argument('--width', type=int, default=1280, help='Image width')
+    visual.add_argument('--height', type=int, default=720, help='Image height')
+    visual.set_defaults(func=bench_visual)
+
+    features = subparsers.add_parser('features', help='Per-image cost of local style features')
+    features.add_argument('--images', type=int, default=8, help='Number of synthetic images')
+    features.add_argument('--width', type=int, default=4000, help='Image width')
+    features.add_argument('--height', type=int, default=3000, help='Image height')
+    features.add_argument('--source', help='Directory of real images to use instead of synthetic ones')
+    features.set_defaults(func=bench_features)
+
+    edges = subparsers.add_parser('edges', help='Edge detector time and memory per megapixel')
+    edges.add_argument('--width', type=int, default=4000, help='Image width')
+    edges.add_argument('--height', type=int, default=3000, help='Image height')
+    edges.set_defaults(func=bench_edges)
+
+    rescan = subparsers.add_parser('rescan', help='Incremental material rescan')
+    rescan.add_argument('--images', type=int, default=1000, help='Number of synthetic images')
+    rescan.add_argument('--changed', type=int, default=10, help='Files modified before the second rescan')
+    rescan.add_argument('--width', type=int, default=640, help='Image width')
+    rescan.add_argument('--height', type=int, default=480, help='Image height')
+    rescan.set_defaults(func=bench_rescan)
+
+    metadata = subparsers.add_parser('metadata', help='Metadata backend load/update time')
+    metadata.add_argument('--materials', type=int, default=50000, help='Number of material records')
+    metadata.add_argument('--skip-yaml', action='store_true', help='Only benchmark the SQLite backend')
+    metadata.set_defaults(func=bench_metadata)
+
+    match = subparsers.add_parser('match', help='MaterialMatcher keyword scoring')
+    match.add_argument('--materials', type=int, default=10000, help='Number of materials')
+    match.add_argument('--cuts', type=int, default=200, help='Number of cuts')
+    match.set_defaults(func=bench_match)
+
+    scores = subparsers.add_parser('scores', help='Vectorized cut x material score matrix')
+    scores.add_argument('--materials', type=int, default=10000, help='Number of materials')
+    scores.add_argument('--cuts', type=int, default=200, help='Number of cuts')
+    scores.add_argument('--k', type=int, default=5, help='Candidates per cut')
+    scores.set_defaults(func=bench_scores)
+
+    best = subparsers.add_parser('best', help='Best match per cut with pruned top-k')
+    best.add_argument('--materials', type=int, nargs='+', default=[1000, 10000, 50000], help='Material counts')
+    best.add_argument('--cuts', type=int, default=200, help='Number of cuts')
+    best.set_defaults(func=bench_best)
+
+    assign = subparsers.add_parser('assign', help='Greedy vs global material assignment')
+    assign.add_argument('--materials', type=int, default=5000, help='Number of materials')
+    assign.add_argument('--cuts', type=int, default=2000, help='Number of cuts across the batch')
+    assign.set_defaults(func=bench_assign)
+
+    research = subparsers.add_parser('research', help='ResearchAwareStrategy research bonus scaling')
+    research.add_argument('--cuts', type=int, default=50, help='Number of cuts')
+    research.add_argument('--materials', type=int, nargs='+', default=[100, 400], help='Material counts')
+    research.add_argument('--location-copies', type=int, nargs='+', default=[1, 4],
+                          help='Repeat the research locations to scale the database')
+    research.set_defaults(func=bench_research)
+
+    research_db = subparsers.add_parser('research-db', help='ResearchDatabase query time vs database size')
+    research_db.add_argument('--queries', type=int, default=200, help='Number of suggestion queries')
+    research_db.add_argument('--location-copies', type=int, nargs='+', default=[1, 10, 100],
+                             help='Repeat the research locations to scale the database')
+    research_db.set_defaults(func=bench_research_db)
+
+    research_load = subparsers.add_parser('research-load', help='ResearchDatabase startup time')
+    research_load.add_argument('--location-copies', type=int, nargs='+', default=[1, 100, 1000],
+                               help='Repeat the research locations to scale the database')
+    research_load.add_argument('--repeats', type=int, default=3, help='Repetitions per measurement')
+    research_load.set_defaults(func=bench_research_load)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ python scripts/generate_enhanced_storyboard.py --story "白浜の魅力を紹介
 """
 
 import argparse
+import logging
 import os
 import sys
 import json
@@ -22,7 +23,7 @@ from core.video.enhanced_storyboard_generator import (
     VideoGenre, 
     AspectRatio
 )
-from core.base import GeneratorConfig
+from core.base import GeneratorConfig, configure_logging
 
 
 def create_enhanced_config(args):
@@ -44,6 +45,7 @@ def create_enhanced_config(args):
         'empathy_enhancement': args.empathy,
         'three_layer_stimulation': args.stimulation,
         'vertical_optimization': args.vertical,
+        'seed': args.seed,
         'title': base_config.title,
         'duration': base_config.duration,
         'num_cuts': base_config.num_cuts,
@@ -185,6 +187,8 @@ Examples:
                        help='Enable empathy enhancement features (default: enabled)')
     parser.add_argument('--stimulation', action='store_true', default=True,
                        help='Enable 3-layer stimulation system (default: enabled)')
+    parser.add_argument('--seed', type=int,
+                       help='Variation seed (default: derived from the story and settings, so reruns are identical)')
     
     # その他
     parser.add_argument('--audience', default='general', help='Target audience (default: general)')
@@ -198,6 +202,7 @@ Examples:
                        help='Disable 3-layer stimulation')
     
     args = parser.parse_args()
+    configure_logging(logging.DEBUG)
     
     try:
         output_path = generate_storyboard(args)
@@ -8,6 +8,7 @@ python scripts/generate_skills_storyboard.py --project nanki-shirahama-2024 --st
 """
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -15,6 +16,8 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from core.base import configure_logging
+
 try:
     from core.video.claude_skills_enhanced_generator import CloudeSkillsEnhancedGenerator
     SKILLS_AVAILABLE = True
@@ -61,6 +64,7 @@ Claude Skills統合例:
                        help='Show Claude Skills integration information')
     
     args = parser.parse_args()
+    configure_logging(logging.DEBUG)
     
     if args.skills_info:
         show_skills_info()
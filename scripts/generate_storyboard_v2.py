@@ -5,6 +5,7 @@ Complete workflow using the new modular architecture
 """
 import sys
 import argparse
+import logging
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -16,7 +17,7 @@ try:
 except ImportError:
     pass
 
-from core.base import GeneratorConfig
+from core.base import GeneratorConfig, configure_logging
 from core.video import CoreStoryboardGenerator, ImageGenerator
 from core.analysis import VisualAnalyzer
 from core.music import MusicGenerator
@@ -43,8 +44,13 @@ def main():
     parser.add_argument('--narration-language', default='ja', help='Narration language (ja, en)')
     parser.add_argument('--no-auto-naming', action='store_true', help='Disable automatic timestamped naming')
     parser.add_argument('--overwrite', action='store_true', help='Allow overwriting existing directory')
+    parser.add_argument('--workers', type=int, default=4, help='Worker threads shared by pipeline stages (default: 4)')
+    parser.add_argument('--stream', action='store_true', help='Stream each cut through all stages as soon as it is created')
+    parser.add_argument('--quiet', action='store_true', help='Only show stage summaries (no per-cut progress)')
+    parser.add_argument('--log-json', help='Also write structured logs (JSON Lines) to this file')
 
     args = parser.parse_args()
+    configure_logging(logging.INFO if args.quiet else logging.DEBUG, json_path=args.log_json)
 
     # Create configuration
     config = GeneratorConfig(
@@ -94,7 +100,7 @@ def main():
         print(f"  ✓ Colors: {', '.join(visual_analysis['colors'][:3])}")
         print(f"  ✓ Mood: {visual_analysis['mood']}")
 
-    # Step 2: Generate storyboard
+    # Step 2: Build the stage graph (storyboard → images / narration → music plan → save)
     generator = CoreStoryboardGenerator(config)
 
     input_data = {
@@ -104,39 +110,39 @@ def main():
         'visual_analysis': visual_analysis
     }
 
-    storyboard = generator.generate_storyboard(input_data)
-
-    # Step 3: Generate images if requested
-    if config.generate_images:
-        print("\n🎨 Generating images with Imagen 3...")
-        image_gen = ImageGenerator()
-        image_gen.generate_images(storyboard.cuts, config.output_dir)
-
-        # Capture image generation errors
-        error_summary = image_gen.get_error_summary()
-        if error_summary['has_errors']:
-            storyboard.image_generation_errors = error_summary
-            print(f"\n⚠️  Image generation: {error_summary['total_generated']} succeeded, {error_summary['total_failed']} failed")
-
-    # Step 4: Generate narrations if requested
-    if config.generate_narrations:
-        narration_gen = NarrationGenerator()
-        storyboard.cuts = narration_gen.generate_narrations_for_storyboard(
-            storyboard.cuts,
-            args.story,
-            config.narration_style
+    generators = {
+        'image_generator': ImageGenerator() if config.generate_images else None,
+        'narration_generator': NarrationGenerator() if config.generate_narrations else None,
+        'music_generator': MusicGenerator() if config.generate_music else None,
+    }
+
+    if args.stream:
+        # Step 3: Stream cuts (each cut flows through all stages independently)
+        storyboard, report = generator.generate_storyboard_streaming(
+            input_data,
+            output_dir=config.output_dir,
+            workers=args.workers,
+            **generators
+        )
+    else:
+        pipeline = generator.build_pipeline(
+            input_data,
+            output_dir=config.output_dir,
+            max_workers=args.workers,
+            **generators
         )
 
-    # Step 5: Generate music prompts if requested
-    if config.generate_music:
-        print("\n🎵 Generating BGM prompts...")
-        music_gen = MusicGenerator()
-        music_plan = music_gen.generate_music_plan(storyboard.to_dict())
-        storyboard.music_sections = music_plan['sections']
-        print(f"  ✓ Created {len(music_plan['sections'])} music sections")
+        # Step 3: Run stages (independent stages overlap)
+        context = {}
+        report = pipeline.run(context)
+        storyboard = context['storyboard']
 
-    # Step 6: Save results
-    generator.save_storyboard(storyboard, config.output_dir)
+    if storyboard.image_generation_errors:
+        errors = storyboard.image_generation_errors
+        print(f"\n⚠️  Image generation: {errors['total_generated']} succeeded, {errors['total_failed']} failed")
+
+    print()
+    print(report.format())
 
     print("\n" + "=" * 60)
     print("✅ Generation Complete!")
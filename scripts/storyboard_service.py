@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Storyboard Generation Service
+Keep warm workers loaded and serve storyboard jobs over HTTP (TCP or Unix socket)
+
+Usage:
+    python scripts/storyboard_service.py --workers 4 --port 8765
+    python scripts/storyboard_service.py --socket /tmp/storyboard.sock
+
+    curl -X POST localhost:8765/jobs -d '{"story": "魔法少女の物語", "cuts": 6, "images": false}'
+    curl localhost:8765/jobs/<job_id>
+    curl 'localhost:8765/jobs/<job_id>/result?wait=60'
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+from core.base import configure_logging
+from core.service import StoryboardService, create_server
+
+
+def main():
+    """Main CLI entry point"""
+    parser = argparse.ArgumentParser(description='Storyboard generation service (warm workers)')
+    parser.add_argument('--workers', type=int, default=2, help='Warm worker threads (default: 2)')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    parser.add_argument('--socket', help='Serve on a Unix socket instead of TCP')
+    parser.add_argument('--requests-per-minute', type=float, help='Image API rate limit shared by all workers')
+    parser.add_argument('--verbose', action='store_true', help='Show per-cut progress of every job')
+    parser.add_argument('--log-json', help='Also write structured logs (JSON Lines) to this file')
+    args = parser.parse_args()
+
+    # 既定ではステージの要約のみ（ジョブごとのカット進捗は出さない）
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO, json_path=args.log_json)
+
+    print("=" * 60)
+    print("🎬 Storyboard Generation Service")
+    print("=" * 60)
+    print(f"⏳ Warming up {args.workers} workers...")
+
+    service = StoryboardService(
+        num_workers=args.workers,
+        requests_per_minute=args.requests_per_minute
+    ).start()
+    server = create_server(service, args.host, args.port, args.socket)
+
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"✅ Listening on {address}")
+    print("   POST /jobs · GET /jobs/<id> · GET /jobs/<id>/result?wait=SECONDS · GET /health")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Shutting down...")
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
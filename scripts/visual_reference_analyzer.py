@@ -5,6 +5,7 @@ Analyzes key visual images to extract style, colors, and mood for consistent vid
 """
 
 import os
+import sys
 import json
 import base64
 from pathlib import Path
@@ -15,6 +16,13 @@ import numpy as np
 from collections import Counter
 import colorsys
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analysis.edge_detector import (
+    downsample_luminance, edge_mask, image_luminance
+)
+
 # Load .env file if present
 try:
     from dotenv import load_dotenv
@@ -102,7 +110,7 @@ class VisualReferenceAnalyzer:
         elements = self._identify_elements(image, image_path)
         texture = self._analyze_texture(image, image_path)
         camera_angle = self._detect_camera_angle(image, image_path)
-        depth = self._analyze_depth(image)
+        depth = self._analyze_depth(image, image_path)
         contrast = self._analyze_contrast(image)
         saturation = self._analyze_saturation(image)
         
@@ -382,11 +390,10 @@ class VisualReferenceAnalyzer:
         
         return "eye level"
     
-    def _analyze_depth(self, image: Image.Image) -> str:
+    def _analyze_depth(self, image: Image.Image, image_path: str) -> str:
         """Analyze depth of field"""
-        # Simple edge detection to estimate depth
-        img_array = np.array(image.convert('L'))
-        edges = self._detect_edges(img_array)
+        # Edge density on downsampled luminance (decoded from the file, so `image` is not modified)
+        edges = edge_mask(image_luminance(image_path))
         
         edge_density = np.sum(edges) / edges.size
         
@@ -429,18 +436,8 @@ class VisualReferenceAnalyzer:
             return "medium saturation"
     
     def _detect_edges(self, img_array: np.ndarray) -> np.ndarray:
-        """Simple edge detection"""
-        from scipy import ndimage
-        
-        try:
-            # Sobel edge detection
-            sx = ndimage.sobel(img_array, axis=0, mode='constant')
-            sy = ndimage.sobel(img_array, axis=1, mode='constant')
-            edges = np.hypot(sx, sy)
-            return edges > np.mean(edges)
-        except ImportError:
-            # Fallback simple difference
-            return np.zeros_like(img_array, dtype=bool)
+        """Edge mask from integer Sobel on a downsampled luminance view"""
+        return edge_mask(downsample_luminance(img_array))
     
     def _query_gemini_vision(self, image_path: str, prompt: str) -> Optional[str]:
         """Query Gemini Vision API"""
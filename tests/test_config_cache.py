@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Config Cache
+Parsed configs are shared per path and reloaded only when the file changes
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base import ConfigCache, get_config_cache, thaw
+from tools.material_system import MaterialConfig
+
+
+CONFIG = """
+project:
+  type: tourism
+requirements:
+  materials:
+    categories: [beach, nature]
+    tokenizer: ngram
+"""
+
+
+def test_cache_reuses_views_until_file_changes():
+    """Same view while the mtime is unchanged; edits are picked up; views are read-only"""
+    print("=" * 60)
+    print("Test 1: Config cache keyed on mtime")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.yaml"
+        path.write_text(CONFIG, encoding='utf-8')
+
+        cache = ConfigCache()
+        first = cache.load(path)
+        assert cache.load(str(path)) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        categories = first['requirements']['materials']['categories']
+        assert categories == ('beach', 'nature')
+        try:
+            first['project']['type'] = 'education'
+            assert False, "Cached config must be read-only"
+        except TypeError:
+            pass
+
+        # thaw() は可変のコピー（キャッシュには影響しない）
+        copy = thaw(first)
+        copy['project']['type'] = 'education'
+        copy['requirements']['materials']['categories'].append('culture')
+        assert first['project']['type'] == 'tourism'
+        assert cache.load(path)['requirements']['materials']['categories'] == ('beach', 'nature')
+
+        # ファイルが更新されたら再解析
+        path.write_text(CONFIG.replace('tourism', 'education'), encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert cache.load(path)['project']['type'] == 'education'
+        assert cache.misses == 2
+
+        # トップレベルがマッピングでない設定はエラー
+        bad = Path(tmp) / "bad.yaml"
+        bad.write_text("- a\n- b\n", encoding='utf-8')
+        try:
+            cache.load(bad)
+            assert False, "Non-mapping config must raise"
+        except ValueError:
+            pass
+
+        # MaterialConfig は共有キャッシュを通して1回だけ解析
+        shared = get_config_cache()
+        misses = shared.misses
+        configs = [MaterialConfig.from_yaml(path) for _ in range(3)]
+        assert shared.misses == misses + 1
+        assert configs[0].categories == ['beach', 'nature']
+        configs[0].categories.append('culture')
+        assert configs[1].categories == ['beach', 'nature']
+
+    print("\n✅ Test 1 passed!\n")
+
+
+if __name__ == "__main__":
+    test_cache_reuses_views_until_file_changes()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test Cut Stream
+Per-cut streaming through bounded queues
+"""
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base import CutStream, GeneratorConfig
+from core.video import CoreStoryboardGenerator
+from core.video.subtitle_generator import SubtitleGenerator
+
+
+def test_stream_completes_first_cut_early():
+    """The first cut finishes before the last one is produced; queues bound the cuts in flight"""
+    print("=" * 60)
+    print("Test 1: Streaming with bounded queues")
+    print("=" * 60)
+
+    produced = {}
+    completed = []
+    lock = threading.Lock()
+
+    def source():
+        for i in range(1, 9):
+            time.sleep(0.01)  # 構成生成の遅延
+            produced[i] = time.perf_counter()
+            yield SimpleNamespace(cut_number=i, stages=[])
+
+    def stage(name, delay):
+        def run(cut):
+            time.sleep(delay)
+            cut.stages.append(name)
+        return run
+
+    def on_complete(cut):
+        with lock:
+            completed.append((cut.cut_number, time.perf_counter()))
+
+    stream = (
+        CutStream(queue_size=1)
+        .add_stage('images', stage('images', 0.02), workers=2)
+        .add_stage('voices', stage('voices', 0.01))
+        .add_stage('subtitles', stage('subtitles', 0.0))
+    )
+    report = stream.run(source(), on_complete=on_complete)
+    print(report.format())
+
+    assert sorted(n for n, _ in completed) == list(range(1, 9))
+    assert len(report.cut_times) == 8
+    first_number, first_done = min(completed, key=lambda c: c[1])
+    # 最初のカットは最後のカットの構成より先に完成
+    assert first_done < produced[8]
+    assert report.first_cut_time < report.total_time
+    # 3ステージ × (キュー1 + ワーカー) 程度で頭打ち
+    assert report.peak_in_flight <= 8
+    assert set(report.stage_busy) == {'images', 'voices', 'subtitles'}
+
+    # ステージの例外は送出され、ストリームは詰まらずに終了する
+    def fail(cut):
+        if cut.cut_number == 3:
+            raise RuntimeError("cut 3 failed")
+
+    failing = CutStream(queue_size=1).add_stage('images', fail).add_stage('voices', stage('voices', 0.0))
+    try:
+        failing.run(source())
+        assert False, "Stage error must propagate"
+    except RuntimeError as e:
+        assert 'cut 3' in str(e)
+
+    print("\n✅ Test 1 passed!\n")
+
+
+class FakeNarration:
+    use_claude = True
+
+    def __init__(self):
+        self.analyzed = 0
+
+    def analyze_narration_needs(self, cuts, story_context, style="documentary"):
+        self.analyzed += 1
+        return [cut.cut_number % 2 == 1 for cut in cuts]
+
+    def generate_narration_for_cut(self, cut, story_context, previous_cuts, style, needs_narration=True):
+        assert [c.cut_number for c in previous_cuts] == list(range(1, cut.cut_number))
+        cut.narration_needed = needs_narration
+        if not needs_narration:
+            return None
+        cut.narration_text = f"カット{cut.cut_number}のナレーション。"
+        cut.narration_duration = 2.0
+        return cut.narration_text
+
+
+def test_streaming_storyboard():
+    """generate_storyboard_streaming uses the narration needs analysis and saves the storyboard"""
+    print("=" * 60)
+    print("Test 2: Streaming storyboard generation")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = GeneratorConfig(duration=24, num_cuts=6, output_dir=tmp, auto_naming=False, overwrite=True)
+        generator = CoreStoryboardGenerator(config)
+        narration = FakeNarration()
+        storyboard, report = generator.generate_storyboard_streaming(
+            {'story_description': 'A quiet day at the beach'},
+            narration_generator=narration,
+            subtitle_generator=SubtitleGenerator()
+        )
+        print(report.format())
+
+        assert [cut.cut_number for cut in storyboard.cuts] == list(range(1, 7))
+        # 要否分析はストリーミングなしと同じく1回だけ、その結果どおりにナレーションを付ける
+        assert narration.analyzed == 1
+        assert [bool(cut.narration_text) for cut in storyboard.cuts] == [True, False] * 3
+        assert all(cut.subtitle_lines for cut in storyboard.cuts if cut.narration_text)
+        assert len(report.cut_times) == 6
+        assert (Path(tmp) / 'storyboard.json').exists()
+
+        # ストリーミングなしの生成と同じカット構成
+        plain = CoreStoryboardGenerator(config).generate_storyboard({'story_description': 'A quiet day at the beach'})
+        assert [c.scene_description for c in plain.cuts] == [c.scene_description for c in storyboard.cuts]
+
+        # narrate_all では分析せずに全カットへナレーション
+        narration = FakeNarration()
+        storyboard, _ = generator.generate_storyboard_streaming(
+            {'story_description': 'A quiet day at the beach'},
+            narration_generator=narration,
+            narrate_all=True
+        )
+        assert narration.analyzed == 0
+        assert all(cut.narration_text for cut in storyboard.cuts)
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_voices_do_not_wait_for_images():
+    """Images run as a branch beside narration → voices, so slow images do not hold voices back"""
+    print("=" * 60)
+    print("Test 3: Images in parallel with voices")
+    print("=" * 60)
+
+    events = []
+    lock = threading.Lock()
+
+    class SlowImages:
+        use_gemini = True
+
+        def generate_image(self, cut, frames_dir):
+            time.sleep(0.05)
+            with lock:
+                events.append(('image', cut.cut_number))
+            return {'cut_number': cut.cut_number}
+
+        def record_results(self, results):
+            self.results = results
+
+        def get_error_summary(self):
+            return {'has_errors': False}
+
+    class Voices:
+        def generate_voices_for_cut(self, cut, audio_dir):
+            with lock:
+                events.append(('voice', cut.cut_number))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = GeneratorConfig(duration=16, num_cuts=4, output_dir=tmp, auto_naming=False, overwrite=True)
+        images = SlowImages()
+        storyboard, report = CoreStoryboardGenerator(config).generate_storyboard_streaming(
+            {'story_description': 'A quiet day at the beach'},
+            image_generator=images,
+            narration_generator=FakeNarration(),
+            voice_generator=Voices(),
+            workers=1
+        )
+        print(report.format())
+        print(f"  Order: {events}")
+
+        # 最初の画像より先に音声が進む
+        assert events[0][0] == 'voice'
+        assert sorted(n for kind, n in events if kind == 'voice') == [1, 2, 3, 4]
+        assert [r['cut_number'] for r in images.results] == [1, 2, 3, 4]
+        assert set(report.stage_busy) == {'narration', 'voices', 'images'}
+        assert len(report.cut_times) == 4
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_stream_completes_first_cut_early()
+    test_streaming_storyboard()
+    test_voices_do_not_wait_for_images()
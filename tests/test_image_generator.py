@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test Image Generator
+Shared worker pool and rate limiting across videos (batch mode)
+"""
+import base64
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.video.image_generator as image_generator
+from core.base import RateLimiter
+from core.video import ImageGenerator
+
+
+class _FakeGenai:
+    """Stand-in for google.generativeai: returns one inline image per prompt"""
+
+    def __init__(self, failing_prompts=()):
+        self.failing_prompts = set(failing_prompts)
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def configure(self, api_key):
+        pass
+
+    def GenerativeModel(self, name):
+        return self
+
+    def generate_content(self, content_parts):
+        prompt = content_parts[-1]
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.02)
+            if prompt in self.failing_prompts:
+                raise RuntimeError("429 quota exceeded")
+            data = base64.b64encode(prompt.encode())
+            part = SimpleNamespace(inline_data=SimpleNamespace(data=data))
+            return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class _CountingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(None)
+        self.calls = 0
+        self._count_lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self._count_lock:
+            self.calls += 1
+        return super().acquire()
+
+
+def _cuts(video: str, count: int) -> list:
+    return [
+        SimpleNamespace(cut_number=i, image_prompt=f"{video}-cut{i}", reference_images=[])
+        for i in range(1, count + 1)
+    ]
+
+
+def _generator(limiter) -> ImageGenerator:
+    generator = ImageGenerator(api_key='test', rate_limiter=limiter)
+    generator.use_gemini = True
+    generator.image_model = 'fake'
+    return generator
+
+
+def test_shared_pool_matches_serial():
+    """Videos sharing one pool and limiter produce the same files and error order as serial runs"""
+    print("=" * 60)
+    print("Test 1: Shared image pool across videos")
+    print("=" * 60)
+
+    original = getattr(image_generator, 'genai', None)
+    fake = _FakeGenai(failing_prompts={'b-cut4', 'b-cut2'})
+    image_generator.genai = fake
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            limiter = _CountingLimiter()
+            videos = {'a': _cuts('a', 5), 'b': _cuts('b', 5)}
+            generators = {name: _generator(limiter) for name in videos}
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                with ThreadPoolExecutor(max_workers=2) as video_pool:
+                    futures = [
+                        video_pool.submit(generators[name].generate_images, cuts,
+                                          str(Path(tmp) / name), executor=pool)
+                        for name, cuts in videos.items()
+                    ]
+                    for future in futures:
+                        future.result()
+
+            print(f"  API calls: {limiter.calls}, max concurrent: {fake.max_active}")
+            assert limiter.calls == 10
+            assert fake.max_active > 1
+
+            summary_a = generators['a'].get_error_summary()
+            summary_b = generators['b'].get_error_summary()
+            assert (summary_a['total_generated'], summary_a['total_failed']) == (5, 0)
+            assert (summary_b['total_generated'], summary_b['total_failed']) == (3, 2)
+            # エラーは完了順ではなくカット順
+            assert [e['cut_number'] for e in summary_b['errors']] == [2, 4]
+            assert summary_b['errors'][0]['type'] == 'quota_exceeded'
+
+            for name, cuts in videos.items():
+                for cut in cuts:
+                    frame = Path(tmp) / name / 'frames' / f"cut_{cut.cut_number:02d}.jpg"
+                    if f"{name}-cut{cut.cut_number}" in fake.failing_prompts:
+                        assert not frame.exists()
+                    else:
+                        assert frame.read_bytes() == cut.image_prompt.encode()
+                        assert cut.generated_image_path == str(frame)
+
+            # 逐次実行（executorなし）でも同じ結果
+            serial = _generator(None)
+            serial.generate_images(_cuts('b', 5), str(Path(tmp) / 'serial'))
+            assert serial.get_error_summary()['errors'] == summary_b['errors']
+    finally:
+        image_generator.genai = original
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_busy_time_excludes_rate_limit_waits():
+    """busy_time counts time inside generate_image but not rate-limiter waits"""
+    print("=" * 60)
+    print("Test 2: Busy time without waits")
+    print("=" * 60)
+
+    original = getattr(image_generator, 'genai', None)
+    image_generator.genai = _FakeGenai()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            generator = _generator(RateLimiter(600))  # 0.1秒間隔
+            start = time.perf_counter()
+            generator.generate_images(_cuts('a', 4), tmp)
+            elapsed = time.perf_counter() - start
+    finally:
+        image_generator.genai = original
+
+    print(f"  Elapsed: {elapsed:.2f}s, busy: {generator.busy_time:.2f}s")
+    assert generator.busy_time >= 4 * 0.02
+    assert elapsed - generator.busy_time >= 0.2, "Rate-limiter waits are not busy time"
+    generator.reset()
+    assert generator.busy_time == 0.0
+
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_shared_pool_matches_serial()
+    test_busy_time_excludes_rate_limit_waits()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test Import Time
+CLI startup must not load heavy optional dependencies (Gemini, Cloud TTS, Anthropic, PIL, numpy)
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base import LazyModule, module_available
+
+ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = [
+    'google.generativeai',
+    'google.cloud.texttospeech',
+    'anthropic',
+    'PIL',
+    'numpy',
+    'yaml',
+    'multiprocessing',
+]
+
+# 時間の上限は環境依存（キャッシュの冷えたCIなど）で揺れるため、指定したときだけ検査する
+#   例: IMPORT_TIME_BUDGET=0.3 pytest tests/test_import_time.py
+# 遅延読み込み前は google.generativeai だけで約0.9秒かかっていた
+IMPORT_BUDGET_ENV = 'IMPORT_TIME_BUDGET'
+
+
+def _importtime(args):
+    """Run python -X importtime and return {module: cumulative seconds} for top-level imports"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(cumulative) / 1e6, not name.startswith('  '))
+    return modules
+
+
+def test_cli_startup_skips_heavy_imports():
+    """--help and the core package imports stay light; heavy modules load on first use only"""
+    print("=" * 60)
+    print("Test 1: CLI startup import time")
+    print("=" * 60)
+
+    modules = _importtime(['scripts/generate_storyboard_v2.py', '--help'])
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"Heavy modules imported at startup: {loaded}"
+
+    ours = {name: seconds for name, (seconds, top) in modules.items()
+            if top and name.split('.')[0] in ('core', 'tools')}
+    total = sum(ours.values())
+    print(f"  core imports: {total * 1000:.1f} ms ({', '.join(sorted(ours))})")
+    budget = os.environ.get(IMPORT_BUDGET_ENV)
+    if budget:
+        assert total < float(budget), f"Import time regressed: {total:.3f}s (budget {budget}s)"
+
+    # パッケージの import だけでは重いサブモジュールを読み込まない
+    code = (
+        "import sys, core.video, core.audio, core.analysis, core.narration, core.service, tools;"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]', output
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_lazy_attributes_resolve():
+    """Lazily exported names and modules resolve to the real objects on first access"""
+    print("=" * 60)
+    print("Test 2: Lazy attributes")
+    print("=" * 60)
+
+    import core.video
+    import tools
+    from core.video.image_generator import ImageGenerator
+    from tools.tokenizer import get_tokenizer
+
+    assert core.video.ImageGenerator is ImageGenerator
+    assert 'ImageGenerator' in dir(core.video)
+    assert tools.get_tokenizer is get_tokenizer
+    try:
+        tools.NoSuchThing
+        assert False, "Unknown names must raise AttributeError"
+    except AttributeError:
+        pass
+
+    json_module = LazyModule('json')
+    assert 'not loaded' in repr(json_module)
+    assert json_module.dumps([1]) == '[1]'
+    assert 'loaded' in repr(json_module) and 'not loaded' not in repr(json_module)
+
+    assert module_available('json')
+    assert not module_available('no_such_module_xyz')
+    assert not module_available('no_such_package_xyz.sub')
+
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_cli_startup_skips_heavy_imports()
+    test_lazy_attributes_resolve()
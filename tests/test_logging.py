@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test Logging
+Leveled console output, the JSON Lines sink and progress callbacks
+"""
+import io
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base import GeneratorConfig, ProgressEvent, configure_logging
+from core.base.log import PACKAGE_LOGGERS
+from core.video import CoreStoryboardGenerator
+
+
+def _reset_logging():
+    for name in PACKAGE_LOGGERS:
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+
+
+def test_levels_and_json_sink():
+    """INFO console hides per-cut lines; the JSON sink keeps them with cut_number"""
+    print("=" * 60)
+    print("Test 1: Levels and JSON sink")
+    print("=" * 60)
+
+    generator = CoreStoryboardGenerator(GeneratorConfig(duration=30, num_cuts=4, visual_style='anime'))
+    console = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / 'logs' / 'run.jsonl'
+        configure_logging(logging.INFO, json_path=json_path, stream=console)
+        try:
+            generator.generate_storyboard({'story_description': '魔法少女の物語'})
+        finally:
+            _reset_logging()
+        records = [json.loads(line) for line in json_path.read_text(encoding='utf-8').splitlines()]
+
+    assert '✓ Cut' not in console.getvalue()
+    assert 'Storyboard generation complete! (4 cuts)' in console.getvalue()
+
+    cut_records = [r for r in records if 'cut_number' in r]
+    assert [r['cut_number'] for r in cut_records] == [1, 2, 3, 4]
+    assert all(r['level'] == 'DEBUG' and r['logger'] == 'core.video.storyboard_generator' for r in cut_records)
+    assert records[-1]['level'] == 'INFO'
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_progress_callback():
+    """Each created cut is reported as a ProgressEvent, even without logging configured"""
+    print("=" * 60)
+    print("Test 2: Progress callback")
+    print("=" * 60)
+
+    events = []
+    generator = CoreStoryboardGenerator(GeneratorConfig(duration=30, num_cuts=3), progress_callback=events.append)
+    generator.generate_storyboard({'story_description': '旅の物語'})
+
+    assert all(isinstance(event, ProgressEvent) for event in events)
+    assert [(e.stage, e.current, e.total, e.cut_number) for e in events] == [
+        ('storyboard', 1, 3, 1), ('storyboard', 2, 3, 2), ('storyboard', 3, 3, 3)
+    ]
+    assert events[0].to_dict()['status'] == 'ok'
+
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_levels_and_json_sink()
+    test_progress_callback()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test Material Assigner
+Global cut × material assignment with usage requirements
+"""
+import itertools
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from tools.material_system import Material, MaterialConfig, MaterialSystem
+from tools import material_assigner
+from tools.material_assigner import MaterialAssigner
+
+
+def _make_config(**usage_requirements) -> MaterialConfig:
+    return MaterialConfig(
+        project_root=Path('.'),
+        project_type='custom',
+        categories=['beach', 'nature'],
+        usage_requirements=usage_requirements,
+        constraints={},
+        scoring_weights=MaterialConfig._default_weights()
+    )
+
+
+def _material(material_id: str, category: str, description: str) -> Material:
+    return Material(
+        id=material_id,
+        filename=f"{material_id}.jpg",
+        path=f"{material_id}.jpg",
+        category=category,
+        width=1920,
+        height=1080,
+        file_size=0,
+        description=description,
+        main_subject=category
+    )
+
+
+def _brute_force(scores, mask, materials, assigner):
+    """小さな問題の全探索（割り当て数優先、次にスコア合計）"""
+    n_cuts, n_materials = scores.shape
+    best = None
+    options = [[None] + [m for m in range(n_materials) if mask[c, m]] for c in range(n_cuts)]
+    for columns in itertools.product(*options):
+        used = [col for col in columns if col is not None]
+        if not assigner.allow_reuse and len(used) != len(set(used)):
+            continue
+        counts = {}
+        for col in used:
+            counts[materials[col].category] = counts.get(materials[col].category, 0) + 1
+        if any(not low <= counts.get(category, 0) <= (high if high is not None else n_cuts)
+               for category, (low, high) in assigner.category_quotas.items()):
+            continue
+        if len(set(used)) < np.ceil(assigner.minimum_usage_rate * n_materials - 1e-9):
+            continue
+        key = (len(used), round(sum(scores[c, col] for c, col in enumerate(columns) if col is not None), 9))
+        if best is None or key > best:
+            best = key
+    return best
+
+
+def test_global_assignment_beats_greedy():
+    """Greedy lets an early cut take the material a later cut needs"""
+    print("=" * 60)
+    print("Test 1: Global vs greedy assignment")
+    print("=" * 60)
+
+    def run(method):
+        system = MaterialSystem(_make_config())
+        system.materials = [
+            _material('beach_1', 'beach', 'sunset beach with palm trees'),
+            _material('beach_2', 'beach', 'quiet sand'),
+        ]
+        system.matcher.index_materials(system.materials)
+        storyboard = {'cuts': [
+            {'scene_description': 'sunset beach', 'categories': ['beach']},
+            {'scene_description': 'palm trees at sunset on the beach', 'categories': ['beach']},
+        ]}
+        mapped = system.map_to_storyboard(storyboard, method=method)
+        return system, [cut['source_material']['filename'] for cut in mapped['cuts']]
+
+    greedy_system, greedy = run('greedy')
+    global_system, optimal = run('global')
+    print(f"  greedy: {greedy}")
+    print(f"  global: {optimal}")
+
+    # greedy でも使用済み素材は再利用されない（assigned_to が設定される）
+    assert greedy == ['beach_1.jpg', 'beach_2.jpg']
+    assert [m.assigned_to for m in greedy_system.materials] == [1, 2]
+
+    assert optimal == ['beach_2.jpg', 'beach_1.jpg']
+    assert [m.assigned_to for m in global_system.materials] == [2, 1]
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_usage_requirements_match_brute_force():
+    """Quotas, reuse limits and minimum usage give the exhaustive optimum"""
+    print("=" * 60)
+    print("Test 2: Usage requirements")
+    print("=" * 60)
+
+    rng = np.random.default_rng(3)
+    materials = [_material(f"m{i}", ['beach', 'nature', 'culture'][i % 3], '') for i in range(5)]
+    requirements = [
+        {},
+        {'category_quotas': {'beach': 1, 'nature': '1-2'}},
+        {'minimum_usage_rate': 0.8},
+        {'allow_reuse': True, 'max_reuse': 2, 'category_quotas': {'culture': {'min': 1}}},
+        {'allow_reuse': True, 'minimum_usage_rate': 0.6},
+    ]
+
+    for trial, usage_requirements in enumerate(requirements):
+        assigner = MaterialAssigner(_make_config(**usage_requirements))
+        for _ in range(3):
+            scores = np.round(rng.random((4, 5)) * 10, 2)
+            mask = rng.random((4, 5)) < 0.7
+            result = assigner.assign(scores, mask, materials)
+
+            used = [col for col in result.columns if col is not None]
+            assert all(mask[c, col] for c, col in enumerate(result.columns) if col is not None)
+            key = (len(used), round(sum(s for s in result.scores if s is not None), 9))
+            expected = _brute_force(scores, mask, materials, assigner)
+            if expected is None:
+                assert result.relaxed
+            else:
+                assert key == expected, (usage_requirements, key, expected)
+        print(f"  {usage_requirements or 'no requirements'}: {result.method} {result.columns}")
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_batch_records_storyboard():
+    """Cut numbers restart per storyboard, so the storyboard is recorded with them"""
+    print("=" * 60)
+    print("Test 3: Storyboard of each assignment in a batch")
+    print("=" * 60)
+
+    system = MaterialSystem(_make_config())
+    system.materials = [
+        _material('beach_1', 'beach', 'sunset beach'),
+        _material('beach_2', 'beach', 'palm trees'),
+    ]
+    system.matcher.index_materials(system.materials)
+    storyboards = [
+        {'id': 'video_a', 'cuts': [{'scene_description': 'sunset beach', 'categories': ['beach']}]},
+        {'cuts': [{'scene_description': 'palm trees', 'categories': ['beach']}]},
+    ]
+    system.map_storyboards(storyboards, method='global')
+
+    assigned = {m.id: (m.assigned_storyboard, m.assigned_to) for m in system.materials}
+    print(f"  assigned: {assigned}")
+    # どちらもカット1だが、割り当て先の動画で区別できる
+    assert assigned == {'beach_1': ('video_a', 1), 'beach_2': ('1', 1)}
+
+    report = system.generate_report()
+    used = {m['filename']: (m['storyboard_id'], m['cut_number']) for m in report['used_materials']}
+    assert used == {'beach_1.jpg': ('video_a', 1), 'beach_2.jpg': ('1', 1)}
+
+    print("\n✅ Test 3 passed!\n")
+
+
+def test_milp_failure_is_reported():
+    """A MILP without a solution raises a clear error instead of rounding None"""
+    print("=" * 60)
+    print("Test 4: MILP failure")
+    print("=" * 60)
+
+    assigner = MaterialAssigner(_make_config(allow_reuse=True, minimum_usage_rate=0.6))
+    materials = [_material(f"m{i}", 'beach', '') for i in range(3)]
+    scores = np.arange(6, dtype=float).reshape(2, 3)
+    mask = np.ones((2, 3), dtype=bool)
+
+    # LPの解が整数にならず、MILPが時間切れ／実行不能になる場合
+    original_linprog, original_milp = material_assigner.linprog, material_assigner.milp
+    fractional = lambda objective, **kwargs: SimpleNamespace(status=0, x=np.full(len(objective), 0.5), message='')
+    try:
+        for status, message, expected in [
+            (1, 'Time limit reached', 'Assignment MILP failed: Time limit reached'),
+            (2, 'Infeasible', 'Assignment LP is infeasible'),
+        ]:
+            material_assigner.linprog = fractional
+            material_assigner.milp = lambda *args, **kwargs: SimpleNamespace(status=status, x=None, message=message)
+            try:
+                assigner.assign(scores, mask, materials)
+            except RuntimeError as e:
+                print(f"  status {status}: {e}")
+                assert str(e) == expected
+            else:
+                raise AssertionError("MILP failure was not reported")
+    finally:
+        material_assigner.linprog, material_assigner.milp = original_linprog, original_milp
+
+    print("\n✅ Test 4 passed!\n")
+
+
+def test_pruning_keeps_quota_feasible():
+    """Candidate pruning alone does not make a category lower bound look infeasible"""
+    print("=" * 60)
+    print("Test 5: Pruned candidates and quota lower bounds")
+    print("=" * 60)
+
+    materials = [_material('b1', 'beach', ''), _material('b2', 'beach', ''),
+                 _material('c1', 'culture', ''), _material('c2', 'culture', '')]
+    # culture の素材はどちらもカット0が最良 → 上位候補だけではカット1に culture がない
+    scores = np.array([[10.0, 10.0, 5.0, 5.0],
+                       [10.0, 10.0, 4.0, 4.0]])
+    mask = np.ones_like(scores, dtype=bool)
+
+    assigner = MaterialAssigner(_make_config(category_quotas={'culture': {'min': 2}}))
+    assigner.candidates_per_cut = 1
+    assigner.cuts_per_material = 1
+    rows, cols = assigner._candidate_pairs(scores, mask)
+    assert not any(row == 1 and materials[col].category == 'culture' for row, col in zip(rows, cols))
+
+    result = assigner.assign(scores, mask, materials)
+    print(f"  {result.method}: {result.columns}, relaxed={result.relaxed}")
+    assert not result.relaxed
+    assert sorted(materials[col].id for col in result.columns) == ['c1', 'c2']
+
+    print("\n✅ Test 5 passed!\n")
+
+
+if __name__ == "__main__":
+    test_global_assignment_beats_greedy()
+    test_usage_requirements_match_brute_force()
+    test_batch_records_storyboard()
+    test_milp_failure_is_reported()
+    test_pruning_keeps_quota_feasible()
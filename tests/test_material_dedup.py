@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test Material Deduplication
+Perceptual-hash clustering of near-identical source materials
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from tools.material_system import MaterialConfig
+from tools.material_analyzer import MaterialAnalyzer
+from tools.material_matcher import MaterialMatcher
+from tools.perceptual_hash import PerceptualHashIndex, dhash, hamming_distance
+
+
+def _make_config(root: Path, **deduplication) -> MaterialConfig:
+    return MaterialConfig(
+        project_root=root,
+        project_type='tourism',
+        categories=['beach', 'nature'],
+        usage_requirements={},
+        constraints={},
+        scoring_weights=MaterialConfig._default_weights(),
+        deduplication=deduplication
+    )
+
+
+def _write_materials(raw: Path):
+    """beach: 2 near-identical shots + 1 different shot, nature: 1 shot"""
+    yy, xx = np.mgrid[0:240, 0:320]
+    scene = np.stack([xx * 255 // 320, yy * 255 // 240, (xx + yy) % 256], axis=-1).astype(np.uint8)
+    other = scene[::-1, ::-1].copy()
+
+    (raw / "beach").mkdir(parents=True)
+    (raw / "nature").mkdir(parents=True)
+    Image.fromarray(scene).save(raw / "beach" / "shot1.jpg", quality=95)
+    # 同じ構図の少し明るい別カット（高解像度）
+    brighter = np.clip(scene.astype(int) + 8, 0, 255).astype(np.uint8)
+    Image.fromarray(brighter).resize((640, 480)).save(raw / "beach" / "shot2.jpg", quality=80)
+    Image.fromarray(other).save(raw / "beach" / "shot3.jpg", quality=95)
+    Image.fromarray(np.full((240, 320, 3), 90, dtype=np.uint8)).save(raw / "nature" / "forest.jpg")
+
+
+def test_hash_index_clusters():
+    """Near-identical hashes cluster, distant hashes stay separate"""
+    print("=" * 60)
+    print("Test 1: Perceptual hash index")
+    print("=" * 60)
+
+    index = PerceptualHashIndex(max_distance=4)
+    base = 0x0F0F_F0F0_1234_ABCD
+    index.add('a', base, pixel_count=100)
+    index.add('b', base ^ 0b101, pixel_count=400)      # distance 2
+    index.add('c', ~base & (2 ** 64 - 1))              # distance 64
+    index.add('d', base ^ (0b111 << 40), pixel_count=50)  # distance 3 to a
+
+    clusters = sorted(index.clusters(), key=len, reverse=True)
+    print(f"  Clusters: {clusters}")
+    assert clusters[0] == ['b', 'a', 'd'], "Highest resolution member should represent the cluster"
+    assert clusters[1] == ['c']
+    assert index.duplicate_count() == 2
+    assert index.representatives()['d'] == 'b'
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_analyzer_reuses_cluster_analysis():
+    """Scanning records hashes and reuses one analysis per cluster"""
+    print("=" * 60)
+    print("Test 2: Analyzer reuses analysis for near-duplicates")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        materials_root = root / "source_materials"
+        _write_materials(materials_root / "raw")
+
+        shot1, shot2 = materials_root / "raw" / "beach" / "shot1.jpg", materials_root / "raw" / "beach" / "shot2.jpg"
+        print(f"  dHash distance shot1/shot2: {hamming_distance(dhash(shot1), dhash(shot2))}")
+
+        analyzer = MaterialAnalyzer(_make_config(root, reuse_analysis=True))
+        analyzer.use_gemini = False
+
+        analyzed = []
+        original = analyzer.analyze_image
+        analyzer.analyze_image = lambda path, category: analyzed.append(path.name) or original(path, category)
+
+        materials = {m.id: m for m in analyzer.analyze_all_materials(materials_root)}
+
+    print(f"  Vision analyses: {sorted(analyzed)}")
+    assert sorted(analyzed) == ['forest.jpg', 'shot2.jpg', 'shot3.jpg']
+    assert materials['beach_shot1'].duplicate_of == 'beach_shot2'
+    assert materials['beach_shot2'].duplicate_of is None
+    assert materials['beach_shot3'].duplicate_of is None
+    assert materials['beach_shot1'].width == 320, "Basic info is kept per file"
+    assert all(len(m.phash) == 16 for m in materials.values())
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_matcher_skips_duplicates():
+    """Matching keeps the highest-scoring member of each cluster"""
+    print("=" * 60)
+    print("Test 3: Matcher skips redundant candidates")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        materials_root = root / "source_materials"
+        _write_materials(materials_root / "raw")
+
+        config = _make_config(root)
+        analyzer = MaterialAnalyzer(config)
+        analyzer.use_gemini = False
+        materials = analyzer.analyze_all_materials(materials_root)
+
+    cut = {'categories': ['beach'], 'scene_description': 'beach'}
+    by_id = {m.id: m for m in materials}
+    # 候補順で先の shot1 より後の shot2 のスコアが高い
+    by_id['beach_shot1'].quality_score = 0.0
+    by_id['beach_shot2'].quality_score = 1.0
+
+    matcher = MaterialMatcher(config)
+    matcher.index_materials(materials)
+    candidates = matcher.find_candidates(cut, materials)
+    scores = matcher.score_matrix([cut], candidates)[0]
+    kept = [m.id for m, _ in matcher._collapse_duplicates(candidates, scores)]
+    top = [m.id for m, _ in matcher.top_k(cut, materials, k=3)]
+    mask = matcher.candidate_mask([cut], materials)[0]
+    print(f"  Kept: {kept}, top-k: {top}")
+    assert len(candidates) == 3, "Near-duplicates are collapsed after scoring"
+    assert sorted(kept) == ['beach_shot2', 'beach_shot3']
+    assert sorted(top) == ['beach_shot2', 'beach_shot3']
+    assert sorted(m.id for m, keep in zip(materials, mask) if keep) == ['beach_shot2', 'beach_shot3']
+
+    # 使用済みの素材は除外され、同クラスタの別素材が候補になる
+    by_id['beach_shot2'].assigned_to = 1
+    remaining = [m.id for m, _ in matcher.top_k(cut, materials, k=3)]
+    print(f"  After assignment: {remaining}")
+    assert sorted(remaining) == ['beach_shot1', 'beach_shot3']
+
+    by_id['beach_shot2'].assigned_to = None
+    matcher = MaterialMatcher(_make_config(root, skip_duplicates=False))
+    matcher.index_materials(materials)
+    assert len(matcher.top_k(cut, materials, k=3)) == 3
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_hash_index_clusters()
+    test_analyzer_reuses_cluster_analysis()
+    test_matcher_skips_duplicates()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Test Material Matcher
+Keyword index and scoring
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.material_system import Material, MaterialConfig
+from tools.material_matcher import MaterialMatcher
+from tools.matching_strategies import (
+    CompetitionMatchingStrategy, DefaultMatchingStrategy, EducationMatchingStrategy,
+    MarketingMatchingStrategy, TourismMatchingStrategy
+)
+
+
+def _make_config(**overrides) -> MaterialConfig:
+    settings = dict(
+        project_root=Path('.'),
+        project_type='tourism',
+        categories=['beach', 'nature'],
+        usage_requirements={},
+        constraints={},
+        scoring_weights=MaterialConfig._default_weights()
+    )
+    settings.update(overrides)
+    return MaterialConfig(**settings)
+
+
+def _material(material_id: str, category: str, description: str, **fields) -> Material:
+    return Material(
+        id=material_id,
+        filename=f"{material_id}.jpg",
+        path=f"{material_id}.jpg",
+        category=category,
+        width=1920,
+        height=1080,
+        file_size=0,
+        description=description,
+        main_subject=fields.pop('main_subject', category),
+        **fields
+    )
+
+
+MATERIALS = [
+    _material('beach_1', 'beach', '白良浜の全景。白い砂浜とエメラルドグリーンの海', location='白良浜'),
+    _material('beach_2', 'beach', 'White sand beaches at sunset', time_of_day='evening', color_tone='warm gold'),
+    _material('nature_1', 'nature', 'Engetsu island arch at dusk', location='円月島'),
+]
+
+
+def test_keyword_index_matches_token_scan():
+    """Indexed keyword scoring equals the per-pair token comparison"""
+    print("=" * 60)
+    print("Test 1: Keyword index")
+    print("=" * 60)
+
+    matcher = MaterialMatcher(_make_config())
+    matcher.index_materials(MATERIALS)
+
+    scenes = ['白良浜の美しい景色', 'sunset on the beach', 'engetsu island 円月島', 'nothing here']
+    for scene in scenes:
+        scene_desc = scene.lower()
+        matches = matcher.keyword_matches(scene_desc)
+        for material in MATERIALS:
+            tokens = matcher.tokenizer.token_set(f"{material.description} {material.main_subject} {material.location or ''}")
+            expected = sum(1 for kw in matcher._extract_keywords(scene_desc) if kw in tokens)
+            assert matches.get(material.id, 0) == expected, (scene, material.id)
+        print(f"  '{scene}': {matches}")
+
+    # 空白のない日本語も文字bigramで一致（白良・良浜）、英語は単数形に揃えて一致
+    assert matcher.keyword_matches('白良浜の美しい景色')['beach_1'] == 2
+    assert matcher.keyword_matches('beach')['beach_2'] == 1
+    assert 'nature_1' not in matcher.keyword_matches('sunset on the beach')
+
+    # 単語の一部だけの一致は数えない（"sun" ⊂ "sunset"）
+    assert 'beach_2' not in matcher.keyword_matches('sun')
+
+    # インデックス外の素材も同じスコアになる
+    cut = {'scene_description': 'Sunset on the beach', 'categories': ['beach'], 'time_of_day': 'evening'}
+    outside = MaterialMatcher(_make_config())
+    assert outside.score_material(MATERIALS[1], cut) == matcher.score_material(MATERIALS[1], cut)
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_score_matrix_matches_per_pair_scoring():
+    """Vectorized scores equal score_material plus the strategy bonus"""
+    print("=" * 60)
+    print("Test 2: Score matrix")
+    print("=" * 60)
+
+    materials = MATERIALS + [
+        _material('beach_3', 'beach', 'Premium lifestyle resort', weather='Sunny',
+                  composition='rule_of_thirds', color_tone='bright', quality_score=0.9),
+        _material('nature_2', 'nature', 'Simple forest path', composition='centered',
+                  time_of_day='golden_hour', assigned_to=1),
+    ]
+    cuts = [
+        {'scene_description': '白良浜の美しい景色', 'categories': ['beach'], 'mood': 'hopeful'},
+        {'scene_description': 'Sunset at Engetsu island 円月島', 'categories': ['nature'], 'time_of_day': 'evening'},
+        {'scene_description': 'A premium resort', 'categories': [], 'mood': 'calm'},
+    ]
+    strategies = [TourismMatchingStrategy, EducationMatchingStrategy, MarketingMatchingStrategy,
+                  CompetitionMatchingStrategy, DefaultMatchingStrategy]
+
+    for strategy_class in strategies:
+        config = _make_config(usage_requirements={'allow_reuse': True})
+        matcher = MaterialMatcher(config)
+        matcher.index_materials(materials)
+        strategy = strategy_class(config)
+
+        scores = matcher.score_matrix(cuts, bonus_terms=strategy.bonus_terms)
+        for row, cut in enumerate(cuts):
+            candidates = matcher.find_candidates(cut, materials)
+            best = strategy.find_best_match(cut, materials, matcher)
+            candidate_scores = [scores[row, materials.index(material)] for material in candidates]
+            # 最高スコアの候補（同点は先頭）
+            assert best is candidates[candidate_scores.index(max(candidate_scores))]
+            assert best.match_score == max(candidate_scores)
+        print(f"  {strategy_class.__name__}: {scores.max(axis=1)}")
+
+    # 候補の絞り込みとスコア降順の上位k件
+    config = _make_config()
+    matcher = MaterialMatcher(config)
+    matcher.index_materials(materials)
+    strategy = TourismMatchingStrategy(config)
+    top = strategy.top_k_matches(cuts, materials, matcher, k=2)
+
+    assert [m.id for m, _ in top[0]] == ['beach_1', 'beach_3']
+    assert [m.id for m, _ in top[1]] == ['nature_1']          # nature_2 は使用済み
+    assert len(top[2]) == 2 and top[2][0][1] >= top[2][1][1]  # カテゴリ指定なしは全素材が候補
+    for cut, row in zip(cuts, top):
+        assert all(material in matcher.find_candidates(cut, materials) for material, _ in row)
+    print(f"  Top-2: {[[m.id for m, _ in row] for row in top]}")
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_pruned_top_k_matches_full_scoring():
+    """Pruned single-cut top-k equals sorting every candidate, while scoring fewer"""
+    print("=" * 60)
+    print("Test 3: Pruned top-k")
+    print("=" * 60)
+
+    import random
+    from tools.score_matrix import MaterialFeatures
+
+    rng = random.Random(7)
+    words = 'white sand beach emerald sea island arch sunset spring ocean cliffs forest 白良浜 円月島 夕日'.split()
+    materials = [
+        _material(
+            f"m{i}", rng.choice(['beach', 'nature']), ' '.join(rng.choices(words, k=5)),
+            location=rng.choice([None, '白良浜', '円月島']),
+            time_of_day=rng.choice([None, 'evening', 'golden_hour']),
+            color_tone=rng.choice([None, 'warm gold', 'blue']),
+            weather=rng.choice([None, 'sunny']),
+            quality_score=rng.random(),
+            assigned_to=rng.choice([None, None, None, 1]),
+            duplicate_of=f"m{i - 1}" if i % 10 == 1 else None,
+        )
+        for i in range(400)
+    ]
+    cuts = [
+        {'scene_description': 'sunset over the white sand beach', 'categories': ['beach'], 'time_of_day': 'evening'},
+        {'scene_description': '円月島に沈む夕日', 'categories': ['nature', 'beach'], 'mood': 'romantic'},
+        {'scene_description': 'forest spring', 'categories': []},
+    ]
+
+    scored = []
+    original_subset = MaterialFeatures.subset
+    MaterialFeatures.subset = lambda self, positions, **kwargs: scored.append(len(positions)) or original_subset(self, positions, **kwargs)
+    try:
+        for strategy_class in [TourismMatchingStrategy, CompetitionMatchingStrategy, DefaultMatchingStrategy]:
+            for allow_reuse in (False, True):
+                config = _make_config(usage_requirements={'allow_reuse': allow_reuse})
+                matcher = MaterialMatcher(config)
+                matcher.index_materials(materials)
+                strategy = strategy_class(config)
+
+                scores = matcher.score_matrix(cuts, bonus_terms=strategy.bonus_terms)
+                for row, cut in enumerate(cuts):
+                    candidates = matcher.find_candidates(cut, materials)
+                    # 類似素材はクラスタ内でスコア最高の1件
+                    collapsed = matcher._collapse_duplicates(
+                        candidates, [scores[row, materials.index(m)] for m in candidates]
+                    )
+                    ranked = sorted(range(len(collapsed)), key=lambda i: (-collapsed[i][1], i))
+                    for k in (1, 5):
+                        scored.clear()
+                        top = matcher.top_k(cut, materials, k, strategy.bonus_terms, strategy.bonus_bound)
+                        expected = [collapsed[i] for i in ranked[:k]]
+                        assert top == expected, (strategy_class.__name__, allow_reuse, row, k)
+                        assert sum(scored) < len(candidates)
+            print(f"  {strategy_class.__name__}: scored {sum(scored)} of {len(materials)} for the last cut")
+    finally:
+        MaterialFeatures.subset = original_subset
+
+    # 上限のない戦略ボーナスは全候補を採点
+    config = _make_config()
+    matcher = MaterialMatcher(config)
+    matcher.index_materials(materials)
+    strategy = TourismMatchingStrategy(config)
+    unbounded = matcher.top_k(cuts[0], materials, 3, strategy.bonus_terms)
+    assert unbounded == matcher.top_k(cuts[0], materials, 3, strategy.bonus_terms, strategy.bonus_bound)
+
+    # 候補の採点は候補の行だけ（ライブラリ全体の特徴量を走査しない）
+    cut = cuts[1]
+    candidates = matcher.find_candidates(cut, materials)[:3]
+    full = matcher.score_matrix([cut], bonus_terms=strategy.bonus_terms)[0]
+    sizes = []
+    original_unused = MaterialFeatures.unused
+    MaterialFeatures.unused = lambda self: sizes.append(len(self)) or original_unused(self)
+    try:
+        best = strategy._score_and_select(candidates, cut, matcher)
+    finally:
+        MaterialFeatures.unused = original_unused
+    expected = [full[materials.index(material)] for material in candidates]
+    assert best is candidates[expected.index(max(expected))]
+    assert [material.match_score for material in candidates] == expected
+    assert sizes and max(sizes) == len(candidates), sizes
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_keyword_index_matches_token_scan()
+    test_score_matrix_matches_per_pair_scoring()
+    test_pruned_top_k_matches_full_scoring()
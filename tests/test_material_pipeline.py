@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test Material Analysis Pipeline
+Concurrent, rate-limited vision analysis with crash-safe partial results
+"""
+import io
+import sys
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from tools.material_system import MaterialConfig
+from tools.material_analyzer import MaterialAnalyzer
+
+
+class FakeVisionModel:
+    """generate_content stand-in that records calls and concurrency"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, parts):
+        prompt, image = parts
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append(image)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+        size = Image.open(io.BytesIO(image['data'])).size
+        text = json.dumps({'description': f"photo {size[0]}x{size[1]}", 'main_subject': 'sea'})
+
+        class Response:
+            pass
+        response = Response()
+        response.text = f"```json\n{text}\n```"
+        return response
+
+
+def _make_analyzer(root: Path, model: FakeVisionModel, **analysis) -> MaterialAnalyzer:
+    config = MaterialConfig(
+        project_root=root,
+        project_type='tourism',
+        categories=['beach'],
+        usage_requirements={},
+        constraints={},
+        scoring_weights=MaterialConfig._default_weights(),
+        analysis=analysis
+    )
+    analyzer = MaterialAnalyzer(config)
+    analyzer.use_gemini = True
+    analyzer.model = model
+    return analyzer
+
+
+def _write_materials(materials_root: Path, count: int):
+    beach = materials_root / "raw" / "beach"
+    beach.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        pixels = rng.integers(0, 256, size=(300, 400, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(beach / f"photo{i}.jpg")
+
+
+def test_parallel_vision_pipeline():
+    """Every image is analyzed once, concurrently, from a thumbnail"""
+    print("=" * 60)
+    print("Test 1: Parallel vision pipeline")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        materials_root = Path(tmp) / "source_materials"
+        _write_materials(materials_root, 8)
+
+        model = FakeVisionModel()
+        analyzer = _make_analyzer(Path(tmp), model, max_workers=4,
+                                  requests_per_minute=0, thumbnail_size=200)
+        materials = analyzer.analyze_all_materials(materials_root)
+        journal = materials_root / "metadata" / MaterialAnalyzer.PARTIAL_RESULTS_FILE
+        journal_removed = not journal.exists()
+
+    print(f"  Calls: {len(model.calls)}, max concurrent: {model.max_active}")
+    assert len(materials) == 8 and len(model.calls) == 8
+    assert model.max_active > 1, "Vision calls should overlap"
+    assert all(m.description == "photo 200x150" for m in materials), "Thumbnails are sent"
+    assert all(m.width == 400 for m in materials), "Basic info comes from the original"
+    assert journal_removed, "Partial results are removed after metadata is saved"
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_partial_results_survive_crash():
+    """Completed analyses are reused after the run is interrupted"""
+    print("=" * 60)
+    print("Test 2: Partial results survive a crash")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        materials_root = Path(tmp) / "source_materials"
+        _write_materials(materials_root, 4)
+
+        analyzer = _make_analyzer(Path(tmp), FakeVisionModel(delay=0), requests_per_minute=0)
+
+        def crash(*args):
+            raise RuntimeError("simulated crash")
+        analyzer._save_metadata = crash
+
+        try:
+            analyzer.analyze_all_materials(materials_root)
+            assert False, "Expected the simulated crash"
+        except RuntimeError:
+            pass
+
+        model = FakeVisionModel(delay=0)
+        analyzer = _make_analyzer(Path(tmp), model, requests_per_minute=0)
+        materials = analyzer.analyze_all_materials(materials_root)
+
+    print(f"  Vision calls after restart: {len(model.calls)}")
+    assert len(model.calls) == 0
+    assert len(materials) == 4 and all(m.main_subject == 'sea' for m in materials)
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_producer_failure_does_not_hang():
+    """A stage that dies outside its per-job handling surfaces its error instead of hanging"""
+    print("=" * 60)
+    print("Test 3: Producer failure")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        materials_root = Path(tmp) / "source_materials"
+        _write_materials(materials_root, 2)
+        image_file = materials_root / "raw" / "beach" / "photo0.jpg"
+
+        analyzer = _make_analyzer(Path(tmp), FakeVisionModel(delay=0), max_workers=2, requests_per_minute=0)
+
+        def jobs():
+            yield 'beach_photo0', 'beach', image_file
+            raise OSError("listing failed")  # サムネイル段のループ外で失敗
+
+        outcome = {}
+
+        def consume():
+            try:
+                outcome['results'] = [material_id for material_id, _, _ in analyzer._vision_pipeline(jobs())]
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=consume, daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+
+    print(f"  Outcome: {outcome}")
+    assert not thread.is_alive(), "The pipeline must not wait forever"
+    assert isinstance(outcome.get('error'), OSError) and 'listing failed' in str(outcome['error'])
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_parallel_vision_pipeline()
+    test_partial_results_survive_crash()
+    test_producer_failure_does_not_hang()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test Incremental Material Scan
+Only new or changed files are re-analyzed; deleted files are pruned
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from tools.material_system import MaterialConfig, MaterialSystem
+
+
+def _make_system(root: Path) -> MaterialSystem:
+    config = MaterialConfig(
+        project_root=root,
+        project_type='tourism',
+        categories=['beach'],
+        usage_requirements={},
+        constraints={},
+        scoring_weights=MaterialConfig._default_weights()
+    )
+    system = MaterialSystem(config)
+    system.analyzer.use_gemini = False
+    return system
+
+
+def _write_image(path: Path, seed: int):
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)).save(path)
+
+
+def _track_analysis(system: MaterialSystem) -> list:
+    analyzed = []
+    original = system.analyzer.analyze_image
+
+    def analyze_image(image_path, category):
+        analyzed.append(image_path.name)
+        return original(image_path, category)
+
+    system.analyzer.analyze_image = analyze_image
+    return analyzed
+
+
+def test_rescan_only_changed_files():
+    """Unchanged files keep metadata, changed/new files are analyzed, deleted files are pruned"""
+    print("=" * 60)
+    print("Test 1: Incremental rescan")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        beach = root / "source_materials" / "raw" / "beach"
+        beach.mkdir(parents=True)
+        for i in range(4):
+            _write_image(beach / f"photo{i}.png", seed=i)
+
+        system = _make_system(root)
+        first = system.load_materials()
+        assert len(first) == 4
+        assert all(m.content_hash and m.mtime for m in first)
+
+        # 手動で付けた説明文は未変更なら保持される
+        metadata = {m.id: m for m in first}
+        metadata['beach_photo0'].description = "curated description"
+        system.analyzer._save_metadata(list(metadata.values()), system.materials_root)
+
+        _write_image(beach / "photo1.png", seed=100)   # 内容を変更
+        (beach / "photo2.png").unlink()                 # 削除
+        _write_image(beach / "photo4.png", seed=4)     # 新規
+        stat = (beach / "photo3.png").stat()            # 更新時刻のみ変更
+        os.utime(beach / "photo3.png", (stat.st_atime, stat.st_mtime + 60))
+
+        system = _make_system(root)
+        analyzed = _track_analysis(system)
+        materials = {m.id: m for m in system.load_materials(rescan=True)}
+
+    print(f"  Re-analyzed: {sorted(analyzed)}")
+    assert sorted(analyzed) == ['photo1.png', 'photo4.png']
+    assert sorted(materials) == ['beach_photo0', 'beach_photo1', 'beach_photo3', 'beach_photo4']
+    assert materials['beach_photo0'].description == "curated description"
+    assert materials['beach_photo3'].mtime == stat.st_mtime + 60
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_rescan_adopts_legacy_metadata():
+    """Legacy metadata is adopted unless the file changed after it was written"""
+    print("=" * 60)
+    print("Test 2: Legacy metadata adoption")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        beach = root / "source_materials" / "raw" / "beach"
+        beach.mkdir(parents=True)
+        _write_image(beach / "photo0.png", seed=0)
+        # BMPは内容が変わってもファイルサイズが同じ
+        Image.fromarray(np.zeros((48, 64, 3), dtype=np.uint8)).save(beach / "photo1.bmp")
+
+        system = _make_system(root)
+        legacy = system.load_materials()
+        for material in legacy:
+            material.mtime = material.content_hash = None
+        system.analyzer._save_metadata(legacy, system.materials_root)
+
+        # メタデータ保存後に同じサイズで再書き出し
+        edited = beach / "photo1.bmp"
+        size = edited.stat().st_size
+        Image.fromarray(np.full((48, 64, 3), 200, dtype=np.uint8)).save(edited)
+        stat = edited.stat()
+        os.utime(edited, (stat.st_atime, stat.st_mtime + 60))
+        assert edited.stat().st_size == size
+
+        system = _make_system(root)
+        analyzed = _track_analysis(system)
+        materials = {m.id: m for m in system.load_materials(rescan=True)}
+
+    print(f"  Re-analyzed: {analyzed}")
+    assert analyzed == ['photo1.bmp']
+    assert all(m.content_hash is not None for m in materials.values())
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_rescan_ignores_scan_order():
+    """A rescan that only sees files in a different order does not rewrite the store"""
+    print("=" * 60)
+    print("Test 3: Scan order")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        beach = root / "source_materials" / "raw" / "beach"
+        beach.mkdir(parents=True)
+        for i in range(3):
+            _write_image(beach / f"photo{i}.png", seed=i)
+
+        system = _make_system(root)
+        first = system.load_materials()
+
+        saved = []
+        system.analyzer._save_metadata = lambda *args: saved.append(args)
+        materials = system.analyzer.analyze_all_materials(system.materials_root, previous=list(reversed(first)))
+
+    assert sorted(m.id for m in materials) == sorted(m.id for m in first)
+    assert saved == [], "Reordered but unchanged materials are not written"
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_rescan_only_changed_files()
+    test_rescan_adopts_legacy_metadata()
+    test_rescan_ignores_scan_order()
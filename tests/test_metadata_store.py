@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test Metadata Store
+YAML and SQLite metadata backends
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from tools.material_system import MaterialConfig, MaterialSystem
+from tools.metadata_store import (
+    SQLiteMetadataStore, YamlMetadataStore, open_metadata_store
+)
+
+
+PHOTOS = [
+    {'id': 'beach_a', 'filename': 'a.jpg', 'category': 'beach', 'description': '白良浜の全景'},
+    {'filename': 'b.jpg', 'category': 'nature', 'description': 'Engetsu island'},
+]
+
+
+def test_backends_round_trip():
+    """Both backends save, update, delete and convert records"""
+    print("=" * 60)
+    print("Test 1: Metadata backends")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metadata_dir = Path(tmp)
+        for store in [YamlMetadataStore(metadata_dir / "photos.yaml"),
+                      SQLiteMetadataStore(metadata_dir / "photos.db")]:
+            store.save(PHOTOS, {'project_type': 'tourism'})
+            data = store.load()
+            assert data['project_type'] == 'tourism'
+            assert data['photos'] == PHOTOS
+
+            # idのない手動メタデータは category_語幹 で照合
+            store.upsert([{**PHOTOS[1], 'description': 'updated'},
+                          {'id': 'beach_c', 'filename': 'c.jpg', 'category': 'beach'}])
+            store.delete(['beach_a'])
+            photos = store.load()['photos']
+            print(f"  {type(store).__name__}: {[p['filename'] for p in photos]}")
+            assert [p['filename'] for p in photos] == ['b.jpg', 'c.jpg']
+            assert photos[0]['description'] == 'updated'
+
+        # YAML → SQLite のインポート
+        yaml_store = YamlMetadataStore(metadata_dir / "photo_descriptions.yaml")
+        yaml_store.save(PHOTOS)
+        assert isinstance(open_metadata_store(metadata_dir), YamlMetadataStore)
+
+        sqlite_store = open_metadata_store(metadata_dir, 'sqlite')
+        sqlite_store.import_from(yaml_store)
+        assert isinstance(open_metadata_store(metadata_dir), SQLiteMetadataStore)
+        assert sqlite_store.load()['photos'] == PHOTOS
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_sqlite_backend_in_material_system():
+    """Rescans write only changed rows to the SQLite store"""
+    print("=" * 60)
+    print("Test 2: MaterialSystem with the SQLite backend")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        beach = root / "source_materials" / "raw" / "beach"
+        beach.mkdir(parents=True)
+        rng = np.random.default_rng(0)
+        for i in range(3):
+            Image.fromarray(rng.integers(0, 256, size=(32, 32, 3), dtype=np.uint8)).save(beach / f"p{i}.png")
+
+        config = MaterialConfig(
+            project_root=root,
+            project_type='tourism',
+            categories=['beach'],
+            usage_requirements={},
+            constraints={},
+            scoring_weights=MaterialConfig._default_weights(),
+            metadata_backend='sqlite'
+        )
+        system = MaterialSystem(config)
+        system.analyzer.use_gemini = False
+        assert len(system.load_materials()) == 3
+
+        store = system.metadata_store()
+        assert isinstance(store, SQLiteMetadataStore) and store.exists()
+        assert not (root / "source_materials" / "metadata" / "photo_descriptions.yaml").exists()
+
+        writes = []
+        original_apply = SQLiteMetadataStore.apply
+        SQLiteMetadataStore.apply = lambda self, changed, removed: (
+            writes.append(([p['id'] for p in changed], list(removed))) or original_apply(self, changed, removed)
+        )
+        try:
+            (beach / "p0.png").unlink()
+            Image.fromarray(rng.integers(0, 256, size=(32, 32, 3), dtype=np.uint8)).save(beach / "p3.png")
+            materials = MaterialSystem(config).load_materials(rescan=True)
+        finally:
+            SQLiteMetadataStore.apply = original_apply
+
+        stored = [p['id'] for p in store.load()['photos']]
+
+    print(f"  Writes on rescan: {writes}")
+    assert writes == [(['beach_p3'], ['beach_p0'])], "Changes and removals go in one write"
+    assert sorted(stored) == sorted(m.id for m in materials) == ['beach_p1', 'beach_p2', 'beach_p3']
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_single_write_and_legacy_import():
+    """apply() rewrites the YAML once; opening the SQLite backend imports an existing YAML file"""
+    print("=" * 60)
+    print("Test 3: Single write per apply, YAML import on first SQLite open")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metadata_dir = Path(tmp)
+        yaml_store = YamlMetadataStore(metadata_dir / "photo_descriptions.yaml")
+        yaml_store.save(PHOTOS, {'project_type': 'tourism'})
+
+        saves = []
+        original_save = YamlMetadataStore.save
+        YamlMetadataStore.save = lambda self, photos, info=None: saves.append(len(photos)) or original_save(self, photos, info)
+        try:
+            yaml_store.apply([{'id': 'beach_c', 'filename': 'c.jpg', 'category': 'beach'}], ['beach_a'])
+        finally:
+            YamlMetadataStore.save = original_save
+        assert saves == [2]
+        assert [p['filename'] for p in yaml_store.load()['photos']] == ['b.jpg', 'c.jpg']
+
+        schema_calls = []
+        original_schema = SQLiteMetadataStore._create_schema
+        SQLiteMetadataStore._create_schema = lambda self, conn: schema_calls.append(1) or original_schema(self, conn)
+        try:
+            sqlite_store = open_metadata_store(metadata_dir, 'sqlite')
+            assert sqlite_store.exists()
+            data = sqlite_store.load()
+            assert sqlite_store.load() == data
+        finally:
+            SQLiteMetadataStore._create_schema = original_schema
+        assert data['project_type'] == 'tourism'
+        assert data['photos'] == yaml_store.load()['photos']
+        assert len(schema_calls) == 1, "Schema DDL runs on the first connection only"
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_backends_round_trip()
+    test_sqlite_backend_in_material_system()
+    test_single_write_and_legacy_import()
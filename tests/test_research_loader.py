@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Research Loader
+Indexed lookups, search and scene suggestions
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.research_loader import ResearchDatabase
+
+
+DB_PATH = Path(__file__).parent.parent / "projects" / "nanki-shirahama-2024" / "data" / "shirahama-locations-database.yaml"
+
+
+def _scan_suggestions(db, scene_description, mood=None, time_of_day=None):
+    """各ロケーションを順に走査する参照実装"""
+    desc_lower = scene_description.lower()
+    scene_terms = set(db.tokenizer.tokenize(scene_description))
+    scored = []
+    for location in db.locations.values():
+        score = 0.0
+        if location.name.lower() in desc_lower:
+            score += 20.0
+        score += 5.0 * sum(1 for w in db.tokenizer.tokenize(location.core_narrative) if w in scene_terms)
+        for feature in location.key_features:
+            score += 3.0 * sum(1 for w in db.tokenizer.tokenize(feature) if w in scene_terms)
+        if mood and mood.lower() in db.MOOD_KEYWORDS:
+            theme_text = f"{location.storytelling_theme} {location.core_narrative}".lower()
+            if any(keyword in theme_text for keyword in db.MOOD_KEYWORDS[mood.lower()]):
+                score += 10.0
+        best_time = location.filming_tips.get('best_time', '')
+        if time_of_day and isinstance(best_time, str) and time_of_day.lower() in best_time.lower():
+            score += 8.0
+        if score > 0:
+            scored.append((score, location))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [location for _, location in scored]
+
+
+def test_indexed_queries_match_scans():
+    """Name map, search and suggestions give the same results as a linear scan"""
+    print("=" * 60)
+    print("Test 1: Indexed research database")
+    print("=" * 60)
+
+    db = ResearchDatabase(DB_PATH)
+
+    # 名前（大文字小文字を区別しない）・ID
+    assert db.get_location_by_name('円月島').id == 'engetsuto'
+    assert db.get_location_by_name('suntide café&bar').id == 'suntide'
+    assert db.get_location_by_name('engetsuto').name == '円月島'
+    assert db.get_location_by_name('存在しない場所') is None
+
+    # 検索はカテゴリ・タイプ・キーワードの積（元の順序を維持）
+    for category, keywords in [('beach', None), (None, ['温泉']), (None, ['温']), ('nature', ['島']), (None, ['NONE'])]:
+        expected = [
+            location for location in db.locations.values()
+            if (not category or location.category == category)
+            and all(kw.lower() in f"{location.name} {location.core_narrative} {location.storytelling_theme} "
+                                  f"{' '.join(location.key_features)}".lower() for kw in keywords or [])
+        ]
+        assert db.search_locations(category=category, keywords=keywords) == expected
+    assert [loc.id for loc in db.search_locations(location_type='断崖')] == ['sandanbeki']
+
+    scenes = [
+        ('円月島に沈む夕日', 'romantic', None),
+        ('peaceful hot spring with ocean waves crashing', 'peaceful', 'early morning'),
+        ('白良浜の白い砂浜と日本最古級の露天風呂', None, '日中'),
+        ('熊野古道・富田坂 森林の木漏れ日', 'spiritual', '午前中'),
+        ('nothing matches', None, None),
+    ]
+    for scene, mood, time_of_day in scenes:
+        suggestions = db.suggest_locations_for_scene(scene, mood=mood, time_of_day=time_of_day)
+        assert suggestions == _scan_suggestions(db, scene, mood, time_of_day), scene
+        print(f"  {scene}: {[loc.name for loc in suggestions[:3]]}")
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_snapshot_cache():
+    """Snapshots are reused, survive touch, rebuild when the YAML changes, and are ignored if others can write them"""
+    print("=" * 60)
+    print("Test 2: Snapshot cache")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_path = Path(tmp) / "research.yaml"
+        shutil.copy(DB_PATH, yaml_path)
+
+        first = ResearchDatabase(yaml_path)
+        assert first.snapshot_path.exists()
+
+        parsed = []
+        original_load_yaml = ResearchDatabase._load_yaml
+        ResearchDatabase._load_yaml = lambda self: parsed.append(self.yaml_path) or original_load_yaml(self)
+        try:
+            # スナップショットから復元（YAMLは解析しない）
+            cached = ResearchDatabase(yaml_path)
+            assert parsed == []
+            assert cached.locations == first.locations
+            assert cached.suggest_locations_for_scene('円月島に沈む夕日') == first.suggest_locations_for_scene('円月島に沈む夕日')
+
+            # 更新時刻だけの変更は内容のハッシュで再利用
+            stat = yaml_path.stat()
+            os.utime(yaml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            ResearchDatabase(yaml_path)
+            assert parsed == []
+
+            # 内容が変われば作り直す
+            yaml_path.write_text(
+                yaml_path.read_text(encoding='utf-8').replace('name: "円月島"', 'name: "円月島（臥龍島）"'),
+                encoding='utf-8'
+            )
+            rebuilt = ResearchDatabase(yaml_path)
+            assert parsed == [yaml_path]
+            assert rebuilt.get_location_by_name('円月島（臥龍島）').id == 'engetsuto'
+
+            # 壊れたスナップショットは無視
+            first.snapshot_path.write_bytes(b'broken')
+            assert ResearchDatabase(yaml_path).get_location('engetsuto') is not None
+            assert len(parsed) == 2
+
+            # グループ・他ユーザーが書き込めるスナップショットは読まない（pickleの読み込みはコード実行になり得る）
+            os.chmod(first.snapshot_path, 0o666)
+            ResearchDatabase(yaml_path)
+            assert len(parsed) == 3
+            assert first.snapshot_path.stat().st_mode & 0o777 == 0o600
+        finally:
+            ResearchDatabase._load_yaml = original_load_yaml
+
+        # 一時ファイルは残らない
+        assert not list(Path(tmp).glob('*.tmp'))
+
+    print(f"  YAML parsed {len(parsed)} times for 7 constructions")
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_indexed_queries_match_scans()
+    test_snapshot_cache()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test Research-Aware Strategy
+Per-cut research bonus tables
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.material_system import Material, MaterialConfig
+from tools.material_matcher import MaterialMatcher
+from tools.research_aware_strategy import ResearchAwareStrategy
+
+
+PROJECT_ROOT = Path(__file__).parent.parent / "projects" / "nanki-shirahama-2024"
+
+
+def _make_config() -> MaterialConfig:
+    return MaterialConfig(
+        project_root=PROJECT_ROOT,
+        project_type='tourism',
+        categories=['beach', 'nature', 'attractions', 'culture'],
+        usage_requirements={},
+        constraints={},
+        scoring_weights=MaterialConfig._default_weights()
+    )
+
+
+def _material(material_id: str, category: str, location: str) -> Material:
+    return Material(
+        id=material_id,
+        filename=f"{material_id}.jpg",
+        path=f"{material_id}.jpg",
+        category=category,
+        width=1920,
+        height=1080,
+        file_size=0,
+        description=f"{location}の風景",
+        main_subject=category,
+        location=location
+    )
+
+
+def test_research_bonus_is_computed_once_per_cut():
+    """Suggestions run once per cut; materials look up the per-cut table"""
+    print("=" * 60)
+    print("Test 1: Per-cut research bonus")
+    print("=" * 60)
+
+    strategy = ResearchAwareStrategy(_make_config())
+    assert strategy.research_db is not None
+
+    calls = []
+    suggest = strategy.research_db.suggest_locations_for_scene
+    strategy.research_db.suggest_locations_for_scene = lambda **kwargs: calls.append(kwargs) or suggest(**kwargs)
+
+    materials = [
+        _material('beach_1', 'beach', '白良浜'),
+        _material('nature_1', 'nature', '円月島'),
+        _material('nature_2', 'nature', '千畳敷'),
+        _material('culture_1', 'culture', '熊野古道・富田坂'),
+        _material('other_1', 'nature', '未登録の場所'),
+    ]
+    cuts = [
+        {'scene_description': '円月島に沈む夕日', 'categories': ['nature'], 'mood': 'romantic'},
+        {'scene_description': '白良浜の白い砂浜', 'categories': ['beach'], 'time_of_day': '日中'},
+    ]
+
+    matcher = MaterialMatcher(strategy.config)
+    matcher.index_materials(materials)
+    for cut in cuts:
+        best = strategy.find_best_match(cut, materials, matcher)
+        print(f"  {cut['scene_description']}: {best.location} ({best.match_score:.1f})")
+
+    # 素材数によらずカットごとに1回
+    assert len(calls) == len(cuts)
+
+    # 行列のボーナスは素材ごとの観光ボーナス + リサーチボーナス
+    scores = matcher.score_matrix(cuts, bonus_terms=strategy.bonus_terms)
+    plain = matcher.score_matrix(cuts, bonus_terms=super(ResearchAwareStrategy, strategy).bonus_terms)
+    for row, cut in enumerate(cuts):
+        for col, material in enumerate(materials):
+            assert abs(scores[row, col] - plain[row, col] - strategy._research_bonus(material, cut)) < 1e-9
+    assert len(calls) == len(cuts)
+
+    table = strategy._research_bonus_table(cuts[0])
+    assert table['円月島'] > table['千畳敷']  # 撮影優先度と提案1位
+    assert strategy._research_bonus(materials[-1], cuts[0]) == 0.0
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_cut_cache_is_bounded():
+    """Per-cut tables are kept in an LRU capped at CUT_CACHE_LIMIT"""
+    print("=" * 60)
+    print("Test 2: Bounded per-cut cache")
+    print("=" * 60)
+
+    strategy = ResearchAwareStrategy(_make_config())
+    strategy.CUT_CACHE_LIMIT = 3
+
+    first = strategy._research_bonus_table({'scene_description': '円月島に沈む夕日'})
+    for i in range(5):
+        # 最初のカットは参照し続けるので残る
+        assert strategy._research_bonus_table({'scene_description': '円月島に沈む夕日'}) is first
+        strategy._research_bonus_table({'scene_description': f'白良浜の砂浜 {i}'})
+
+    cuts = strategy._research_cache()['cuts']
+    print(f"  Cached cuts: {len(cuts)}")
+    assert len(cuts) == 3
+    assert ('円月島に沈む夕日', '', '') in cuts
+    assert ('白良浜の砂浜 0', '', '') not in cuts
+
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_research_bonus_is_computed_once_per_cut()
+    test_cut_cache_is_bounded()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test Selection Tables
+Precompiled camera angle / composition / movement tables in IntelligentSelectionEngine
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.video.enhanced_storyboard_generator import (
+    AspectRatio, EmotionalPhase, IntelligentSelectionEngine, SceneContext, VideoGenre
+)
+
+
+class RecordingRandom:
+    """choice() returns the whole candidate tuple so tests can inspect it"""
+
+    def choice(self, candidates):
+        return candidates
+
+
+def _context(mood, intensity=0.5, pacing='medium', genre=VideoGenre.TOURISM, aspect_ratio=AspectRatio.VERTICAL):
+    return SceneContext(EmotionalPhase.A_MELO, intensity, pacing, mood, genre, aspect_ratio)
+
+
+def test_tables_follow_selection_rules():
+    """Table lookups reproduce the mood / intensity / pacing / genre / aspect ratio rules"""
+    print("=" * 60)
+    print("Test 1: Selection tables")
+    print("=" * 60)
+
+    engine = IntelligentSelectionEngine(RecordingRandom())
+
+    # カメラアングル: 強度バケット、大文字ムード、行列にないムード
+    assert engine.select_camera_angle(_context('peaceful'), 'dialogue') == ('MS', 'LS')
+    assert engine.select_camera_angle(_context('Peaceful', intensity=0.9), 'dialogue') == ('MS', 'LS', 'CU')
+    assert engine.select_camera_angle(_context('tense', intensity=0.9), 'dialogue') == ('CU', 'ECU')
+    assert engine.select_camera_angle(_context('tense', intensity=0.1), 'dialogue') == 'MS'
+    assert engine.select_camera_angle(_context('climactic'), 'establishing') == 'ELS'
+
+    # 構図: ジャンルとアスペクト比で絞り込み
+    assert engine.select_composition(_context('peaceful'), 'dialogue') == ('rule_of_thirds',)
+    assert engine.select_composition(
+        _context('peaceful', genre=VideoGenre.NARRATIVE, aspect_ratio=AspectRatio.SQUARE), 'dialogue'
+    ) == ('rule_of_thirds', 'symmetry')
+    assert engine.select_composition(_context('energetic', genre='music', aspect_ratio='2.35:1'), 'x') == \
+        ('diagonal', 'dynamic_angles')
+    assert engine.select_composition(_context('neutral'), 'dialogue') == 'rule_of_thirds'
+
+    # ムーブメント: ペーシングと高強度
+    assert engine.select_camera_movement(_context('calm', pacing='slow'), 'x') == ('static', 'slow_dolly')
+    assert engine.select_camera_movement(_context('epic', pacing='fast'), 'x') == ('tracking', 'handheld')
+    assert engine.select_camera_movement(_context('neutral', intensity=0.9), 'x') == \
+        ('handheld', 'fast_zoom', 'dynamic_tracking')
+    assert engine.select_camera_movement(_context('neutral'), 'x') == 'static'
+
+    # 候補はクラス定義時に作られた同じタプル（呼び出しごとに作り直さない）
+    first = engine.select_camera_angle(_context('epic'), 'x')
+    assert engine.select_camera_angle(_context('EPIC'), 'x') is first
+
+    print("\n✅ Test 1 passed!\n")
+
+
+if __name__ == "__main__":
+    test_tables_follow_selection_rules()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test Stage Pipeline
+Declarative stage graph with per-cut scheduling
+"""
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base import GeneratorConfig, StagePipeline
+from core.video import CoreStoryboardGenerator
+from core.video.subtitle_generator import SubtitleGenerator
+
+
+def test_per_cut_stages_overlap():
+    """Per-cut stages wait only for the same cut upstream; whole stages wait for every cut"""
+    print("=" * 60)
+    print("Test 1: Per-cut scheduling and critical path")
+    print("=" * 60)
+
+    events = []
+    lock = threading.Lock()
+
+    def log(name, cut=None):
+        with lock:
+            events.append((name, cut.cut_number if cut else None))
+
+    def structure(context):
+        context['storyboard'] = SimpleNamespace(cuts=[SimpleNamespace(cut_number=i) for i in range(1, 5)])
+        log('structure')
+
+    def narration(context, cut):
+        time.sleep(0.01 * cut.cut_number)  # 後半のカットほど遅い
+        cut.text = f"text{cut.cut_number}"
+        log('narration', cut)
+
+    def voices(context, cut):
+        assert cut.text == f"text{cut.cut_number}"
+        log('voices', cut)
+
+    def images(context, cut):
+        time.sleep(0.05)
+        log('images', cut)
+
+    def save(context):
+        log('save')
+
+    pipeline = (
+        StagePipeline(max_workers=4)
+        .add_stage('structure', structure)
+        .add_stage('narration', narration, ['structure'], per_cut=True)
+        .add_stage('voices', voices, ['narration'], per_cut=True)
+        .add_stage('images', images, ['structure'], per_cut=True)
+        .add_stage('save', save, ['voices', 'images'])
+    )
+    report = pipeline.run({})
+    print(report.format())
+
+    position = {event: i for i, event in enumerate(events)}
+    assert events[0] == ('structure', None)
+    assert events[-1] == ('save', None)
+    for n in range(1, 5):
+        assert position[('narration', n)] < position[('voices', n)]
+    # カット1の音声は最後のナレーションより先に始まる
+    assert position[('voices', 1)] < position[('narration', 4)]
+
+    assert report.stages['voices'].tasks == 4
+    assert report.stages['images'].busy >= 0.2
+    # クリティカルパスは依存関係をたどる
+    path = [key for key, _ in report.critical_path]
+    assert path[0] == ('structure', None) and path[-1] == ('save', None)
+    for (prev, _), (name, _) in zip(path, path[1:]):
+        assert prev in pipeline.stages[name].depends_on
+
+    # 未登録の依存関係・重複はエラー
+    for args in [('x', save, ['missing']), ('save', save, [])]:
+        try:
+            pipeline.add_stage(*args)
+            assert False, "Invalid stage must raise"
+        except ValueError:
+            pass
+
+    # 失敗したステージの例外はそのまま送出され、後続は実行されない
+    def fail(context, cut):
+        raise RuntimeError(f"cut {cut.cut_number} failed")
+
+    failing = (
+        StagePipeline()
+        .add_stage('structure', structure)
+        .add_stage('images', fail, ['structure'], per_cut=True)
+        .add_stage('save', save, ['images'])
+    )
+    events.clear()
+    try:
+        failing.run({})
+        assert False, "Stage error must propagate"
+    except RuntimeError as e:
+        assert 'failed' in str(e)
+    assert ('save', None) not in events
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_storyboard_pipeline():
+    """build_pipeline wires narration → subtitles/voices per cut and saves the storyboard"""
+    print("=" * 60)
+    print("Test 2: Storyboard pipeline")
+    print("=" * 60)
+
+    class FakeNarration:
+        use_claude = True
+
+        def analyze_narration_needs(self, cuts, story_context, style):
+            return [i % 2 == 0 for i in range(len(cuts))]
+
+        def generate_narration_for_cut(self, cut, story_context, previous_cuts, style, needs_narration=True):
+            assert [c.cut_number for c in previous_cuts] == list(range(1, cut.cut_number))
+            cut.narration_needed = needs_narration
+            if needs_narration:
+                cut.narration_text = f"カット{cut.cut_number}のナレーション。"
+                cut.narration_duration = 2.0
+            return cut.narration_text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = GeneratorConfig(duration=20, num_cuts=4, output_dir=tmp, auto_naming=False, overwrite=True)
+        generator = CoreStoryboardGenerator(config)
+        pipeline = generator.build_pipeline(
+            {'story_description': 'A quiet day at the beach'},
+            narration_generator=FakeNarration(),
+            subtitle_generator=SubtitleGenerator()
+        )
+        assert list(pipeline.stages) == ['storyboard', 'narration_plan', 'narration', 'subtitles', 'save']
+
+        context = {}
+        report = pipeline.run(context)
+        print(report.format())
+
+        cuts = context['storyboard'].cuts
+        assert [bool(cut.narration_text) for cut in cuts] == [True, False, True, False]
+        assert all(cut.subtitle_lines for cut in cuts if cut.narration_text)
+        assert not any(cut.subtitle_lines for cut in cuts if not cut.narration_text)
+        assert (Path(tmp) / 'storyboard.json').exists()
+
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_per_cut_stages_overlap()
+    test_storyboard_pipeline()
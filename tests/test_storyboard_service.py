@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test Storyboard Service
+Job queue with warm workers over HTTP and Unix sockets
+"""
+import json
+import socket
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.service import StoryboardService, WarmWorker, create_server
+
+
+def _request(url: str, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_submit_status_result():
+    """Jobs are served by workers created once; status and result follow the job lifecycle"""
+    print("=" * 60)
+    print("Test 1: Submit / status / result over HTTP")
+    print("=" * 60)
+
+    created = []
+
+    def factory():
+        worker = WarmWorker(service.rate_limiter)
+        created.append(worker)
+        return worker
+
+    service = StoryboardService(num_workers=2, worker_factory=factory)
+    service.start()
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            job_ids = []
+            for i in range(3):
+                status, body = _request(f"{base}/jobs", {
+                    'story': f'Story {i}', 'duration': 20, 'cuts': 4,
+                    'images': False, 'output': str(Path(tmp) / f'job{i}'), 'auto_naming': False
+                })
+                assert status == 202 and body['status'] == 'queued'
+                job_ids.append(body['job_id'])
+
+            for job_id in job_ids:
+                status, body = _request(f"{base}/jobs/{job_id}/result?wait=30")
+                assert status == 200, body
+                result = body['result']
+                assert body['status'] == 'done'
+                assert len(result['storyboard']['cuts']) == 4
+                assert result['storyboard']['music_sections']
+                assert (Path(result['output_path']) / 'storyboard.json').exists()
+                assert 'save' in result['timings']['stages']
+
+                status, body = _request(f"{base}/jobs/{job_id}")
+                assert status == 200 and body['status'] == 'done'
+
+            # ワーカーは起動時の2つだけ（ジョブごとに作り直さない）
+            assert len(created) == 2
+
+            # 不正なジョブは failed、未知のIDは404
+            status, body = _request(f"{base}/jobs", {'duration': 10})
+            status, body = _request(f"{base}/jobs/{body['job_id']}/result?wait=30")
+            assert status == 500 and body['status'] == 'failed' and 'story' in body['error']
+            assert _request(f"{base}/jobs/unknown")[0] == 404
+
+            status, body = _request(f"{base}/health")
+            assert body['workers'] == 2 and body['jobs'] == {'done': 3, 'failed': 1}
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_concurrent_jobs_default_naming():
+    """Concurrent jobs with the default title and auto naming get their own output directories"""
+    print("=" * 60)
+    print("Test 2: Concurrent jobs with default naming")
+    print("=" * 60)
+
+    service = StoryboardService(num_workers=2).start()
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            job_ids = [
+                _request(f"{base}/jobs", {'story': f'Story {i}', 'cuts': 3, 'images': False, 'output': tmp})[1]['job_id']
+                for i in range(2)
+            ]
+            results = [_request(f"{base}/jobs/{job_id}/result?wait=30") for job_id in job_ids]
+            assert all(status == 200 for status, _ in results), results
+
+            paths = [Path(body['result']['output_path']) for _, body in results]
+            print(f"  Output directories: {[path.name for path in paths]}")
+            assert paths[0] != paths[1]
+            for job_id, path, (_, body) in zip(job_ids, paths, results):
+                assert path.parent == Path(tmp) and path.name.endswith(job_id)
+                saved = json.loads((path / 'storyboard.json').read_text(encoding='utf-8'))
+                assert saved['cuts'] == body['result']['storyboard']['cuts']
+
+            status, body = _request(f"{base}/jobs/{job_ids[0]}/result?wait=abc")
+            assert status == 400 and 'wait' in body['error']
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_unix_socket():
+    """The same endpoints are served on a Unix socket"""
+    print("=" * 60)
+    print("Test 3: Unix socket")
+    print("=" * 60)
+
+    service = StoryboardService(num_workers=1, worker_factory=lambda: None).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / 'service.sock')
+        server = create_server(service, socket_path=path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(path)
+            client.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+            client.close()
+
+            head, body = response.split(b"\r\n\r\n", 1)
+            assert head.startswith(b"HTTP/1.0 200")
+            assert json.loads(body)['workers'] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.stop()
+
+    print("\n✅ Test 3 passed!\n")
+
+
+if __name__ == "__main__":
+    test_submit_status_result()
+    test_concurrent_jobs_default_naming()
+    test_unix_socket()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Tokenizer
+Japanese-aware tokenization shared by matching and research scoring
+"""
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tools.tokenizer as tokenizer_module
+from tools.tokenizer import NgramTokenizer, get_tokenizer
+
+
+def test_ngram_tokenizer():
+    """Kanji/katakana runs become bigrams, Latin words stay whole, particles are dropped"""
+    print("=" * 60)
+    print("Test 1: N-gram tokenizer")
+    print("=" * 60)
+
+    tokenizer = NgramTokenizer()
+    cases = [
+        ('白良浜の美しい景色', ['白良', '良浜', '美', '景色']),
+        ('エメラルドの海', ['エメ', 'メラ', 'ラル', 'ルド', '海']),
+        ('White sand BEACHES at sunset', ['white', 'sand', 'beach', 'sunset']),
+        # 全角英数・半角カナは正規化してから分割
+        ('Ｅｎｇｅｔｓｕ ｱｲｽ', ['engetsu', 'アイ', 'イス']),
+        # 3文字以上のひらがな区間は残す
+        ('しらはまの海', ['しら', 'らは', 'はま', 'まの', '海']),
+    ]
+    for text, expected in cases:
+        tokens = tokenizer.tokenize(text)
+        print(f"  {text}: {tokens}")
+        assert tokens == expected, text
+
+    # 同じ名前は同じインスタンス（分割結果のキャッシュを共有）
+    assert get_tokenizer('ngram') is get_tokenizer()
+    assert get_tokenizer().token_set('白良浜') == frozenset({'白良', '良浜'})
+
+    try:
+        get_tokenizer('unknown')
+        assert False, "Unknown tokenizer must raise"
+    except ValueError:
+        pass
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_morphological_fallback_warns_once():
+    """Without fugashi/janome, 'morphological' falls back to n-gram with a single warning"""
+    print("=" * 60)
+    print("Test 2: Morphological fallback")
+    print("=" * 60)
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('tools.tokenizer')
+
+    saved = (tokenizer_module.FUGASHI_AVAILABLE, tokenizer_module.JANOME_AVAILABLE,
+             tokenizer_module._TOKENIZERS.pop('morphological', None))
+    tokenizer_module.FUGASHI_AVAILABLE = tokenizer_module.JANOME_AVAILABLE = False
+    logger.addHandler(handler)
+    try:
+        first = get_tokenizer('morphological')
+        second = get_tokenizer('morphological')
+    finally:
+        logger.removeHandler(handler)
+        tokenizer_module.FUGASHI_AVAILABLE, tokenizer_module.JANOME_AVAILABLE, previous = saved
+        tokenizer_module._TOKENIZERS.pop('morphological', None)
+        if previous is not None:
+            tokenizer_module._TOKENIZERS['morphological'] = previous
+
+    print(f"  Warnings: {[record.getMessage() for record in records]}")
+    assert first is second is get_tokenizer('ngram')
+    assert len(records) == 1 and records[0].levelno == logging.WARNING
+
+    print("\n✅ Test 2 passed!\n")
+
+
+if __name__ == "__main__":
+    test_ngram_tokenizer()
+    test_morphological_fallback_warns_once()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test Visual Analyzer
+Local image analysis and batch (multi-image) mode
+"""
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from core.analysis import VisualAnalyzer
+from core.analysis.edge_detector import (
+    downsample_luminance, edge_density, image_luminance, sobel_magnitude
+)
+
+
+def _write_image(path: Path, pixels: np.ndarray) -> str:
+    Image.fromarray(pixels.astype(np.uint8)).save(path)
+    return str(path)
+
+
+def _sample_images(directory: Path) -> list:
+    """Bright warm, dark cool and mid-grey test images"""
+    warm = np.zeros((120, 160, 3))
+    warm[..., 0], warm[..., 1], warm[..., 2] = 250, 210, 160
+    cool = np.zeros((120, 160, 3))
+    cool[..., 0], cool[..., 1], cool[..., 2] = 10, 30, 70
+    yy, xx = np.mgrid[0:120, 0:160]
+    checker = ((xx // 20 + yy // 20) % 2) * 200 + 20
+    grey = np.stack([checker] * 3, axis=-1)
+
+    return [
+        _write_image(directory / "warm.png", warm),
+        _write_image(directory / "cool.png", cool),
+        _write_image(directory / "checker.png", grey),
+    ]
+
+
+def test_local_style_features():
+    """Mood, contrast and saturation are computed from pixel data"""
+    print("=" * 60)
+    print("Test 1: Local style features")
+    print("=" * 60)
+
+    analyzer = VisualAnalyzer()
+    analyzer.use_gemini = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warm, cool, checker = _sample_images(Path(tmp))
+        warm_result = analyzer.analyze_key_visual(warm)
+        cool_result = analyzer.analyze_key_visual(cool)
+        checker_result = analyzer.analyze_key_visual(checker)
+
+    for name, result in [('warm', warm_result), ('cool', cool_result), ('checker', checker_result)]:
+        print(f"  {name}: {result.mood} | {result.lighting} | {result.depth} | "
+              f"{result.contrast} | {result.saturation}")
+
+    assert warm_result.mood == "bright cheerful"
+    assert cool_result.mood == "dark mysterious"
+    assert warm_result.contrast == "low contrast"
+    assert checker_result.contrast == "high contrast"
+    assert checker_result.saturation == "low saturation"
+    assert cool_result.saturation == "high saturation"
+    assert warm_result.lighting == "soft even lighting"
+    assert warm_result.depth == "shallow depth"
+
+    print("\n✅ Test 1 passed!\n")
+
+
+def test_analyze_many_matches_single():
+    """analyze_many yields each image once with the same local analysis"""
+    print("=" * 60)
+    print("Test 2: Batch analysis matches single-image analysis")
+    print("=" * 60)
+
+    analyzer = VisualAnalyzer()
+    analyzer.use_gemini = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _sample_images(Path(tmp))
+
+        expected = {path: analyzer.analyze_key_visual(path).to_dict() for path in paths}
+        results = dict(analyzer.analyze_many(paths, max_workers=2))
+
+    assert sorted(results) == sorted(paths), "Every path should be yielded exactly once"
+    for path, analysis in results.items():
+        print(f"  {Path(path).name}: {analysis.mood}, {analysis.contrast}")
+        assert analysis.to_dict() == expected[path]
+
+    print("\n✅ Test 2 passed!\n")
+
+
+def test_large_jpeg_batch_matches_single():
+    """A large JPEG is decoded at draft scale on both paths and gives identical results"""
+    print("=" * 60)
+    print("Test 3: Large JPEG, batch vs single")
+    print("=" * 60)
+
+    analyzer = VisualAnalyzer()
+    analyzer.use_gemini = False
+
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0:3000, 0:4000]
+    pixels = np.stack([xx * 255 // 4000, yy * 255 // 3000, (xx + yy) % 256], axis=-1)
+    pixels = pixels + rng.integers(0, 40, pixels.shape)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "large.jpg")
+        Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(path, quality=90)
+
+        small = analyzer._downsample(path)
+        single = analyzer.analyze_key_visual(path).to_dict()
+        batch = dict(analyzer.analyze_many([path], max_workers=2))[path].to_dict()
+
+    print(f"  Decoded at {small.size} for analysis")
+    assert max(small.size) <= VisualAnalyzer.ANALYSIS_SIZE
+    assert batch == single, (batch['colors'], single['colors'])
+
+    print("\n✅ Test 3 passed!\n")
+
+
+def test_analyze_many_in_process():
+    """max_workers=1 runs without a process pool; a corrupt image does not stop the batch"""
+    print("=" * 60)
+    print("Test 4: In-process batch analysis")
+    print("=" * 60)
+
+    analyzer = VisualAnalyzer()
+    analyzer.use_gemini = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _sample_images(Path(tmp))
+        broken = Path(tmp) / "broken.jpg"
+        broken.write_bytes(b"not an image")
+        results = dict(analyzer.analyze_many(paths + [str(broken)], max_workers=1))
+
+        # Vision API へは縮小したJPEGを送る（PNG入力でも）
+        large = _write_image(Path(tmp) / "large.png", np.full((1500, 2000, 3), 120))
+        encoded = analyzer._encode_for_vision(large)
+        sent = Image.open(io.BytesIO(encoded))
+
+    assert len(results) == len(paths) + 1
+    assert results[str(broken)].to_dict() == analyzer._default_analysis().to_dict()
+    assert sent.format == 'JPEG' and max(sent.size) == VisualAnalyzer.VISION_SIZE
+    print("\n✅ Test 4 passed!\n")
+
+
+def test_edge_detector():
+    """Integer Sobel finds step edges and ignores flat regions"""
+    print("=" * 60)
+    print("Test 5: Separable integer edge detector")
+    print("=" * 60)
+
+    flat = np.full((64, 64), 128, dtype=np.uint8)
+    step = flat.copy()
+    step[:, 32:] = 200
+
+    magnitude = sobel_magnitude(step)
+    print(f"  Step edge magnitude: {magnitude.max()} (dtype {magnitude.dtype})")
+    assert magnitude.dtype == np.int16
+    assert magnitude.max() == 4 * 72
+    assert edge_density(flat, threshold=1) == 0.0
+    assert 0.0 < edge_density(step, threshold=1) < 0.1
+
+    # Full-resolution RGB input is reduced through a strided view
+    large = np.zeros((2000, 3000, 3), dtype=np.uint8)
+    luma = downsample_luminance(large, max_size=256)
+    print(f"  Downsampled {large.shape[:2]} -> {luma.shape}")
+    assert max(luma.shape) <= 256 and luma.dtype == np.uint8
+
+    # 呼び出し元の Image は縮小・グレースケール化されない（パス指定時は独自に開く）
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "photo.jpg"
+        Image.fromarray(np.full((1200, 1600, 3), 90, dtype=np.uint8)).save(path, quality=90)
+        image = Image.open(path)
+        from_image = image_luminance(image, max_size=256)
+        from_path = image_luminance(str(path), max_size=256)
+        assert image.size == (1600, 1200) and image.mode == 'RGB'
+        image.close()
+    assert max(from_image.shape) == max(from_path.shape) == 256
+
+    print("\n✅ Test 5 passed!\n")
+
+
+if __name__ == "__main__":
+    test_local_style_features()
+    test_analyze_many_matches_single()
+    test_large_jpeg_batch_matches_single()
+    test_analyze_many_in_process()
+    test_edge_detector()
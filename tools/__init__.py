@@ -1,38 +1,50 @@
 """
 Project management tools and generic material system
 """
-from .project_manager import ProjectManager
-from .material_system import MaterialSystem, MaterialConfig, Material
-from .material_analyzer import MaterialAnalyzer
-from .material_matcher import MaterialMatcher
-from .usage_tracker import UsageTracker
-from .matching_strategies import (
-    MaterialMatchingStrategy,
-    TourismMatchingStrategy,
-    EducationMatchingStrategy,
-    MarketingMatchingStrategy,
-    CompetitionMatchingStrategy,
-    DefaultMatchingStrategy
-)
-from .research_loader import ResearchDatabase, Location, StoryFramework
-from .research_aware_strategy import ResearchAwareStrategy
+import importlib
 
-__all__ = [
-    'ProjectManager',
-    'MaterialSystem',
-    'MaterialConfig',
-    'Material',
-    'MaterialAnalyzer',
-    'MaterialMatcher',
-    'UsageTracker',
-    'MaterialMatchingStrategy',
-    'TourismMatchingStrategy',
-    'EducationMatchingStrategy',
-    'MarketingMatchingStrategy',
-    'CompetitionMatchingStrategy',
-    'DefaultMatchingStrategy',
-    'ResearchDatabase',
-    'Location',
-    'StoryFramework',
-    'ResearchAwareStrategy',
-]
+# 各クラスは初回アクセス時にサブモジュールごと読み込む（numpy / PIL / Gemini を必要な時だけ）
+_LAZY_ATTRIBUTES = {
+    'ProjectManager': '.project_manager',
+    'MaterialSystem': '.material_system',
+    'MaterialConfig': '.material_system',
+    'Material': '.material_system',
+    'MaterialAnalyzer': '.material_analyzer',
+    'MaterialMatcher': '.material_matcher',
+    'UsageTracker': '.usage_tracker',
+    'MaterialAssigner': '.material_assigner',
+    'PerceptualHashIndex': '.perceptual_hash',
+    'MaterialFeatures': '.score_matrix',
+    'Tokenizer': '.tokenizer',
+    'NgramTokenizer': '.tokenizer',
+    'get_tokenizer': '.tokenizer',
+    'MetadataStore': '.metadata_store',
+    'YamlMetadataStore': '.metadata_store',
+    'SQLiteMetadataStore': '.metadata_store',
+    'open_metadata_store': '.metadata_store',
+    'MaterialMatchingStrategy': '.matching_strategies',
+    'TourismMatchingStrategy': '.matching_strategies',
+    'EducationMatchingStrategy': '.matching_strategies',
+    'MarketingMatchingStrategy': '.matching_strategies',
+    'CompetitionMatchingStrategy': '.matching_strategies',
+    'DefaultMatchingStrategy': '.matching_strategies',
+    'ResearchDatabase': '.research_loader',
+    'Location': '.research_loader',
+    'StoryFramework': '.research_loader',
+    'ResearchAwareStrategy': '.research_aware_strategy',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,7 +5,9 @@ Strategy Pattern implementation for flexible material matching
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 
 class MaterialMatchingStrategy(ABC):
@@ -24,6 +26,59 @@ class MaterialMatchingStrategy(ABC):
         """最適な素材を検索"""
         pass
 
+    def bonus_terms(self, features: 'MaterialFeatures', cuts: List[Dict]) -> Optional[np.ndarray]:
+        """
+        戦略固有のボーナス（カット×素材を一括計算）
+
+        Args:
+            features: 素材の特徴量配列
+            cuts: カットのリスト
+
+        Returns:
+            (カット数, 素材数) にブロードキャストできる配列（ボーナスなしは None）
+        """
+        return None
+
+    def bonus_bound(self, features: 'MaterialFeatures', cut: Dict):
+        """
+        戦略ボーナスの上限（1カット分、MaterialMatcher.top_k の枝刈り用）
+
+        既定では bonus_terms そのもの（正確な値なので上限としても有効）。
+        素材の使用状況のように全素材で求めると遅い項は、より粗い上限に置き換える。
+
+        Returns:
+            素材ごとの配列またはスカラー（None なら枝刈りしない）
+        """
+        bonus = self.bonus_terms(features, [cut])
+        if bonus is None:
+            return 0.0
+        return np.broadcast_to(bonus, (1, len(features)))[0]
+
+    def top_k_matches(
+        self,
+        cuts: List[Dict],
+        materials: List['Material'],
+        matcher: 'MaterialMatcher',
+        k: int = 3
+    ) -> List[List[Tuple['Material', float]]]:
+        """カットごとの上位k件の候補（スコア降順）"""
+        return matcher.top_k(cuts, materials, k, self.bonus_terms)
+
+    def _select_best(
+        self,
+        cut: Dict,
+        materials: List['Material'],
+        matcher: 'MaterialMatcher'
+    ) -> Optional['Material']:
+        """上位1件の枝刈り検索で最適な素材を選択（同点は先頭の候補）"""
+        top = matcher.top_k(cut, materials, k=1, bonus_terms=self.bonus_terms, bonus_bound=self.bonus_bound)
+        if not top:
+            return None
+
+        material, score = top[0]
+        material.match_score = score
+        return material
+
     def _score_and_select(
         self,
         candidates: List['Material'],
@@ -31,25 +86,26 @@ class MaterialMatchingStrategy(ABC):
         matcher: 'MaterialMatcher',
         bonus_fn=None
     ) -> Optional['Material']:
-        """候補をスコアリングして最適な素材を選択（共通ロジック）"""
+        """
+        候補をスコアリングして最適な素材を選択（共通ロジック）
+
+        bonus_fn（素材1件ずつのボーナス）を指定した場合は bonus_terms の代わりに使う。
+        """
         if not candidates:
             return None
 
-        scored = []
-        for material in candidates:
-            score = matcher.score_material(material, cut)
+        bonus_terms = None if bonus_fn else self.bonus_terms
+        scores = matcher.score_matrix([cut], candidates, bonus_terms)[0]
 
-            # ストラテジー固有のボーナス
-            if bonus_fn:
-                score += bonus_fn(material, cut)
+        # ストラテジー固有のボーナス（素材ごと）
+        if bonus_fn:
+            scores = scores + np.array([bonus_fn(material, cut) for material in candidates])
 
+        for material, score in zip(candidates, scores.tolist()):
             material.match_score = score
-            scored.append((score, material))
-
-        # スコア順にソート
-        scored.sort(key=lambda x: x[0], reverse=True)
 
-        return scored[0][1] if scored else None
+        # 同点は先頭の候補
+        return candidates[int(np.argmax(scores))]
 
 
 class TourismMatchingStrategy(MaterialMatchingStrategy):
@@ -63,33 +119,30 @@ class TourismMatchingStrategy(MaterialMatchingStrategy):
     ) -> Optional['Material']:
         """観光向けマッチング"""
 
-        candidates = matcher.find_candidates(cut, materials)
+        return self._select_best(cut, materials, matcher)
 
-        def tourism_bonus(material: 'Material', cut: Dict) -> float:
-            """観光特有のボーナス"""
-            bonus = 0.0
+    def bonus_terms(self, features: 'MaterialFeatures', cuts: List[Dict]) -> np.ndarray:
+        """観光特有のボーナス"""
 
+        def static_bonus():
             # ランドマークが明確 → ボーナス
-            if material.location and len(material.location) > 0:
-                bonus += 10.0
+            bonus = features.match('location', bool, lower=False) * 10.0
 
             # 天候が良好 → ボーナス
-            if material.weather and material.weather.lower() in ['sunny', 'clear']:
-                bonus += 5.0
+            bonus += features.match('weather', lambda v: v in ['sunny', 'clear']) * 5.0
 
             # ゴールデンアワー/ブルーアワー → ボーナス
-            if material.time_of_day and material.time_of_day.lower() in ['golden_hour', 'blue_hour']:
-                bonus += 5.0
-
-            # 場所名が完全一致
-            if material.location:
-                scene_desc = cut.get('scene_description', '').lower()
-                if material.location.lower() in scene_desc:
-                    bonus += 15.0
+            bonus += features.match('time_of_day', lambda v: v in ['golden_hour', 'blue_hour']) * 5.0
 
             return bonus
 
-        return self._score_and_select(candidates, cut, matcher, tourism_bonus)
+        # 場所名が完全一致
+        location_match = features.match_cuts(
+            'location', cuts,
+            lambda location, cut: bool(location) and location in cut.get('scene_description', '').lower()
+        )
+
+        return features.cached('tourism_bonus', static_bonus) + location_match * 15.0
 
 
 class EducationMatchingStrategy(MaterialMatchingStrategy):
@@ -103,19 +156,17 @@ class EducationMatchingStrategy(MaterialMatchingStrategy):
     ) -> Optional['Material']:
         """教育向けマッチング"""
 
-        candidates = matcher.find_candidates(cut, materials)
+        return self._select_best(cut, materials, matcher)
 
-        def education_bonus(material: 'Material', cut: Dict) -> float:
-            """教育特有のボーナス"""
-            bonus = 0.0
+    def bonus_terms(self, features: 'MaterialFeatures', cuts: List[Dict]) -> np.ndarray:
+        """教育特有のボーナス"""
 
+        def static_bonus():
             # シンプルな構図 → 学習しやすい
-            if material.composition and material.composition.lower() in ['centered', 'simple']:
-                bonus += 10.0
+            bonus = features.match('composition', lambda v: v in ['centered', 'simple']) * 10.0
 
             # 明るい画像 → 見やすい
-            if material.color_tone and material.color_tone.lower() in ['bright', 'clear']:
-                bonus += 5.0
+            bonus += features.match('color_tone', lambda v: v in ['bright', 'clear']) * 5.0
 
             # 高い教育的価値（カスタムフィールド）
             # educational_value は Gemini の education プロンプトで取得
@@ -123,12 +174,14 @@ class EducationMatchingStrategy(MaterialMatchingStrategy):
 
             return bonus
 
-        return self._score_and_select(candidates, cut, matcher, education_bonus)
+        return features.cached('education_bonus', static_bonus)
 
 
 class MarketingMatchingStrategy(MaterialMatchingStrategy):
     """マーケティングプロジェクト用のマッチング戦略"""
 
+    EMOTIONAL_KEYWORDS = ['exciting', 'luxurious', 'premium', 'lifestyle', 'elegant']
+
     def find_best_match(
         self,
         cut: Dict,
@@ -137,29 +190,26 @@ class MarketingMatchingStrategy(MaterialMatchingStrategy):
     ) -> Optional['Material']:
         """マーケティング向けマッチング"""
 
-        candidates = matcher.find_candidates(cut, materials)
+        return self._select_best(cut, materials, matcher)
 
-        def marketing_bonus(material: 'Material', cut: Dict) -> float:
-            """マーケティング特有のボーナス"""
-            bonus = 0.0
+    def bonus_terms(self, features: 'MaterialFeatures', cuts: List[Dict]) -> np.ndarray:
+        """マーケティング特有のボーナス"""
 
+        def static_bonus():
             # 感情的な訴求力
-            emotional_keywords = ['exciting', 'luxurious', 'premium', 'lifestyle', 'elegant']
-            material_desc = material.description.lower()
-            if any(kw in material_desc for kw in emotional_keywords):
-                bonus += 10.0
+            bonus = features.match(
+                'description', lambda v: any(kw in v for kw in self.EMOTIONAL_KEYWORDS)
+            ) * 10.0
 
             # 構図が商品配置に適している
-            if material.composition and material.composition.lower() in ['rule_of_thirds', 'leading_lines']:
-                bonus += 5.0
+            bonus += features.match('composition', lambda v: v in ['rule_of_thirds', 'leading_lines']) * 5.0
 
             # 明るく鮮やかな色調
-            if material.color_tone and material.color_tone.lower() in ['vivid', 'bright', 'saturated']:
-                bonus += 3.0
+            bonus += features.match('color_tone', lambda v: v in ['vivid', 'bright', 'saturated']) * 3.0
 
             return bonus
 
-        return self._score_and_select(candidates, cut, matcher, marketing_bonus)
+        return features.cached('marketing_bonus', static_bonus)
 
 
 class CompetitionMatchingStrategy(MaterialMatchingStrategy):
@@ -173,19 +223,17 @@ class CompetitionMatchingStrategy(MaterialMatchingStrategy):
     ) -> Optional['Material']:
         """コンペ向けマッチング（全素材使用を優先）"""
 
-        candidates = matcher.find_candidates(cut, materials)
+        return self._select_best(cut, materials, matcher)
 
-        def competition_bonus(material: 'Material', cut: Dict) -> float:
-            """コンペ特有のボーナス"""
-            bonus = 0.0
+    def bonus_terms(self, features: 'MaterialFeatures', cuts: List[Dict]) -> np.ndarray:
+        """コンペ特有のボーナス"""
 
-            # 未使用素材に大きなボーナス（全素材使用を促進）
-            if material.assigned_to is None:
-                bonus += 20.0
+        # 未使用素材に大きなボーナス（全素材使用を促進）
+        return features.unused() * 20.0
 
-            return bonus
-
-        return self._score_and_select(candidates, cut, matcher, competition_bonus)
+    def bonus_bound(self, features: 'MaterialFeatures', cut: Dict) -> float:
+        """未使用ボーナスの上限（全素材の使用状況は確認しない）"""
+        return 20.0
 
 
 class DefaultMatchingStrategy(MaterialMatchingStrategy):
@@ -199,6 +247,4 @@ class DefaultMatchingStrategy(MaterialMatchingStrategy):
     ) -> Optional['Material']:
         """標準的なマッチング"""
 
-        candidates = matcher.find_candidates(cut, materials)
-
-        return self._score_and_select(candidates, cut, matcher, bonus_fn=None)
+        return self._select_best(cut, materials, matcher)
@@ -4,23 +4,34 @@ AI-powered Material Analyzer
 Uses Gemini Vision API for image understanding
 """
 
+import io
 import os
 import json
 import re
+import time
+import queue
+import hashlib
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
+from dataclasses import replace
 from PIL import Image
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+from core.base import LazyModule, RateLimiter, module_available
+from .perceptual_hash import PerceptualHashIndex, dhash
+from .metadata_store import METADATA_BACKENDS, open_metadata_store
+
+# APIキーがある場合のみ読み込む
+genai = LazyModule('google.generativeai')
+GEMINI_AVAILABLE = module_available('google.generativeai')
 
 
 class MaterialAnalyzer:
     """AI画像解析クラス"""
 
+    # 解析途中の結果（1行1素材のJSON Lines）
+    PARTIAL_RESULTS_FILE = ".analysis_partial.jsonl"
+
     def __init__(self, config: 'MaterialConfig'):
         self.config = config
         self.use_gemini = GEMINI_AVAILABLE and os.environ.get('GEMINI_API_KEY')
@@ -38,9 +49,20 @@ class MaterialAnalyzer:
 
     def analyze_all_materials(
         self,
-        materials_root: Path
+        materials_root: Path,
+        previous: Optional[List['Material']] = None
     ) -> List['Material']:
-        """全素材を解析"""
+        """
+        全素材を解析
+
+        Args:
+            materials_root: 素材ルートディレクトリ
+            previous: 前回の解析結果（指定時は新規・変更ファイルのみ解析し、
+                      削除されたファイルは除外する）
+
+        Returns:
+            素材リスト
+        """
         from .material_system import Material
 
         print("🔍 Analyzing materials with AI...")
@@ -60,6 +82,8 @@ class MaterialAnalyzer:
             print(f"  ⚠️  No category directories found in {raw_path}")
             return materials
 
+        # 1. スキャン: 画像ファイルを列挙
+        entries = []
         for category_dir in category_dirs:
             category = category_dir.name
             print(f"\n  📂 Category: {category}")
@@ -75,43 +99,408 @@ class MaterialAnalyzer:
                 continue
 
             print(f"    Found {len(image_files)} images")
+            entries.extend((f"{category}_{image_file.stem}", category, image_file)
+                           for image_file in image_files)
+
+        # 2. 前回の解析結果と照合（変更のないファイルは再解析しない）
+        previous_by_id = {m.id: m for m in previous or []}
+        metadata_time = self._metadata_mtime(materials_root) if previous else None
+        fingerprints = {}
+        unchanged = {}
+        for material_id, _, image_file in entries:
+            fingerprints[material_id] = self._file_fingerprint(image_file)
+            prev = previous_by_id.get(material_id)
+            if prev is not None and self._is_unchanged(prev, image_file, fingerprints[material_id], metadata_time):
+                unchanged[material_id] = prev
+
+        if previous is not None:
+            removed = len(set(previous_by_id) - set(fingerprints))
+            print(f"\n  🔄 {len(unchanged)} unchanged, "
+                  f"{len(entries) - len(unchanged)} new/changed, {removed} removed")
+
+        # 3. 知覚ハッシュで類似素材をクラスタ化
+        known_hashes = {
+            material_id: (int(m.phash, 16), m.width * m.height)
+            for material_id, m in unchanged.items() if m.phash
+        }
+        hashes, representatives = self._build_hash_index(entries, known_hashes)
+        reuse_analysis = self.config.deduplication.get('reuse_analysis', False)
+
+        # 4. 解析（類似素材は代表素材の結果を再利用）
+        analyses = {material_id: m.to_dict() for material_id, m in unchanged.items()}
+        journal_path = materials_root / "metadata" / self.PARTIAL_RESULTS_FILE
+        analyses.update(self._load_partial_results(journal_path, fingerprints, analyses))
+
+        jobs = []
+        duplicates = []
+        for entry in entries:
+            material_id = entry[0]
+            if material_id in analyses:
+                continue
+            if reuse_analysis and representatives.get(material_id, material_id) != material_id:
+                duplicates.append(entry)
+            else:
+                jobs.append(entry)
+
+        if jobs:
+            start = time.perf_counter()
+            journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(journal_path, 'a', encoding='utf-8') as journal:
+                for material_id, image_file, analysis in self._analyze_images(jobs):
+                    analyses[material_id] = analysis
+                    print(f"    📸 {image_file.name} ✓")
+
+                    # 途中結果を逐次保存（中断時は次回の解析で再利用）
+                    record = {
+                        'id': material_id,
+                        'file_size': fingerprints[material_id]['file_size'],
+                        'mtime': fingerprints[material_id]['mtime'],
+                        'analysis': analysis
+                    }
+                    journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    journal.flush()
+
+            elapsed = time.perf_counter() - start
+            print(f"\n  ⚡ {len(jobs)} images in {elapsed:.1f}s "
+                  f"({len(jobs) / elapsed:.2f} images/s)")
+
+        for material_id, _, image_file in duplicates:
+            representative = representatives[material_id]
+            analyses[material_id] = {
+                **analyses[representative],
+                **self._get_basic_info(image_file)
+            }
+            print(f"    📸 {image_file.name} ♻️  (same as {representative})")
+
+        for material_id, category, image_file in entries:
+            analysis = analyses[material_id]
+            representative = representatives.get(material_id, material_id)
+            fingerprint = fingerprints[material_id]
+
+            # 変更検出・類似素材の情報
+            tracking = {
+                'file_size': fingerprint['file_size'],
+                'mtime': fingerprint['mtime'],
+                'content_hash': fingerprint.get('content_hash') or self._content_hash(image_file),
+                'phash': hashes.get(material_id),
+                'duplicate_of': representative if representative != material_id else None
+            }
 
-            for image_file in image_files:
-                print(f"    📸 {image_file.name}...", end=" ")
-
-                # 画像を解析
-                analysis = self.analyze_image(image_file, category)
-
-                # Materialオブジェクト作成
-                material = Material(
-                    id=f"{category}_{image_file.stem}",
-                    filename=image_file.name,
-                    path=str(image_file),
-                    category=category,
-                    width=analysis['width'],
-                    height=analysis['height'],
-                    file_size=analysis['file_size'],
-                    description=analysis['description'],
-                    main_subject=analysis['main_subject'],
-                    location=analysis.get('location'),
-                    time_of_day=analysis.get('time_of_day'),
-                    weather=analysis.get('weather'),
-                    color_tone=analysis.get('color_tone'),
-                    composition=analysis.get('composition'),
-                    quality_score=analysis.get('quality_score', 0.0),
-                    is_hd=analysis['width'] >= 1920 or analysis['height'] >= 1080
-                )
-
-                materials.append(material)
-                print("✓")
-
-        # メタデータを保存
-        if materials:
-            self._save_metadata(materials, materials_root)
+            if material_id in unchanged:
+                materials.append(replace(unchanged[material_id], path=str(image_file), **tracking))
+                continue
+
+            # Materialオブジェクト作成
+            material = Material(
+                id=material_id,
+                filename=image_file.name,
+                path=str(image_file),
+                category=category,
+                width=analysis['width'],
+                height=analysis['height'],
+                description=analysis['description'],
+                main_subject=analysis['main_subject'],
+                location=analysis.get('location'),
+                time_of_day=analysis.get('time_of_day'),
+                weather=analysis.get('weather'),
+                color_tone=analysis.get('color_tone'),
+                composition=analysis.get('composition'),
+                quality_score=analysis.get('quality_score', 0.0),
+                is_hd=analysis['width'] >= 1920 or analysis['height'] >= 1080,
+                **tracking
+            )
+
+            materials.append(material)
+
+        # メタデータを保存（再スキャンで変更がなければ書き込まない。走査順の違いは変更としない）
+        if materials and {m.id: m for m in materials} != previous_by_id:
+            self._save_metadata(materials, materials_root, previous)
+
+        if journal_path.exists():
+            journal_path.unlink()
 
         print(f"\n✅ Analyzed {len(materials)} materials")
         return materials
 
+    def _build_hash_index(
+        self,
+        entries: List[tuple],
+        known_hashes: Optional[Dict[str, tuple]] = None
+    ) -> tuple:
+        """
+        知覚ハッシュ（dHash）で類似素材をクラスタ化
+
+        Args:
+            entries: (素材ID, カテゴリ, 画像パス) のリスト
+            known_hashes: 計算済みの {素材ID: (ハッシュ値, 画素数)}
+
+        Returns:
+            ({素材ID: ハッシュ16進文字列}, {素材ID: 代表素材ID})
+        """
+        max_distance = self.config.deduplication.get('max_distance', 6)
+        index = PerceptualHashIndex(max_distance=max_distance)
+        hashes = {}
+
+        known_hashes = known_hashes or {}
+
+        for material_id, _, image_file in entries:
+            if material_id in known_hashes:
+                hash_value, pixel_count = known_hashes[material_id]
+            else:
+                hash_value = dhash(image_file)
+                if hash_value is None:
+                    continue
+                info = self._get_basic_info(image_file)
+                pixel_count = info['width'] * info['height']
+            index.add(material_id, hash_value, pixel_count)
+            hashes[material_id] = f"{hash_value:016x}"
+
+        duplicates = index.duplicate_count()
+        if duplicates:
+            print(f"\n  🔁 {duplicates} near-duplicate images "
+                  f"(hamming distance <= {max_distance})")
+
+        return hashes, index.representatives()
+
+    def _file_fingerprint(self, image_file: Path) -> Dict:
+        """変更検出用のファイル情報（サイズ・更新時刻）"""
+        stat = image_file.stat()
+        return {
+            'file_size': stat.st_size,
+            'mtime': stat.st_mtime
+        }
+
+    def _content_hash(self, image_file: Path) -> str:
+        """ファイル内容のSHA-256ハッシュ"""
+        digest = hashlib.sha256()
+        with open(image_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _metadata_mtime(self, materials_root: Path) -> Optional[float]:
+        """既存のメタデータファイルの最終更新時刻（なければ None）"""
+        metadata_dir = materials_root / "metadata"
+        times = [
+            (metadata_dir / filename).stat().st_mtime
+            for _, filename in METADATA_BACKENDS.values()
+            if (metadata_dir / filename).exists()
+        ]
+        return max(times) if times else None
+
+    def _is_unchanged(
+        self,
+        previous: 'Material',
+        image_file: Path,
+        fingerprint: Dict,
+        metadata_time: Optional[float] = None
+    ) -> bool:
+        """
+        前回の解析結果をそのまま使えるか判定
+
+        サイズと更新時刻が一致すれば未変更とみなす。更新時刻だけが
+        異なる場合（コピー・touchなど）は内容ハッシュで確認する。
+
+        Args:
+            previous: 前回の素材情報
+            image_file: 画像ファイルパス
+            fingerprint: _file_fingerprint の結果（内容ハッシュを追記する）
+            metadata_time: メタデータファイルの更新時刻（旧形式メタデータの判定用）
+
+        Returns:
+            未変更ならTrue
+        """
+        if previous.file_size != fingerprint['file_size']:
+            return False
+
+        if previous.content_hash is None:
+            # 変更検出情報のない旧形式メタデータ: 内容ハッシュを記録して次回以降の比較に使う。
+            # 同じサイズの再書き出しは区別できないため、メタデータより後に更新されたファイルは再解析する
+            fingerprint['content_hash'] = self._content_hash(image_file)
+            return metadata_time is not None and fingerprint['mtime'] <= metadata_time
+
+        if previous.mtime == fingerprint['mtime']:
+            fingerprint['content_hash'] = previous.content_hash
+            return True
+
+        fingerprint['content_hash'] = self._content_hash(image_file)
+        return fingerprint['content_hash'] == previous.content_hash
+
+    def _load_partial_results(
+        self,
+        journal_path: Path,
+        fingerprints: Dict[str, Dict],
+        done: Dict[str, Dict]
+    ) -> Dict[str, Dict]:
+        """
+        中断された解析の途中結果を読み込む
+
+        Args:
+            journal_path: 途中結果ファイル
+            fingerprints: 現在の {素材ID: ファイル情報}
+            done: 解析済みの素材（読み込み対象外）
+
+        Returns:
+            {素材ID: 解析結果}（ファイルが変更されていないもののみ）
+        """
+        if not journal_path.exists():
+            return {}
+
+        results = {}
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 書き込み途中で中断された行
+                    continue
+
+                fingerprint = fingerprints.get(record.get('id'))
+                if (fingerprint and record['id'] not in done
+                        and record.get('file_size') == fingerprint['file_size']
+                        and record.get('mtime') == fingerprint['mtime']):
+                    results[record['id']] = record['analysis']
+
+        if results:
+            print(f"\n  ↩️  Resuming {len(results)} analyses from an interrupted run")
+        return results
+
+    def _analyze_images(self, jobs: List[tuple]):
+        """
+        複数画像を解析（完了順にyield）
+
+        Args:
+            jobs: (素材ID, カテゴリ, 画像パス) のリスト
+
+        Yields:
+            (素材ID, 画像パス, 解析結果)
+        """
+        if not self.use_gemini:
+            # 基本情報のみの解析はAPI呼び出しがないので逐次処理
+            for material_id, category, image_file in jobs:
+                yield material_id, image_file, self.analyze_image(image_file, category)
+            return
+
+        yield from self._vision_pipeline(jobs)
+
+    def _vision_pipeline(self, jobs: List[tuple]):
+        """
+        並列解析パイプライン
+
+        サムネイル変換（1スレッド）→ レート制限付きVision API呼び出し
+        （max_workersスレッド）→ パース（呼び出し元スレッド）の各段を
+        上限付きキューで接続する。
+
+        Args:
+            jobs: (素材ID, カテゴリ, 画像パス) のリスト
+
+        Yields:
+            (素材ID, 画像パス, 解析結果)
+        """
+        settings = self.config.analysis
+        workers = max(1, settings.get('max_workers', 4))
+        queue_size = settings.get('queue_size', workers * 2)
+        thumbnail_size = settings.get('thumbnail_size', 1024)
+        limiter = RateLimiter(settings.get('requests_per_minute', 60))
+
+        encoded = queue.Queue(maxsize=queue_size)
+        responses = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []  # 段の外側で発生した例外（呼び出し元で送出）
+
+        def put(target: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return None
+
+        def encode_stage():
+            try:
+                for job in jobs:
+                    try:
+                        payload = self._encode_thumbnail(job[2], thumbnail_size)
+                    except Exception as e:
+                        payload = e
+                    if not put(encoded, (job, payload)):
+                        return
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                # 異常終了でもAPI段を終了させる
+                for _ in range(workers):
+                    put(encoded, None)
+
+        def vision_stage():
+            try:
+                while True:
+                    item = get(encoded)
+                    if item is None:
+                        return
+                    job, payload = item
+                    try:
+                        if isinstance(payload, Exception):
+                            raise payload
+                        limiter.acquire()
+                        result = (job, self._query_vision(payload, job[1]), None)
+                    except Exception as e:
+                        result = (job, None, e)
+                    if not put(responses, result):
+                        return
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                # 終了通知（パース段はワーカー数分の通知で完了）
+                put(responses, None)
+
+        threads = [threading.Thread(target=encode_stage, daemon=True)]
+        threads.extend(threading.Thread(target=vision_stage, daemon=True) for _ in range(workers))
+        for thread in threads:
+            thread.start()
+
+        try:
+            finished = 0
+            while finished < workers:
+                try:
+                    item = responses.get(timeout=0.5)
+                except queue.Empty:
+                    # 生産側のスレッドが終了通知なしに止まった場合は待ち続けない
+                    if not any(thread.is_alive() for thread in threads):
+                        if errors:
+                            raise errors[0]
+                        raise RuntimeError("Vision pipeline stopped before all results were returned")
+                    continue
+                if item is None:
+                    finished += 1
+                    continue
+
+                (material_id, category, image_file), response_text, error = item
+                basic_info = self._get_basic_info(image_file)
+                if error is not None:
+                    print(f"\n    ⚠️  Error analyzing {image_file.name}: {error}")
+                    analysis = self._fallback_analysis(category)
+                else:
+                    analysis = self._parse_gemini_response(response_text)
+
+                yield material_id, image_file, {**basic_info, **analysis}
+
+            if errors:
+                raise errors[0]
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
     def analyze_image(
         self,
         image_path: Path,
@@ -126,22 +515,19 @@ class MaterialAnalyzer:
             # Gemini利用不可の場合は基本情報のみ
             return {
                 **basic_info,
-                'description': f"{category} image",
-                'main_subject': category,
-                'quality_score': 0.5
+                **self._fallback_analysis(category)
             }
 
         # Gemini Vision APIで解析
         try:
-            img = Image.open(image_path)
-
-            # プロジェクトタイプに応じたプロンプト
-            prompt = self._create_analysis_prompt(category, self.config.project_type)
-
-            response = self.model.generate_content([prompt, img])
+            image_data = self._encode_thumbnail(
+                image_path,
+                self.config.analysis.get('thumbnail_size', 1024)
+            )
+            response_text = self._query_vision(image_data, category)
 
             # レスポンスをパース
-            analysis = self._parse_gemini_response(response.text)
+            analysis = self._parse_gemini_response(response_text)
 
             return {
                 **basic_info,
@@ -152,11 +538,58 @@ class MaterialAnalyzer:
             print(f"\n    ⚠️  Error analyzing {image_path.name}: {e}")
             return {
                 **basic_info,
-                'description': f"{category} image",
-                'main_subject': category,
-                'quality_score': 0.5
+                **self._fallback_analysis(category)
             }
 
+    def _fallback_analysis(self, category: str) -> Dict:
+        """AI解析なしの場合の解析結果"""
+        return {
+            'description': f"{category} image",
+            'main_subject': category,
+            'quality_score': 0.5
+        }
+
+    def _encode_thumbnail(self, image_path: Path, max_size: int = 1024) -> bytes:
+        """
+        Vision API送信用のJPEGサムネイルを作成
+
+        Args:
+            image_path: 画像ファイルパス
+            max_size: 長辺の最大ピクセル数
+
+        Returns:
+            JPEGバイト列
+        """
+        with Image.open(image_path) as img:
+            # JPEGは縮小デコードで高速化
+            img.draft('RGB', (max_size, max_size))
+            thumbnail = img.convert('RGB')
+            thumbnail.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format='JPEG', quality=90)
+        return buffer.getvalue()
+
+    def _query_vision(self, image_data: bytes, category: str) -> str:
+        """
+        Gemini Vision APIに解析を依頼
+
+        Args:
+            image_data: JPEGバイト列
+            category: 素材カテゴリ
+
+        Returns:
+            レスポンステキスト
+        """
+        # プロジェクトタイプに応じたプロンプト
+        prompt = self._create_analysis_prompt(category, self.config.project_type)
+
+        response = self.model.generate_content([
+            prompt,
+            {'mime_type': 'image/jpeg', 'data': image_data}
+        ])
+        return response.text
+
     def _get_basic_info(self, image_path: Path) -> Dict:
         """画像の基本情報を取得"""
         try:
@@ -268,21 +701,35 @@ Include the following fields:"""
     def _save_metadata(
         self,
         materials: List['Material'],
-        materials_root: Path
+        materials_root: Path,
+        previous: Optional[List['Material']] = None
     ):
-        """メタデータをYAMLファイルに保存"""
-        metadata_path = materials_root / "metadata" / "photo_descriptions.yaml"
-        metadata_path.parent.mkdir(parents=True, exist_ok=True)
-
-        data = {
+        """
+        メタデータを保存
+
+        Args:
+            materials: 素材リスト
+            materials_root: 素材ルートディレクトリ
+            previous: 前回の素材リスト（指定時は変更分のみ書き込む）
+        """
+        store = open_metadata_store(materials_root / "metadata", self.config.metadata_backend)
+
+        if previous is not None and store.exists():
+            # 追加・変更・削除された素材だけを反映
+            before = {m.id: m for m in previous}
+            current_ids = {m.id for m in materials}
+            changed = [m.to_dict() for m in materials if before.get(m.id) != m]
+            removed = [material_id for material_id in before if material_id not in current_ids]
+
+            store.apply(changed, removed)
+            print(f"💾 Metadata updated: {store.path} "
+                  f"({len(changed)} written, {len(removed)} removed)")
+            return
+
+        info = {
             'project_type': self.config.project_type,
-            'total_materials': len(materials),
-            'analyzed_by': 'MaterialAnalyzer with Gemini Vision API' if self.use_gemini else 'MaterialAnalyzer (basic)',
-            'photos': [m.to_dict() for m in materials]
+            'analyzed_by': 'MaterialAnalyzer with Gemini Vision API' if self.use_gemini else 'MaterialAnalyzer (basic)'
         }
+        store.save([m.to_dict() for m in materials], info)
 
-        import yaml
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
-
-        print(f"💾 Metadata saved to: {metadata_path}")
+        print(f"💾 Metadata saved to: {store.path}")
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Global Material Assignment
+Assign materials to all cuts at once (Hungarian algorithm / min-cost flow LP)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    from scipy.optimize import linear_sum_assignment, linprog, milp, Bounds, LinearConstraint
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+@dataclass
+class AssignmentResult:
+    """割り当て結果"""
+    columns: List[Optional[int]]  # カットごとの素材の列番号（なしは None）
+    scores: List[Optional[float]]  # カットごとのスコア
+    method: str  # 'hungarian' / 'flow' / 'argmax' / 'greedy'
+    relaxed: bool = False  # 下限（最小使用率・カテゴリ下限）を満たせず緩和した
+
+
+def parse_quota(value) -> Tuple[int, Optional[int]]:
+    """
+    カテゴリ割り当て数の指定を (下限, 上限) に変換
+
+    Args:
+        value: 5（上限のみ）、"4-5"（範囲）、{'min': 4, 'max': 5}
+
+    Returns:
+        (下限, 上限)（上限なしは None）
+    """
+    if isinstance(value, dict):
+        return int(value.get('min', 0)), (int(value['max']) if value.get('max') is not None else None)
+    if isinstance(value, str) and '-' in value:
+        low, high = value.split('-', 1)
+        return int(low), int(high)
+    return 0, int(value)
+
+
+class MaterialAssigner:
+    """
+    カット×素材のスコア行列から全カットの割り当てを一括で決める
+
+    - 再利用なし・カテゴリ割り当て数の指定なし → ハンガリアン法（linear_sum_assignment）
+    - 再利用あり・指定なし → カットごとの最大スコア
+    - それ以外 → 最小費用流のLP（HiGHS）。制約行列がネットワーク行列になるため
+      単体法の頂点解は整数になる（ならない場合のみMILPで解き直す）
+    """
+
+    def __init__(self, config: 'MaterialConfig'):
+        self.config = config
+
+        requirements = config.usage_requirements
+        self.allow_reuse = requirements.get('allow_reuse', False)
+        self.max_reuse = requirements.get('max_reuse')
+        self.minimum_usage_rate = requirements.get('minimum_usage_rate', 0.0) or 0.0
+        self.category_quotas: Dict[str, Tuple[int, Optional[int]]] = {
+            category: parse_quota(value)
+            for category, value in requirements.get('category_quotas', {}).items()
+        }
+
+        # LPの変数を絞り込む（カットごと・素材ごとの上位候補）
+        self.candidates_per_cut = config.assignment.get('candidates_per_cut', 32)
+        self.cuts_per_material = config.assignment.get('cuts_per_material', 2)
+
+    def assign(
+        self,
+        scores: np.ndarray,
+        mask: np.ndarray,
+        materials: List['Material']
+    ) -> AssignmentResult:
+        """
+        全カットの素材を割り当てる
+
+        割り当てるカット数を優先し、その中でスコアの合計を最大化する。
+
+        Args:
+            scores: 形状 (カット数, 素材数) のスコア行列
+            mask: 形状 (カット数, 素材数) の候補（True のみ割り当て可）
+            materials: 列に対応する素材
+
+        Returns:
+            AssignmentResult
+        """
+        if scores.size == 0 or not mask.any():
+            return self._result(scores, [None] * scores.shape[0], 'none')
+
+        if not SCIPY_AVAILABLE:
+            print("  ⚠️ scipy not installed, using greedy global assignment")
+            return self._greedy(scores, mask, materials)
+
+        if not self.category_quotas:
+            if not self.allow_reuse:
+                return self._hungarian(scores, mask)
+            if not self.minimum_usage_rate and self.max_reuse is None:
+                return self._argmax(scores, mask)
+
+        return self._flow(scores, mask, materials)
+
+    def _hungarian(self, scores: np.ndarray, mask: np.ndarray) -> AssignmentResult:
+        """再利用なし: ハンガリアン法"""
+        low, high = scores[mask].min(), scores[mask].max()
+        # 候補外のペアは割り当て数を優先できるだけ大きいコスト
+        infeasible = (high - low + 1.0) * (min(scores.shape) + 1)
+        cost = np.where(mask, high - scores, infeasible)
+
+        rows, cols = linear_sum_assignment(cost)
+        columns: List[Optional[int]] = [None] * scores.shape[0]
+        for row, col in zip(rows, cols):
+            if mask[row, col]:
+                columns[row] = int(col)
+
+        # 再利用なしでは割り当て数が最大なので、届かなければ最小使用率は満たせない
+        used = sum(col is not None for col in columns)
+        relaxed = used < math.ceil(self.minimum_usage_rate * scores.shape[1] - 1e-9)
+        return self._result(scores, columns, 'hungarian', relaxed)
+
+    def _argmax(self, scores: np.ndarray, mask: np.ndarray) -> AssignmentResult:
+        """再利用あり・制約なし: カットごとの最大スコア"""
+        masked = np.where(mask, scores, -np.inf)
+        best = masked.argmax(axis=1)
+        columns = [int(col) if mask[row, col] else None for row, col in enumerate(best)]
+        return self._result(scores, columns, 'argmax')
+
+    def _flow(
+        self,
+        scores: np.ndarray,
+        mask: np.ndarray,
+        materials: List['Material'],
+        prune: bool = True
+    ) -> AssignmentResult:
+        """
+        割り当て数・カテゴリ・最小使用率の制約付き: 最小費用流のLP
+
+        変数 x[カット, 素材]（候補ペアのみ）と、最小使用率がある場合の y[素材]（使用したか）。
+        候補ペアの絞り込みで下限を満たせなくなった場合は、全ペアで解き直してから緩和する。
+        """
+        n_cuts, n_materials = scores.shape
+        rows, cols = self._candidate_pairs(scores, mask) if prune else np.nonzero(mask)
+        n_pairs = len(rows)
+        pair_ids = np.arange(n_pairs)
+        values = scores[rows, cols]
+
+        # 割り当て1件あたりの報酬（スコア差の合計より大きく、割り当て数を優先する）
+        reward = (values.max() - values.min() + 1.0) * (min(n_cuts, n_pairs) + 1)
+
+        blocks = []  # (行列, 下限, 上限)
+        capacity = 1 if not self.allow_reuse else (self.max_reuse or n_cuts)
+
+        # カット: 素材は1つまで
+        blocks.append((
+            sparse.csr_matrix((np.ones(n_pairs), (rows, pair_ids)), shape=(n_cuts, n_pairs)),
+            np.zeros(n_cuts), np.ones(n_cuts)
+        ))
+        # 素材: 使用回数の上限
+        blocks.append((
+            sparse.csr_matrix((np.ones(n_pairs), (cols, pair_ids)), shape=(n_materials, n_pairs)),
+            np.zeros(n_materials), np.full(n_materials, float(capacity))
+        ))
+
+        # カテゴリ: 割り当て数の範囲
+        quotas = [(category, low, high) for category, (low, high) in self.category_quotas.items()]
+        if quotas:
+            category_rows = {category: i for i, (category, _, _) in enumerate(quotas)}
+            material_rows = np.array([category_rows.get(m.category, -1) for m in materials])
+            pair_rows = material_rows[cols]
+            in_quota = pair_rows >= 0
+            blocks.append((
+                sparse.csr_matrix(
+                    (np.ones(in_quota.sum()), (pair_rows[in_quota], pair_ids[in_quota])),
+                    shape=(len(quotas), n_pairs)
+                ),
+                np.array([float(low) for _, low, _ in quotas]),
+                np.array([float(high) if high is not None else np.inf for _, _, high in quotas])
+            ))
+
+        # 最小使用率: 使用した素材数（再利用ありの場合は y で数える）
+        required = math.ceil(self.minimum_usage_rate * len(materials) - 1e-9)
+        n_vars = n_pairs
+        if required and self.allow_reuse:
+            n_vars = n_pairs + n_materials
+            # y[素材] <= その素材への割り当て数
+            link = sparse.hstack([
+                -sparse.csr_matrix((np.ones(n_pairs), (cols, pair_ids)), shape=(n_materials, n_pairs)),
+                sparse.identity(n_materials, format='csr')
+            ])
+            blocks = [(sparse.hstack([a, sparse.csr_matrix((a.shape[0], n_materials))]), lo, hi)
+                      for a, lo, hi in blocks]
+            blocks.append((link, np.full(n_materials, -np.inf), np.zeros(n_materials)))
+            blocks.append((
+                sparse.hstack([sparse.csr_matrix((1, n_pairs)), sparse.csr_matrix(np.ones((1, n_materials)))]),
+                np.array([float(required)]), np.array([np.inf])
+            ))
+        elif required:
+            # 再利用なしなら使用素材数 = 割り当て数
+            blocks.append((
+                sparse.csr_matrix(np.ones((1, n_pairs))),
+                np.array([float(required)]), np.array([np.inf])
+            ))
+
+        objective = np.zeros(n_vars)
+        objective[:n_pairs] = -(values + reward)
+
+        x, relaxed = self._solve(objective, blocks)
+        if relaxed and prune and n_pairs < mask.sum():
+            # 下限を満たせないのが絞り込みのせいかもしれない
+            return self._flow(scores, mask, materials, prune=False)
+        chosen = np.flatnonzero(x[:n_pairs] > 0.5)
+
+        columns: List[Optional[int]] = [None] * n_cuts
+        for pair in chosen:
+            columns[rows[pair]] = int(cols[pair])
+        return self._result(scores, columns, 'flow', relaxed)
+
+    def _solve(self, objective: np.ndarray, blocks: List) -> Tuple[np.ndarray, bool]:
+        """LPを解く（下限を満たせない場合は下限を外して解き直す）"""
+        for relaxed in (False, True):
+            if relaxed:
+                blocks = [(a, np.minimum(lo, 0.0), hi) for a, lo, hi in blocks]
+
+            matrix = sparse.vstack([a for a, _, _ in blocks], format='csr')
+            lower = np.concatenate([lo for _, lo, _ in blocks])
+            upper = np.concatenate([hi for _, _, hi in blocks])
+
+            # linprog は A_ub x <= b_ub の形式（両側の制約は2行に分ける）
+            has_lower = np.isfinite(lower) & (lower > 0)
+            a_ub = sparse.vstack([matrix, -matrix[has_lower]], format='csr')
+            b_ub = np.concatenate([upper, -lower[has_lower]])
+            finite = np.isfinite(b_ub)
+
+            result = linprog(
+                objective,
+                A_ub=a_ub[finite],
+                b_ub=b_ub[finite],
+                bounds=(0, 1),
+                method='highs-ds'
+            )
+            if result.status == 2:  # infeasible
+                continue
+            if result.status != 0:
+                raise RuntimeError(f"Assignment LP failed: {result.message}")
+
+            x = result.x
+            if np.abs(x - np.round(x)).max() > 1e-6:
+                # 整数にならない場合（再利用＋最小使用率）はMILPで解き直す
+                result = milp(
+                    objective,
+                    constraints=LinearConstraint(matrix, lower, upper),
+                    integrality=np.ones(len(objective)),
+                    bounds=Bounds(0, 1),
+                    options={'mip_rel_gap': 0}
+                )
+                if result.status == 2:  # infeasible
+                    continue
+                if result.status != 0 or result.x is None:
+                    # 時間切れなどで解が得られない
+                    raise RuntimeError(f"Assignment MILP failed: {result.message}")
+                x = result.x
+            return np.round(x), relaxed
+
+        raise RuntimeError("Assignment LP is infeasible")
+
+    def _candidate_pairs(self, scores: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        LPの変数にする候補ペア
+
+        カットごとの上位 candidates_per_cut 件、素材ごとの上位 cuts_per_material 件、
+        制約なしの最適割り当て（ハンガリアン法）のペアの和集合。
+        上位候補が多くのカットで重なっても、割り当て数の最大値は候補内で実現できる。
+        """
+        n_cuts, n_materials = scores.shape
+        masked = np.where(mask, scores, -np.inf)
+        keep = np.zeros_like(mask)
+
+        k = min(self.candidates_per_cut, n_materials)
+        if k < n_materials:
+            top = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+            np.put_along_axis(keep, top, True, axis=1)
+        else:
+            keep[:] = True
+
+        k = min(self.cuts_per_material, n_cuts)
+        if k < n_cuts:
+            top = np.argpartition(-masked, k - 1, axis=0)[:k, :]
+            np.put_along_axis(keep, top, True, axis=0)
+        else:
+            keep[:] = True
+
+        if not keep[mask].all():
+            for row, col in enumerate(self._hungarian(scores, mask).columns):
+                if col is not None:
+                    keep[row, col] = True
+
+        return np.nonzero(keep & mask)
+
+    def _greedy(
+        self,
+        scores: np.ndarray,
+        mask: np.ndarray,
+        materials: List['Material']
+    ) -> AssignmentResult:
+        """scipy がない場合: スコアの高いペアから順に割り当て（上限のみ考慮）"""
+        capacity = 1 if not self.allow_reuse else (self.max_reuse or scores.shape[0])
+        used = np.zeros(scores.shape[1], dtype=np.int64)
+        category_used: Dict[str, int] = {}
+
+        columns: List[Optional[int]] = [None] * scores.shape[0]
+        rows, cols = np.nonzero(mask)
+        for pair in np.argsort(-scores[rows, cols], kind='stable'):
+            row, col = rows[pair], cols[pair]
+            category = materials[col].category
+            high = self.category_quotas.get(category, (0, None))[1]
+            if columns[row] is not None or used[col] >= capacity:
+                continue
+            if high is not None and category_used.get(category, 0) >= high:
+                continue
+            columns[row] = int(col)
+            used[col] += 1
+            category_used[category] = category_used.get(category, 0) + 1
+
+        return self._result(scores, columns, 'greedy')
+
+    @staticmethod
+    def _result(
+        scores: np.ndarray,
+        columns: List[Optional[int]],
+        method: str,
+        relaxed: bool = False
+    ) -> AssignmentResult:
+        return AssignmentResult(
+            columns=columns,
+            scores=[float(scores[row, col]) if col is not None else None for row, col in enumerate(columns)],
+            method=method,
+            relaxed=relaxed
+        )
@@ -3,10 +3,14 @@
 Material Matching Engine with Scoring System
 """
 
-import re
-from typing import Dict, List, Optional
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 from collections import defaultdict
 
+import numpy as np
+
+from .score_matrix import MaterialFeatures, top_k_indices
+from .tokenizer import get_tokenizer
+
 
 class MaterialMatcher:
     """素材マッチングエンジン"""
@@ -14,17 +18,30 @@ class MaterialMatcher:
     def __init__(self, config: 'MaterialConfig'):
         self.config = config
         self.weights = config.scoring_weights
+        self.tokenizer = get_tokenizer(config.tokenizer)
 
         # インデックス
         self.by_category: Dict[str, List['Material']] = defaultdict(list)
         self.by_subject: Dict[str, List['Material']] = defaultdict(list)
         self.by_time: Dict[str, List['Material']] = defaultdict(list)
 
+        # キーワード検索用: 素材テキストのトークン転置インデックス
+        self.tokens: Dict[str, FrozenSet[str]] = {}
+        self.by_token: Dict[str, Set[str]] = defaultdict(set)
+        self._keyword_cache: Dict[str, Dict[str, int]] = {}
+
+        # スコア行列用の特徴量（index_materials で作成）
+        self.features: Optional[MaterialFeatures] = None
+        self._indexed_list: Optional[List['Material']] = None
+
     def index_materials(self, materials: List['Material']):
         """素材をインデックス化して高速検索"""
         self.by_category.clear()
         self.by_subject.clear()
         self.by_time.clear()
+        self.tokens.clear()
+        self.by_token.clear()
+        self._keyword_cache.clear()
 
         for material in materials:
             # カテゴリ別
@@ -38,6 +55,15 @@ class MaterialMatcher:
             if material.time_of_day:
                 self.by_time[material.time_of_day.lower()].append(material)
 
+            # キーワード用トークン（インデックス時に1回だけ分割）
+            tokens = self.tokenizer.token_set(self._material_text(material))
+            self.tokens[material.id] = tokens
+            for token in tokens:
+                self.by_token[token].add(material.id)
+
+        self.features = MaterialFeatures(materials, matcher=self)
+        self._indexed_list = materials
+
     def find_candidates(
         self,
         cut: Dict,
@@ -60,8 +86,37 @@ class MaterialMatcher:
         if not self.config.usage_requirements.get('allow_reuse', False):
             candidates = [m for m in candidates if m.assigned_to is None]
 
+        # 類似素材の絞り込みは採点後（_collapse_duplicates でクラスタ内の最高スコアを残す）
         return candidates
 
+    def _collapse_duplicates(
+        self,
+        candidates: List['Material'],
+        scores: Sequence[float]
+    ) -> List[Tuple['Material', float]]:
+        """
+        知覚ハッシュのクラスタごとにスコア最高の候補だけを残す
+
+        skip_duplicates が無効なら全候補を返す。同点は候補順で先の素材。
+
+        Args:
+            candidates: find_candidates の候補
+            scores: 候補ごとのスコア
+
+        Returns:
+            [(素材, スコア), ...]（候補順）
+        """
+        pairs = list(zip(candidates, scores))
+        if not self.config.deduplication.get('skip_duplicates', True):
+            return pairs
+
+        best: Dict[str, int] = {}
+        for i, (material, score) in enumerate(pairs):
+            cluster = material.duplicate_of or material.id
+            if cluster not in best or score > pairs[best[cluster]][1]:
+                best[cluster] = i
+        return [pairs[i] for i in sorted(best.values())]
+
     def score_material(
         self,
         material: 'Material',
@@ -73,10 +128,12 @@ class MaterialMatcher:
         scene_desc = cut.get('scene_description', '').lower()
 
         # 1. キーワードマッチング
-        keywords = self._extract_keywords(scene_desc)
-        material_text = f"{material.description} {material.main_subject} {material.location or ''}".lower()
-
-        keyword_matches = sum(1 for kw in keywords if kw in material_text)
+        if material.id in self.tokens:
+            keyword_matches = self.keyword_matches(scene_desc).get(material.id, 0)
+        else:
+            # インデックス外の素材は直接照合
+            material_tokens = self.tokenizer.token_set(self._material_text(material))
+            keyword_matches = sum(1 for kw in self._extract_keywords(scene_desc) if kw in material_tokens)
         score += keyword_matches * self.weights.get('keyword_match', 5.0)
 
         # 2. カテゴリマッチング
@@ -107,12 +164,418 @@ class MaterialMatcher:
 
         return score
 
+    def score_matrix(
+        self,
+        cuts: List[Dict],
+        materials: Optional[List['Material']] = None,
+        bonus_terms: Optional[Callable] = None
+    ) -> np.ndarray:
+        """
+        カット×素材のスコア行列（score_material と同じ採点を一括計算）
+
+        Args:
+            cuts: カットのリスト
+            materials: 対象素材（省略時はインデックス済みの全素材）
+            bonus_terms: 戦略ボーナス (features, cuts) -> 配列
+                         （(カット数, 素材数) にブロードキャストできる形状）
+
+        Returns:
+            形状 (カット数, 素材数) のスコア行列
+        """
+        features, columns = self._features_for(materials)
+        if columns is not None:
+            # 対象素材の行だけを採点（ライブラリ全体を採点してから切り出さない）
+            features = features.subset(columns)
+        return self._score_features(features, cuts, bonus_terms)
+
+    def _score_features(
+        self,
+        features: MaterialFeatures,
+        cuts: List[Dict],
+        bonus_terms: Optional[Callable] = None
+    ) -> np.ndarray:
+        """特徴量の全素材に対するスコア行列（score_matrix の本体）"""
+        weights = self.weights
+
+        # 1. キーワードマッチング
+        scores = features.keyword_counts(cuts, self._extract_keywords) * weights.get('keyword_match', 5.0)
+
+        # 2. カテゴリマッチング
+        scores += features.match_cuts(
+            'category', cuts, self._category_matches, lower=False
+        ) * weights.get('category_match', 3.0)
+
+        # 3. 時間帯マッチング
+        scores += features.match_cuts('time_of_day', cuts, self._time_matches) * weights.get('time_match', 2.0)
+
+        # 4. ムードマッチング
+        scores += features.match_cuts('color_tone', cuts, self._mood_matches) * weights.get('mood_match', 2.0)
+
+        # 5. 品質ボーナス
+        scores += features.is_hd * weights.get('quality_bonus', 1.0)
+        scores += features.quality * weights.get('quality_bonus', 1.0)
+
+        # 6. 未使用ボーナス
+        scores += features.unused() * weights.get('unused_bonus', 0.5)
+
+        # 戦略固有のボーナス
+        if bonus_terms is not None:
+            bonus = bonus_terms(features, cuts)
+            if bonus is not None:
+                scores += bonus
+
+        return scores
+
+    def candidate_mask(
+        self,
+        cuts: List[Dict],
+        materials: Optional[List['Material']] = None,
+        scores: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        find_candidates の条件（カテゴリ・再利用）と類似素材の絞り込みをカット×素材の真偽値で返す
+
+        類似素材はカットごとにクラスタ内でスコア最高の候補だけを残す（同点は素材リスト順で先）。
+
+        Args:
+            cuts: カットのリスト
+            materials: 対象素材（省略時はインデックス済みの全素材）
+            scores: score_matrix のスコア行列（省略時は戦略ボーナスなしで計算）
+
+        Returns:
+            形状 (カット数, 素材数) の真偽値行列
+        """
+        features, columns = self._features_for(materials)
+
+        has_categories = np.array([bool(cut.get('categories')) for cut in cuts])
+        mask = features.match_cuts('category', cuts, self._category_matches, lower=False) > 0
+        mask |= ~has_categories[:, None]
+
+        if not self.config.usage_requirements.get('allow_reuse', False):
+            mask &= features.unused() > 0
+
+        if columns is not None:
+            mask = mask[:, columns]
+            members = [features.materials[c] for c in columns]
+        else:
+            members = features.materials
+
+        if self.config.deduplication.get('skip_duplicates', True):
+            clusters = {}
+            cluster_codes = np.array(
+                [clusters.setdefault(m.duplicate_of or m.id, len(clusters)) for m in members],
+                dtype=np.int64
+            )
+            if len(clusters) < len(members):
+                if scores is None:
+                    scores = self.score_matrix(cuts, materials)
+                for row in range(mask.shape[0]):
+                    positions = np.flatnonzero(mask[row])
+                    # クラスタ順・スコア降順・リスト順に並べ、各クラスタの先頭を残す
+                    order = np.lexsort((positions, -scores[row, positions], cluster_codes[positions]))
+                    _, first = np.unique(cluster_codes[positions[order]], return_index=True)
+                    keep = np.zeros(mask.shape[1], dtype=bool)
+                    keep[positions[order[first]]] = True
+                    mask[row] = keep
+
+        return mask
+
+    def top_k(
+        self,
+        cuts,
+        materials: Optional[List['Material']] = None,
+        k: int = 1,
+        bonus_terms: Optional[Callable] = None,
+        bonus_bound: Optional[Callable] = None
+    ):
+        """
+        カットごとの上位k件の候補（スコア降順）
+
+        cuts にカット1件（dict）を渡すと、スコアの上限で枝刈りしながら
+        そのカットの上位k件だけを求める（_top_k_pruned）。
+
+        Args:
+            cuts: カットのリスト、またはカット1件
+            materials: 対象素材（省略時はインデックス済みの全素材）
+            k: 取得数
+            bonus_terms: 戦略ボーナス（score_matrix を参照）
+            bonus_bound: 戦略ボーナスの上限 (features, cut) -> 素材ごとの配列 / スカラー
+                         （カット1件の場合のみ。None なら枝刈りしない）
+
+        Returns:
+            カットごとの [(素材, スコア), ...]（カット1件の場合はそのカットのリスト）
+        """
+        if isinstance(cuts, dict):
+            return self._top_k_pruned(cuts, materials, k, bonus_terms, bonus_bound)
+
+        members = materials if materials is not None else self.features.materials
+        scores = self.score_matrix(cuts, materials, bonus_terms)
+        scores = np.where(self.candidate_mask(cuts, materials, scores), scores, -np.inf)
+
+        results = []
+        for row, indices in zip(scores, top_k_indices(scores, k)):
+            results.append([
+                (members[i], float(row[i])) for i in indices if np.isfinite(row[i])
+            ])
+        return results
+
+    def _top_k_pruned(
+        self,
+        cut: Dict,
+        materials: Optional[List['Material']],
+        k: int,
+        bonus_terms: Optional[Callable],
+        bonus_bound: Optional[Callable]
+    ) -> List[Tuple['Material', float]]:
+        """
+        1カットの上位k件（スコアの上限による枝刈り、MaxScore方式）
+
+        キーワード・カテゴリ・時間帯・ムード・品質の項は全素材をベクトル演算で正確に求め、
+        素材1件ずつの確認が必要な項（未使用ボーナス、戦略ボーナス）は上限で見積もる。
+        上限の高い順にブロック単位で候補を確認・採点し、残りの上限がk位のスコアを
+        下回った時点で打ち切る。
+
+        候補と同点の扱いは find_candidates + score_material + _collapse_duplicates と同じ
+        （同点は find_candidates の並び順で先の素材）。
+        """
+        if k <= 0:
+            return []
+
+        features, positions = self._candidate_positions(cut, materials)
+        if len(positions) == 0:
+            return []
+
+        weights = self.weights
+
+        # 正確に求まる項（score_matrix と同じ順に加算）
+        keyword_counts = features.keyword_counts([cut], self._extract_keywords)
+        base = keyword_counts[0] * weights.get('keyword_match', 5.0)
+        base += features.match_cuts(
+            'category', [cut], self._category_matches, lower=False
+        )[0] * weights.get('category_match', 3.0)
+        base += features.match_cuts('time_of_day', [cut], self._time_matches)[0] * weights.get('time_match', 2.0)
+        base += features.match_cuts('color_tone', [cut], self._mood_matches)[0] * weights.get('mood_match', 2.0)
+        base += features.is_hd * weights.get('quality_bonus', 1.0)
+        base += features.quality * weights.get('quality_bonus', 1.0)
+
+        # 上限: 未使用ボーナス + 戦略ボーナスの上限
+        bound = base[positions] + max(weights.get('unused_bonus', 0.5), 0.0)
+        if bonus_terms is not None:
+            extra = bonus_bound(features, cut) if bonus_bound is not None else None
+            if extra is None:
+                bound = np.full(len(positions), np.inf)
+            else:
+                extra = np.asarray(extra, dtype=np.float64)
+                bound = bound + (extra[positions] if extra.ndim else extra)
+
+        allow_reuse = self.config.usage_requirements.get('allow_reuse', False)
+        skip_duplicates = self.config.deduplication.get('skip_duplicates', True)
+        clusters = self._cluster_codes(features) if skip_duplicates else None
+        cluster_sizes = features.cached('_cluster_sizes', lambda: np.bincount(clusters)) if skip_duplicates else None
+        representatives: Dict[int, Optional[int]] = {}
+
+        def representative(cluster: int) -> Optional[int]:
+            # 類似素材のクラスタで（使用可能な素材のうち）スコア最高の素材、同点は候補順で先
+            if cluster not in representatives:
+                members = np.array([
+                    p for p in positions[clusters[positions] == cluster]
+                    if allow_reuse or features.materials[p].assigned_to is None
+                ], dtype=np.int64)
+                best = None
+                if len(members):
+                    view = features.subset(members, keyword_counts=keyword_counts)
+                    best = int(members[np.argmax(self._score_features(view, [cut], bonus_terms)[0])])
+                representatives[cluster] = best
+            return representatives[cluster]
+
+        def is_candidate(p: int) -> bool:
+            if not allow_reuse and features.materials[p].assigned_to is not None:
+                return False
+            if skip_duplicates and cluster_sizes[clusters[p]] > 1:
+                return representative(clusters[p]) == p
+            return True
+
+        # (スコア, 候補順, 位置) をスコア降順・候補順で保持
+        results: List[Tuple[float, int, int]] = []
+        for block in self._bound_order(bound, k):
+            if len(results) >= k:
+                # 上限・候補順の並びで先頭の候補がk位に勝てなければ残りも勝てない
+                kth_score, kth_rank, _ = results[-1]
+                first = block[0]
+                if bound[first] < kth_score or (bound[first] == kth_score and first > kth_rank):
+                    break
+
+            ranks = [int(r) for r in block if is_candidate(int(positions[r]))]
+            if not ranks:
+                continue
+
+            block_positions = positions[ranks]
+            view = features.subset(block_positions, keyword_counts=keyword_counts)
+            scores = self._score_features(view, [cut], bonus_terms)[0]
+            results.extend(zip(scores.tolist(), ranks, block_positions.tolist()))
+            results.sort(key=lambda r: (-r[0], r[1]))
+            del results[k:]
+
+        return [(features.materials[p], score) for score, _, p in results]
+
+    def _candidate_positions(
+        self,
+        cut: Dict,
+        materials: Optional[List['Material']]
+    ) -> Tuple[MaterialFeatures, np.ndarray]:
+        """
+        find_candidates と同じ候補の特徴量と位置（候補の並び順）
+
+        カテゴリ指定があればインデックスからカテゴリ順に、なければ素材リスト順に並べる。
+        未使用・類似素材の条件は含まない（_top_k_pruned で候補ごとに確認する）。
+        """
+        categories = cut.get('categories', [])
+        if categories and self.features is not None:
+            features = self.features
+            values, codes = features.column('category', lower=False)
+            codes_by_value = {value: i for i, value in enumerate(values)}
+            parts = [
+                features.cached(
+                    f'_category:{category}',
+                    lambda code=codes_by_value[category]: np.flatnonzero(codes == code)
+                )
+                for category in categories if category in codes_by_value
+            ]
+            if not parts:
+                return features, np.empty(0, dtype=np.int64)
+            positions = np.concatenate(parts)
+            if len(set(categories)) < len(categories):
+                # 同じカテゴリが重複して指定された場合は最初の出現のみ
+                _, first = np.unique(positions, return_index=True)
+                positions = positions[np.sort(first)]
+            return features, positions
+
+        features, columns = self._features_for(materials)
+        positions = columns if columns is not None else np.arange(len(features), dtype=np.int64)
+        if categories:
+            matched = features.match_cuts('category', [cut], self._category_matches, lower=False)[0] > 0
+            positions = positions[matched[positions]]
+        return features, positions
+
+    @staticmethod
+    def _cluster_codes(features: MaterialFeatures) -> np.ndarray:
+        """類似素材のクラスタ番号（duplicate_of または自身のID）"""
+        def compute():
+            clusters: Dict[str, int] = {}
+            return np.array(
+                [clusters.setdefault(m.duplicate_of or m.id, len(clusters)) for m in features.materials],
+                dtype=np.int64
+            )
+        return features.cached('_clusters', compute)
+
+    @staticmethod
+    def _bound_order(bound: np.ndarray, k: int, block_size: int = 64):
+        """
+        候補の番号を（上限の降順, 候補順）でブロック単位で返す
+
+        最初のブロックは部分選択（同じ上限の候補は候補順で先のもの）で選び、
+        足りなければ残りを整列する。
+        """
+        block_size = max(block_size, 2 * k)
+        if len(bound) <= block_size:
+            yield np.argsort(-bound, kind='stable')
+            return
+
+        threshold = -np.partition(-bound, block_size - 1)[block_size - 1]
+        above = np.flatnonzero(bound > threshold)
+        ties = np.flatnonzero(bound == threshold)[:block_size - len(above)]
+        first = np.concatenate([above, ties])
+        first = first[np.argsort(-bound[first], kind='stable')]
+        yield first
+
+        rest = np.ones(len(bound), dtype=bool)
+        rest[first] = False
+
+        # 次の1件だけを先に返す（多くの場合ここで打ち切られ、残りの整列は不要）
+        remaining = np.flatnonzero(rest)
+        following = remaining[np.argmax(bound[remaining])]
+        yield np.array([following])
+
+        rest[following] = False
+        remaining = np.flatnonzero(rest)
+        remaining = remaining[np.argsort(-bound[remaining], kind='stable')]
+        for start in range(0, len(remaining), block_size):
+            yield remaining[start:start + block_size]
+
+    def _features_for(
+        self,
+        materials: Optional[List['Material']]
+    ) -> Tuple[MaterialFeatures, Optional[np.ndarray]]:
+        """
+        素材リストの特徴量
+
+        インデックス済みの素材だけなら共有の特徴量と列番号を返し、
+        それ以外はその場で特徴量を作る。
+        """
+        indexed = self.features
+        if materials is None:
+            if indexed is None:
+                raise ValueError("index_materials() must be called before scoring all materials")
+            return indexed, None
+
+        if indexed is not None:
+            # インデックス作成時と同じリスト
+            if materials is self._indexed_list and len(materials) == len(indexed.materials):
+                return indexed, None
+
+            columns = [indexed.position.get(m.id) for m in materials]
+            if all(c is not None and indexed.materials[c] is m for c, m in zip(columns, materials)):
+                return indexed, np.array(columns, dtype=np.int64)
+
+        return MaterialFeatures(materials, tokenizer=self.tokenizer), None
+
+    @staticmethod
+    def _category_matches(category: str, cut: Dict) -> bool:
+        return category in cut.get('categories', [])
+
+    @staticmethod
+    def _time_matches(time_of_day: str, cut: Dict) -> bool:
+        cut_time = cut.get('time_of_day', '').lower()
+        return bool(cut_time and time_of_day and cut_time in time_of_day)
+
+    def _mood_matches(self, color_tone: str, cut: Dict) -> bool:
+        cut_mood = cut.get('mood', '').lower()
+        return bool(cut_mood and color_tone and self._mood_matches_color(cut_mood, color_tone))
+
+    def keyword_matches(self, scene_desc: str) -> Dict[str, int]:
+        """
+        シーン説明のキーワードを含む素材と一致数
+
+        シーン説明のトークンごとに転置リストを引いて数える。シーンごとにキャッシュ。
+
+        Args:
+            scene_desc: シーン説明（小文字）
+
+        Returns:
+            {素材ID: 一致したキーワード数}（一致なしの素材は含まない）
+        """
+        if scene_desc in self._keyword_cache:
+            return self._keyword_cache[scene_desc]
+
+        matches: Dict[str, int] = defaultdict(int)
+        for keyword in self._extract_keywords(scene_desc):
+            for material_id in self._keyword_postings(keyword):
+                matches[material_id] += 1
+
+        self._keyword_cache[scene_desc] = dict(matches)
+        return self._keyword_cache[scene_desc]
+
+    def _keyword_postings(self, keyword: str) -> Set[str]:
+        """キーワード（トークン）を含む素材IDの集合"""
+        return self.by_token.get(keyword, set())
+
+    def _material_text(self, material: 'Material') -> str:
+        """キーワード照合用の素材テキスト（小文字）"""
+        return f"{material.description} {material.main_subject} {material.location or ''}".lower()
+
     def _extract_keywords(self, text: str) -> List[str]:
-        """テキストからキーワードを抽出"""
-        # 3文字以上の単語を抽出
-        words = re.findall(r'\b\w{3,}\b', text.lower())
-        # 重複を除去
-        return list(set(words))
+        """テキストからキーワードを抽出（素材と同じトークナイザー、重複なし）"""
+        return sorted(self.tokenizer.token_set(text))
 
     def _mood_matches_color(self, mood: str, color_tone: str) -> bool:
         """ムードと色調の相性チェック"""
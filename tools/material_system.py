@@ -6,10 +6,16 @@ Supports multiple project types with pluggable strategies
 
 import os
 import json
-import yaml
+import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, asdict
+
+from core.base import ProgressCallback, configure_logging, load_config, report_progress, thaw
+
+from .metadata_store import METADATA_BACKENDS, MetadataStore, open_metadata_store
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -36,13 +42,22 @@ class Material:
     composition: Optional[str] = None
 
     # 使用状況
-    assigned_to: Optional[int] = None
+    assigned_to: Optional[int] = None  # カット番号（ストーリーボードごとに1から）
+    assigned_storyboard: Optional[str] = None  # 割り当て先のストーリーボード（動画）
     match_score: float = 0.0
 
     # 品質指標
     quality_score: float = 0.0
     is_hd: bool = False
 
+    # 変更検出（インクリメンタルスキャン）
+    mtime: Optional[float] = None
+    content_hash: Optional[str] = None
+
+    # 類似素材（知覚ハッシュ）
+    phash: Optional[str] = None
+    duplicate_of: Optional[str] = None
+
     @property
     def aspect_ratio(self) -> float:
         """アスペクト比を計算"""
@@ -67,7 +82,7 @@ class Material:
         is_hd = width >= 1920 or height >= 1080
 
         return cls(
-            id=data.get('id', f"{category}_{Path(filename).stem}"),
+            id=data.get('id') or f"{category}_{Path(filename).stem}",
             filename=filename,
             path=file_path,
             category=category,
@@ -82,9 +97,14 @@ class Material:
             color_tone=data.get('color_tone'),
             composition=data.get('composition'),
             assigned_to=data.get('assigned_to'),
+            assigned_storyboard=data.get('assigned_storyboard'),
             match_score=data.get('match_score', 0.0),
             quality_score=data.get('quality_score', 0.0),
-            is_hd=is_hd
+            is_hd=is_hd,
+            mtime=data.get('mtime'),
+            content_hash=data.get('content_hash'),
+            phash=data.get('phash'),
+            duplicate_of=data.get('duplicate_of')
         )
 
     def to_dict(self) -> Dict:
@@ -101,12 +121,17 @@ class MaterialConfig:
     usage_requirements: Dict[str, Any]  # 使用要件
     constraints: Dict[str, bool]  # 制約（変形禁止など）
     scoring_weights: Dict[str, float]  # スコアリングの重み
+    deduplication: Dict[str, Any] = field(default_factory=dict)  # 類似素材の扱い
+    analysis: Dict[str, Any] = field(default_factory=dict)  # AI解析の並列度・レート制限
+    metadata_backend: str = 'auto'  # メタデータの保存形式（yaml / sqlite / auto）
+    assignment: Dict[str, Any] = field(default_factory=dict)  # 素材の割り当て方式（greedy / global）
+    tokenizer: str = 'ngram'  # キーワード照合のトークナイザー（ngram / morphological / auto）
 
     @classmethod
     def from_yaml(cls, config_path: Path) -> 'MaterialConfig':
-        """プロジェクト設定ファイルから読み込み"""
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        """プロジェクト設定ファイルから読み込み（解析結果はプロセス内でキャッシュ）"""
+        # キャッシュは共有の読み取り専用ビューなので、設定値は可変のコピーで持つ
+        data = thaw(load_config(config_path))
 
         # プロジェクトタイプ
         project_type = data.get('project', {}).get('type', 'custom')
@@ -132,6 +157,21 @@ class MaterialConfig:
         # 制約
         constraints = materials_config.get('constraints', {})
 
+        # 類似素材（知覚ハッシュ）
+        deduplication = materials_config.get('deduplication', {})
+
+        # AI解析パイプライン
+        analysis = materials_config.get('analysis', {})
+
+        # メタデータの保存形式
+        metadata_backend = materials_config.get('metadata_backend', 'auto')
+
+        # 素材の割り当て方式
+        assignment = materials_config.get('assignment', {})
+
+        # キーワード照合のトークナイザー
+        tokenizer = materials_config.get('tokenizer', 'ngram')
+
         # スコアリング重み（カスタム or デフォルト）
         scoring_weights = data.get('material_scoring_weights', cls._default_weights())
 
@@ -141,7 +181,12 @@ class MaterialConfig:
             categories=categories,
             usage_requirements=usage_requirements,
             constraints=constraints,
-            scoring_weights=scoring_weights
+            scoring_weights=scoring_weights,
+            deduplication=deduplication,
+            analysis=analysis,
+            metadata_backend=metadata_backend,
+            assignment=assignment,
+            tokenizer=tokenizer
         )
 
     @staticmethod
@@ -160,24 +205,28 @@ class MaterialConfig:
 class MaterialSystem:
     """汎用素材管理システム"""
 
-    def __init__(self, config: MaterialConfig):
+    def __init__(self, config: MaterialConfig, progress_callback: Optional[ProgressCallback] = None):
         """
         Initialize material system
 
         Args:
             config: Material configuration
+            progress_callback: カットへの割り当てごとに ProgressEvent を受け取る
         """
         self.config = config
+        self.progress_callback = progress_callback
         self.materials_root = config.project_root / "source_materials"
 
         # コンポーネント初期化（後で実装）
         from .material_analyzer import MaterialAnalyzer
         from .material_matcher import MaterialMatcher
         from .usage_tracker import UsageTracker
+        from .material_assigner import MaterialAssigner
 
         self.analyzer = MaterialAnalyzer(self.config)
         self.matcher = MaterialMatcher(self.config)
         self.tracker = UsageTracker(self.config)
+        self.assigner = MaterialAssigner(self.config)
 
         # ストラテジー選択
         self.strategy = self._select_strategy()
@@ -209,29 +258,59 @@ class MaterialSystem:
 
         return strategy_class(self.config)
 
-    def load_materials(self) -> List[Material]:
-        """素材を読み込む"""
-        # メタデータファイルから読み込み
-        metadata_file = self.materials_root / "metadata" / "photo_descriptions.yaml"
+    def load_materials(self, rescan: bool = False) -> List[Material]:
+        """
+        素材を読み込む
+
+        Args:
+            rescan: rawフォルダを再スキャンし、新規・変更ファイルのみ解析する
+                    （削除されたファイルはメタデータから除外）
 
-        if metadata_file.exists():
-            print(f"📂 Loading materials from metadata: {metadata_file}")
-            self.materials = self._load_from_metadata(metadata_file)
+        Returns:
+            素材リスト
+        """
+        # メタデータから読み込み
+        store = self.metadata_store()
+
+        if store.exists() and rescan:
+            logger.info("🔄 Rescanning materials against metadata: %s", store.path)
+            previous = self._load_from_metadata(store)
+            self.materials = self.analyzer.analyze_all_materials(
+                self.materials_root,
+                previous=previous
+            )
+        elif store.exists():
+            logger.info("📂 Loading materials from metadata: %s", store.path)
+            self.materials = self._load_from_metadata(store)
         else:
             # メタデータがない場合は自動解析
-            print("📸 Metadata not found. Analyzing materials...")
+            logger.info("📸 Metadata not found. Analyzing materials...")
             self.materials = self.analyzer.analyze_all_materials(self.materials_root)
 
         # カテゴリ別にインデックス
         self.matcher.index_materials(self.materials)
 
-        print(f"✅ Loaded {len(self.materials)} materials")
+        logger.info("✅ Loaded %d materials", len(self.materials))
         return self.materials
 
-    def _load_from_metadata(self, metadata_file: Path) -> List[Material]:
-        """メタデータファイルから素材を読み込む"""
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+    def metadata_store(self, backend: Optional[str] = None) -> MetadataStore:
+        """
+        メタデータの保存先を取得
+
+        Args:
+            backend: 'yaml' / 'sqlite' / 'auto'（省略時は設定値）
+
+        Returns:
+            MetadataStore
+        """
+        return open_metadata_store(
+            self.materials_root / "metadata",
+            backend or self.config.metadata_backend
+        )
+
+    def _load_from_metadata(self, store: MetadataStore) -> List[Material]:
+        """メタデータから素材を読み込む"""
+        data = store.load()
 
         materials = []
         for item in data.get('photos', []):
@@ -243,7 +322,8 @@ class MaterialSystem:
     def map_to_storyboard(
         self,
         storyboard: Dict,
-        allow_generation: bool = True
+        allow_generation: bool = True,
+        method: Optional[str] = None
     ) -> Dict:
         """
         ストーリーボードに素材をマッピング
@@ -251,55 +331,131 @@ class MaterialSystem:
         Args:
             storyboard: ストーリーボードデータ
             allow_generation: 素材がない場合のAI生成を許可
+            method: 'greedy'（カット順に選択）または 'global'（全カットを一括で最適化）
+                    （省略時は設定値、既定は greedy）
 
         Returns:
             素材がマッピングされたストーリーボード
         """
-        print("\n🎯 Mapping materials to storyboard...")
+        return self.map_storyboards([storyboard], allow_generation, method)[0]
 
-        mapped_storyboard = storyboard.copy()
+    def map_storyboards(
+        self,
+        storyboards: List[Dict],
+        allow_generation: bool = True,
+        method: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        複数のストーリーボード（動画のバッチ）に素材をマッピング
 
-        for i, cut in enumerate(mapped_storyboard['cuts'], 1):
-            print(f"  Cut {i}:", end=" ")
+        global の場合は全動画のカットをまとめて割り当てるため、
+        再利用禁止・カテゴリ割り当て数・最小使用率がバッチ全体に適用される。
 
-            # ストラテジーを使ってマッチング
-            best_material = self.strategy.find_best_match(
-                cut=cut,
-                materials=self.materials,
-                matcher=self.matcher
-            )
+        Args:
+            storyboards: ストーリーボードのリスト
+            allow_generation: 素材がない場合のAI生成を許可
+            method: 'greedy' または 'global'（省略時は設定値）
 
-            if best_material:
-                # 素材を割り当て
-                cut['source_material'] = {
-                    'filename': best_material.filename,
-                    'path': best_material.path,
-                    'category': best_material.category,
-                    'confidence': best_material.match_score
-                }
-                cut['generation_required'] = False
+        Returns:
+            素材がマッピングされたストーリーボードのリスト
+        """
+        method = method or self.config.assignment.get('method', 'greedy')
+        if method not in ('greedy', 'global'):
+            raise ValueError(f"Unknown assignment method: {method}")
 
-                # 使用を追跡
-                self.tracker.mark_used(best_material.id, cut_number=i)
+        logger.info("\n🎯 Mapping materials to storyboard (%s)...", method)
 
-                print(f"✓ {best_material.filename} (score: {best_material.match_score:.1f})")
+        mapped_storyboards = [storyboard.copy() for storyboard in storyboards]
+        cuts = [cut for storyboard in mapped_storyboards for cut in storyboard['cuts']]
 
-            else:
-                # 素材が見つからない
-                if allow_generation:
-                    cut['generation_required'] = True
-                    cut['generation_prompt'] = self._create_generation_prompt(cut)
-                    print("⚠️ No match, requires AI generation")
+        if method == 'global':
+            assigned = iter(self._assign_global(cuts))
+
+        done = 0
+        for index, storyboard in enumerate(mapped_storyboards):
+            # カット番号は動画ごとに1から始まるため、どの動画のカットかを併せて記録
+            storyboard_id = str(storyboard.get('id') or index)
+            for i, cut in enumerate(storyboard['cuts'], 1):
+                if method == 'global':
+                    best_material = next(assigned)
                 else:
-                    raise ValueError(f"No suitable material found for cut {i}")
+                    # ストラテジーを使ってマッチング
+                    best_material = self.strategy.find_best_match(
+                        cut=cut,
+                        materials=self.materials,
+                        matcher=self.matcher
+                    )
+
+                self._apply_material(cut, i, best_material, allow_generation, storyboard_id)
+                done += 1
+                report_progress(self.progress_callback, 'materials', done, len(cuts), cut_number=i,
+                                status='ok' if best_material else 'skipped')
 
         # 使用率を計算
         usage_stats = self.tracker.calculate_usage_rate(self.materials)
-        mapped_storyboard['material_usage'] = usage_stats
-
-        print(f"\n📊 Material usage: {usage_stats['percentage']}")
+        for storyboard in mapped_storyboards:
+            storyboard['material_usage'] = usage_stats
+
+        logger.info("\n📊 Material usage: %s", usage_stats['percentage'])
+
+        return mapped_storyboards
+
+    def _assign_global(self, cuts: List[Dict]) -> List[Optional[Material]]:
+        """全カットのスコア行列から一括で割り当て"""
+        if not cuts or not self.materials:
+            return [None] * len(cuts)
+
+        scores = self.matcher.score_matrix(cuts, self.materials, self.strategy.bonus_terms)
+        mask = self.matcher.candidate_mask(cuts, self.materials, scores)
+        result = self.assigner.assign(scores, mask, self.materials)
+        logger.info("  Solved %d cuts x %d materials (%s)", len(cuts), len(self.materials), result.method)
+        if result.relaxed:
+            logger.warning("  ⚠️ Usage requirements cannot be met, lower bounds relaxed")
+
+        assigned = []
+        for column, score in zip(result.columns, result.scores):
+            material = self.materials[column] if column is not None else None
+            if material is not None:
+                material.match_score = score
+            assigned.append(material)
+        return assigned
+
+    def _apply_material(
+        self,
+        cut: Dict,
+        cut_number: int,
+        material: Optional[Material],
+        allow_generation: bool,
+        storyboard_id: Optional[str] = None
+    ):
+        """カットに素材を割り当て（なければ生成プロンプト）"""
+        if material:
+            # 素材を割り当て
+            cut['source_material'] = {
+                'filename': material.filename,
+                'path': material.path,
+                'category': material.category,
+                'confidence': material.match_score
+            }
+            cut['generation_required'] = False
+
+            # 使用を追跡（再利用禁止の候補フィルタは assigned_to を参照）
+            self.tracker.mark_used(material.id, cut_number=cut_number, storyboard_id=storyboard_id)
+            material.assigned_to = cut_number
+            material.assigned_storyboard = storyboard_id
+
+            logger.debug("  Cut %d: ✓ %s (score: %.1f)", cut_number, material.filename, material.match_score,
+                         extra={'cut_number': cut_number})
 
-        return mapped_storyboard
+        else:
+            # 素材が見つからない
+            if allow_generation:
+                cut['generation_required'] = True
+                cut['generation_prompt'] = self._create_generation_prompt(cut)
+                logger.debug("  Cut %d: ⚠️ No match, requires AI generation", cut_number,
+                             extra={'cut_number': cut_number})
+            else:
+                raise ValueError(f"No suitable material found for cut {cut_number}")
 
     def _create_generation_prompt(self, cut: Dict) -> str:
         """素材生成用のプロンプトを作成"""
@@ -314,7 +470,7 @@ Generate an image for this scene:
 
     def generate_report(self, output_path: Optional[Path] = None) -> Dict:
         """使用レポートを生成"""
-        print("\n📋 Generating usage report...")
+        logger.info("\n📋 Generating usage report...")
 
         report = self.tracker.generate_detailed_report(self.materials)
 
@@ -322,13 +478,13 @@ Generate an image for this scene:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(report, f, indent=2, ensure_ascii=False)
-            print(f"  ✓ Report saved to: {output_path}")
+            logger.info("  ✓ Report saved to: %s", output_path)
 
         return report
 
     def validate_requirements(self) -> Dict[str, Any]:
         """プロジェクト要件を検証"""
-        print("\n✅ Validating requirements...")
+        logger.info("\n✅ Validating requirements...")
 
         validation = {
             'valid': True,
@@ -347,9 +503,9 @@ Generate an image for this scene:
             )
             validation['errors'].append(error_msg)
             validation['valid'] = False
-            print(f"  ❌ {error_msg}")
+            logger.error("  ❌ %s", error_msg)
         else:
-            print(f"  ✓ Usage rate {current_usage:.1%} meets requirement {min_usage:.1%}")
+            logger.info("  ✓ Usage rate %.1f%% meets requirement %.1f%%", current_usage * 100, min_usage * 100)
 
         # カテゴリ別の使用チェック
         category_usage = self.tracker.get_category_usage(self.materials)
@@ -357,7 +513,7 @@ Generate an image for this scene:
             if category not in category_usage or category_usage[category] == 0:
                 warning_msg = f"No materials used from category: {category}"
                 validation['warnings'].append(warning_msg)
-                print(f"  ⚠️ {warning_msg}")
+                logger.warning("  ⚠️ %s", warning_msg)
 
         return validation
 
@@ -377,10 +533,21 @@ def main():
     parser.add_argument(
         '--analyze',
         action='store_true',
-        help='Analyze materials (force re-analysis)'
+        help='Rescan materials (analyze new or changed files only)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='With --analyze, discard metadata and re-analyze every file'
+    )
+    parser.add_argument(
+        '--convert-metadata',
+        choices=['yaml', 'sqlite'],
+        help='Copy the current metadata into the given backend (YAML import/export)'
     )
 
     args = parser.parse_args()
+    configure_logging(logging.DEBUG)
 
     # Load configuration
     config = MaterialConfig.from_yaml(Path(args.config))
@@ -388,13 +555,26 @@ def main():
     # Initialize system
     system = MaterialSystem(config)
 
+    # Convert metadata between backends
+    if args.convert_metadata:
+        source = system.metadata_store()
+        target = system.metadata_store(args.convert_metadata)
+        if source.exists() and source.path != target.path:
+            target.import_from(source)
+            print(f"🔁 Metadata copied: {source.path} → {target.path}")
+
     # Load or analyze materials
-    if args.analyze:
+    if args.analyze and args.force:
         # Force re-analysis
-        metadata_file = system.materials_root / "metadata" / "photo_descriptions.yaml"
-        if metadata_file.exists():
-            metadata_file.unlink()
+        # 全バックエンドのファイルを削除（SQLiteがYAMLを取り込み直さないように）
+        for _, filename in METADATA_BACKENDS.values():
+            metadata_file = system.materials_root / "metadata" / filename
+            if metadata_file.exists():
+                metadata_file.unlink()
         system.load_materials()
+    elif args.analyze:
+        # Incremental re-analysis
+        system.load_materials(rescan=True)
     else:
         system.load_materials()
 
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Material Metadata Store
+Pluggable backends for photo metadata (YAML / SQLite)
+"""
+
+import json
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+def material_key(photo: Dict) -> str:
+    """素材のキー（id がない手動メタデータは category_ファイル名の語幹）"""
+    if photo.get('id'):
+        return photo['id']
+    return f"{photo.get('category', 'unknown')}_{Path(photo['filename']).stem}"
+
+
+class MetadataStore(ABC):
+    """素材メタデータの保存先（基底クラス）"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        """保存先が存在するか"""
+        return self.path.exists()
+
+    @abstractmethod
+    def load(self) -> Dict[str, Any]:
+        """
+        メタデータを読み込む
+
+        Returns:
+            {'photos': [素材の辞書, ...], その他のヘッダ項目}
+        """
+        pass
+
+    @abstractmethod
+    def save(self, photos: List[Dict], info: Optional[Dict[str, Any]] = None):
+        """
+        メタデータ全体を書き込む
+
+        Args:
+            photos: 素材の辞書のリスト
+            info: ヘッダ項目（project_type など）
+        """
+        pass
+
+    @abstractmethod
+    def apply(self, changed: List[Dict], removed: Iterable[str]):
+        """
+        追加・更新と削除をまとめて1回の書き込みで反映
+
+        Args:
+            changed: 追加・更新する素材（idで照合）
+            removed: 削除する素材ID（changed と重なる場合は削除を優先）
+        """
+        pass
+
+    def upsert(self, photos: List[Dict]):
+        """素材を追加・更新（idで照合）"""
+        self.apply(photos, [])
+
+    def delete(self, material_ids: Iterable[str]):
+        """素材を削除"""
+        self.apply([], material_ids)
+
+    def import_from(self, source: 'MetadataStore'):
+        """別の保存先から全件をコピー"""
+        data = source.load()
+        photos = data.pop('photos', [])
+        self.save(photos, data)
+
+
+class YamlMetadataStore(MetadataStore):
+    """photo_descriptions.yaml（手動編集・インポート/エクスポート用）"""
+
+    def load(self) -> Dict[str, Any]:
+        # 大規模ライブラリ向けにlibyamlのローダーを優先
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=loader) or {}
+        data.setdefault('photos', [])
+        return data
+
+    def save(self, photos: List[Dict], info: Optional[Dict[str, Any]] = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {**(info or {}), 'total_materials': len(photos), 'photos': photos}
+
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            yaml.dump(data, f, Dumper=dumper, allow_unicode=True, sort_keys=False)
+
+    def apply(self, changed: List[Dict], removed: Iterable[str]):
+        # YAMLは部分更新できないため、全変更をまとめて1回だけ全体を書き直す
+        removed = set(removed)
+        if not changed and (not removed or not self.exists()):
+            return
+
+        data = self.load() if self.exists() else {'photos': []}
+        updates = {material_key(photo): photo for photo in changed}
+
+        merged = [updates.pop(key, photo) for photo in data.pop('photos')
+                  if (key := material_key(photo)) not in removed]
+        merged.extend(photo for key, photo in updates.items() if key not in removed)
+        self.save(merged, data)
+
+
+class SQLiteMetadataStore(MetadataStore):
+    """
+    photo_descriptions.db（大規模ライブラリ用）
+
+    素材ごとに1行（JSON）を持つため、読み込みはJSONのデコードのみ、
+    1件の更新は1行の書き換えで済む。
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        if not self._schema_ready:
+            self._create_schema(conn)
+            self._schema_ready = True
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        """テーブル作成（WALモードはファイルに保存されるため、接続ごとではなく初回のみ）"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS info (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS materials (
+                id TEXT PRIMARY KEY,
+                category TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_materials_category ON materials(category);
+        """)
+        conn.execute(
+            "INSERT OR IGNORE INTO info (key, value) VALUES ('schema_version', ?)",
+            (json.dumps(self.SCHEMA_VERSION),)
+        )
+        conn.commit()
+
+    def load(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            data = {
+                key: json.loads(value)
+                for key, value in conn.execute("SELECT key, value FROM info")
+                if key != 'schema_version'
+            }
+            # 1行ずつではなく1つのJSON配列としてまとめてデコード（大量件数で高速）
+            rows = conn.execute("SELECT data FROM materials ORDER BY rowid").fetchall()
+            data['photos'] = json.loads('[' + ','.join(row[0] for row in rows) + ']')
+        finally:
+            conn.close()
+        return data
+
+    def save(self, photos: List[Dict], info: Optional[Dict[str, Any]] = None):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM materials")
+                conn.execute("DELETE FROM info WHERE key != 'schema_version'")
+                conn.executemany(
+                    "INSERT INTO info (key, value) VALUES (?, ?)",
+                    [(key, json.dumps(value, ensure_ascii=False))
+                     for key, value in (info or {}).items() if key not in ('photos', 'total_materials')]
+                )
+                self._write(conn, photos)
+        finally:
+            conn.close()
+
+    def apply(self, changed: List[Dict], removed: Iterable[str]):
+        conn = self._connect()
+        try:
+            with conn:
+                self._write(conn, changed)
+                conn.executemany(
+                    "DELETE FROM materials WHERE id = ?",
+                    [(material_id,) for material_id in removed]
+                )
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, photos: List[Dict]):
+        conn.executemany(
+            """INSERT INTO materials (id, category, data) VALUES (?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET category = excluded.category, data = excluded.data""",
+            [
+                (material_key(photo), photo.get('category'), json.dumps(photo))
+                for photo in photos
+            ]
+        )
+
+
+# バックエンド名 → (クラス, ファイル名)
+METADATA_BACKENDS = {
+    'yaml': (YamlMetadataStore, "photo_descriptions.yaml"),
+    'sqlite': (SQLiteMetadataStore, "photo_descriptions.db"),
+}
+
+
+def open_metadata_store(metadata_dir: Path, backend: str = 'auto') -> MetadataStore:
+    """
+    メタデータの保存先を開く
+
+    Args:
+        metadata_dir: source_materials/metadata ディレクトリ
+        backend: 'yaml', 'sqlite', または 'auto'（.db があればSQLite、なければYAML）
+                 'sqlite' で .db がなく YAML だけがある場合は、初回に YAML を取り込む
+
+    Returns:
+        MetadataStore
+    """
+    metadata_dir = Path(metadata_dir)
+
+    if backend == 'auto':
+        sqlite_file = metadata_dir / METADATA_BACKENDS['sqlite'][1]
+        backend = 'sqlite' if sqlite_file.exists() else 'yaml'
+
+    if backend not in METADATA_BACKENDS:
+        raise ValueError(f"Unknown metadata backend: {backend}")
+
+    store_class, filename = METADATA_BACKENDS[backend]
+    store = store_class(metadata_dir / filename)
+
+    if backend == 'sqlite' and not store.exists():
+        # 既存の解析結果を引き継ぐ（取り込まないと全素材がVision APIで再解析される）
+        legacy = YamlMetadataStore(metadata_dir / METADATA_BACKENDS['yaml'][1])
+        if legacy.exists():
+            store.import_from(legacy)
+            logger.info("🔁 Imported %s into %s", legacy.path, store.path)
+
+    return store
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Perceptual Hash Index
+dHash-based grouping of near-duplicate source materials
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from collections import defaultdict
+
+from PIL import Image
+
+
+def dhash(image_path: Path, hash_size: int = 8) -> Optional[int]:
+    """
+    画像の差分ハッシュ（dHash）を計算
+
+    Args:
+        image_path: 画像ファイルパス
+        hash_size: ハッシュの一辺（hash_size² ビット）
+
+    Returns:
+        ハッシュ値（読み込み失敗時はNone）
+    """
+    try:
+        with Image.open(image_path) as img:
+            # JPEGは縮小デコードで高速化
+            img.draft('L', (hash_size * 8, hash_size * 8))
+            small = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+            pixels = small.tobytes()
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """2つのハッシュのハミング距離"""
+    return bin(a ^ b).count('1')
+
+
+class PerceptualHashIndex:
+    """
+    知覚ハッシュによる類似素材インデックス
+
+    64ビットハッシュを (max_distance + 1) 個のバンドに分割して登録する。
+    距離 max_distance 以内のペアは鳩の巣原理により少なくとも1つのバンドが
+    完全一致するため、全ペア比較をせずに候補を絞り込める。
+    """
+
+    def __init__(self, max_distance: int = 6, hash_bits: int = 64):
+        self.max_distance = max_distance
+        self.hash_bits = hash_bits
+        self.num_bands = max_distance + 1
+        self.band_bits = -(-hash_bits // self.num_bands)
+
+        self.hashes: Dict[str, int] = {}
+        self.sizes: Dict[str, int] = {}
+        self._bands: Dict[tuple, List[str]] = defaultdict(list)
+        self._exact: Dict[int, str] = {}
+        self._parent: Dict[str, str] = {}
+
+    def add(self, material_id: str, hash_value: int, pixel_count: int = 0):
+        """
+        素材を登録し、既存の類似素材とクラスタ化
+
+        Args:
+            material_id: 素材ID
+            hash_value: dHash値
+            pixel_count: 画素数（代表素材の選択に使用）
+        """
+        self.hashes[material_id] = hash_value
+        self.sizes[material_id] = pixel_count
+        self._parent[material_id] = material_id
+
+        # 完全一致のハッシュは最初の素材だけをバンドに登録
+        if hash_value in self._exact:
+            self._union(self._exact[hash_value], material_id)
+            return
+        self._exact[hash_value] = material_id
+
+        mask = (1 << self.band_bits) - 1
+        seen = set()
+        for band in range(self.num_bands):
+            key = (band, (hash_value >> (band * self.band_bits)) & mask)
+            for other_id in self._bands[key]:
+                if other_id in seen:
+                    continue
+                seen.add(other_id)
+                if hamming_distance(hash_value, self.hashes[other_id]) <= self.max_distance:
+                    self._union(material_id, other_id)
+            self._bands[key].append(material_id)
+
+    def _find(self, material_id: str) -> str:
+        root = material_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[material_id] != root:
+            self._parent[material_id], material_id = root, self._parent[material_id]
+        return root
+
+    def _union(self, a: str, b: str):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+    def clusters(self) -> List[List[str]]:
+        """
+        類似素材のクラスタ一覧（代表素材が先頭）
+
+        代表素材は画素数が最大のもの（同数なら登録順）。
+        """
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for material_id in self.hashes:
+            groups[self._find(material_id)].append(material_id)
+
+        result = []
+        for members in groups.values():
+            representative = max(members, key=lambda m: self.sizes[m])
+            result.append([representative] + [m for m in members if m != representative])
+        return result
+
+    def representatives(self) -> Dict[str, str]:
+        """{素材ID: 代表素材ID} のマッピング"""
+        mapping = {}
+        for members in self.clusters():
+            for material_id in members:
+                mapping[material_id] = members[0]
+        return mapping
+
+    def duplicate_count(self) -> int:
+        """代表以外の（冗長な）素材数"""
+        return len(self.hashes) - len(self.clusters())
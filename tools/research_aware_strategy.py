@@ -4,10 +4,15 @@ Research-Aware Matching Strategy
 Uses structured research data to enhance material matching
 """
 
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
+
+import numpy as np
+
 from .matching_strategies import TourismMatchingStrategy
 from .research_loader import ResearchDatabase
+from .tokenizer import get_tokenizer
 
 
 class ResearchAwareStrategy(TourismMatchingStrategy):
@@ -18,6 +23,9 @@ class ResearchAwareStrategy(TourismMatchingStrategy):
     より精度の高い素材マッチングを実現する。
     """
 
+    # カットごとのボーナス表のキャッシュ上限（常駐サービスで増え続けないよう LRU で捨てる）
+    CUT_CACHE_LIMIT = 1024
+
     def __init__(self, config: 'MaterialConfig', research_db_path: Optional[Path] = None):
         """
         Initialize research-aware strategy
@@ -29,16 +37,18 @@ class ResearchAwareStrategy(TourismMatchingStrategy):
         super().__init__(config)
 
         self.research_db = None
+        self._cache: Optional[Dict] = None
 
-        # リサーチデータベースの読み込み
+        # リサーチデータベースの読み込み（マッチャーと同じトークナイザーを共有）
+        tokenizer = get_tokenizer(config.tokenizer)
         if research_db_path and research_db_path.exists():
-            self.research_db = ResearchDatabase(research_db_path)
+            self.research_db = ResearchDatabase(research_db_path, tokenizer=tokenizer)
             print(f"✓ Research database loaded: {self.research_db.project.get('name')}")
         else:
             # デフォルトパスを試行
             default_path = config.project_root / "data" / "shirahama-locations-database.yaml"
             if default_path.exists():
-                self.research_db = ResearchDatabase(default_path)
+                self.research_db = ResearchDatabase(default_path, tokenizer=tokenizer)
                 print(f"✓ Research database loaded from default path")
 
     def find_best_match(
@@ -58,95 +68,80 @@ class ResearchAwareStrategy(TourismMatchingStrategy):
         Returns:
             最適な素材
         """
-        candidates = matcher.find_candidates(cut, materials)
-
-        def research_aware_bonus(material: 'Material', cut: Dict) -> float:
-            """リサーチデータに基づくボーナス"""
-            bonus = 0.0
-
-            # 通常のツーリズムボーナス
-            bonus += self._tourism_bonus(material, cut)
+        return self._select_best(cut, materials, matcher)
+
+    def bonus_terms(self, features: 'MaterialFeatures', cuts: List[Dict]) -> np.ndarray:
+        """観光ボーナス + リサーチデータに基づくボーナス"""
+        bonus = super().bonus_terms(features, cuts)
+
+        # リサーチデータベースが利用可能な場合
+        if self.research_db:
+            bonus = bonus + features.match_cuts(
+                'location', cuts,
+                lambda location, cut: self._research_bonus_table(cut).get(self._research_name(location), 0.0),
+                lower=False
+            )
 
-            # リサーチデータベースが利用可能な場合
-            if self.research_db:
-                bonus += self._research_bonus(material, cut)
+        return bonus
 
-            return bonus
+    def _research_bonus(self, material: 'Material', cut: Dict) -> float:
+        """リサーチデータに基づく追加ボーナス（カットごとの表を参照）"""
+        if not material.location:
+            return 0.0
+        return self._research_bonus_table(cut).get(self._research_name(material.location), 0.0)
 
-        return self._score_and_select(candidates, cut, matcher, research_aware_bonus)
+    def _research_name(self, location_name: str) -> str:
+        """素材のロケーション名をリサーチDBの名前に正規化（別名・大文字小文字の違い）"""
+        location = self.research_db.get_location_by_name(location_name) if location_name else None
+        return location.name if location else location_name
 
-    def _tourism_bonus(self, material: 'Material', cut: Dict) -> float:
-        """観光特有のボーナス（親クラスのロジックを再利用）"""
-        bonus = 0.0
+    def _research_bonus_table(self, cut: Dict) -> Dict[str, float]:
+        """
+        カットに対するロケーション名 → ボーナスの表
 
-        # ランドマークが明確 → ボーナス
-        if material.location and len(material.location) > 0:
-            bonus += 10.0
+        ボーナスは素材のロケーション名だけで決まるため、カットごとに
+        リサーチDBのロケーションを1回ずつ評価し、素材の採点は表の参照で済ませる。
+        """
+        scene_desc = cut.get('scene_description', '').lower()
+        mood = cut.get('mood', '')
+        time_of_day = cut.get('time_of_day', '')
 
-        # 天候が良好 → ボーナス
-        if material.weather and material.weather.lower() in ['sunny', 'clear']:
-            bonus += 5.0
+        key = (scene_desc, mood, time_of_day)
+        cache = self._research_cache()
+        if key in cache['cuts']:
+            cache['cuts'].move_to_end(key)
+            return cache['cuts'][key]
+
+        # シーン説明の語（ロケーションの語と同じトークナイザー）と推奨撮影時間が一致するロケーション
+        matched_terms = self.research_db.terms_in(scene_desc)
+        best_time_matches = self.research_db.locations_for_best_time(time_of_day) if time_of_day else set()
+
+        table: Dict[str, float] = {}
+        for location in self.research_db.locations.values():
+            # 同名のロケーションは最初のもの（get_location_by_name と同じ）
+            if location.name in table:
+                continue
+            terms = self.research_db.location_terms(location.id)
+            bonus = 0.0
 
-        # ゴールデンアワー/ブルーアワー → ボーナス
-        if material.time_of_day and material.time_of_day.lower() in ['golden_hour', 'blue_hour']:
-            bonus += 5.0
+            # コアナラティブのマッチング
+            bonus += sum(count for term, count in terms['narrative'].items() if term in matched_terms) * 8.0
 
-        # 場所名が完全一致
-        if material.location:
-            scene_desc = cut.get('scene_description', '').lower()
-            if material.location.lower() in scene_desc:
-                bonus += 15.0
+            # ストーリーテーマのマッチング
+            bonus += sum(count for term, count in terms['theme'].items() if term in matched_terms) * 6.0
 
-        return bonus
+            # ビジュアル要素のマッチング
+            bonus += sum(count for term, count in terms['visual'].items() if term in matched_terms) * 4.0
 
-    def _research_bonus(self, material: 'Material', cut: Dict) -> float:
-        """リサーチデータに基づく追加ボーナス"""
-        bonus = 0.0
+            # 推奨撮影時間のマッチング
+            if location.id in best_time_matches:
+                bonus += 12.0
 
-        scene_desc = cut.get('scene_description', '').lower()
-        mood = cut.get('mood', '')
-        time_of_day = cut.get('time_of_day', '')
+            # 撮影優先度が高いロケーション
+            if location.name in cache['priority_names']:
+                bonus += 10.0
 
-        # 素材のロケーション情報からリサーチデータを検索
-        if material.location:
-            # ロケーション名で検索
-            location = self.research_db.get_location_by_name(material.location)
-
-            if location:
-                # コアナラティブのマッチング
-                narrative_words = location.core_narrative.lower().split()
-                for word in narrative_words:
-                    if len(word) > 2 and word in scene_desc:
-                        bonus += 8.0
-
-                # ストーリーテーマのマッチング
-                theme_words = location.storytelling_theme.lower().split()
-                for word in theme_words:
-                    if len(word) > 2 and word in scene_desc:
-                        bonus += 6.0
-
-                # ビジュアル要素のマッチング
-                visual_primary = location.visual_elements.get('primary', '')
-                if visual_primary:
-                    visual_words = visual_primary.lower().split()
-                    matches = sum(1 for word in visual_words if len(word) > 2 and word in scene_desc)
-                    bonus += matches * 4.0
-
-                # 推奨撮影時間のマッチング
-                filming_tips = location.filming_tips
-                best_time = filming_tips.get('best_time', '')
-
-                if isinstance(best_time, str) and time_of_day:
-                    if time_of_day.lower() in best_time.lower():
-                        bonus += 12.0
-
-                # カテゴリの重要度ボーナス
-                # 撮影優先度が高いロケーション
-                priorities = self.research_db.get_filming_priority_locations()
-                priority_locations = [p['location'] for p in priorities]
-
-                if location.name in priority_locations:
-                    bonus += 10.0
+            table[location.name] = bonus
 
         # リサーチDBを使ったシーンマッチング提案
         suggested_locations = self.research_db.suggest_locations_for_scene(
@@ -156,14 +151,33 @@ class ResearchAwareStrategy(TourismMatchingStrategy):
         )
 
         # 素材のロケーションが提案されたロケーションに含まれる場合
-        if material.location and suggested_locations:
-            suggested_names = [loc.name for loc in suggested_locations[:3]]  # Top 3
-            if material.location in suggested_names:
-                # ランキングに応じたボーナス
-                rank = suggested_names.index(material.location) + 1
-                bonus += 20.0 / rank  # 1位: 20pt, 2位: 10pt, 3位: 6.7pt
+        suggested_names = [loc.name for loc in suggested_locations[:3]]  # Top 3
+        for name in dict.fromkeys(suggested_names):
+            # ランキングに応じたボーナス
+            rank = suggested_names.index(name) + 1
+            table[name] = table.get(name, 0.0) + 20.0 / rank  # 1位: 20pt, 2位: 10pt, 3位: 6.7pt
+
+        cache['cuts'][key] = table
+        if len(cache['cuts']) > self.CUT_CACHE_LIMIT:
+            cache['cuts'].popitem(last=False)
+        return table
+
+    def _research_cache(self) -> Dict:
+        """
+        リサーチDBごとのキャッシュ（撮影優先ロケーション名とカットごとの表）
 
-        return bonus
+        カットごとの表は CUT_CACHE_LIMIT 件までの LRU。
+
+        research_db が差し替えられた場合は作り直す。
+        """
+        if self._cache is None or self._cache['db'] is not self.research_db:
+            priorities = self.research_db.get_filming_priority_locations()
+            self._cache = {
+                'db': self.research_db,
+                'priority_names': {p['location'] for p in priorities},
+                'cuts': OrderedDict()
+            }
+        return self._cache
 
     def get_location_context(self, location_name: str) -> Optional[Dict]:
         """
@@ -4,11 +4,18 @@ Research Data Loader and Query System
 Loads structured research data (locations, story frameworks, etc.) for story generation
 """
 
+import hashlib
+import os
+import pickle
+import tempfile
 import yaml
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass
 
+from .tokenizer import Tokenizer, get_tokenizer
+
 
 @dataclass
 class Location:
@@ -32,6 +39,7 @@ class Location:
     symbolism: Optional[str] = None
     historical_legend: Optional[str] = None
     metaphor: Optional[str] = None
+    aliases: Optional[List[str]] = None  # 別名（get_location_by_name で照合）
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Location':
@@ -55,7 +63,8 @@ class Location:
             historical_depth=data.get('historical_depth'),
             symbolism=data.get('symbolism'),
             historical_legend=data.get('historical_legend'),
-            metaphor=data.get('metaphor')
+            metaphor=data.get('metaphor'),
+            aliases=data.get('aliases')
         )
 
 
@@ -82,17 +91,49 @@ class StoryFramework:
         )
 
 
+def _terms(text: str, tokenizer: Tokenizer) -> Dict[str, int]:
+    """照合用の語（トークナイザーで分割）と出現数"""
+    # Counter ではなく dict で保持（スナップショットの復元が速い）
+    return dict(Counter(tokenizer.tokenize(text)))
+
+
 class ResearchDatabase:
     """リサーチデータベース"""
 
-    def __init__(self, yaml_path: Path):
+    # ムード → ストーリーテーマ・コアナラティブに含まれるキーワード
+    MOOD_KEYWORDS = {
+        'peaceful': ['静', '穏やか', '平和', 'calm'],
+        'energetic': ['動', 'ダイナミック', 'dynamic', '賑わい'],
+        'romantic': ['ロマン', 'romantic', '夕日', 'sunset'],
+        'spiritual': ['霊場', '巡礼', '祈り', 'spiritual'],
+        'natural': ['自然', '野趣', 'nature', '波']
+    }
+
+    # スナップショットの形式（Location / インデックスの構造を変えたら上げる）
+    SNAPSHOT_VERSION = 2
+
+    def __init__(
+        self,
+        yaml_path: Path,
+        use_snapshot: bool = True,
+        tokenizer: Optional[Tokenizer] = None
+    ):
         """
         Initialize research database
 
         Args:
             yaml_path: Path to research YAML file
+            use_snapshot: YAMLの隣のスナップショット（解析済みデータとインデックス）を使う
+            tokenizer: 語の分割に使うトークナイザー（省略時は共有の n-gram トークナイザー）
         """
-        self.yaml_path = yaml_path
+        self.yaml_path = Path(yaml_path)
+        self.tokenizer = tokenizer or get_tokenizer()
+
+        state = self._load_snapshot() if use_snapshot else None
+        if state is not None:
+            self.__dict__.update(state)
+            return
+
         self.data = self._load_yaml()
 
         # プロジェクト情報
@@ -116,21 +157,225 @@ class ResearchDatabase:
         # 撮影サマリー
         self.filming_summary = self.data.get('filming_summary', {})
 
+        # 検索用インデックス
+        self._build_indexes()
+
+        if use_snapshot:
+            self._save_snapshot()
+
+    @property
+    def snapshot_path(self) -> Path:
+        """スナップショットのパス（YAMLと同じディレクトリ）"""
+        return self.yaml_path.with_name(f".{self.yaml_path.name}.snapshot")
+
+    def _source_fingerprint(self) -> Dict[str, Any]:
+        """YAMLのサイズと更新時刻"""
+        stat = self.yaml_path.stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _source_hash(self) -> str:
+        """YAMLの内容のハッシュ"""
+        return hashlib.sha256(self.yaml_path.read_bytes()).hexdigest()
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        有効なスナップショットを読み込む
+
+        形式のバージョンとトークナイザーが一致し、YAMLのサイズ・更新時刻が同じなら即座に採用する。
+        更新時刻だけが変わった場合（checkout や touch）は内容のハッシュで判定する。
+        pickleは読み込むだけでコードを実行できるため、自分が書いたファイル
+        （現在のユーザー所有で、他ユーザーが書き込めない）以外は読まない。
+
+        Returns:
+            属性の辞書（無効・存在しない場合は None）
+        """
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                if not self._is_trusted_snapshot(os.fstat(f.fileno())):
+                    print(f"⚠️ Ignoring research database snapshot not owned by the current user: {self.snapshot_path}")
+                    return None
+                header = pickle.load(f)
+                if (header.get('version') != self.SNAPSHOT_VERSION
+                        or header.get('tokenizer') != self.tokenizer.signature):
+                    return None
+
+                fingerprint = self._source_fingerprint()
+                refresh = False
+                if header.get('source') != fingerprint:
+                    if header.get('sha256') != self._source_hash():
+                        return None
+                    refresh = True
+
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring research database snapshot: {e}")
+            return None
+
+        if refresh:
+            self.__dict__.update(state)
+            self._save_snapshot()
+        return state
+
+    @staticmethod
+    def _is_trusted_snapshot(stat: os.stat_result) -> bool:
+        """スナップショットが現在のユーザー所有で、グループ・他ユーザーから書き込めないか"""
+        if not hasattr(os, 'getuid'):
+            # Windows: 所有者の概念が異なるため確認しない
+            return True
+        return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+    def _save_snapshot(self):
+        """解析済みデータとインデックスをスナップショットに書き出す"""
+        header = {
+            'version': self.SNAPSHOT_VERSION,
+            'tokenizer': self.tokenizer.signature,
+            'source': self._source_fingerprint(),
+            'sha256': self._source_hash(),
+        }
+        state = {
+            key: value for key, value in self.__dict__.items()
+            if key not in ('yaml_path', 'tokenizer')
+        }
+
+        # 途中まで書かれたファイルを読まないよう一時ファイルから置き換える
+        # （一時ファイル名は書き込みごとに一意。並列に動く複数のプロセスが同時に保存しても衝突しない）
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.snapshot_path.parent, prefix=self.snapshot_path.name + '.', suffix='.tmp'
+            )
+        except OSError:
+            # 書き込めない場所（読み取り専用など）ではキャッシュしない
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self.snapshot_path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def _build_indexes(self):
+        """
+        読み込み時に検索用のインデックスを作成
+
+        - 名前・別名・ID（casefold）→ ロケーション
+        - ロケーションごとの語の出現数（ナラティブ・特徴・テーマ・ビジュアル）
+        - 語 → (ロケーションID, シーン提案の加点) の転置インデックス
+        - 名前（小文字）→ ロケーションID（シーン説明中の部分文字列として照合）
+        - カテゴリ・タイプ・推奨撮影時間・ムード → ロケーションID
+        """
+        self._order: Dict[str, int] = {location_id: i for i, location_id in enumerate(self.locations)}
+        self._by_name: Dict[str, Location] = {}
+        self._by_category: Dict[str, List[str]] = defaultdict(list)
+        self._by_type: Dict[str, List[str]] = defaultdict(list)
+        self._by_best_time: Dict[str, List[str]] = defaultdict(list)
+        self._by_mood: Dict[str, Set[str]] = {mood: set() for mood in self.MOOD_KEYWORDS}
+        self._location_terms: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._search_texts: Dict[str, str] = {}
+        self._suggest_postings: Dict[str, List[tuple]] = defaultdict(list)
+        self._name_postings: Dict[str, List[str]] = defaultdict(list)
+
+        # 完全一致の名前を優先し、次に別名・ID（いずれも先に登録されたものを優先）
+        for location in self.locations.values():
+            self._by_name.setdefault(location.name.casefold(), location)
+        for location in self.locations.values():
+            for alias in [location.id] + list(location.aliases or []):
+                self._by_name.setdefault(alias.casefold(), location)
+
+        for location_id, location in self.locations.items():
+            self._by_category[location.category].append(location_id)
+            self._by_type[location.type].append(location_id)
+
+            best_time = location.filming_tips.get('best_time', '')
+            if isinstance(best_time, str):
+                self._by_best_time[best_time.lower()].append(location_id)
+
+            theme_text = f"{location.storytelling_theme} {location.core_narrative}".lower()
+            for mood, keywords in self.MOOD_KEYWORDS.items():
+                if any(keyword in theme_text for keyword in keywords):
+                    self._by_mood[mood].add(location_id)
+
+            terms = {
+                'narrative': _terms(location.core_narrative, self.tokenizer),
+                'features': _terms(' '.join(location.key_features), self.tokenizer),
+                'theme': _terms(location.storytelling_theme, self.tokenizer),
+                'visual': _terms(location.visual_elements.get('primary', '') or '', self.tokenizer),
+            }
+            self._location_terms[location_id] = terms
+
+            self._search_texts[location_id] = (
+                f"{location.name} {location.core_narrative} {location.storytelling_theme}"
+                f" {' '.join(location.key_features)}"
+            ).lower()
+
+            # シーン提案: 名前 20点、ナラティブの語 5点、特徴の語 3点
+            self._name_postings[location.name.lower()].append(location_id)
+            weights: Dict[str, float] = defaultdict(float)
+            for term, count in terms['narrative'].items():
+                weights[term] += 5.0 * count
+            for term, count in terms['features'].items():
+                weights[term] += 3.0 * count
+            for term, weight in weights.items():
+                self._suggest_postings[term].append((location_id, weight))
+
+        # 名前の照合に使う長さの一覧
+        self._name_lengths = sorted({len(name) for name in self._name_postings if name})
+
+    def terms_in(self, text: str) -> Set[str]:
+        """テキストの語（location_terms と同じトークナイザーで分割）"""
+        return self.tokenizer.token_set(text)
+
+    def names_in(self, text: str) -> Set[str]:
+        """
+        テキストに部分文字列として含まれるロケーションのID（名前で照合）
+
+        名前にある長さの部分文字列だけを列挙して名前の一覧との積を取る。
+        """
+        text = text.lower()
+        substrings = {
+            text[i:i + length]
+            for length in self._name_lengths
+            for i in range(len(text) - length + 1)
+        }
+        return {
+            location_id
+            for name in substrings & self._name_postings.keys()
+            for location_id in self._name_postings[name]
+        }
+
+    def location_terms(self, location_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        ロケーションの語の出現数
+
+        Returns:
+            {'narrative' / 'features' / 'theme' / 'visual': {語: 出現数}}
+        """
+        return self._location_terms[location_id]
+
+    def locations_for_best_time(self, time_of_day: str) -> Set[str]:
+        """推奨撮影時間に time_of_day を含むロケーションのID"""
+        time_lower = time_of_day.lower()
+        return {
+            location_id
+            for best_time, location_ids in self._by_best_time.items() if time_lower in best_time
+            for location_id in location_ids
+        }
+
     def _load_yaml(self) -> Dict:
-        """YAMLファイルを読み込み"""
+        """YAMLファイルを読み込み（libyamlのローダーを優先）"""
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         with open(self.yaml_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=loader) or {}
 
     def get_location(self, location_id: str) -> Optional[Location]:
         """IDでロケーションを取得"""
         return self.locations.get(location_id)
 
     def get_location_by_name(self, name: str) -> Optional[Location]:
-        """名前でロケーションを取得"""
-        for location in self.locations.values():
-            if location.name == name:
-                return location
-        return None
+        """名前でロケーションを取得（大文字小文字を区別せず、別名・IDでも可）"""
+        return self._by_name.get(name.casefold())
 
     def search_locations(
         self,
@@ -144,34 +389,35 @@ class ResearchDatabase:
         Args:
             category: カテゴリでフィルタ (attractions, culture, beach, nature)
             location_type: タイプでフィルタ (露天風呂, ビーチ, etc.)
-            keywords: キーワードで検索
+            keywords: キーワードで検索（名前・ナラティブ・テーマ・特徴への部分文字列一致、すべてを含むもの）
 
         Returns:
             マッチしたロケーションのリスト
         """
-        results = []
-
-        for location in self.locations.values():
-            # カテゴリフィルタ
-            if category and location.category != category:
-                continue
-
-            # タイプフィルタ
-            if location_type and location.type != location_type:
-                continue
-
-            # キーワード検索
-            if keywords:
-                text = f"{location.name} {location.core_narrative} {location.storytelling_theme}"
-                text += f" {' '.join(location.key_features)}"
-                text = text.lower()
-
-                if not all(kw.lower() in text for kw in keywords):
-                    continue
-
-            results.append(location)
-
-        return results
+        # インデックスから候補IDの集合を絞り込む
+        candidates: Set[str] = set(self.locations)
+
+        # カテゴリフィルタ
+        if category:
+            candidates &= set(self._by_category.get(category, []))
+
+        # タイプフィルタ
+        if location_type:
+            candidates &= set(self._by_type.get(location_type, []))
+
+        # キーワード検索
+        # 語の集合（_location_terms）との積集合にはしない: 日本語は単語境界がなく、
+        # キーワードがトークナイザーの語と一致するとは限らないため（例: 「白浜温泉」は
+        # 白浜/浜温/温泉 に分割され、「温」はどの語にもならない）。従来どおり検索用
+        # テキストへの部分文字列一致で判定し、走査はカテゴリ・タイプで絞り込んだ候補に限る。
+        for keyword in keywords or []:
+            keyword = keyword.lower()
+            candidates = {
+                location_id for location_id in candidates
+                if keyword in self._search_texts[location_id]
+            }
+
+        return [self.locations[location_id] for location_id in sorted(candidates, key=self._order.get)]
 
     def get_locations_by_category(self, category: str) -> List[Location]:
         """カテゴリ別にロケーションを取得"""
@@ -231,61 +477,30 @@ class ResearchDatabase:
         Returns:
             提案されたロケーションのリスト（スコア順）
         """
-        scored_locations = []
-
-        for location in self.locations.values():
-            score = 0.0
-
-            # シーン説明とのマッチング
-            desc_lower = scene_description.lower()
-
-            # ロケーション名のマッチング
-            if location.name.lower() in desc_lower:
-                score += 20.0
-
-            # コアナラティブのマッチング
-            narrative_words = location.core_narrative.lower().split()
-            for word in narrative_words:
-                if len(word) > 2 and word in desc_lower:
-                    score += 5.0
-
-            # キーフィーチャーのマッチング
-            for feature in location.key_features:
-                feature_words = feature.lower().split()
-                for word in feature_words:
-                    if len(word) > 2 and word in desc_lower:
-                        score += 3.0
-
-            # ムードのマッチング
-            if mood:
-                mood_keywords = {
-                    'peaceful': ['静', '穏やか', '平和', 'calm'],
-                    'energetic': ['動', 'ダイナミック', 'dynamic', '賑わい'],
-                    'romantic': ['ロマン', 'romantic', '夕日', 'sunset'],
-                    'spiritual': ['霊場', '巡礼', '祈り', 'spiritual'],
-                    'natural': ['自然', '野趣', 'nature', '波']
-                }
-
-                mood_lower = mood.lower()
-                if mood_lower in mood_keywords:
-                    keywords = mood_keywords[mood_lower]
-                    theme_text = f"{location.storytelling_theme} {location.core_narrative}".lower()
-
-                    for keyword in keywords:
-                        if keyword in theme_text:
-                            score += 10.0
-                            break
-
-            # 時間帯のマッチング
-            if time_of_day:
-                filming_tips = location.filming_tips
-                best_time = filming_tips.get('best_time', '')
-                if isinstance(best_time, str):
-                    if time_of_day.lower() in best_time.lower():
-                        score += 8.0
-
-            if score > 0:
-                scored_locations.append((score, location))
+        scores: Dict[str, float] = defaultdict(float)
+
+        # シーン説明とのマッチング（名前・コアナラティブ・キーフィーチャー）
+        for location_id in self.names_in(scene_description):
+            scores[location_id] += 20.0
+        for term in self.terms_in(scene_description):
+            for location_id, weight in self._suggest_postings.get(term, []):
+                scores[location_id] += weight
+
+        # ムードのマッチング
+        if mood:
+            for location_id in self._by_mood.get(mood.lower(), ()):
+                scores[location_id] += 10.0
+
+        # 時間帯のマッチング
+        if time_of_day:
+            for location_id in self.locations_for_best_time(time_of_day):
+                scores[location_id] += 8.0
+
+        scored_locations = [
+            (scores[location_id], self.locations[location_id])
+            for location_id in sorted(scores, key=self._order.get)
+            if scores[location_id] > 0
+        ]
 
         # スコア順にソート
         scored_locations.sort(key=lambda x: x[0], reverse=True)
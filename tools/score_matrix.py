@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Score Matrix
+Vectorized cut × material scoring for matching strategies
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .tokenizer import Tokenizer, get_tokenizer
+
+
+class MaterialFeatures:
+    """
+    素材リストの特徴量配列
+
+    文字列属性は「一意値のリスト + 素材ごとのコード配列」で保持する。
+    条件判定は一意値ごとに1回だけ行い、コード配列で全素材に展開する。
+    """
+
+    def __init__(
+        self,
+        materials: List['Material'],
+        matcher: Optional['MaterialMatcher'] = None,
+        tokenizer: Optional[Tokenizer] = None
+    ):
+        """
+        Args:
+            materials: 素材リスト
+            matcher: キーワードの転置インデックスを持つマッチャー
+                     （index_materials で作成した場合のみ）
+            tokenizer: マッチャーがない場合のキーワード分割（省略時は共有の n-gram）
+        """
+        self.materials = list(materials)
+        self.matcher = matcher
+        self.tokenizer = matcher.tokenizer if matcher is not None else (tokenizer or get_tokenizer())
+        self.position: Dict[str, int] = {m.id: i for i, m in enumerate(self.materials)}
+
+        count = len(self.materials)
+        self.is_hd = np.fromiter((bool(m.is_hd) for m in self.materials), dtype=np.float64, count=count)
+        self.quality = np.fromiter((m.quality_score or 0.0 for m in self.materials), dtype=np.float64, count=count)
+
+        self._columns: Dict[Tuple[str, bool], Tuple[List[str], np.ndarray]] = {}
+        self._cache: Dict[str, np.ndarray] = {}
+        self._keyword_positions: Dict[str, np.ndarray] = {}
+        self._token_positions: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.materials)
+
+    def column(self, attribute: str, lower: bool = True) -> Tuple[List[str], np.ndarray]:
+        """
+        属性の一意値とコード配列
+
+        Args:
+            attribute: Materialの属性名
+            lower: 小文字化するか（Noneは空文字）
+
+        Returns:
+            (一意値リスト, 素材ごとのコード配列)
+        """
+        key = (attribute, lower)
+        if key not in self._columns:
+            codes_by_value: Dict[str, int] = {}
+            codes = np.empty(len(self.materials), dtype=np.int64)
+            for i, material in enumerate(self.materials):
+                value = getattr(material, attribute, None) or ''
+                if lower:
+                    value = value.lower()
+                codes[i] = codes_by_value.setdefault(value, len(codes_by_value))
+            self._columns[key] = (list(codes_by_value), codes)
+        return self._columns[key]
+
+    def match(self, attribute: str, predicate: Callable[[str], float], lower: bool = True) -> np.ndarray:
+        """
+        素材ごとの条件判定（カットに依存しない項）
+
+        Returns:
+            形状 (素材数,) の配列
+        """
+        values, codes = self.column(attribute, lower)
+        table = np.array([float(predicate(value)) for value in values], dtype=np.float64)
+        return table[codes] if len(values) else np.zeros(len(self.materials))
+
+    def match_cuts(
+        self,
+        attribute: str,
+        cuts: List[Dict],
+        predicate: Callable[[str, Dict], float],
+        lower: bool = True
+    ) -> np.ndarray:
+        """
+        カット×素材の条件判定
+
+        Returns:
+            形状 (カット数, 素材数) の配列
+        """
+        values, codes = self.column(attribute, lower)
+        table = np.array(
+            [[float(predicate(value, cut)) for value in values] for cut in cuts],
+            dtype=np.float64
+        ).reshape(len(cuts), len(values))
+        return table[:, codes]
+
+    def cached(self, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """カットに依存しない項をキャッシュ（戦略のボーナス用）"""
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def unused(self) -> np.ndarray:
+        """未割り当ての素材（割り当て中に変化するためキャッシュしない）"""
+        return np.fromiter(
+            (m.assigned_to is None for m in self.materials),
+            dtype=np.float64,
+            count=len(self.materials)
+        )
+
+    def keyword_counts(self, cuts: List[Dict], extract_keywords: Callable[[str], List[str]]) -> np.ndarray:
+        """
+        カットのキーワードを含む素材の一致数
+
+        Returns:
+            形状 (カット数, 素材数) の配列
+        """
+        counts = np.zeros((len(cuts), len(self.materials)), dtype=np.float64)
+        for row, cut in enumerate(cuts):
+            scene_desc = cut.get('scene_description', '').lower()
+            for keyword in extract_keywords(scene_desc):
+                counts[row, self._positions_for_keyword(keyword)] += 1
+        return counts
+
+    def _positions_for_keyword(self, keyword: str) -> np.ndarray:
+        if keyword not in self._keyword_positions:
+            if self.matcher is not None:
+                # マッチャーの転置インデックスを利用
+                positions = sorted(
+                    self.position[material_id]
+                    for material_id in self.matcher._keyword_postings(keyword)
+                    if material_id in self.position
+                )
+            else:
+                if self._token_positions is None:
+                    self._token_positions = defaultdict(list)
+                    for i, m in enumerate(self.materials):
+                        text = f"{m.description} {m.main_subject} {m.location or ''}"
+                        for token in self.tokenizer.token_set(text):
+                            self._token_positions[token].append(i)
+                positions = self._token_positions.get(keyword, [])
+            self._keyword_positions[keyword] = np.array(positions, dtype=np.int64)
+        return self._keyword_positions[keyword]
+
+
+    def subset(self, positions: np.ndarray, keyword_counts: Optional[np.ndarray] = None) -> 'MaterialFeatures':
+        """
+        一部の素材（位置の配列）だけの特徴量
+
+        一意値・コード配列・キャッシュ済みの項は元の特徴量を切り出して共有する。
+
+        Args:
+            positions: 素材の位置
+            keyword_counts: 全素材で計算済みのキーワード一致数（同じカットで採点する場合）
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if keyword_counts is not None:
+            keyword_counts = keyword_counts[:, positions]
+        return _FeatureSubset(self, positions, keyword_counts)
+
+
+class _FeatureSubset(MaterialFeatures):
+    """MaterialFeatures の一部の素材を指すビュー（枝刈り検索でブロックごとに採点する）"""
+
+    def __init__(self, parent: MaterialFeatures, positions: np.ndarray, keyword_counts: Optional[np.ndarray] = None):
+        self.parent = parent
+        self.positions = positions
+        self._keyword_counts = keyword_counts  # この部分集合の列だけ（同じカット）
+        self.materials = [parent.materials[i] for i in positions]
+        self.matcher = parent.matcher
+        self.tokenizer = parent.tokenizer
+        self.position = {m.id: i for i, m in enumerate(self.materials)}
+        self.is_hd = parent.is_hd[positions]
+        self.quality = parent.quality[positions]
+
+        self._columns = {}
+        self._cache = {}
+        self._keyword_positions = {}
+        self._token_positions = None
+
+    def column(self, attribute: str, lower: bool = True) -> Tuple[List[str], np.ndarray]:
+        # この部分集合に現れる値だけに絞る（条件判定が全素材の一意値に比例しないように）
+        key = (attribute, lower)
+        if key not in self._columns:
+            values, codes = self.parent.column(attribute, lower)
+            used, subset_codes = np.unique(codes[self.positions], return_inverse=True)
+            self._columns[key] = ([values[i] for i in used], subset_codes.reshape(-1))
+        return self._columns[key]
+
+    def cached(self, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if name in self.parent._cache:
+            return self.parent._cache[name][self.positions]
+        return super().cached(name, compute)
+
+    def keyword_counts(self, cuts: List[Dict], extract_keywords: Callable[[str], List[str]]) -> np.ndarray:
+        if self._keyword_counts is not None:
+            return self._keyword_counts
+
+        # 親の転置リスト（位置の昇順）からこの部分集合の位置だけを二分探索で引く
+        counts = np.zeros((len(cuts), len(self.positions)), dtype=np.float64)
+        for row, cut in enumerate(cuts):
+            scene_desc = cut.get('scene_description', '').lower()
+            for keyword in extract_keywords(scene_desc):
+                postings = self.parent._positions_for_keyword(keyword)
+                if len(postings):
+                    found = np.minimum(np.searchsorted(postings, self.positions), len(postings) - 1)
+                    counts[row] += postings[found] == self.positions
+        return counts
+
+    def subset(self, positions: np.ndarray, keyword_counts: Optional[np.ndarray] = None) -> 'MaterialFeatures':
+        positions = np.asarray(positions, dtype=np.int64)
+        if keyword_counts is None:
+            keyword_counts = self._keyword_counts
+        if keyword_counts is not None:
+            keyword_counts = keyword_counts[:, positions]
+        return _FeatureSubset(self.parent, self.positions[positions], keyword_counts)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    各行の上位k列のインデックス（スコア降順）
+
+    Args:
+        scores: 形状 (カット数, 素材数) のスコア行列（-infは候補外）
+        k: 取得数
+
+    Returns:
+        形状 (カット数, min(k, 素材数)) のインデックス配列
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Text Tokenizers
+Japanese-aware tokenization shared by material matching and research scoring
+"""
+
+import logging
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, FrozenSet, List
+
+try:
+    import fugashi
+    FUGASHI_AVAILABLE = True
+except ImportError:
+    FUGASHI_AVAILABLE = False
+
+try:
+    from janome.tokenizer import Tokenizer as JanomeTokenizer
+    JANOME_AVAILABLE = True
+except ImportError:
+    JANOME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+_CJK = r'぀-ヿㇰ-ㇿ㐀-䶿一-鿿豈-﫿ｦ-ﾟ々〆ヶ'
+
+# 文字種ごとの連続区間（漢字 / カタカナ / ひらがな / それ以外の英数字）
+_RUNS = re.compile(
+    r'(?P<kanji>[㐀-䶿一-鿿豈-﫿々〆ヶ]+)'
+    r'|(?P<katakana>[゠-ヿㇰ-ㇿ]+)'
+    r'|(?P<hiragana>[぀-ゟ]+)'
+    rf'|(?P<word>[^\W_{_CJK}]+)'
+)
+
+
+def normalize_text(text: str) -> str:
+    """NFKC正規化（全角英数・半角カナの統一）と小文字化"""
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def fold_plural(word: str) -> str:
+    """英単語の簡易的な単数化（beaches → beach, islands → island）"""
+    if len(word) <= 3 or word.endswith('ss'):
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith(('ches', 'shes', 'sses', 'xes', 'zes')):
+        return word[:-2]
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+class Tokenizer(ABC):
+    """トークナイザーの基底クラス"""
+
+    name = 'base'
+
+    def __init__(self):
+        # 同じテキスト（シーン説明など）の分割結果を共有
+        self.token_set = lru_cache(maxsize=65536)(self._token_set)
+
+    @abstractmethod
+    def tokenize(self, text: str) -> List[str]:
+        """
+        テキストをトークンに分割
+
+        Args:
+            text: 入力テキスト
+
+        Returns:
+            トークンのリスト（出現順、重複あり）
+        """
+        pass
+
+    def _token_set(self, text: str) -> FrozenSet[str]:
+        return frozenset(self.tokenize(text))
+
+    @property
+    def signature(self) -> str:
+        """設定を含む識別子（インデックスやスナップショットの互換性判定用）"""
+        return self.name
+
+
+class NgramTokenizer(Tokenizer):
+    """
+    文字n-gramトークナイザー（外部依存なし）
+
+    - 英数字: 3文字以上の単語（簡易単数化）
+    - 漢字・カタカナ: 連続区間の文字n-gram（n文字以下の区間はそのまま）
+    - ひらがな: 3文字以上の区間のみn-gram（助詞・送り仮名を除く）
+    """
+
+    name = 'ngram'
+
+    def __init__(self, n: int = 2, min_word_length: int = 3):
+        super().__init__()
+        self.n = n
+        self.min_word_length = min_word_length
+
+    @property
+    def signature(self) -> str:
+        return f"{self.name}:{self.n}:{self.min_word_length}"
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = []
+        for match in _RUNS.finditer(normalize_text(text)):
+            run = match.group()
+            kind = match.lastgroup
+
+            if kind == 'word':
+                if len(run) >= self.min_word_length:
+                    tokens.append(fold_plural(run))
+            elif kind == 'hiragana' and len(run) < self.min_word_length:
+                continue
+            elif len(run) <= self.n:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + self.n] for i in range(len(run) - self.n + 1))
+        return tokens
+
+
+class MorphologicalTokenizer(Tokenizer):
+    """
+    形態素解析トークナイザー（fugashi/MeCab、なければ janome）
+
+    名詞・動詞・形容詞・形容動詞の基本形を使う。英数字の単語は NgramTokenizer と同じ扱い。
+    """
+
+    name = 'morphological'
+
+    CONTENT_POS = ('名詞', '動詞', '形容詞', '形容動詞')
+
+    def __init__(self):
+        super().__init__()
+        if FUGASHI_AVAILABLE:
+            self._tagger = fugashi.Tagger()
+            self.backend = 'fugashi'
+        elif JANOME_AVAILABLE:
+            self._tagger = JanomeTokenizer()
+            self.backend = 'janome'
+        else:
+            raise ImportError("fugashi or janome is required for morphological tokenization")
+
+    @property
+    def signature(self) -> str:
+        return f"{self.name}:{self.backend}"
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = []
+        for surface, pos, base in self._analyze(normalize_text(text)):
+            if not pos.startswith(self.CONTENT_POS):
+                continue
+            if re.fullmatch(rf'[^\W_{_CJK}]+', surface):
+                if len(surface) >= 3:
+                    tokens.append(fold_plural(surface))
+            else:
+                tokens.append(base if base and base != '*' else surface)
+        return tokens
+
+    def _analyze(self, text: str):
+        """(表層形, 品詞, 基本形) を順に返す"""
+        if self.backend == 'fugashi':
+            for word in self._tagger(text):
+                yield word.surface, word.feature.pos1, getattr(word.feature, 'lemma', None) or word.surface
+        else:
+            for token in self._tagger.tokenize(text):
+                yield token.surface, token.part_of_speech, token.base_form
+
+
+# 名前 → インスタンス（マッチャー・リサーチDB・ストラテジーで共有）
+_TOKENIZERS: Dict[str, Tokenizer] = {}
+
+
+def get_tokenizer(name: str = 'ngram') -> Tokenizer:
+    """
+    共有のトークナイザーを取得
+
+    Args:
+        name: 'ngram'、'morphological'、または 'auto'（形態素解析が使えればそれ、なければ ngram）
+
+    Returns:
+        Tokenizer
+    """
+    if name == 'auto':
+        name = 'morphological' if (FUGASHI_AVAILABLE or JANOME_AVAILABLE) else 'ngram'
+
+    if name not in _TOKENIZERS:
+        if name == 'ngram':
+            _TOKENIZERS[name] = NgramTokenizer()
+        elif name == 'morphological':
+            if not (FUGASHI_AVAILABLE or JANOME_AVAILABLE):
+                # 代替を登録して、警告は最初の1回だけにする
+                logger.warning("fugashi/janome not installed, using n-gram tokenizer")
+                _TOKENIZERS[name] = get_tokenizer('ngram')
+            else:
+                _TOKENIZERS[name] = MorphologicalTokenizer()
+        else:
+            raise ValueError(f"Unknown tokenizer: {name}")
+
+    return _TOKENIZERS[name]
@@ -13,11 +13,14 @@ class UsageTracker:
     def __init__(self, config: 'MaterialConfig'):
         self.config = config
         self.usage_map: Dict[str, int] = {}  # {material_id: cut_number}
+        self.storyboard_map: Dict[str, str] = {}  # {material_id: storyboard_id}（バッチで動画を区別）
         self.unused_reasons: Dict[str, str] = {}
 
-    def mark_used(self, material_id: str, cut_number: int):
+    def mark_used(self, material_id: str, cut_number: int, storyboard_id: Optional[str] = None):
         """素材を使用済みとしてマーク"""
         self.usage_map[material_id] = cut_number
+        if storyboard_id is not None:
+            self.storyboard_map[material_id] = storyboard_id
 
     def is_used(self, material_id: str) -> bool:
         """素材が使用済みかチェック"""
@@ -92,6 +95,7 @@ class UsageTracker:
         for material in materials:
             if material.id in self.usage_map:
                 report['used_materials'].append({
+                    'storyboard_id': self.storyboard_map.get(material.id),
                     'cut_number': self.usage_map[material.id],
                     'filename': material.filename,
                     'category': material.category,